@@ -1,13 +1,29 @@
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+import time
+
+_BOOT = time.perf_counter()  # 워커 부팅 시간 측정 시작점. 아래 import 시간도 포함한다.
+
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from src.core.config import settings
 from src.models.schemas import *
-from src.services.search_service import search_service
-from src.services.rag_service import rag_service
-from src.core.database import get_database
-import time
+from src.models.records import dumps
+from src.services.search_service import SearchService, get_search_service
+from src.services.rag_service import RAGService, degradable, get_rag_service
+from src.services.recommendation_service import RecommendationService, get_recommendation_service
+from src.services.chat_service import ChatService, get_chat_service
+from src.services.warmup import reset_graph_state, warm_up
+from src.core.database import get_async_database
+from src.utils.admission import Overloaded, admission_stats, expired, get_gate
+from src.utils.cache import cache_stats
+from src.utils.event_log import get_event_log
+from src.utils.graph_version import read_graph_version
+from src.utils.singleflight import flight_stats
+from src.utils.metrics import HTTP_REQUEST_SECONDS, STARTUP_SECONDS, render, server_timing, timed, tracing
+from datetime import datetime
+from typing import Optional
+import asyncio
 import logging
 import uuid
 
@@ -29,51 +45,316 @@ app.add_middleware(
 )
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """요청 지연을 라우트 템플릿별로 기록하고, 요청하면 단계별 시간을 Server-Timing 헤더로 돌려준다."""
+    start = time.perf_counter()
+    with tracing() as trace:
+        response = await call_next(request)
+    elapsed = time.perf_counter() - start
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=response.status_code)
+    if settings.trace_headers or request.headers.get("x-trace") == "1":
+        # 스트리밍 응답은 헤더를 먼저 보내므로 그 시점까지의 단계만 담긴다.
+        response.headers["Server-Timing"] = server_timing({**trace, "total": elapsed})
+        response.headers["X-Request-ID"] = request.headers.get("x-request-id") or uuid.uuid4().hex
+    return response
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    """게이트가 거절한 요청. 줄이 가득 차면 429, 대기/마감 초과면 503이며 Retry-After로 다시 올 시점을 알린다."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+def _json(payload: Any) -> Response:
+    """곡 레코드를 담은 응답을 Pydantic 검증 없이 바로 JSON 바이트로 쓴다. 필드는 response_model과 같다.
+
+    직렬화 시간은 serialization 단계로 잰다.
+    """
+    with timed("serialization"):
+        body = dumps(payload)
+    return Response(content=body, media_type="application/json")
+
+@app.on_event("startup")
+async def start_warm_up():
+    """서비스는 첫 요청에서 지연 생성되므로 여기까지는 Neo4j/OpenAI에 닿지 않는다. 예열은 백그라운드로 돈다."""
+    STARTUP_SECONDS.set(time.perf_counter() - _BOOT)
+    logger.info(f"Worker ready in {time.perf_counter() - _BOOT:.2f}s")
+    app.state.warm_up_task = None
+    if settings.warm_up:
+        app.state.warm_up_task = asyncio.create_task(
+            warm_up(get_search_service(), get_recommendation_service(), get_rag_service())
+        )
+    app.state.profile_sync_task = asyncio.create_task(_sync_profiles())
+    app.state.graph_watch_task = asyncio.create_task(_watch_graph_version())
+
+async def _watch_graph_version():
+    """적재 잡(jobs/ingest.py)이 그래프 버전을 올리면 그래프에서 만든 캐시/색인을 버리고 다시 예열한다."""
+    version = await asyncio.to_thread(read_graph_version)
+    while True:
+        await asyncio.sleep(settings.graph_version_interval)
+        current = await asyncio.to_thread(read_graph_version)
+        if current == version:
+            continue
+        version = current
+        logger.info(f"Graph version changed to {current}, dropping graph-derived state")
+        search, recommendation, rag = get_search_service(), get_recommendation_service(), get_rag_service()
+        task = getattr(app.state, "warm_up_task", None)
+        if task is not None:
+            task.cancel()
+        try:
+            reset_graph_state(search, recommendation, rag)
+        except Exception as e:
+            logger.warning(f"Graph state reset failed: {e}")
+        if settings.warm_up:
+            app.state.warm_up_task = asyncio.create_task(warm_up(search, recommendation, rag))
+
+async def _sync_profiles():
+    """이벤트 버퍼를 주기적으로 쓰고 다른 워커가 쓴 세그먼트까지 프로필에 반영한다."""
+    while True:
+        await asyncio.sleep(settings.event_flush_interval)
+        try:
+            await asyncio.to_thread(get_recommendation_service().sync_profiles)
+        except Exception as e:
+            logger.warning(f"Profile sync failed: {e}")
+
+def _warm_up_status():
+    task = getattr(app.state, "warm_up_task", None)
+    if task is None:
+        return "disabled"
+    if not task.done():
+        return "running"
+    return "cancelled" if task.cancelled() else task.result()
+
 @app.get("/health")
 async def health_check():
-    db = get_database()
-    db_healthy = db.health_check()
-    
+    """헬스 체크가 서비스를 만들지 않도록 RAG 통계는 이미 만들어진 서비스가 있을 때만 담는다."""
+    db = get_async_database()
+    db_healthy = await db.health_check()
+    rag = get_rag_service() if get_rag_service.cache_info().currsize else None
+
     return {
         "status": "healthy" if db_healthy else "unhealthy",
         "database": "connected" if db_healthy else "disconnected",
+        "cache": cache_stats(),
+        "coalescing": flight_stats(),
+        "rag": rag.stats.as_dict() if rag is not None else None,
+        "admission": admission_stats(),
+        "warm_up": _warm_up_status(),
         "timestamp": time.time()
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 스크레이프용 지표 (text exposition format 0.0.4)."""
+    return Response(content=render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def _record_views(recommendation: RecommendationService, request: SearchRequest, songs) -> None:
+    """로그인한 사용자에게 보여 준 결과 곡을 view 이벤트로 남긴다. 버퍼에 넣기만 한다."""
+    if request.user_id and songs:
+        recommendation.record_events(request.user_id, [song.song_id for song in songs], "view")
+
 @app.post("/api/search", response_model=SearchResponse)
-async def search_songs(request: SearchRequest):
+async def search_songs(
+    request: SearchRequest,
+    search: SearchService = Depends(get_search_service),
+    recommendation: RecommendationService = Depends(get_recommendation_service),
+):
     start_time = time.time()
     try:
         if request.search_type == "rag":
+            # RAG 서비스(LLM 클라이언트, 매처)는 rag 검색에서만 만든다.
+            rag = get_rag_service()
             # response_text, songs = rag_service.query(request.query)
             try:
-                response_text, songs = rag_service.query(request.query)
+                response_text, songs, _ = await rag.aquery_admitted(request.query)
+            except Overloaded:
+                raise
             except Exception as e:
                 logger.error(f"RAG query failed: {e}")
                 response_text = "Error in RAG processing"  # 기본값 할당
-            return SearchResponse(
-                songs=songs,
-                rag_response=response_text,
-                total_count=len(songs),
-                search_type=request.search_type,
-                query=request.query,
-                execution_time=time.time() - start_time
-            )
+                songs = []
+            _record_views(recommendation, request, songs)
+            return _json({
+                "songs": songs,
+                "rag_response": response_text,
+                "total_count": len(songs),
+                "search_type": request.search_type,
+                "query": request.query,
+                "execution_time": time.time() - start_time,
+                "next_cursor": None,
+            })
         else:
-            songs = search_service.search(request)
-            return SearchResponse(
-                songs=songs,
-                rag_response=None,
-                total_count=len(songs),
-                search_type=request.search_type,
-                query=request.query,
-                execution_time=time.time() - start_time
-            )
+            next_cursor = None
+            gate = get_gate(request.search_type)
+            if request.paged:
+                songs, next_cursor = await gate.run(lambda: search.asearch_page(request))
+            else:
+                songs = await gate.run(lambda: search.asearch(request))
+            _record_views(recommendation, request, songs)
+            return _json({
+                "songs": songs,
+                "rag_response": None,
+                "total_count": len(songs),
+                "search_type": request.search_type,
+                "query": request.query,
+                "execution_time": time.time() - start_time,
+                "next_cursor": next_cursor,
+            })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Overloaded:
+        raise
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# @app.post("/api/chat", response_model=ChatResponse)
+def _sse(event: str, data) -> str:
+    with timed("serialization"):
+        return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+async def _search_events(request: SearchRequest, search: SearchService, rag: Optional[RAGService]):
+    start_time = time.time()
+    gate = get_gate(request.search_type)
+    try:
+        async with gate.admit():
+            if request.search_type == "rag":
+                async for event, data in rag.astream(request.query):
+                    if event == "done":
+                        data = {**data, "execution_time": time.time() - start_time}
+                    yield _sse(event, data)
+                    # 마감이 지나면 남은 답변 토큰은 버리고 끝낸다. 곡 목록은 이미 보냈다.
+                    if event == "token" and expired():
+                        raise gate.reject("deadline")
+            else:
+                try:
+                    songs = await asyncio.wait_for(search.asearch(request), gate.deadline)
+                except asyncio.TimeoutError:
+                    raise gate.reject("deadline") from None
+                except Exception as e:
+                    logger.error(f"Search error: {e}")
+                    yield _sse("error", str(e))
+                    return
+                yield _sse("songs", songs)
+                yield _sse("done", {"path": request.search_type, "execution_time": time.time() - start_time})
+    except Overloaded as e:
+        # 헤더는 이미 나갔으므로 상태 코드 대신 이벤트로 알린다. rag는 LLM 없이 찾은 곡으로 대신한다.
+        if request.search_type == "rag" and degradable(e):
+            gate.counts["degraded"] += 1
+            answer, songs = await rag.adegraded(request.query)
+            yield _sse("songs", songs)
+            yield _sse("token", answer)
+            yield _sse("done", {"path": "degraded", "execution_time": time.time() - start_time})
+            return
+        yield _sse("error", {"detail": str(e), "reason": e.reason, "retry_after": e.retry_after})
+
+@app.post("/api/search/stream")
+async def stream_search(
+    request: SearchRequest,
+    search: SearchService = Depends(get_search_service),
+):
+    """검색 결과를 Server-Sent Events로 보낸다. songs → token... → done 순서.
+
+    줄이 이미 가득 찼으면 스트림을 열기 전에 429로 거절한다. 그 뒤의 대기/마감 초과는 error 이벤트로 알린다.
+    """
+    if request.search_type != "rag" or not settings.rag_degrade:
+        get_gate(request.search_type).check()
+    return StreamingResponse(
+        _search_events(request, search, get_rag_service() if request.search_type == "rag" else None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _export_lines(request: ExportRequest, search: SearchService):
+    try:
+        async for song in search.aexport(request.search_type, request.query):
+            yield dumps(song) + b"\n"
+    except Exception as e:
+        # 스트림 중간에 끊기면 클라이언트가 알 수 있도록 마지막 줄에 오류를 남긴다.
+        logger.error(f"Export error: {e}")
+        yield dumps({"error": str(e)}) + b"\n"
+
+@app.post("/api/search/export")
+async def export_search(request: ExportRequest, search: SearchService = Depends(get_search_service)):
+    """검색 결과 전체를 NDJSON(한 줄에 곡 하나)으로 흘려보낸다. 행 수 제한이 없는 export용."""
+    return StreamingResponse(_export_lines(request, search), media_type="application/x-ndjson")
+
+@app.post("/api/recommendations/batch", response_model=BatchRecommendationResponse)
+async def batch_recommendations(
+    request: BatchRecommendationRequest,
+    recommendation: RecommendationService = Depends(get_recommendation_service),
+):
+    """여러 seed 곡(결과 페이지, 플레이리스트)의 추천을 한 번의 그래프 조회로 합쳐 점수순으로 반환한다."""
+    start_time = time.time()
+    songs = await get_gate("recommendation").run(
+        lambda: recommendation.arecommend_for_songs(request.song_ids, request.rec_type, request.limit)
+    )
+    return _json({
+        "songs": songs,
+        "total_count": len(songs),
+        "rec_type": request.rec_type,
+        "seed_count": len(set(request.song_ids)),
+        "execution_time": time.time() - start_time,
+    })
+
+@app.post("/api/events", response_model=EventResponse, status_code=202)
+async def record_events(
+    request: EventRequest,
+    recommendation: RecommendationService = Depends(get_recommendation_service),
+):
+    """곡 조회/클릭 이벤트를 받는다. 개인화 추천에는 다음 프로필 동기화(event_flush_interval)부터 반영된다."""
+    accepted = recommendation.record_events(request.user_id, request.song_ids, request.kind)
+    return JSONResponse(status_code=202, content={"accepted": accepted})
+
+@app.get("/api/recommendations/user/{user_id}", response_model=List[ScoredSong])
+async def get_user_recommendations(
+    user_id: str,
+    limit: int = Query(default=20, ge=1, le=100),
+    recommendation: RecommendationService = Depends(get_recommendation_service),
+):
+    """사용자의 조회/클릭 기록으로 만든 추천. 기록이 없으면 인기곡을 준다."""
+    return _json(await get_gate("recommendation").run(lambda: recommendation.arecommend_for_user(user_id, limit)))
+
+@app.get("/api/recommendations/{song_id}", response_model=List[SongInfo])
+async def get_recommendations(
+    song_id: str,
+    rec_type: str = Query(default="genre", pattern="^(genre|artist|cooccurrence|embedding)$"),
+    limit: int = Query(default=5, ge=1, le=50),
+    recommendation: RecommendationService = Depends(get_recommendation_service),
+):
+    if rec_type == "genre":
+        recommend = recommendation.arecommend_by_genre
+    elif rec_type == "artist":
+        recommend = recommendation.arecommend_by_artist
+    elif rec_type == "cooccurrence":
+        recommend = recommendation.arecommend_by_playlist_cooccurrence
+    else:
+        recommend = recommendation.arecommend_by_embedding
+    return _json(await get_gate("recommendation").run(lambda: recommend(song_id, limit)))
+
+@app.on_event("shutdown")
+async def close_database():
+    for name in ("warm_up_task", "profile_sync_task", "graph_watch_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    # 아직 버퍼에 남은 이벤트를 세그먼트에 쓴다.
+    get_event_log().flush()
+    await get_async_database().close()
+
+@app.post("/api/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, chat: ChatService = Depends(get_chat_service)):
+    """session_id로 이전 대화를 이어 간다. 응답의 session_id를 다음 요청에 넘긴다."""
+    session, answer, songs = await chat.achat(request)
+    return _json({
+        "response": answer,
+        "songs": songs,
+        "session_id": session.session_id,
+        "timestamp": datetime.now().isoformat(),
+    })
 
 if __name__ == "__main__":
     import uvicorn
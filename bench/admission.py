@@ -0,0 +1,119 @@
+# src/bench/admission.py - 과부하에서 게이트 유무별 지연 분포, 거절/축소 응답 수, 처리량
+# 실행: python -m src.bench.admission --capacity 8 --service-ms 50 --load 1.0 2.0 4.0 --seconds 10
+# 동시에 capacity개만 처리하는 느린 백엔드(Neo4j/OpenAI 대역)에 초당 load×처리량만큼 요청을 열린 루프로 보낸다.
+# 게이트가 없으면 초과분이 백엔드 앞에 쌓여 모든 요청이 함께 느려진다. 게이트가 있으면 한도 밖은 빨리 거절되고
+# (--degrade-ms를 주면 축소 응답으로 대신하고), 들어간 요청의 지연은 대기 시간 + 처리 시간으로 묶인다.
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.bench.cooccurrence import _percentile
+from src.utils.admission import AdmissionGate, Overloaded, remaining
+
+
+class SlowBackend:
+    """동시에 capacity개까지 처리하고 나머지는 줄 세우는 백엔드. timeout이 지나면 트랜잭션처럼 중단된다."""
+
+    def __init__(self, capacity: int, service: float, jitter: float, seed: int):
+        self.capacity = asyncio.Semaphore(capacity)
+        self.service = service
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    async def query(self, timeout: float) -> str:
+        deadline = time.monotonic() + timeout
+        async with self.capacity:
+            left = deadline - time.monotonic()
+            cost = self.service * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+            if cost > left:
+                await asyncio.sleep(max(0.0, left))
+                raise TimeoutError("transaction timed out")
+            await asyncio.sleep(cost)
+        return "ok"
+
+
+async def run(backend: SlowBackend, gate: Optional[AdmissionGate], rate: float, seconds: float,
+              degrade: float, default_timeout: float, seed: int) -> Dict[str, object]:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+
+    async def one():
+        start = time.perf_counter()
+        try:
+            if gate is None:
+                await backend.query(default_timeout)
+            else:
+                await gate.run(lambda: backend.query(remaining(default_timeout)))
+            outcomes["ok"] += 1
+            latencies.append(time.perf_counter() - start)
+        except Overloaded as e:
+            if degrade:
+                await asyncio.sleep(degrade)  # LLM 없이 캐시/색인으로 만든 축소 응답
+                outcomes["degraded"] += 1
+            else:
+                outcomes[e.reason] += 1
+        except TimeoutError:
+            outcomes["backend_timeout"] += 1
+        return time.perf_counter() - start
+
+    tasks = []
+    start = time.perf_counter()
+    next_at = start
+    while next_at - start < seconds:
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        tasks.append(asyncio.create_task(one()))
+        next_at += rng.expovariate(rate)
+    every = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return {"latencies": latencies, "every": every, "outcomes": outcomes, "elapsed": elapsed}
+
+
+def report(name: str, result: Dict[str, object]) -> None:
+    ok = result["latencies"] or [0.0]
+    every = result["every"]
+    outcomes = result["outcomes"]
+    print(f"  {name:9s} ok p50={_percentile(ok, 0.5) * 1000:7.0f}ms p99={_percentile(ok, 0.99) * 1000:7.0f}ms | "
+          f"all p99={_percentile(every, 0.99) * 1000:7.0f}ms | goodput {outcomes['ok'] / result['elapsed']:6.1f}/s | "
+          + " ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+
+
+async def main_async(args):
+    throughput = args.capacity / (args.service_ms / 1000)
+    print(f"backend: {args.capacity} concurrent x {args.service_ms:.0f}ms = {throughput:.0f} req/s; "
+          f"gate limit={args.capacity} queue={args.capacity * args.queue_factor} wait={args.wait}s "
+          f"deadline={args.deadline}s")
+    for load in args.load:
+        rate = throughput * load
+        print(f"load {load:.1f}x ({rate:.0f} req/s for {args.seconds:.0f}s)")
+        for name, use_gate, degrade in (("no gate", False, 0.0), ("gate", True, 0.0),
+                                        ("degrade", True, args.degrade_ms / 1000)):
+            if name == "degrade" and not args.degrade_ms:
+                continue
+            backend = SlowBackend(args.capacity, args.service_ms / 1000, 0.3, args.seed)
+            gate = AdmissionGate("bench", args.capacity, args.capacity * args.queue_factor, args.wait,
+                                 args.deadline) if use_gate else None
+            result = await run(backend, gate, rate, args.seconds, degrade, args.timeout, args.seed)
+            report(name, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--capacity", type=int, default=8, help="백엔드 동시 처리 수 = 게이트 한도")
+    parser.add_argument("--service-ms", type=float, default=50.0)
+    parser.add_argument("--load", type=float, nargs="+", default=[1.0, 2.0, 4.0], help="처리량 대비 도착률")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--queue-factor", type=int, default=4)
+    parser.add_argument("--wait", type=float, default=1.0)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="게이트 밖에서 쓰는 트랜잭션 timeout")
+    parser.add_argument("--degrade-ms", type=float, default=5.0, help="축소 응답 비용. 0이면 생략")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# src/bench/async_load.py - 블로킹 vs async 데이터 접근 경로 동시성 부하 테스트
+# 실행: python -m src.bench.async_load --requests 500 --latency-ms 20 --pool-size 100
+# 실제 Neo4j 대신 고정 지연을 주는 가짜 드라이버를 써서, 이벤트 루프 위에서
+# 요청이 얼마나 겹쳐 실행되는지만 비교한다.
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from src.services.search_service import SearchService
+from src.utils.cache import invalidate_all
+
+
+def _rows(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"song_id": song_id, "title": f"song {song_id}"} for song_id in params.get("song_ids", [])]
+
+
+class FakeGraph:
+    """Neo4jGraph.query처럼 호출 스레드를 latency 동안 막는다."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        time.sleep(self.latency)
+        return _rows(params or {})
+
+
+class FakeDatabase:
+    def __init__(self, latency: float):
+        self.graph = FakeGraph(latency)
+
+
+class FakeAsyncDatabase:
+    """AsyncDatabaseManager.query와 같은 인터페이스. 풀 크기만큼만 동시에 실행된다."""
+
+    def __init__(self, latency: float, pool_size: int):
+        self.latency = latency
+        self._pool = asyncio.Semaphore(pool_size)
+
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        async with self._pool:
+            await asyncio.sleep(self.latency)
+        return _rows(params or {})
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def _run(handler, requests: int) -> Dict[str, float]:
+    timings: List[float] = []
+
+    async def one(i: int):
+        start = time.perf_counter()
+        await handler([f"{i}-{j}" for j in range(10)])
+        timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed": elapsed,
+        "rps": requests / elapsed,
+        "p50": statistics.median(timings),
+        "p99": _percentile(timings, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--pool-size", type=int, default=100)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+
+    async def run_all():
+        service = SearchService()
+        service.db = FakeDatabase(latency)
+        service.adb = FakeAsyncDatabase(latency, args.pool_size)
+
+        async def blocking(song_ids):
+            # 기존 엔드포인트처럼 async 핸들러 안에서 동기 쿼리를 직접 호출한다.
+            return service.search_by_song_ids(song_ids)
+
+        results = {}
+        for name, handler in (("blocking", blocking), ("async", service.asearch_by_song_ids)):
+            invalidate_all()
+            results[name] = await _run(handler, args.requests)
+        return results
+
+    for name, r in asyncio.run(run_all()).items():
+        print(
+            f"{name:>8}: {args.requests} requests in {r['elapsed']:.2f}s "
+            f"({r['rps']:.0f} req/s) p50={r['p50']:.1f}ms p99={r['p99']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
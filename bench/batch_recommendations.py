@@ -0,0 +1,68 @@
+# src/bench/batch_recommendations.py - 결과 페이지 전체 추천: seed별 호출 vs 배치 호출의 그래프 왕복 수/지연
+# 실행: python -m src.bench.batch_recommendations --page 50 --latency-ms 20 --pool-size 10
+# 고정 지연 가짜 드라이버를 써서 Neo4j 없이 돈다. 곡별 장르/아티스트 추천을 모두 부르는 경우와
+# recommend_for_songs를 추천 유형마다 한 번 부르는 경우를 비교한다.
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from src.bench.async_load import FakeAsyncDatabase
+from src.services.recommendation_service import RecommendationService
+from src.utils.cache import invalidate_all
+
+REC_TYPES = ("genre", "artist")
+
+
+class CountingAsyncDatabase(FakeAsyncDatabase):
+    def __init__(self, latency: float, pool_size: int):
+        super().__init__(latency, pool_size)
+        self.calls = 0
+
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        self.calls += 1
+        params = dict(params or {})
+        params.setdefault("song_ids", [f"rec-{i}" for i in range(params.get("limit", 0))])
+        return await super().query(query, params, timeout)
+
+
+async def _per_seed(service: RecommendationService, song_ids: List[str], limit: int):
+    calls = []
+    for song_id in song_ids:
+        calls.append(service.arecommend_by_genre(song_id, limit))
+        calls.append(service.arecommend_by_artist(song_id, limit))
+    return await asyncio.gather(*calls)
+
+
+async def _batch(service: RecommendationService, song_ids: List[str], limit: int):
+    return await asyncio.gather(*(service.arecommend_for_songs(song_ids, rec_type, limit) for rec_type in REC_TYPES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=50, help="seed로 쓸 결과 페이지 크기")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    song_ids = [str(i) for i in range(args.page)]
+
+    async def run_all():
+        results = {}
+        for name, handler in (("per_seed", _per_seed), ("batch", _batch)):
+            invalidate_all()
+            service = RecommendationService()
+            service.adb = CountingAsyncDatabase(args.latency_ms / 1000, args.pool_size)
+            start = time.perf_counter()
+            await handler(service, song_ids, args.limit)
+            results[name] = (service.adb.calls, time.perf_counter() - start)
+        return results
+
+    for name, (calls, elapsed) in asyncio.run(run_all()).items():
+        print(f"{name:>8}: page of {args.page} songs -> {calls} graph queries in {elapsed * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# src/bench/chat_sessions.py - 대화 세션 저장소: 유휴 세션 메모리, 만료 청소, 긴 대화의 프롬프트 크기/지연
+# 실행: python -m src.bench.chat_sessions --sessions 100000 --turns 200
+# RAG는 받은 history 길이만 기록하는 가짜를 쓰므로 Neo4j/OpenAI 없이 돈다.
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from src.core.config import settings
+from src.models.schemas import ChatRequest
+from src.services.chat_service import ChatService
+from src.utils.session_store import MemorySessionStore, Session
+
+ANSWER = "요청하신 분위기의 곡을 골라봤어요. 'Hype Boy' - NewJeans, '여름밤의 꿈' - 아이유, " * 8
+
+
+class FakeRAG:
+    """ChatService가 넘긴 history 길이를 기록하고 고정 답을 돌려준다."""
+
+    def __init__(self):
+        self.history_chars: List[int] = []
+
+    def _answer(self, question: str, history: str) -> Tuple[str, list]:
+        self.history_chars.append(len(history))
+        return ANSWER, []
+
+    def query(self, question: str, history: str = "") -> Tuple[str, list]:
+        return self._answer(question, history)
+
+    async def aquery(self, question: str, history: str = "") -> Tuple[str, list]:
+        return self._answer(question, history)
+
+
+def idle_sessions(n: int) -> None:
+    """질문 하나/답 하나를 주고받고 멈춘 세션 n개가 차지하는 메모리와 만료 청소 시간."""
+    store = MemorySessionStore(n, settings.session_timeout)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for i in range(n):
+        session = Session(f"{i:032x}", f"user-{i}")
+        session.append("user", f"신나는 여름 노래 추천해줘 {i}")
+        session.append("assistant", f"{i} {ANSWER}")  # 답은 세션마다 다른 문자열이다
+        store.save(session)
+    elapsed = time.perf_counter() - start
+    size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    print(f"{n} idle sessions: {size / 2**20:.1f}MB ({size / n:.0f}B/session), "
+          f"saved in {elapsed:.2f}s ({elapsed / n * 1e6:.1f}us/save)")
+
+    # 모두 session_timeout을 넘긴 것으로 돌려 두고, 다음 저장이 앞에서부터 걷어내는 시간을 잰다.
+    for session in list(store._data.values()):
+        session.updated_at -= settings.session_timeout + 1
+    start = time.perf_counter()
+    store.save(Session("fresh", "user-fresh"))
+    print(f"expired sweep: {n} sessions in {(time.perf_counter() - start) * 1000:.0f}ms, {len(store)} left")
+
+
+async def long_conversation(turns: int) -> None:
+    rag = FakeRAG()
+    chat = ChatService(rag=rag, store=MemorySessionStore(10, settings.session_timeout))
+    session_id = None
+    latencies: List[float] = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        session, _, _ = await chat.achat(ChatRequest(
+            message=f"{turn}번째 질문: 비슷한 분위기로 더 보여줘", user_id="u1", session_id=session_id,
+        ))
+        latencies.append((time.perf_counter() - start) * 1e6)
+        session_id = session.session_id
+    for turn in sorted({1, 5, 10, 50, turns}):
+        if turn <= turns:
+            print(f"turn {turn:>4}: history {rag.history_chars[turn - 1]:>5} chars, "
+                  f"chat overhead {latencies[turn - 1]:.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    idle_sessions(args.sessions)
+    asyncio.run(long_conversation(args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# src/bench/cooccurrence.py - 공동 등장 이웃 테이블 빌드/조회 벤치마크 (합성 플레이리스트)
+# 실행: python -m src.bench.cooccurrence --songs 707989 --playlists 115071
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import Iterator, List, Tuple
+
+from src.jobs.cooccurrence import build_index
+from src.utils.cooccurrence import CooccurrenceIndex
+
+
+def synthetic_edges(songs: int, playlists: int, mean_length: int = 46, seed: int = 42) -> Iterator[Tuple[str, str]]:
+    """곡 인기도가 Zipf 분포를 따르는 (playlist_id, song_id) 간선을 만든다."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(songs)]
+    song_ids = [str(i) for i in range(songs)]
+    for playlist in range(playlists):
+        length = max(1, int(rng.expovariate(1 / mean_length)))
+        for song_id in rng.choices(song_ids, weights, k=length):
+            yield str(playlist), song_id
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--songs", type=int, default=707_989)
+    parser.add_argument("--playlists", type=int, default=115_071)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_index(synthetic_edges(args.songs, args.playlists), top_k=args.top_k)
+    print(f"build: {time.perf_counter() - start:.1f}s, {len(index)} songs, {len(index.neighbors)} neighbours")
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        index = CooccurrenceIndex.load(path)
+        rng = random.Random(7)
+        queries = [str(index.song_ids[rng.randrange(len(index))]) for _ in range(args.queries)]
+        timings = []
+        for song_id in queries:
+            t = time.perf_counter()
+            index.neighbors_of(song_id, args.limit)
+            timings.append((time.perf_counter() - t) * 1e6)
+        print(
+            f"lookup (mmap): p50={statistics.median(timings):.1f}us "
+            f"p99={_percentile(timings, 0.99):.1f}us max={max(timings):.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
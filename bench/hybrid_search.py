@@ -0,0 +1,143 @@
+# src/bench/hybrid_search.py - hybrid 검색과 기존 방식(title/artist/embedding/rag)의 적중률과 지연
+# 실행: python -m src.bench.hybrid_search --scale 0.05 --queries 300 --llm-token-ms 20
+# 합성 그래프의 곡 하나를 정답으로 정하고 세 종류의 질의를 만든다.
+#   title: 제목 단어 하나 (여러 곡이 걸리는 모호한 질의)
+#   artist_title: "아티스트 단어 + 제목 단어" (한 색인만으로는 전체 문자열이 걸리지 않는다)
+#   semantic: 뜻으로만 찾을 수 있는 문장. 임베딩 stub이 정답 곡 벡터에 잡음을 더해 돌려준다
+# 각 방식이 정답 곡을 상위 limit 안에, 몇 번째로 내는지(hit@limit, MRR)와 캐시를 비운 호출의 지연을 잰다.
+import argparse
+import asyncio
+import random
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from src.bench.cooccurrence import _percentile
+from src.bench.suite import _query_word, setup_services
+from src.bench.synthetic import synthetic_graph
+from src.utils.cache import invalidate_all
+
+KINDS = ("title", "artist_title", "semantic")
+
+
+class TargetEmbeddings:
+    """등록한 문장이면 정답 곡 벡터에 잡음을 더한 벡터를, 아니면 문장마다 고정된 난수 벡터를 준다."""
+
+    def __init__(self, index, noise: float, seed: int):
+        self.index = index
+        self.noise = noise
+        self.targets: Dict[str, str] = {}
+        self.rng = np.random.default_rng(seed)
+
+    def embed_query(self, text: str) -> List[float]:
+        song_id = self.targets.get(text)
+        if song_id is None:
+            return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(self.index.dim).tolist()
+        vector = self.index.vector(self.index.row(song_id)).astype(np.float32)
+        scale = float(np.linalg.norm(vector)) / np.sqrt(len(vector))
+        return (vector + self.noise * scale * self.rng.standard_normal(len(vector))).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+def make_queries(graph, embeddings: TargetEmbeddings, per_kind: int, seed: int) -> List[Tuple[str, str, str]]:
+    """(종류, 질의, 정답 song_id) 목록."""
+    rng = random.Random(seed)
+    nodes, edges = graph
+    titles = {song_id: title for song_id, title, _ in nodes["song"]}
+    names = dict(nodes["artist"])
+    performed = [(song_id, artist_id) for song_id, artist_id in edges["song_artist"] if titles.get(song_id)]
+    queries = []
+    for i in range(per_kind):
+        song_id, artist_id = rng.choice(performed)
+        queries.append(("title", _query_word(rng, titles[song_id]), song_id))
+        song_id, artist_id = rng.choice(performed)
+        artist_word = max(names[artist_id].split(), key=len)
+        queries.append(("artist_title", f"{artist_word} {_query_word(rng, titles[song_id])}", song_id))
+        song_id, _ = rng.choice(performed)
+        sentence = f"그 노래 #{i} 같은 분위기"
+        embeddings.targets[sentence] = song_id
+        queries.append(("semantic", sentence, song_id))
+    return queries
+
+
+async def evaluate(name: str, fn: Callable[[str, int], Any], queries: List[Tuple[str, str, str]],
+                   limit: int) -> Dict[str, Dict[str, float]]:
+    """종류별 hit@limit, MRR, 캐시를 비운 호출의 p50/p99(ms)."""
+    stats: Dict[str, Dict[str, list]] = {kind: {"ranks": [], "ms": []} for kind in KINDS}
+    for kind, query, target in queries:
+        invalidate_all()
+        start = time.perf_counter()
+        result = await fn(query, limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        songs = result[1] if isinstance(result, tuple) else result
+        ids = list(dict.fromkeys(song.song_id for song in songs))
+        stats[kind]["ranks"].append(ids.index(target) + 1 if target in ids else None)
+        stats[kind]["ms"].append(elapsed)
+    report = {}
+    for kind, s in stats.items():
+        ranks = s["ranks"]
+        report[kind] = {
+            "hit": sum(rank is not None for rank in ranks) / len(ranks),
+            "mrr": sum(1 / rank for rank in ranks if rank is not None) / len(ranks),
+            "p50": _percentile(s["ms"], 0.5),
+            "p99": _percentile(s["ms"], 0.99),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=300, help="질의 종류마다 수")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--noise", type=float, default=0.6, help="semantic 질의 벡터에 더하는 잡음 (곡 벡터 크기 대비)")
+    parser.add_argument("--embed-ms", type=float, default=0.0, help="질의 임베딩 API 지연")
+    parser.add_argument("--llm-token-ms", type=float, default=0.0, help="stub LLM의 단어당 지연 (rag)")
+    parser.add_argument("--rag-queries", type=int, default=30, help="rag는 느리므로 종류마다 이만큼만 잰다")
+    args = parser.parse_args()
+
+    graph = synthetic_graph(args.scale, args.seed)
+    setup: Dict[str, float] = {}
+    search, _, rag, _ = setup_services(graph, "memory", False, args.dim, args.llm_token_ms / 1000, setup)
+    embeddings = TargetEmbeddings(search.vector_index, args.noise, args.seed)
+    if args.embed_ms:
+        embed = embeddings.aembed_query
+
+        async def slow_embed(text: str) -> List[float]:
+            await asyncio.sleep(args.embed_ms / 1000)
+            return await embed(text)
+
+        embeddings.aembed_query = slow_embed
+    search._embeddings = embeddings
+    queries = make_queries(graph, embeddings, args.queries, args.seed)
+    print(f"{len(graph[0]['song'])} songs, {len(queries)} queries, limit={args.limit}, "
+          f"embed={args.embed_ms:.0f}ms, llm token={args.llm_token_ms:.0f}ms")
+
+    modes = {
+        "title": search.asearch_by_title,
+        "artist": search.asearch_by_artist,
+        "embedding": search.asearch_by_embedding,
+        "hybrid": search.asearch_by_hybrid,
+        "rag": lambda query, limit: rag.aquery(query),
+    }
+
+    async def run_all():
+        print(f"{'mode':10s} " + " ".join(f"{kind + ' hit/mrr':>22s}" for kind in KINDS) + "   p50/p99 (ms)")
+        for name, fn in modes.items():
+            subset = queries if name != "rag" else queries[:3 * args.rag_queries]
+            report = await evaluate(name, fn, subset, args.limit)
+            ms = [report[kind] for kind in KINDS]
+            print(f"{name:10s} " + " ".join(f"{r['hit']:>14.3f}/{r['mrr']:.3f}" for r in ms)
+                  + f"   {np.mean([r['p50'] for r in ms]):6.2f}/{max(r['p99'] for r in ms):6.2f}")
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# src/bench/hydration_profile.py - 곡 hydration 쿼리 PROFILE 비교 (기존 OPTIONAL MATCH vs song_card_query)
+# 실행: python -m src.bench.hydration_profile --runs 5 --batch 50
+# 실제 Neo4j에 PROFILE을 걸어 db hits/행 수를 모으고, 같은 쿼리를 반복 실행해 지연 시간을 잰다.
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.core.database import get_database
+from src.services.recommendation_service import ARTIST_RECOMMENDATION_QUERY, POPULAR_SONGS_QUERY
+from src.services.search_service import SONG_BY_ID_QUERY, SONGS_BY_ARTIST_IDS_QUERY, SONGS_BY_IDS_QUERY, TITLE_SCAN_QUERY
+
+_LEGACY_RETURN = """
+WITH {carry}s,
+     head(collect(DISTINCT a)) as artist,
+     head(collect(DISTINCT g)) as genre,
+     head(collect(DISTINCT al)) as album,
+     head(collect(DISTINCT sg)) as subgenre
+RETURN s.song_id AS song_id,
+       s.title AS title,
+       s.issue_date AS issue_date,
+       artist.name AS artist_name,
+       artist.artist_id AS artist_id,
+       genre.name AS genre_name,
+       genre.genre_id AS genre_id,
+       album.title AS album_title,
+       album.album_id AS album_id,
+       subgenre.name AS subgenre_name
+"""
+
+_LEGACY_FANOUT = """
+OPTIONAL MATCH (s)-[:PERFORMED_BY]-(a:Artist)
+OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
+OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
+OPTIONAL MATCH (g)-[:CONTAINS]-(sg:SubGenre)
+"""
+
+
+def _legacy(match: str, carry: str = "", tail: str = "") -> str:
+    return match + _LEGACY_FANOUT + _LEGACY_RETURN.format(carry=carry) + tail
+
+
+# song_card_query 도입 전 서비스 쿼리 원문
+LEGACY_QUERIES = {
+    "songs_by_ids": _legacy(
+        "UNWIND range(0, size($song_ids) - 1) AS idx\nMATCH (s:Song {song_id: $song_ids[idx]})",
+        carry="idx, ", tail="ORDER BY idx\n",
+    ),
+    "song_by_id": _legacy("MATCH (s:Song {song_id: $song_id})"),
+    "songs_by_artist_ids": """
+UNWIND range(0, size($artist_ids) - 1) AS rank
+MATCH (a:Artist {artist_id: $artist_ids[rank]})-[:PERFORMED_BY]-(s:Song)
+WITH s, rank, a
+ORDER BY rank
+WITH s, head(collect(rank)) AS rank, head(collect(a)) AS a
+ORDER BY rank, coalesce(s.popularity, 0) DESC, s.title
+LIMIT $limit
+OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
+OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
+OPTIONAL MATCH (g)-[:CONTAINS]-(sg:SubGenre)
+WITH rank, s, a,
+     head(collect(DISTINCT g)) as genre,
+     head(collect(DISTINCT al)) as album,
+     head(collect(DISTINCT sg)) as subgenre
+RETURN s.song_id AS song_id, s.title AS title, s.issue_date AS issue_date,
+       a.name AS artist_name, a.artist_id AS artist_id, genre.name AS genre_name, genre.genre_id AS genre_id,
+       album.title AS album_title, album.album_id AS album_id, subgenre.name AS subgenre_name
+ORDER BY rank, coalesce(s.popularity, 0) DESC, s.title
+""",
+    "title_scan": _legacy(
+        "MATCH (s:Song)\nWHERE toLower(s.title) CONTAINS toLower($query)\nWITH DISTINCT s",
+        tail="ORDER BY s.title\nLIMIT $limit\n",
+    ),
+    "artist_recommendation": """
+MATCH (s:Song {song_id: $song_id})-[:PERFORMED_BY]-(a:Artist)-[:PERFORMED_BY]-(rec:Song)
+WHERE s.song_id <> rec.song_id
+WITH DISTINCT rec, a
+OPTIONAL MATCH (rec)-[:HAS_GENRE]-(g:Genre)
+OPTIONAL MATCH (rec)-[:IN_ALBUM]-(al:Album)
+RETURN rec.song_id AS song_id, rec.title AS title, rec.issue_date AS issue_date,
+       a.name AS artist_name, a.artist_id AS artist_id, g.name AS genre_name, g.genre_id AS genre_id,
+       al.title AS album_title, al.album_id AS album_id
+ORDER BY rec.issue_date DESC
+LIMIT $limit
+""",
+    "popular_songs": _legacy(
+        "MATCH (s:Song)\nWHERE s.popularity IS NOT NULL\nWITH s\nORDER BY s.popularity DESC\nLIMIT $limit",
+        tail="ORDER BY s.popularity DESC\n",
+    ),
+}
+
+CURRENT_QUERIES = {
+    "songs_by_ids": SONGS_BY_IDS_QUERY,
+    "song_by_id": SONG_BY_ID_QUERY,
+    "songs_by_artist_ids": SONGS_BY_ARTIST_IDS_QUERY,
+    "title_scan": TITLE_SCAN_QUERY,
+    "artist_recommendation": ARTIST_RECOMMENDATION_QUERY,
+    "popular_songs": POPULAR_SONGS_QUERY,
+}
+
+SAMPLE_QUERY = """
+MATCH (s:Song)-[:PERFORMED_BY]-(a:Artist)
+WITH s, a LIMIT $n
+RETURN collect(DISTINCT s.song_id) AS song_ids, collect(DISTINCT a.artist_id) AS artist_ids
+"""
+
+
+def _totals(plan: Dict[str, Any]) -> Tuple[int, int]:
+    """PROFILE 트리 전체의 db hits 합과 최상위 연산자가 내보낸 행 수."""
+    hits = 0
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        hits += node.get("dbHits", 0)
+        stack.extend(node.get("children", []))
+    return hits, plan.get("rows", 0)
+
+
+def _profile(session, query: str, params: Dict[str, Any], runs: int) -> Dict[str, float]:
+    summary = session.run("PROFILE " + query, params).consume()
+    hits, rows = _totals(summary.profile)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        session.run(query, params).consume()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"db_hits": hits, "rows": rows, "p50_ms": statistics.median(latencies), "max_ms": max(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=50, help="songs_by_ids에 넘길 곡 수")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--title", default="love")
+    args = parser.parse_args()
+
+    graph = get_database().graph
+    with graph._driver.session(database=graph._database) as session:
+        sample = session.run(SAMPLE_QUERY, {"n": args.batch}).single()
+        song_ids, artist_ids = sample["song_ids"], sample["artist_ids"][:3]
+        params = {
+            "song_ids": song_ids,
+            "song_id": song_ids[0],
+            "artist_ids": artist_ids,
+            "query": args.title,
+            "limit": args.limit,
+        }
+        # 첫 실행의 plan 컴파일/페이지 캐시 적재가 비교에 섞이지 않게 한 번씩 미리 돌린다.
+        for query in list(LEGACY_QUERIES.values()) + list(CURRENT_QUERIES.values()):
+            session.run(query, params).consume()
+
+        print(f"{'query':<22} {'version':<8} {'db hits':>10} {'rows':>6} {'p50':>9} {'max':>9}")
+        for name in CURRENT_QUERIES:
+            for version, queries in (("legacy", LEGACY_QUERIES), ("card", CURRENT_QUERIES)):
+                r = _profile(session, queries[name], params, args.runs)
+                print(f"{name:<22} {version:<8} {r['db_hits']:>10} {r['rows']:>6} "
+                      f"{r['p50_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# src/bench/ingest.py - Melon 파일 스트리밍 적재: 파싱 메모리, writer 수별 처리량, 동시 배치 충돌, 재적재/증분 적재
+# 실행: python -m src.bench.ingest --scale 0.05 --workers 1 4 8 --row-us 20
+# 합성 그래프를 Melon 원본 형식(song_meta.json, train.json, genre_gn_all.json)으로 써 두고 jobs/ingest.py를 돌린다.
+# Neo4j 대신 MERGE 의미를 흉내 내는 메모리 그래프에 쓰며, 행당 --row-us 만큼 쓰기 지연을 준다.
+# 같은 라운드에 도는 배치가 같은 노드를 건드리면 conflicts로 센다 (Neo4j라면 잠금 대기/교착).
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.bench.synthetic import synthetic_graph
+from src.jobs.ingest import (EDGE_LOADS, EXISTING_PLAYLISTS_QUERY, NODE_LOADS, GraphWriter, ingest, playlist_chunks,
+                             song_chunks)
+
+ENDPOINTS = {
+    "song_artist": ("song", "artist"),
+    "song_album": ("song", "album"),
+    "song_genre": ("song", "genre"),
+    "song_subgenre": ("song", "subgenre"),
+    "genre_subgenre": ("genre", "subgenre"),
+    "playlist_song": ("playlist", "song"),
+}
+
+
+class MemoryGraphDB:
+    """db.write/db.graph.query만 흉내 내는 그래프. MERGE는 집합 추가, 관계 MATCH는 양 끝 노드가 있을 때만 맞는다."""
+
+    def __init__(self, row_us: float):
+        self.row_us = row_us
+        self.nodes: Dict[str, Set[str]] = defaultdict(set)
+        self.edges: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self.conflicts = 0
+        self.batches = 0
+        self._queries = {query: ("node", name) for name, query in NODE_LOADS.items()}
+        self._queries.update({query: ("edge", name) for name, query in EDGE_LOADS.items()})
+        self._locked: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def graph(self) -> "MemoryGraphDB":
+        return self
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if query == EXISTING_PLAYLISTS_QUERY:
+            return [{"id": playlist_id} for playlist_id in params["ids"] if playlist_id in self.nodes["playlist"]]
+        return []  # 제약 조건/인덱스
+
+    def write(self, query: str, params: Dict[str, Any]) -> Dict[str, int]:
+        kind, name = self._queries[query]
+        rows = params["rows"]
+        if kind == "node":
+            keys = {(name, row[0]) for row in rows}
+        else:
+            src, dst = ENDPOINTS[name]
+            keys = {(src, row[0]) for row in rows} | {(dst, row[1]) for row in rows}
+        with self._lock:
+            self.batches += 1
+            if keys & self._locked:
+                self.conflicts += 1
+            self._locked |= keys
+        try:
+            time.sleep(len(rows) * self.row_us / 1e6)
+            with self._lock:
+                if kind == "node":
+                    before = len(self.nodes[name])
+                    self.nodes[name].update(row[0] for row in rows)
+                    return {"nodes_created": len(self.nodes[name]) - before, "relationships_created": 0}
+                before = len(self.edges[name])
+                self.edges[name].update((row[0], row[1]) for row in rows
+                                        if row[0] in self.nodes[src] and row[1] in self.nodes[dst])
+                return {"nodes_created": 0, "relationships_created": len(self.edges[name]) - before}
+        finally:
+            with self._lock:
+                self._locked -= keys
+
+
+def write_melon_files(path: str, scale: float, seed: int, holdout: float) -> str:
+    """합성 그래프를 Melon 원본 형식으로 쓴다. 플레이리스트 끝의 holdout 비율은 증분 적재용 파일로 뺀다."""
+    nodes, edges = synthetic_graph(scale, seed)
+    artist_names = dict(nodes["artist"])
+    album_titles = dict(nodes["album"])
+    by_song: Dict[str, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+    for name in ("song_artist", "song_album", "song_genre", "song_subgenre"):
+        for song_id, target in edges[name]:
+            by_song[song_id][name].append(target)
+    with open(os.path.join(path, "genre_gn_all.json"), "w", encoding="utf-8") as f:
+        json.dump(dict(nodes["genre"] + nodes["subgenre"]), f, ensure_ascii=False)
+    with open(os.path.join(path, "song_meta.json"), "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, (song_id, title, issue_date) in enumerate(nodes["song"]):
+            song = by_song[song_id]
+            album_id = song["song_album"][0] if song["song_album"] else None
+            f.write(("," if i else "") + json.dumps({
+                "id": int(song_id), "song_name": title, "issue_date": issue_date,
+                "album_id": int(album_id) if album_id is not None else None,
+                "album_name": album_titles.get(album_id),
+                "artist_id_basket": [int(artist_id) for artist_id in song["song_artist"]],
+                "artist_name_basket": [artist_names[artist_id] for artist_id in song["song_artist"]],
+                "song_gn_gnr_basket": song["song_genre"], "song_gn_dtl_gnr_basket": song["song_subgenre"],
+            }, ensure_ascii=False))
+        f.write("]")
+    playlists: Dict[str, List[int]] = defaultdict(list)
+    for playlist_id, song_id in edges["playlist_song"]:
+        playlists[playlist_id].append(int(song_id))
+    items = [{"id": int(playlist_id), "plylst_title": title, "songs": playlists[playlist_id],
+              "like_cnt": len(playlists[playlist_id]), "updt_date": "2020-04-01 00:00:00.000"}
+             for playlist_id, title in nodes["playlist"]]
+    cut = int(len(items) * (1 - holdout))
+    for name, part in (("train.json", items[:cut]), ("delta.json", items[cut:])):
+        with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+            json.dump(part, f, ensure_ascii=False)
+    return path
+
+
+def parse_memory(path: str, chunk_size: int) -> None:
+    """쓰기 없이 파일을 청크로 읽기만 할 때의 최대 할당량. json.load로 한 번에 읽을 때와 비교한다."""
+    for name, chunks in (("song_meta.json", lambda: song_chunks(os.path.join(path, "song_meta.json"), chunk_size)),
+                         ("train.json", lambda: playlist_chunks([os.path.join(path, "train.json")], chunk_size))):
+        size = os.path.getsize(os.path.join(path, name))
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = sum(1 for _ in chunks())
+        streaming = tracemalloc.get_traced_memory()[1]
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        tracemalloc.start()
+        with open(os.path.join(path, name), encoding="utf-8") as f:
+            json.load(f)
+        whole = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name}: {size / 2**20:.0f}MB file, {count} chunks in {elapsed:.1f}s, "
+              f"peak {streaming / 2**20:.0f}MB streaming vs {whole / 2**20:.0f}MB json.load")
+
+
+def run(path: str, workers: int, row_us: float, batch_size: int, chunk_size: int) -> MemoryGraphDB:
+    db = MemoryGraphDB(row_us)
+    writer = GraphWriter(db, batch_size, workers)
+    start = time.perf_counter()
+    try:
+        ingest(db, writer, path, ("genres", "songs", "playlists"), [os.path.join(path, "train.json")], chunk_size)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    rows = sum(stats.rows for name, stats in writer.stats.items() if name != "parse")
+    print(f"workers={workers}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), "
+          f"{db.batches} batches, {db.conflicts} conflicts")
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--row-us", type=float, default=20.0, help="행당 쓰기 지연 (마이크로초)")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--holdout", type=float, default=0.1, help="증분 적재로 넣을 플레이리스트 비율")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        write_melon_files(path, args.scale, args.seed, args.holdout)
+        print(f"Melon-format files written in {time.perf_counter() - start:.1f}s")
+        parse_memory(path, args.chunk_size)
+        for workers in args.workers:
+            db = run(path, workers, args.row_us, args.batch_size, args.chunk_size)
+
+        # 같은 파일을 다시 넣으면 아무것도 만들지 않아야 한다. 새 플레이리스트만 증분으로 들어간다.
+        counts = {name: len(keys) for name, keys in list(db.nodes.items()) + list(db.edges.items())}
+        writer = GraphWriter(db, args.batch_size, args.workers[-1])
+        ingest(db, writer, path, ("genres", "songs", "playlists"), [os.path.join(path, "train.json")],
+               args.chunk_size, skip_existing=False)
+        created = sum(stats.created for stats in writer.stats.values())
+        print(f"re-ingest: {created} created (graph unchanged: "
+              f"{counts == {name: len(keys) for name, keys in list(db.nodes.items()) + list(db.edges.items())}})")
+        writer = GraphWriter(db, args.batch_size, args.workers[-1])
+        start = time.perf_counter()
+        loaded = ingest(db, writer, path, ("playlists",),
+                        [os.path.join(path, "delta.json"), os.path.join(path, "train.json")], args.chunk_size)
+        writer.close()
+        print(f"delta: {len(loaded)} new playlists, {writer.stats['playlist_song'].created} INCLUDES created "
+              f"in {time.perf_counter() - start:.1f}s (existing playlists skipped)")
+
+
+if __name__ == "__main__":
+    main()
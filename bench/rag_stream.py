@@ -0,0 +1,89 @@
+# src/bench/rag_stream.py - RAG 스트리밍(astream) vs 일괄 응답(aquery) 첫 결과까지 걸리는 시간
+# 실행: python -m src.bench.rag_stream --runs 5 --token-delay-ms 20
+# 토큰을 한 글자씩 흘려주는 가짜 LLM과 고정 지연 가짜 그래프를 쓰므로 Neo4j/OpenAI 없이 돈다.
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.bench.async_load import FakeAsyncDatabase
+from src.services.rag_service import RAGService
+from src.utils.cache import invalidate_all
+from src.utils.query_understanding import IntentMatcher
+
+FAKE_CYPHER = "MATCH (s:Song) RETURN s.song_id LIMIT 10"
+FAKE_ANSWER = "여름에 어울리는 신나는 곡들을 골라봤어요. 시원한 비트와 밝은 멜로디가 특징입니다. " * 3
+
+
+class FakeGraph:
+    """GraphCypherQAChain.from_llm이 요구하는 최소 인터페이스."""
+
+    get_structured_schema = {"node_props": {}, "rel_props": {}, "relationships": [], "metadata": {}}
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return []
+
+
+class FakeRAGDatabase(FakeAsyncDatabase):
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        if query == FAKE_CYPHER:
+            await asyncio.sleep(self.latency)
+            return [{"s.song_id": str(i)} for i in range(10)]
+        return await super().query(query, params, timeout)
+
+
+def _service(token_delay: float, db_latency: float) -> RAGService:
+    llm = FakeListChatModel(responses=[FAKE_CYPHER, FAKE_ANSWER], sleep=token_delay)
+    adb = FakeRAGDatabase(db_latency, pool_size=100)
+    service = RAGService(llm=llm, graph=FakeGraph(), adb=adb)
+    service._matcher = IntentMatcher([], lambda name: [])
+    service.answers = None  # 매 질문이 체인 전체를 타도록 답변 캐시를 끈다
+    service.search.adb = adb
+    return service
+
+
+async def _run(service: RAGService, question: str, streaming: bool) -> Tuple[float, float]:
+    """(첫 결과까지, 전체) 시간을 초 단위로 반환한다. 일괄 응답은 둘이 같다."""
+    start = time.perf_counter()
+    if not streaming:
+        await service.aquery(question)
+        elapsed = time.perf_counter() - start
+        return elapsed, elapsed
+    first = None
+    async for event, _ in service.astream(question):
+        if event == "songs" and first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--token-delay-ms", type=float, default=20)
+    parser.add_argument("--db-latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    async def run_all():
+        service = _service(args.token_delay_ms / 1000, args.db_latency_ms / 1000)
+        results = {}
+        for name, streaming in (("aquery", False), ("astream", True)):
+            runs = []
+            for i in range(args.runs):
+                invalidate_all()  # 곡 캐시/Cypher plan 캐시 없이 매번 전체 경로를 탄다
+                runs.append(await _run(service, f"신나는 여름 노래 {name} {i}", streaming))
+            results[name] = runs
+        return results
+
+    for name, runs in asyncio.run(run_all()).items():
+        first = [f * 1000 for f, _ in runs]
+        total = [t * 1000 for _, t in runs]
+        print(f"{name:>8}: time to first result p50={statistics.median(first):.0f}ms "
+              f"max={max(first):.0f}ms, full answer p50={statistics.median(total):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# src/bench/serialization.py - 결과 행 → 응답 바이트: Pydantic 경로 vs 레코드 + orjson 경로
+# 실행: python -m src.bench.serialization --rows 50 --runs 5000
+# 드라이버가 돌려주는 dict 행 50개를 응답 한 건으로 만드는 비용만 잰다 (GZip 제외).
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from src.bench.cooccurrence import _percentile
+from src.models import records
+from src.models.records import SongRecord, dumps
+from src.models.schemas import SearchResponse, SongInfo
+
+
+def _rows(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [{
+        "song_id": str(rng.randrange(700_000)),
+        "title": f"여름밤의 꿈 {i}",
+        "issue_date": f"20{rng.randrange(10, 24)}0{rng.randrange(1, 10)}15",
+        "artist_name": f"아티스트 {rng.randrange(100_000)}",
+        "artist_id": str(rng.randrange(100_000)),
+        "genre_name": "발라드",
+        "genre_id": "GN0100",
+        "album_title": f"앨범 {rng.randrange(300_000)}",
+        "album_id": str(rng.randrange(300_000)),
+        "subgenre_name": "국내발라드" if i % 3 else None,
+    } for i in range(n)]
+
+
+def pydantic_path(rows: List[Dict[str, Any]]) -> bytes:
+    """기존 경로: 행마다 SongInfo 검증 → SearchResponse 재검증 → model_dump_json."""
+    songs = [SongInfo(**row) for row in rows]
+    return SearchResponse(
+        songs=songs, rag_response=None, total_count=len(songs), search_type="title",
+        query="여름", execution_time=0.01,
+    ).model_dump_json().encode()
+
+
+def record_path(rows: List[Dict[str, Any]]) -> bytes:
+    return cached_record_path(SongRecord.from_rows(rows))
+
+
+def cached_record_path(songs: List[SongRecord]) -> bytes:
+    """곡 캐시에서 꺼낸 레코드처럼 이미 인코딩된 곡을 다시 응답으로 쓸 때."""
+    return dumps({
+        "songs": songs, "rag_response": None, "total_count": len(songs), "search_type": "title",
+        "query": "여름", "execution_time": 0.01, "next_cursor": None,
+    })
+
+
+def _timed(fn: Callable[[List[Any]], bytes], rows: List[Any], runs: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(rows)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {"p50": _percentile(samples, 0.5), "p99": _percentile(samples, 0.99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    # 응답 바이트가 같아야 공개 스키마가 그대로라는 뜻이다.
+    assert pydantic_path(rows) == record_path(rows), "record path changed the response body"
+
+    songs = SongRecord.from_rows(rows)
+    cases = {
+        "pydantic": (pydantic_path, rows),
+        "record": (record_path, rows),
+        "record, cached": (cached_record_path, songs),
+    }
+    results = {}
+    orjson = records.orjson
+    for encoder in ("orjson", "json") if orjson is not None else ("json",):
+        records.orjson = orjson if encoder == "orjson" else None
+        for name, (fn, inputs) in cases.items():
+            if name == "pydantic" and encoder == "json":
+                continue
+            for song in songs:
+                song._json = None
+            results[name if name == "pydantic" else f"{name} ({encoder})"] = _timed(fn, inputs, args.runs)
+    records.orjson = orjson
+
+    base = results["pydantic"]["p50"]
+    for name, r in results.items():
+        print(f"{name:>24}: p50={r['p50']:.1f}us p99={r['p99']:.1f}us ({base / r['p50']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
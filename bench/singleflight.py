@@ -0,0 +1,132 @@
+# src/bench/singleflight.py - 같은 질의가 동시에 몰릴 때 백엔드 호출이 한 번으로 합쳐지는지 확인
+# 실행: python -m src.bench.singleflight --concurrency 200 --latency-ms 50
+# 캐시가 빈 상태에서 대소문자/공백만 다른 같은 질의를 동시에 보내고, 가짜 백엔드 호출 수를 센다.
+# 합쳐지지 않으면 0이 아닌 코드로 끝나므로 배포 전 점검에도 쓴다.
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.bench.async_load import FakeAsyncDatabase, FakeGraph
+from src.bench.rag_stream import FAKE_CYPHER, _service as _rag_service
+from src.services.search_service import SearchService
+from src.utils.cache import invalidate_all
+from src.utils.ngram_index import NgramIndex
+from src.utils.singleflight import flight_stats
+
+TITLES = [("1", "Hype Boy"), ("2", "Ditto"), ("3", "Super Shy"), ("4", "Hype Up")]
+
+
+class CountingGraph(FakeGraph):
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        return super().query(query, params)
+
+
+class CountingAsyncDatabase(FakeAsyncDatabase):
+    def __init__(self, latency: float, pool_size: int):
+        super().__init__(latency, pool_size)
+        self.calls = 0
+
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        self.calls += 1
+        return await super().query(query, params, timeout)
+
+
+class CountingDatabase:
+    def __init__(self, latency: float):
+        self.graph = CountingGraph(latency)
+
+
+def _service(latency: float, pool_size: int) -> SearchService:
+    service = SearchService()
+    service.db = CountingDatabase(latency)
+    service.adb = CountingAsyncDatabase(latency, pool_size)
+    service._title_index = NgramIndex.build(TITLES)
+    return service
+
+
+def _rag_calls(latency: float, queries: List[str]) -> Dict[str, Any]:
+    """RAG aquery를 동시에 보내고 생성된 Cypher가 그래프에 몇 번 나갔는지 센다 (= 체인 실행 수)."""
+    service = _rag_service(token_delay=0.001, db_latency=latency)
+    adb = service.adb
+    calls = {"cypher": 0}
+    query = adb.query
+
+    async def counting(cypher: str, params=None, timeout=None):
+        if cypher == FAKE_CYPHER:
+            calls["cypher"] += 1
+        return await query(cypher, params, timeout)
+
+    adb.query = counting
+    elapsed = asyncio.run(_async_calls(service.aquery, queries))
+    return {"calls": calls["cypher"], "elapsed": elapsed}
+
+
+def _variants(query: str, n: int) -> List[str]:
+    """같은 키로 정규화되는 질의 변형들 (앞뒤 공백, 대소문자)."""
+    forms = [query, query.upper(), f"  {query}", query.lower() + " "]
+    return [forms[i % len(forms)] for i in range(n)]
+
+
+async def _async_calls(fn, queries: List[str]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(fn(query) for query in queries))
+    return time.perf_counter() - start
+
+
+def _thread_calls(fn, queries: List[str]) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        list(pool.map(fn, queries))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--query", default="hype boy")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    queries = _variants(args.query, args.concurrency)
+    uncached = SearchService.asearch_by_title.__wrapped__
+
+    failed = False
+    for name, coalesced in (("async", True), ("async, no cache", False), ("threads", True), ("rag", True)):
+        invalidate_all()
+        service = _service(latency, args.pool_size)
+        if name == "rag":
+            result = _rag_calls(latency, _variants("신나는 여름 노래", args.concurrency))
+            elapsed, calls = result["elapsed"], result["calls"]
+        elif name == "threads":
+            elapsed = _thread_calls(service.search_by_title, queries)
+            calls = service.db.graph.calls
+        else:
+            fn = service.asearch_by_title if coalesced else (lambda query: uncached(service, query))
+            elapsed = asyncio.run(_async_calls(fn, queries))
+            calls = service.adb.calls
+        print(f"{name:>16}: {args.concurrency} requests -> {calls} backend calls in {elapsed * 1000:.0f}ms")
+        if coalesced and calls != 1:
+            failed = True
+
+    print(f"coalescing: {flight_stats()}")
+    if failed:
+        print("FAIL: identical concurrent requests were not coalesced into one backend call")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
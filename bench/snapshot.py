@@ -0,0 +1,60 @@
+# src/bench/snapshot.py - 그래프 스냅샷 빌드/로드 시간과 조회 지연 (합성 그래프)
+# 실행: python -m src.bench.snapshot --scale 1.0
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+from src.bench.cooccurrence import _percentile
+from src.bench.synthetic import synthetic_graph
+from src.utils.snapshot import GraphSnapshot
+
+
+def _timed(fn, runs: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50": _percentile(samples, 0.5), "p99": _percentile(samples, 0.99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="README 원본 크기 대비 비율")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    nodes, edges = synthetic_graph(args.scale)
+    start = time.perf_counter()
+    built = GraphSnapshot.build(nodes, edges)
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as path:
+        built.save(path)
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        start = time.perf_counter()
+        snapshot = GraphSnapshot.load(path)
+        load_time = time.perf_counter() - start
+        print(f"build {build_time:.1f}s, load {load_time * 1000:.1f}ms, {size / 2**20:.0f}MB on disk")
+
+        rng = random.Random(7)
+        song_ids = [rng.choice(nodes["song"])[0] for _ in range(args.runs * args.batch)]
+        artist_ids = [rng.choice(nodes["artist"])[0] for _ in range(args.runs)]
+        cases = {
+            f"songs_by_ids x{args.batch}": lambda i: snapshot.songs_by_ids(song_ids[i * args.batch:(i + 1) * args.batch]),
+            "songs_by_artist_ids": lambda i: snapshot.songs_by_artist_ids(artist_ids[i:i + 3], 10),
+            "artist_recommendations": lambda i: snapshot.artist_recommendations([song_ids[i]], 5),
+            "genre_recommendations": lambda i: snapshot.genre_recommendations([song_ids[i]], 5),
+            "popular_songs": lambda i: snapshot.popular_songs(10),
+        }
+        for name, fn in cases.items():
+            r = _timed(fn, args.runs)
+            print(f"{name:>24}: p50={r['p50']:.3f}ms p99={r['p99']:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
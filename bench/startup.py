@@ -0,0 +1,67 @@
+# src/bench/startup.py - API 워커 부팅 시간 (import → startup 이벤트 → 예열 완료)
+# 실행: python -m src.bench.startup --runs 5
+# 매 회 새 인터프리터에서 측정한다. NEO4J_URI를 닿지 않는 주소로 두어
+# 부팅 경로가 Neo4j/OpenAI에 연결하지 않는다는 것도 함께 확인한다.
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from src.bench.cooccurrence import _percentile
+
+SNIPPET = """
+import asyncio, json, time
+start = time.perf_counter()
+from src.api.main import app
+imported = time.perf_counter() - start
+
+async def boot():
+    await app.router.startup()
+    ready = time.perf_counter() - start
+    task = app.state.warm_up_task
+    warm_up = await task if task is not None and {wait} else None
+    return ready, time.perf_counter() - start, warm_up
+
+ready, warmed, steps = asyncio.run(boot())
+print(json.dumps({{"import": imported, "ready": ready, "warmed": warmed, "steps": steps}}))
+"""
+
+
+def _run_once(wait: bool, env: Dict[str, str]) -> Dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(wait=wait)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--wait-warm-up", action="store_true", help="예열 태스크가 끝날 때까지 잰다")
+    parser.add_argument("--neo4j-uri", default="bolt://127.0.0.1:1", help="기본값은 닿지 않는 주소")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    env = dict(os.environ, NEO4J_URI=args.neo4j_uri)
+    if not args.wait_warm_up:
+        env["WARM_UP"] = "false"
+    runs = [_run_once(args.wait_warm_up, env) for _ in range(args.runs)]
+
+    result: Dict[str, Dict[str, float]] = {}
+    for key in ("import", "ready", "warmed"):
+        samples: List[float] = [run[key] * 1000 for run in runs]
+        result[key] = {"p50": _percentile(samples, 0.5), "max": max(samples)}
+        print(f"{key:>8}: p50={result[key]['p50']:.0f}ms max={result[key]['max']:.0f}ms")
+    if args.wait_warm_up and runs[-1]["steps"]:
+        for step, seconds in runs[-1]["steps"].items():
+            print(f"{'':>10}{step}: {seconds * 1000:.0f}ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"runs": runs, "summary": result}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
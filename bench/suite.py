@@ -0,0 +1,406 @@
+# src/bench/suite.py - 서비스 메서드 전체의 처리량/지연 백분위 (콜드/웜 캐시), 결과는 JSON으로 저장
+# 실행: python -m src.bench.suite --scale 0.05 --out bench-results.json
+#       python -m src.bench.suite --backend neo4j --load --scale 1.0 --out v2.json --baseline v1.json
+# 기본(--backend memory)은 합성 그래프의 스냅샷을 Neo4j 자리에 꽂아 쓰고, LLM/임베딩은 고정 응답 stub을 쓴다.
+# 입력(곡 id, 검색어, 질문)은 같은 scale/seed의 합성 그래프에서 뽑으므로 릴리스 간 결과를 그대로 비교할 수 있다.
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+import zlib
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.bench.cooccurrence import _percentile
+from src.bench.synthetic import Graph, graph_counts, load_neo4j, load_snapshot, synthetic_graph
+from src.bench.vector_index import synthetic_vectors
+from src.jobs.cooccurrence import build_index
+from src.models.schemas import SearchRequest
+from src.services import recommendation_service as recommendation_module
+from src.services import search_service as search_module
+from src.services.rag_service import GENRE_NAMES_QUERY, RAGService
+from src.utils.cache import invalidate_all
+from src.utils.genre_pool import GenrePools
+from src.utils.query_understanding import ARTIST_SONGS_QUERY, GENRE_YEAR_SONGS_QUERY
+from src.utils.snapshot import GraphSnapshot, SnapshotBackend
+from src.utils.vector_index import VectorIndex, train_centroids
+
+STUB_CYPHER = "MATCH (s:Song) RETURN s.song_id LIMIT 10"
+STUB_ANSWER = "요청하신 분위기에 맞는 곡들을 골라봤어요. 밝은 멜로디와 경쾌한 리듬이 특징입니다."
+REC_TYPES = ("genre", "artist", "cooccurrence", "embedding")
+
+
+class StubChatModel(BaseChatModel):
+    """Cypher 생성 프롬프트에는 STUB_CYPHER를, 답변 프롬프트에는 STUB_ANSWER를 단어 단위로 준다."""
+
+    token_delay: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @staticmethod
+    def _reply(messages) -> str:
+        prompt = " ".join(str(message.content) for message in messages)
+        return STUB_CYPHER if "Generate Cypher" in prompt else STUB_ANSWER
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._reply(messages)
+        time.sleep(self.token_delay * len(reply.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._reply(messages)
+        await asyncio.sleep(self.token_delay * len(reply.split()))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        for word in self._reply(messages).split(" "):
+            await asyncio.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+class StubEmbeddings:
+    """질의 문장마다 고정된 난수 벡터. OpenAIEmbeddings의 embed_query/aembed_query 자리에 쓴다."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed_query(self, text: str) -> List[float]:
+        return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(self.dim).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+def _genre_names(snapshot: GraphSnapshot) -> List[Dict[str, Any]]:
+    names = snapshot.strings[("genre", "name")]
+    return [{"name": names[row]} for row in range(len(names))]
+
+
+def _genre_year_songs(snapshot: GraphSnapshot, genre: str, year: str, limit: int) -> List[Dict[str, Any]]:
+    names = snapshot.strings[("genre", "name")]
+    dates = snapshot.strings[("song", "issue_date")]
+    songs = [song for row in range(len(names)) if names[row] == genre
+             for song in snapshot.adjacent("genre_song", row).tolist()
+             if (dates[song] or "").startswith(year)]
+    songs.sort(key=lambda song: -int(snapshot.song_popularity[song]))
+    return [{"song_id": str(snapshot.ids["song"][song])} for song in songs[:limit]]
+
+
+# RAG의 장르 목록/빠른 경로 쿼리와 stub Cypher를 스냅샷으로 답한다.
+RAG_HANDLERS = {
+    GENRE_NAMES_QUERY: lambda snapshot, p: _genre_names(snapshot),
+    ARTIST_SONGS_QUERY: lambda snapshot, p: [
+        {"song_id": row["song_id"]} for row in snapshot.songs_by_artist_ids(p["artist_ids"], p["limit"])],
+    GENRE_YEAR_SONGS_QUERY: lambda snapshot, p: _genre_year_songs(snapshot, p["genre"], p["year"], p["limit"]),
+    STUB_CYPHER: lambda snapshot, p: [{"s.song_id": row["song_id"]} for row in snapshot.popular_songs(10)],
+}
+
+
+class MemoryGraph:
+    """DatabaseManager/Neo4jGraph 자리에 꽂는 스냅샷 stand-in. 처리하지 못한 쿼리는 세고 빈 결과를 준다."""
+
+    get_schema = ""
+    get_structured_schema = {"node_props": {}, "rel_props": {}, "relationships": [], "metadata": {}}
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.backend = SnapshotBackend(snapshot, {
+            **search_module.SNAPSHOT_HANDLERS,
+            **recommendation_module.SNAPSHOT_HANDLERS,
+            **RAG_HANDLERS,
+        })
+        self.unsupported: Counter = Counter()
+
+    @property
+    def graph(self) -> "MemoryGraph":
+        return self
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if self.backend.supports(query):
+            return self.backend.query(query, params)
+        self.unsupported[" ".join(query.split())[:80]] += 1
+        return []
+
+    def stream(self, query: str, params: Optional[Dict[str, Any]] = None):
+        return iter(self.query(query, params))
+
+    # GraphCypherQAChain이 확인하는 GraphStore 프로토콜의 나머지. 스냅샷은 읽기 전용이다.
+    def refresh_schema(self) -> None:
+        pass
+
+    def add_graph_documents(self, graph_documents, include_source: bool = False) -> None:
+        raise NotImplementedError("MemoryGraph is read-only")
+
+
+class MemoryAsyncDatabase:
+    """AsyncDatabaseManager 자리의 stand-in. MemoryGraph에 위임한다."""
+
+    def __init__(self, graph: MemoryGraph):
+        self.graph = graph
+
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        return self.graph.query(query, params)
+
+    async def stream(self, query: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+        for row in self.graph.query(query, params):
+            yield row
+
+
+def _timed(setup: Dict[str, float], name: str, fn: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    setup[name] = time.perf_counter() - start
+    return result
+
+
+def _vector_index(graph: Graph, dim: int) -> VectorIndex:
+    song_ids = np.array([row[0] for row in graph[0]["song"]], dtype=str)
+    with tempfile.TemporaryDirectory() as path:
+        vectors = np.array(synthetic_vectors(os.path.join(path, "vectors.npy"), len(song_ids), dim,
+                                             clusters=max(1, len(song_ids) // 500)))
+    centroids = train_centroids(vectors, nlist=max(1, int(4 * np.sqrt(len(song_ids)))))
+    return VectorIndex.build(song_ids, vectors, centroids)
+
+
+def _genre_pools(graph: Graph) -> GenrePools:
+    _, edges = graph
+    popularity = Counter(song_id for _, song_id in edges["playlist_song"])
+    return GenrePools.build((genre_id, song_id, popularity[song_id]) for song_id, genre_id in edges["song_genre"])
+
+
+def setup_services(graph: Graph, backend: str, load: bool, dim: int, token_delay: float,
+                   setup: Dict[str, float]) -> Tuple[Any, Any, RAGService, Optional[MemoryGraph]]:
+    """합성 그래프와 그 위에서 만든 사전 계산물을 꽂은 서비스를 만든다. 세 서비스가 같은 SearchService를 쓴다."""
+    search = search_module.SearchService()
+    recommendation = recommendation_module.RecommendationService(search=search)
+    memory = None
+    if backend == "memory":
+        snapshot = _timed(setup, "snapshot_build", lambda: load_snapshot(graph))
+        memory = MemoryGraph(snapshot)
+        adb = MemoryAsyncDatabase(memory)
+        search.db, search.adb, search._backend = memory, adb, SnapshotBackend(snapshot, search_module.SNAPSHOT_HANDLERS)
+        recommendation.db, recommendation.adb = memory, adb
+        recommendation._backend = SnapshotBackend(snapshot, recommendation_module.SNAPSHOT_HANDLERS)
+        rag = RAGService(llm=StubChatModel(token_delay=token_delay), graph=memory, adb=adb, search=search)
+    else:
+        if load:
+            setup.update({f"neo4j_load_{name}": seconds for name, seconds in load_neo4j(search.db, graph).items()})
+        rag = RAGService(llm=StubChatModel(token_delay=token_delay), search=search)
+
+    recommendation._cooccurrence = _timed(setup, "cooccurrence_build", lambda: build_index(graph[1]["playlist_song"]))
+    recommendation._genre_pools = _timed(setup, "genre_pools_build", lambda: _genre_pools(graph))
+    search._vector_index = _timed(setup, "vector_index_build", lambda: _vector_index(graph, dim))
+    search._embeddings = StubEmbeddings(dim)
+    search._title_index = search._artist_index = None
+    _timed(setup, "title_index_build", lambda: search.title_index)
+    _timed(setup, "artist_index_build", lambda: search.artist_index)
+    _timed(setup, "rag_matcher_build", lambda: rag.matcher)
+    return search, recommendation, rag, memory
+
+
+def _query_word(rng: random.Random, text: str) -> str:
+    word = rng.choice(text.split())
+    return word if word.isascii() else word[:2]
+
+
+def make_inputs(graph: Graph, calls: int, seed: int) -> Dict[str, list]:
+    """메서드 인자로 쓸 입력. 같은 그래프/seed면 항상 같다."""
+    rng = random.Random(seed)
+    nodes, _ = graph
+    songs, artists, genres = nodes["song"], nodes["artist"], nodes["genre"]
+    song_ids = [rng.choice(songs)[0] for _ in range(calls)]
+    titles = [_query_word(rng, rng.choice(songs)[1]) for _ in range(calls)]
+    artist_names = [rng.choice(artists)[1] for _ in range(calls)]
+    questions = []
+    for i in range(calls):
+        if i % 3 == 0:
+            questions.append(f"{rng.randint(2000, 2020)}년 {rng.choice(genres)[1]} 노래")
+        elif i % 3 == 1:
+            questions.append(f"{artist_names[i]} 노래 알려줘")
+        else:
+            questions.append(f"{titles[i]} 같은 분위기의 노래 추천해줘")
+    return {
+        "song_ids": song_ids,
+        "titles": titles,
+        "artists": [name.split()[0] for name in artist_names],
+        "sentences": [rng.choice(songs)[1] for _ in range(calls)],
+        "pages": [[rng.choice(songs)[0] for _ in range(20)] for _ in range(calls)],
+        "limits": [10] * calls,
+        "questions": questions,
+    }
+
+
+async def _drain(iterator: AsyncIterator[Any]) -> List[Any]:
+    return [item async for item in iterator]
+
+
+def make_cases(search, recommendation, rag: RAGService) -> List[Tuple[str, str, Callable[[Any], Any], str]]:
+    """(서비스, 메서드, 입력 하나로 부르는 함수, 입력 이름). async 메서드는 awaitable을 돌려준다."""
+    cases = []
+    for prefix in ("", "a"):
+        for method, inputs in (("search_by_title", "titles"), ("search_by_artist", "artists"),
+                               ("search_by_embedding", "sentences"), ("search_by_hybrid", "titles"),
+                               ("search_by_song_ids", "pages"),
+                               ("search_title_page", "titles"), ("search_artist_page", "artists")):
+            cases.append(("SearchService", prefix + method, getattr(search, prefix + method), inputs))
+        cases.append(("SearchService", prefix + "search",
+                      lambda query, fn=getattr(search, prefix + "search"): fn(
+                          SearchRequest(query=query, search_type="title")), "titles"))
+        cases.append(("SearchService", prefix + "search_page",
+                      lambda query, fn=getattr(search, prefix + "search_page"): fn(
+                          SearchRequest(query=query, search_type="artist", paginate=True)), "artists"))
+    cases.append(("SearchService", "search_by_song_id", search.search_by_song_id, "song_ids"))
+    cases.append(("SearchService", "aexport", lambda query: _drain(search.aexport("artist", query)), "artists"))
+
+    for prefix in ("", "a"):
+        for method in ("recommend_by_genre", "recommend_by_artist", "recommend_by_playlist_cooccurrence",
+                       "recommend_by_embedding"):
+            cases.append(("RecommendationService", prefix + method, getattr(recommendation, prefix + method), "song_ids"))
+        popular = "get_popular_songs" if not prefix else "aget_popular_songs"
+        cases.append(("RecommendationService", popular, getattr(recommendation, popular), "limits"))
+        for rec_type in REC_TYPES:
+            cases.append(("RecommendationService", f"{prefix}recommend_for_songs[{rec_type}]",
+                          lambda song_ids, fn=getattr(recommendation, prefix + "recommend_for_songs"), t=rec_type:
+                          fn(song_ids, t), "pages"))
+
+    cases.append(("RAGService", "query", rag.query, "questions"))
+    cases.append(("RAGService", "aquery", rag.aquery, "questions"))
+    cases.append(("RAGService", "astream", lambda question: _drain(rag.astream(question)), "questions"))
+    return cases
+
+
+def _size(result: Any) -> int:
+    """결과 곡 수. (곡 목록, 커서)/(답변, 곡 목록) 튜플은 그 안의 목록을 센다."""
+    if isinstance(result, tuple):
+        result = next((item for item in result if isinstance(item, list)), [])
+    return len(result or [])
+
+
+async def measure(fn: Callable[[Any], Any], inputs: list, cold: bool) -> Dict[str, Any]:
+    """cold면 매 호출 전에 결과/plan 캐시를 비우고, warm이면 같은 입력으로 한 바퀴 미리 채운다.
+
+    색인/사전 계산물은 두 경우 모두 이미 올라와 있다 (그 비용은 setup_seconds에 따로 기록).
+    """
+    async def call(arg):
+        result = fn(arg)
+        return await result if inspect.isawaitable(result) else result
+
+    if not cold:
+        for arg in inputs:
+            await call(arg)
+    timings: List[float] = []
+    empty = 0
+    for arg in inputs:
+        if cold:
+            invalidate_all()
+        start = time.perf_counter()
+        result = await call(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+        empty += _size(result) == 0
+    return {
+        "calls": len(timings),
+        "empty": empty,
+        "throughput_rps": len(timings) / max(sum(timings) / 1000, 1e-9),
+        "mean_ms": sum(timings) / len(timings),
+        "p50_ms": _percentile(timings, 0.5),
+        "p90_ms": _percentile(timings, 0.9),
+        "p99_ms": _percentile(timings, 0.99),
+        "max_ms": max(timings),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(baseline_path: str, results: List[Dict[str, Any]]) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["service"], r["method"], r["cache"]): r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path} (p50/p99 비율, 1보다 크면 느려짐)")
+    for r in results:
+        old = baseline.get((r["service"], r["method"], r["cache"]))
+        if old and old["p50_ms"] and old["p99_ms"]:
+            print(f"{r['service'] + '.' + r['method']:<60} {r['cache']:<5} "
+                  f"p50 x{r['p50_ms'] / old['p50_ms']:.2f}  p99 x{r['p99_ms'] / old['p99_ms']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=0.02, help="README 원본 크기 대비 비율 (1.0 = Melon 전체)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=("memory", "neo4j"), default="memory")
+    parser.add_argument("--load", action="store_true", help="--backend neo4j일 때 합성 그래프를 먼저 적재한다")
+    parser.add_argument("--calls", type=int, default=200, help="메서드/캐시 상태마다 호출 수")
+    parser.add_argument("--dim", type=int, default=64, help="합성 임베딩 차원")
+    parser.add_argument("--llm-token-ms", type=float, default=0.0, help="stub LLM의 단어당 지연")
+    parser.add_argument("--only", help="'서비스.메서드'에 대한 정규식. 맞는 것만 잰다")
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    setup: Dict[str, float] = {}
+    graph = _timed(setup, "graph_generate", lambda: synthetic_graph(args.scale, args.seed))
+    search, recommendation, rag, memory = setup_services(
+        graph, args.backend, args.load, args.dim, args.llm_token_ms / 1000, setup)
+    inputs = make_inputs(graph, args.calls, args.seed)
+    cases = [case for case in make_cases(search, recommendation, rag)
+             if not args.only or re.search(args.only, f"{case[0]}.{case[1]}")]
+
+    async def run_all() -> List[Dict[str, Any]]:
+        results = []
+        for service, method, fn, input_name in cases:
+            for cache in ("cold", "warm"):
+                r = {"service": service, "method": method, "cache": cache,
+                     **await measure(fn, inputs[input_name], cache == "cold")}
+                results.append(r)
+                print(f"{service + '.' + method:<60} {cache:<5} {r['throughput_rps']:>9.1f}/s "
+                      f"p50={r['p50_ms']:.2f}ms p99={r['p99_ms']:.2f}ms empty={r['empty']}")
+        return results
+
+    results = asyncio.run(run_all())
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "scale": args.scale,
+            "seed": args.seed,
+            "calls": args.calls,
+            "dim": args.dim,
+            "llm_token_ms": args.llm_token_ms,
+        },
+        "graph": graph_counts(graph),
+        "setup_seconds": setup,
+        # memory 백엔드에서 스냅샷으로 답하지 못해 빈 결과를 준 쿼리 (스캔 폴백 등)
+        "unsupported_queries": dict(memory.unsupported) if memory is not None else {},
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nresults -> {args.out}")
+    if args.baseline:
+        _compare(args.baseline, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# src/bench/synthetic.py - Melon 규모 합성 그래프 생성기와 Neo4j/스냅샷 적재
+# 실행: python -m src.bench.synthetic --scale 1.0 --load snapshot --out data/snapshot
+#       python -m src.bench.synthetic --scale 0.1 --load neo4j --wipe
+# 같은 scale/seed면 항상 같은 그래프가 나오므로, 벤치마크 입력을 만들 때도 이 생성기를 다시 돌린다.
+import argparse
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.bench.title_index import synthetic_titles
+from src.jobs.ingest import EDGE_LOADS, NODE_LOADS, GraphWriter, ingest_schema
+from src.utils.snapshot import GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+# README에 적힌 원본 그래프 크기. scale=1.0이면 이 크기에 맞춘다.
+MELON = {
+    "songs": 707_989,
+    "artists": 115_456,
+    "albums": 287_235,
+    "genres": 30,
+    "subgenres": 219,
+    "playlists": 115_071,
+    "performed_by": 779_461,
+    "includes": 5_285_871,
+    "in_album": 707_989,
+    "has_genre": 802_859,
+    "contains": 1_054,
+}
+
+GENRE_NAMES = [
+    "발라드", "댄스", "랩/힙합", "R&B/Soul", "인디음악", "록/메탈", "성인가요/트로트", "포크/블루스",
+    "POP", "일렉트로니카", "OST", "재즈", "클래식", "J-POP", "뉴에이지", "CCM", "키즈", "국악",
+    "월드뮤직", "애니메이션/웹툰", "매장음악", "크로스오버", "중국음악", "종교음악", "태교", "동요",
+    "뮤지컬", "캐롤", "힐링", "그룹사운드",
+]
+
+Graph = Tuple[Dict[str, List[Tuple[Any, ...]]], Dict[str, List[Tuple[str, str]]]]
+
+WIPE_QUERY = "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+
+
+def _zipf(n: int, exponent: float, rng: np.random.Generator) -> np.ndarray:
+    """n개 항목의 Zipf 확률. 순위를 섞어서 id 순서와 인기도가 무관하게 한다."""
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** exponent
+    return rng.permutation(weights / weights.sum())
+
+
+def _dates(rng: np.random.Generator, n: int) -> List[str]:
+    """최근 연도일수록 많은 발매일 (yyyymmdd)."""
+    years = np.clip(2020 - rng.exponential(7.0, n).astype(int), 1960, 2020)
+    months = rng.integers(1, 13, n)
+    days = rng.integers(1, 29, n)
+    return [f"{y}{m:02d}{d:02d}" for y, m, d in zip(years.tolist(), months.tolist(), days.tolist())]
+
+
+def synthetic_graph(scale: float = 1.0, seed: int = 42) -> Graph:
+    """GraphSnapshot.build 입력과 같은 모양의 (nodes, edges). 원본 차수 분포를 흉내낸다.
+
+    - 아티스트별 곡 수와 곡 인기도(INCLUDES)는 Zipf 분포, 플레이리스트 길이는 지수 분포
+    - 곡은 아티스트별로 연속된 앨범에 묶이고, 발매일과 장르는 앨범 단위로 같다
+    - 피처링(두 번째 PERFORMED_BY)과 세부 장르(SubGenre HAS_GENRE)는 원본 간선 수 비율만큼 붙는다
+    Genre/SubGenre 수는 scale과 무관하게 원본 그대로다. edges에는 스냅샷에 없는 genre_subgenre도 들어 있다.
+    """
+    rng = np.random.default_rng(seed)
+    songs = max(1, round(MELON["songs"] * scale))
+    artists = max(1, round(MELON["artists"] * scale))
+    playlists = max(1, round(MELON["playlists"] * scale))
+    genres, subgenres = MELON["genres"], MELON["subgenres"]
+
+    artist_p = _zipf(artists, 0.9, rng)
+    main_artist = rng.choice(artists, size=songs, p=artist_p)
+    featured = np.flatnonzero(rng.random(songs) < MELON["performed_by"] / MELON["songs"] - 1)
+    second_artist = rng.choice(artists, size=len(featured), p=artist_p)
+    keep = second_artist != main_artist[featured]
+    featured, second_artist = featured[keep], second_artist[keep]
+
+    # 아티스트 순으로 늘어놓고 새 아티스트이거나 확률 p_break로 새 앨범을 시작한다.
+    order = np.argsort(main_artist, kind="stable")
+    new_artist = np.r_[True, main_artist[order][1:] != main_artist[order][:-1]]
+    target_albums = max(1, round(MELON["albums"] * scale))
+    distinct = int(new_artist.sum())
+    p_break = min(1.0, max(0.0, (target_albums - distinct) / max(1, songs - distinct)))
+    album = np.empty(songs, dtype=np.int64)
+    album[order] = np.cumsum(new_artist | (rng.random(songs) < p_break)) - 1
+    albums = int(album.max()) + 1
+
+    album_genre = rng.choice(genres, size=albums, p=_zipf(genres, 1.0, rng))
+    song_genre = album_genre[album]
+    has_subgenre = np.flatnonzero(rng.random(songs) < MELON["has_genre"] / MELON["songs"] - 1)
+    # SubGenre s의 상위 장르는 s % genres. 곡의 장르에 속한 세부 장르 중 하나를 고른다.
+    per_genre = np.array([len(range(g, subgenres, genres)) for g in range(genres)])
+    parent = song_genre[has_subgenre]
+    song_subgenre = parent + genres * (rng.random(len(has_subgenre)) * per_genre[parent]).astype(np.int64)
+
+    contains = {(s % genres, s) for s in range(subgenres)}
+    while len(contains) < MELON["contains"]:
+        contains.add((int(rng.integers(genres)), int(rng.integers(subgenres))))
+
+    mean_length = MELON["includes"] / MELON["playlists"]
+    lengths = np.maximum(1, np.rint(rng.exponential(mean_length, playlists)).astype(np.int64))
+    included = rng.choice(songs, size=int(lengths.sum()), p=_zipf(songs, 0.8, rng))
+    playlist_of = np.repeat(np.arange(playlists), lengths)
+
+    song_ids = np.arange(songs).astype(str)
+    artist_ids = np.arange(artists).astype(str)
+    album_ids = np.arange(albums).astype(str)
+    song_keys, album_keys = song_ids.tolist(), album_ids.tolist()
+    genre_ids = [f"GN{g + 1:02d}00" for g in range(genres)]
+    subgenre_ids = [f"GN{s % genres + 1:02d}{s // genres + 1:02d}" for s in range(subgenres)]
+    genre_names = (GENRE_NAMES + [f"장르 {g}" for g in range(len(GENRE_NAMES), genres)])[:genres]
+
+    titles = [title for _, title in synthetic_titles(songs, seed)]
+    names = [name for _, name in synthetic_titles(artists, seed + 1)]
+    album_dates = _dates(rng, albums)
+    first_song = np.full(albums, -1, dtype=np.int64)
+    first_song[album[::-1]] = np.arange(songs)[::-1]
+
+    nodes = {
+        "song": [(song_keys[i], titles[i], album_dates[a]) for i, a in enumerate(album.tolist())],
+        "artist": list(zip(artist_ids.tolist(), names)),
+        # 싱글처럼 앨범 제목은 첫 수록곡 제목을 따른다.
+        "album": [(album_keys[a], titles[first]) for a, first in enumerate(first_song.tolist())],
+        "genre": list(zip(genre_ids, genre_names)),
+        "subgenre": [(subgenre_ids[s], f"{genre_names[s % genres]} {s // genres + 1}") for s in range(subgenres)],
+        "playlist": [(str(p), f"playlist {p}") for p in range(playlists)],
+    }
+    edges = {
+        "song_artist": list(zip(song_keys, artist_ids[main_artist].tolist()))
+        + list(zip(song_ids[featured].tolist(), artist_ids[second_artist].tolist())),
+        "song_album": list(zip(song_keys, album_ids[album].tolist())),
+        "song_genre": [(song_keys[i], genre_ids[g]) for i, g in enumerate(song_genre.tolist())],
+        "song_subgenre": [(song_keys[i], subgenre_ids[s]) for i, s in zip(has_subgenre.tolist(), song_subgenre.tolist())],
+        "genre_subgenre": [(genre_ids[g], subgenre_ids[s]) for g, s in sorted(contains)],
+        "playlist_song": list(zip(playlist_of.astype(str).tolist(), song_ids[included].tolist())),
+    }
+    return nodes, edges
+
+
+def graph_counts(graph: Graph) -> Dict[str, int]:
+    """README의 노드/관계 이름으로 센 크기. 같은 플레이리스트에 중복 수록된 곡도 센다."""
+    nodes, edges = graph
+    return {
+        "songs": len(nodes["song"]),
+        "artists": len(nodes["artist"]),
+        "albums": len(nodes["album"]),
+        "genres": len(nodes["genre"]),
+        "subgenres": len(nodes["subgenre"]),
+        "playlists": len(nodes["playlist"]),
+        "performed_by": len(edges["song_artist"]),
+        "includes": len(edges["playlist_song"]),
+        "in_album": len(edges["song_album"]),
+        "has_genre": len(edges["song_genre"]) + len(edges["song_subgenre"]),
+        "contains": len(edges["genre_subgenre"]),
+    }
+
+
+def load_neo4j(db, graph: Graph, batch_size: int = 10_000, workers: int = 4) -> Dict[str, float]:
+    """jobs/ingest.py와 같은 제약 조건/UNWIND MERGE/병렬 writer로 노드 → 관계 순으로 적재한 뒤
+    Song.popularity를 계산한다. 라벨/관계별 적재 시간(초)을 반환한다.
+    """
+    from src.jobs.popularity import FULL_REFRESH_QUERY
+
+    nodes, edges = graph
+    ingest_schema(db)
+    writer = GraphWriter(db, batch_size, workers)
+    try:
+        for label in NODE_LOADS:
+            writer.nodes(label, nodes[label])
+        for name in EDGE_LOADS:
+            writer.edges(name, edges[name])
+    finally:
+        writer.close()
+    timings = {name: stats.seconds for name, stats in writer.stats.items()}
+    for name, seconds in timings.items():
+        logger.info(f"Loaded {writer.stats[name].rows} {name} rows in {seconds:.1f}s")
+    start = time.perf_counter()
+    db.graph.query(FULL_REFRESH_QUERY)
+    timings["popularity"] = time.perf_counter() - start
+    return timings
+
+
+def load_snapshot(graph: Graph) -> GraphSnapshot:
+    """Neo4j 없이 서비스를 돌릴 때 쓰는 메모리 stand-in. serving_backend=snapshot과 같은 자료구조다."""
+    nodes, edges = graph
+    return GraphSnapshot.build(nodes, edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="README 원본 크기 대비 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--load", choices=("neo4j", "snapshot"), help="생성한 그래프를 적재할 곳")
+    parser.add_argument("--out", default="data/snapshot", help="--load snapshot의 저장 경로")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=4, help="동시에 쓰는 트랜잭션 수")
+    parser.add_argument("--wipe", action="store_true", help="--load neo4j 전에 기존 노드를 모두 지운다")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    graph = synthetic_graph(args.scale, args.seed)
+    print(f"generated in {time.perf_counter() - start:.1f}s")
+    for name, count in graph_counts(graph).items():
+        target = MELON[name] if name in ("genres", "subgenres", "contains") else round(MELON[name] * args.scale)
+        print(f"{name:>13}: {count:>10,} (target {target:,})")
+
+    if args.load == "neo4j":
+        from src.core.database import get_database
+
+        db = get_database()
+        if args.wipe:
+            db.graph.query(WIPE_QUERY)
+        timings = load_neo4j(db, graph, args.batch_size, args.workers)
+        print(f"loaded into Neo4j in {sum(timings.values()):.1f}s")
+    elif args.load == "snapshot":
+        start = time.perf_counter()
+        load_snapshot(graph).save(args.out)
+        print(f"snapshot saved in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
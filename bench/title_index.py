@@ -0,0 +1,95 @@
+# src/bench/title_index.py - CONTAINS 스캔 vs n-gram 역색인 제목 검색 벤치마크
+# 실행: python -m src.bench.title_index --size 707989
+import argparse
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from src.utils.ngram_index import NgramIndex
+
+LATIN_WORDS = [
+    "love", "night", "dream", "summer", "rain", "heart", "star", "blue", "forever", "baby",
+    "light", "feel", "you", "me", "home", "fire", "dance", "moon", "sky", "remix",
+]
+
+
+def synthetic_titles(size: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """실제 제목처럼 소수의 음절/단어가 자주 등장하도록 Zipf 분포로 제목을 만든다."""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(800)]
+    latin = LATIN_WORDS + [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+        for _ in range(2000)
+    ]
+    syllable_weights = [1 / (rank + 1) for rank in range(len(syllables))]
+    latin_weights = [1 / (rank + 1) for rank in range(len(latin))]
+    titles = []
+    for i in range(size):
+        if rng.random() < 0.6:
+            words = [
+                "".join(rng.choices(syllables, syllable_weights, k=rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 3))
+            ]
+        else:
+            words = [w.capitalize() for w in rng.choices(latin, latin_weights, k=rng.randint(1, 4))]
+        if rng.random() < 0.1:
+            words.append("(Feat. " + rng.choice(latin).capitalize() + ")")
+        titles.append((str(i), " ".join(words)))
+    return titles
+
+
+def scan_search(titles: List[Tuple[str, str]], query: str, limit: int) -> List[str]:
+    """기존 쿼리(toLower(s.title) CONTAINS toLower($query) ORDER BY s.title)를 그대로 흉내낸다."""
+    query = query.lower()
+    hits = [(title, key) for key, title in titles if query in title.lower()]
+    hits.sort()
+    return [key for _, key in hits[:limit]]
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def _measure(fn, queries: List[str]) -> List[float]:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=707_989)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    titles = synthetic_titles(args.size)
+    rng = random.Random(7)
+    queries = []
+    for _ in range(args.queries):
+        _, title = rng.choice(titles)
+        start = rng.randrange(len(title))
+        queries.append(title[start:start + rng.randint(1, 4)].strip() or title)
+
+    start = time.perf_counter()
+    index = NgramIndex.build(titles)
+    print(f"index build: {time.perf_counter() - start:.2f}s over {len(index)} titles")
+
+    for name, fn in (
+        ("contains scan", lambda q: scan_search(titles, q, args.limit)),
+        ("ngram index", lambda q: index.search(q, args.limit)),
+    ):
+        timings = _measure(fn, queries)
+        print(
+            f"{name:>14}: p50={statistics.median(timings):.2f}ms "
+            f"p95={_percentile(timings, 0.95):.2f}ms max={max(timings):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
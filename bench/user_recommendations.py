@@ -0,0 +1,117 @@
+# src/bench/user_recommendations.py - 개인화 추천: 이벤트 적재 처리량, 프로필 메모리, 추천 지연과 적중률
+# 실행: python -m src.bench.user_recommendations --scale 0.1 --users 100000 --events 30
+# 합성 그래프의 스냅샷/이웃 테이블을 꽂은 서비스(bench/suite.py)를 쓰므로 Neo4j/OpenAI 없이 돈다.
+# 사용자는 합성 플레이리스트 하나를 골라 그 곡들을 클릭하고 임의 곡 몇 개를 본 것으로 만든다.
+# 각 사용자의 플레이리스트 곡 하나는 기록하지 않고 두었다가 추천 상위 limit에 드는지(hit@limit) 본다.
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from src.bench.cooccurrence import _percentile
+from src.bench.suite import setup_services
+from src.bench.synthetic import synthetic_graph
+from src.utils.event_log import EventLog
+from src.utils.user_profiles import UserProfiles, song_genres
+
+
+def make_users(playlists: Dict[str, List[str]], song_ids: List[str], users: int, events: int,
+               seed: int) -> List[Tuple[str, List[str], List[str], str]]:
+    """(user_id, 클릭한 곡, 본 곡, 남겨 둔 곡) 목록."""
+    rng = random.Random(seed)
+    lists = [songs for songs in playlists.values() if len(songs) >= 3]
+    result = []
+    for i in range(users):
+        songs = rng.choice(lists)
+        picked = rng.sample(songs, min(len(songs), events // 2 + 1))
+        held_out, clicks = picked[0], picked[1:]
+        views = [rng.choice(song_ids) for _ in range(max(0, events - len(clicks)))]
+        result.append((f"user-{i}", clicks, views, held_out))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=float, default=0.1)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=30, help="사용자당 이벤트 수")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    graph = synthetic_graph(args.scale, args.seed)
+    setup: Dict[str, float] = {}
+    _, recommendation, _, _ = setup_services(graph, "memory", False, 64, 0.0, setup)
+    playlists: Dict[str, List[str]] = defaultdict(list)
+    for playlist_id, song_id in graph[1]["playlist_song"]:
+        playlists[playlist_id].append(song_id)
+    song_ids = [row[0] for row in graph[0]["song"]]
+    users = make_users(playlists, song_ids, args.users, args.events, args.seed)
+    print(f"{len(song_ids)} songs, {len(playlists)} playlists, {len(users)} users")
+
+    with tempfile.TemporaryDirectory() as path:
+        log = EventLog(path, flush_size=1000, retention_days=30)
+        start = time.perf_counter()
+        total = 0
+        for user_id, clicks, views, _ in users:
+            total += log.append(user_id, views, "view")
+            total += log.append(user_id, clicks, "click")
+        log.flush()
+        elapsed = time.perf_counter() - start
+        print(f"ingest: {total} events in {elapsed:.2f}s ({total / elapsed:,.0f} events/s)")
+
+        recommendation.events = log
+        recommendation._profiles = None
+        start = time.perf_counter()
+        profiles = recommendation.profiles
+        elapsed = time.perf_counter() - start
+        print(f"replay: {len(profiles)} profiles from {profiles.events} events in {elapsed:.2f}s "
+              f"({profiles.events / elapsed:,.0f} events/s)")
+
+        # 같은 이벤트를 새 프로필에 다시 반영하며 프로필이 차지하는 메모리만 잰다.
+        index, pools = recommendation.cooccurrence, recommendation.genre_pools
+        replay = EventLog(path, flush_size=1000, retention_days=30).read_new()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        measured = UserProfiles(index.song_ids, song_genres(index.song_ids, pools), len(pools), 200)
+        measured.apply(replay)
+        size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+        del replay
+        print(f"profile memory: {size / 2**20:.1f}MB ({size / len(measured):.0f}B/user)")
+
+        # 다른 워커가 세그먼트에 쓴 것처럼 새 이벤트를 붙이고 동기화 한 번의 비용을 잰다.
+        writer = EventLog(path, flush_size=10**9, retention_days=30)
+        for user_id, clicks, _, _ in users[:1000]:
+            writer.append(user_id, clicks[:1], "click")
+        writer.flush()
+        start = time.perf_counter()
+        synced = recommendation.sync_profiles()
+        print(f"sync: {synced} new events in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    rng = random.Random(args.seed)
+    sample = rng.sample(users, min(args.calls, len(users)))
+    scoring, full, hits = [], [], 0
+    for user_id, _, _, held_out in sample:
+        start = time.perf_counter()
+        scored = recommendation._user_scores(user_id, args.limit)
+        scoring.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        recommendation.recommend_for_user(user_id, args.limit)
+        full.append((time.perf_counter() - start) * 1000)
+        hits += any(song_id == held_out for song_id, _ in scored)
+    for name, timings in (("scoring", scoring), ("recommend_for_user", full)):
+        print(f"{name}: p50={_percentile(timings, 0.5):.2f}ms p99={_percentile(timings, 0.99):.2f}ms "
+              f"max={max(timings):.2f}ms")
+    print(f"hit@{args.limit}: {hits / len(sample):.3f} (held-out playlist song)")
+    start = time.perf_counter()
+    recommendation.recommend_for_user("unknown-user", args.limit)
+    print(f"cold-start fallback: {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
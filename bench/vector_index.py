@@ -0,0 +1,85 @@
+# src/bench/vector_index.py - IVF 색인 재현율/지연 vs brute-force NumPy (합성 임베딩)
+# 실행: python -m src.bench.vector_index --size 707989 --dim 1536
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from src.utils.vector_index import DTYPES, VectorIndex, train_centroids
+
+
+def synthetic_vectors(path: str, size: int, dim: int, clusters: int = 2000, seed: int = 42,
+                      chunk_size: int = 65536) -> np.ndarray:
+    """실제 임베딩처럼 군집을 이루는 벡터를 디스크 memmap에 만든다."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(size, dim))
+    for start in range(0, size, chunk_size):
+        end = min(start + chunk_size, size)
+        labels = rng.integers(0, clusters, end - start)
+        matrix[start:end] = centers[labels] + 0.8 * rng.standard_normal((end - start, dim)).astype(np.float32)
+    return matrix
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=707_989)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--dtype", choices=DTYPES, nargs="+", default=list(DTYPES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        vectors = synthetic_vectors(os.path.join(tmp, "vectors.f32.npy"), args.size, args.dim)
+        song_ids = np.array([str(i) for i in range(args.size)])
+        print(f"generate: {time.perf_counter() - start:.1f}s ({args.size} x {args.dim})")
+
+        start = time.perf_counter()
+        centroids = train_centroids(vectors, args.nlist)
+        print(f"train centroids: {time.perf_counter() - start:.1f}s (nlist={len(centroids)})")
+
+        rng = np.random.default_rng(7)
+        query_rows = rng.choice(args.size, size=args.queries, replace=False)
+        queries = np.asarray(vectors[query_rows]) + 0.3 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+        exact = VectorIndex.build(song_ids, vectors, centroids, "float32")
+        truth, timings = [], []
+        for query in queries:
+            t = time.perf_counter()
+            truth.append({key for key, _ in exact.brute_force(query, args.k)})
+            timings.append((time.perf_counter() - t) * 1000)
+        print(f"{'brute-force float32':>24}: recall=1.000 p50={statistics.median(timings):.2f}ms "
+              f"p99={_percentile(timings, 0.99):.2f}ms")
+
+        for dtype in args.dtype:
+            path = os.path.join(tmp, dtype)
+            (exact if dtype == "float32" else VectorIndex.build(song_ids, vectors, centroids, dtype, exact.assignments)).save(path)
+            index = VectorIndex.load(path)
+            size_mb = os.path.getsize(os.path.join(path, "vectors.npy")) / 1e6
+            for nprobe in args.nprobe:
+                recalls, timings = [], []
+                for query, expected in zip(queries, truth):
+                    t = time.perf_counter()
+                    found = {key for key, _ in index.search(query, args.k, nprobe)}
+                    timings.append((time.perf_counter() - t) * 1000)
+                    recalls.append(len(found & expected) / args.k)
+                print(f"{f'ivf {dtype} nprobe={nprobe}':>24}: recall={statistics.mean(recalls):.3f} "
+                      f"p50={statistics.median(timings):.2f}ms p99={_percentile(timings, 0.99):.2f}ms "
+                      f"({size_mb:.0f}MB vectors)")
+
+
+if __name__ == "__main__":
+    main()
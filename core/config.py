@@ -1,23 +1,87 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 import os
 
 class Settings(BaseSettings):
     neo4j_uri: str = "bolt://localhost:7687"
     neo4j_username: str = "neo4j"
     neo4j_password: str = ""
+    neo4j_max_pool_size: int = 100
+    neo4j_acquire_timeout: float = 5.0
+    neo4j_query_timeout: float = 10.0
+    neo4j_scan_timeout: float = 2.0  # 색인 없이 전체를 훑는 CONTAINS 대체 쿼리의 트랜잭션 timeout
     
     openai_api_key: str = ""
     
     redis_url: str = "redis://localhost:6379"
+    cache_backend: str = "memory"  # memory | redis
+    cache_ttl: int = 300
+    cache_maxsize: int = 10000
 
     app_name: str = "Music Search System"
     debug: bool = False
+    trace_headers: bool = False  # True면 모든 응답에, 아니면 X-Trace: 1 요청에만 Server-Timing을 붙인다
     max_search_results: int = 20
+    search_page_artists: int = 20
+    export_batch_size: int = 500
+    export_query_timeout: float = 300.0
+    # 검색 유형별 동시 실행 한도와 마감(초). rag 게이트는 /api/chat도 함께 쓴다.
+    admission_limits: Dict[str, int] = {
+        "title": 64, "artist": 64, "embedding": 16, "hybrid": 16, "recommendation": 32, "rag": 8, "default": 32,
+    }
+    admission_deadlines: Dict[str, float] = {
+        "title": 2.0, "artist": 2.0, "embedding": 5.0, "hybrid": 5.0, "recommendation": 3.0, "rag": 30.0,
+        "default": 5.0,
+    }
+    admission_queue_factor: int = 4  # 한도의 몇 배까지 줄 세울지. 넘으면 바로 429
+    admission_wait: float = 1.0  # 줄에서 기다리는 최대 시간. 넘으면 503
+    rag_degrade: bool = True  # rag 게이트가 거절하면 LLM 없이 템플릿/캐시된 계획/제목·아티스트 검색으로 답한다
     session_timeout: int = 3600 
+    session_backend: str = "memory"  # memory | redis
+    chat_window: int = 6  # 프롬프트에 원문 그대로 넣는 최근 메시지 수 (질문+답변)
+    chat_message_chars: int = 500  # 저장하는 메시지 한 건의 최대 길이
+    chat_summary_chars: int = 600  # 창을 벗어난 이전 질문들을 접어 두는 요약의 최대 길이
+    chat_max_sessions: int = 100000
     
     rag_top_k: int = 50
+    rag_plan_ttl: int = 86400
+    rag_answer_cache: bool = True  # 질문 임베딩이 가까운 이전 답을 재사용한다 (워커별 in-process)
+    rag_answer_threshold: float = 0.95  # ada-002 코사인 유사도. 낮추면 적중은 늘지만 엉뚱한 답이 섞인다
+    rag_answer_ttl: int = 3600
+    rag_answer_maxsize: int = 2000
+    cooccurrence_path: str = "data/cooccurrence"
+    cooccurrence_top_k: int = 50
+    genre_pool_path: str = "data/genre_pools"
+    popularity_path: str = "data/popularity"
+    popularity_reload_interval: float = 60.0
+    event_log_path: str = "data/events"
+    event_flush_size: int = 1000
+    event_flush_interval: float = 5.0  # 버퍼 flush와 다른 워커 세그먼트 반영 주기
+    event_retention_days: int = 30  # 시작할 때 다시 읽어 프로필을 복원하는 기간
+    user_profile_songs: int = 200  # 사용자마다 기억하는 최근 곡 수
+    user_genre_boost: float = 0.5  # 사용자 장르 선호가 후보 점수에 주는 최대 가중
+    # hybrid 검색: 방식별 후보를 RRF로 합치고 그래프 특징으로 재순위한 뒤 limit개만 hydrate한다
+    hybrid_candidates: int = 50  # 검색 방식별로 가져오는 후보 수
+    hybrid_rrf_k: int = 60
+    hybrid_weights: Dict[str, float] = {"title": 1.0, "artist": 1.0, "embedding": 0.7}
+    hybrid_term_weight: float = 0.5  # 여러 단어 질의에서 단어별 목록의 가중치 (질의 전체는 1)
+    hybrid_match_depth: int = 1000  # 단어마다 제목/아티스트 이름이 맞았는지 보는 범위 (coverage 특징)
+    hybrid_features: Dict[str, float] = {"coverage": 1.0, "artist": 0.1, "popularity": 0.02, "recency": 0.01}
+    hybrid_recency_half_life: float = 5.0  # 년
+    vector_index_path: str = "data/vectors"
+    vector_nlist: int = 1024
+    vector_nprobe: int = 16
+    vector_dtype: str = "float16"  # float32 | float16 | int8
     embedding_model: str = "text-embedding-ada-002"
+    serving_backend: str = "neo4j"  # neo4j | snapshot
+    snapshot_path: str = "data/snapshot"
+    graph_schema_path: str = "data/graph_schema"
+    graph_version_path: str = "data/graph_version"
+    graph_version_interval: float = 30.0  # 워커가 적재 잡의 그래프 버전 변경을 확인하는 주기
+    ingest_batch_size: int = 10000  # UNWIND 배치 한 번에 쓰는 행 수
+    ingest_workers: int = 4  # 동시에 쓰는 트랜잭션 수. 배치끼리 노드를 공유하지 않게 나눠 준다
+    warm_up: bool = True  # 워커 시작 후 백그라운드에서 색인/사전 계산물/인기곡 캐시를 미리 올린다
+    warm_up_popular: int = 100
     
     class Config:
         env_file = ".env"
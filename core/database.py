@@ -1,30 +1,97 @@
 from langchain_neo4j import Neo4jGraph
 from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from src.core.config import settings
+from src.utils.arrays import load_meta, save_meta
+from src.utils.admission import remaining
+from src.utils.metrics import NEO4J_ERRORS, NEO4J_INFLIGHT, NEO4J_POOL_SIZE, timed
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+GRAPH_SCHEMA = "schema.json"
+
+
+def refresh_schema(graph: Neo4jGraph, path: Optional[str] = None) -> None:
+    """스키마를 다시 훑어 path에 저장한다. 라벨/관계/속성이 바뀌면 jobs/graph_schema.py로 갱신한다."""
+    path = path or settings.graph_schema_path
+    start = time.perf_counter()
+    graph.refresh_schema()
+    logger.info(f"Graph schema introspected in {time.perf_counter() - start:.1f}s")
+    try:
+        os.makedirs(path, exist_ok=True)
+        save_meta(path, GRAPH_SCHEMA, {
+            "schema": graph.schema,
+            "structured_schema": graph.structured_schema,
+            "saved_at": time.time(),
+        })
+    except OSError as e:
+        logger.warning(f"Could not save graph schema to {path}: {e}")
+
+
 class DatabaseManager:
     def __init__(self):
         self._graph = None
-    
+        self._lock = threading.Lock()
+
     @property
     def graph(self) -> Neo4jGraph:
+        """처음 쓸 때 연결한다. 실패하면 다음 접근에서 다시 시도한다.
+
+        적재/인기도/임베딩 잡도 이 연결로 전체 그래프를 훑으므로 트랜잭션 timeout을 걸지 않는다.
+        요청 경로의 마감은 AsyncDatabaseManager.query/stream이 remaining()으로 건다.
+        """
         if self._graph is None:
-            try:
-                self._graph = Neo4jGraph(
-                    url=settings.neo4j_uri,
-                    username=settings.neo4j_username,
-                    password=settings.neo4j_password,
-                )
-                self._graph.refresh_schema()
-                logger.info("Neo4j connection established")
-            except Exception as e:
-                logger.error(f"Failed to connect to Neo4j: {e}")
-                raise
+            with self._lock:
+                if self._graph is None:
+                    try:
+                        graph = Neo4jGraph(
+                            url=settings.neo4j_uri,
+                            username=settings.neo4j_username,
+                            password=settings.neo4j_password,
+                            refresh_schema=False,
+                        )
+                        self._load_schema(graph)
+                        self._graph = graph
+                        logger.info("Neo4j connection established")
+                    except Exception as e:
+                        logger.error(f"Failed to connect to Neo4j: {e}")
+                        raise
         return self._graph
+
+    @staticmethod
+    def _load_schema(graph: Neo4jGraph) -> None:
+        """Cypher 체인 프롬프트에 넣을 스키마. refresh_schema()는 그래프 전체를 훑으므로 저장본이 있으면 그것을 쓴다."""
+        try:
+            saved = load_meta(settings.graph_schema_path, GRAPH_SCHEMA)
+            graph.schema, graph.structured_schema = saved["schema"], saved["structured_schema"]
+            logger.info(f"Graph schema loaded from {settings.graph_schema_path}")
+        except (OSError, ValueError, KeyError):
+            refresh_schema(graph)
     
+    def stream(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """결과를 메모리에 모으지 않고 레코드 단위로 흘려보낸다. 대량 export용."""
+        with self.graph._driver.session(database=self.graph._database) as session:
+            for record in session.run(query, params or {}):
+                yield record.data()
+
+    def write(self, query: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """쓰기 트랜잭션 하나로 실행하고 생성 카운터를 반환한다. 교착 같은 일시 오류는 드라이버가 재시도한다."""
+        def work(tx):
+            return tx.run(query, params or {}).consume().counters
+
+        with self.graph._driver.session(database=self.graph._database) as session:
+            counters = session.execute_write(work)
+        return {"nodes_created": counters.nodes_created, "relationships_created": counters.relationships_created}
+
+    def reload_schema(self) -> None:
+        """jobs/graph_schema.py나 적재 잡이 저장한 스키마를 다시 읽는다. 연결 전이면 할 일이 없다."""
+        if self._graph is not None:
+            self._load_schema(self._graph)
+
     def health_check(self) -> bool:
         try:
             result = self.graph.query("RETURN 1 as test")
@@ -35,3 +102,82 @@ class DatabaseManager:
 @lru_cache()
 def get_database() -> DatabaseManager:
     return DatabaseManager()
+
+
+class AsyncDatabaseManager:
+    """이벤트 루프를 막지 않는 async Neo4j 드라이버. 커넥션 풀을 공유한다."""
+
+    def __init__(self):
+        self._driver = None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            from neo4j import AsyncGraphDatabase
+
+            self._driver = AsyncGraphDatabase.driver(
+                settings.neo4j_uri,
+                auth=(settings.neo4j_username, settings.neo4j_password),
+                max_connection_pool_size=settings.neo4j_max_pool_size,
+                connection_acquisition_timeout=settings.neo4j_acquire_timeout,
+            )
+            NEO4J_POOL_SIZE.set(settings.neo4j_max_pool_size)
+            logger.info(f"Async Neo4j driver created (pool size {settings.neo4j_max_pool_size})")
+        return self._driver
+
+    async def query(self, query: str, params: Optional[Dict[str, Any]] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Neo4jGraph.query와 같은 형태(dict 목록)로 결과를 반환한다.
+
+        timeout을 주지 않으면 요청 마감(utils/admission.py)까지 남은 시간을 서버 쪽 트랜잭션 timeout으로 건다.
+        """
+        from neo4j import Query
+
+        timeout = remaining(settings.neo4j_query_timeout) if timeout is None else timeout
+        # 풀이 가득 차면 inflight가 pool_size를 넘어 커넥션을 기다리는 요청 수가 보인다.
+        NEO4J_INFLIGHT.inc()
+        try:
+            with timed("neo4j_query"):
+                async with self.driver.session() as session:
+                    result = await session.run(Query(query, timeout=timeout), params or {})
+                    return [record.data() async for record in result]
+        except Exception:
+            NEO4J_ERRORS.inc()
+            raise
+        finally:
+            NEO4J_INFLIGHT.dec()
+
+    async def stream(self, query: str, params: Optional[Dict[str, Any]] = None,
+                     timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """레코드를 받는 대로 흘려보낸다. 결과 전체를 리스트로 모으지 않는 export용."""
+        from neo4j import Query
+
+        timeout = remaining(settings.neo4j_query_timeout) if timeout is None else timeout
+        NEO4J_INFLIGHT.inc()
+        try:
+            async with self.driver.session() as session:
+                result = await session.run(Query(query, timeout=timeout), params or {})
+                async for record in result:
+                    yield record.data()
+        except Exception:
+            NEO4J_ERRORS.inc()
+            raise
+        finally:
+            NEO4J_INFLIGHT.dec()
+
+    async def health_check(self) -> bool:
+        try:
+            result = await self.query("RETURN 1 as test")
+            return len(result) > 0
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        if self._driver is not None:
+            await self._driver.close()
+            self._driver = None
+
+
+@lru_cache()
+def get_async_database() -> AsyncDatabaseManager:
+    return AsyncDatabaseManager()
@@ -0,0 +1,130 @@
+# src/jobs/cooccurrence.py - Playlist-INCLUDES-Song 간선으로 곡×곡 공동 등장 이웃 테이블 생성
+# 실행: python -m src.jobs.cooccurrence --out data/cooccurrence --top-k 50
+from array import array
+from typing import Iterable, Iterator, Tuple
+import argparse
+import logging
+import time
+
+import numpy as np
+from scipy import sparse
+
+from src.core.config import settings
+from src.utils.cooccurrence import CooccurrenceIndex
+
+logger = logging.getLogger(__name__)
+
+EDGES_QUERY = "MATCH (p:Playlist)-[:INCLUDES]-(s:Song) RETURN p.playlist_id AS playlist_id, s.song_id AS song_id"
+
+
+def export_edges(db) -> Iterator[Tuple[str, str]]:
+    """530만 개 INCLUDES 간선을 메모리에 모으지 않고 흘려보낸다."""
+    for row in db.stream(EDGES_QUERY):
+        yield row["playlist_id"], row["song_id"]
+
+
+def build_index(edges: Iterable[Tuple[str, str]], top_k: int = 50, score: str = "cosine",
+                min_count: int = 1, chunk_size: int = 8192) -> CooccurrenceIndex:
+    """플레이리스트×곡 이진 행렬 X로 C = XᵀX를 행 블록 단위로 계산하고 행마다 상위 K개만 남긴다.
+
+    score="count"는 공동 등장 횟수, "cosine"은 count / sqrt(deg_i * deg_j)로
+    인기곡 편향을 줄인다. 블록 단위로 처리하므로 전체 C를 메모리에 올리지 않는다.
+    """
+    playlist_rows: dict = {}
+    song_cols: dict = {}
+    rows = array("I")
+    cols = array("I")
+    for playlist_id, song_id in edges:
+        if playlist_id is None or song_id is None:
+            continue
+        rows.append(playlist_rows.setdefault(playlist_id, len(playlist_rows)))
+        cols.append(song_cols.setdefault(str(song_id), len(song_cols)))
+
+    # 조회 시 이진 탐색할 수 있도록 곡 id를 정렬된 순서로 다시 번호 매긴다.
+    song_ids = np.array(list(song_cols), dtype=str)
+    order = np.argsort(song_ids, kind="stable")
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    song_ids = song_ids[order]
+    n_songs = len(song_ids)
+
+    col_idx = remap[np.frombuffer(cols, dtype=np.uint32)] if len(cols) else np.zeros(0, dtype=np.int64)
+    row_idx = np.frombuffer(rows, dtype=np.uint32) if len(rows) else np.zeros(0, dtype=np.int64)
+    x = sparse.csr_matrix(
+        (np.ones(len(col_idx), dtype=np.float32), (row_idx, col_idx)),
+        shape=(len(playlist_rows), n_songs),
+    )
+    x.data[:] = 1  # 같은 플레이리스트에 중복 수록된 곡은 한 번만 센다
+    xt = x.T.tocsr()
+    degree = np.asarray(x.sum(axis=0), dtype=np.float32).ravel()
+
+    indptr = np.zeros(n_songs + 1, dtype=np.int64)
+    neighbor_parts = []
+    score_parts = []
+    for start in range(0, n_songs, chunk_size):
+        block = (xt[start:start + chunk_size] @ x).tocsr()
+        for i in range(block.shape[0]):
+            song = start + i
+            lo, hi = block.indptr[i], block.indptr[i + 1]
+            nbr = block.indices[lo:hi]
+            val = block.data[lo:hi]
+            keep = (nbr != song) & (val >= min_count)
+            nbr, val = nbr[keep], val[keep]
+            if score == "cosine":
+                val = val / np.sqrt(degree[song] * degree[nbr])
+            if len(val) > top_k:
+                top = np.argpartition(-val, top_k)[:top_k]
+                nbr, val = nbr[top], val[top]
+            ranked = np.lexsort((nbr, -val))
+            neighbor_parts.append(nbr[ranked].astype(np.int32))
+            score_parts.append(val[ranked].astype(np.float32))
+            indptr[song + 1] = indptr[song] + len(ranked)
+        logger.info(f"Co-occurrence rows {min(start + chunk_size, n_songs)}/{n_songs}")
+
+    empty_i, empty_f = np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    return CooccurrenceIndex(
+        song_ids,
+        indptr,
+        np.concatenate(neighbor_parts) if neighbor_parts else empty_i,
+        np.concatenate(score_parts) if score_parts else empty_f,
+        {
+            "songs": int(n_songs),
+            "playlists": len(playlist_rows),
+            "edges": len(rows),
+            "top_k": top_k,
+            "score": score,
+            "min_count": min_count,
+            "built_at": time.time(),
+        },
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=settings.cooccurrence_path)
+    parser.add_argument("--top-k", type=int, default=settings.cooccurrence_top_k)
+    parser.add_argument("--score", choices=("cosine", "count"), default="cosine")
+    parser.add_argument("--min-count", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=8192)
+    args = parser.parse_args()
+
+    from src.core.database import get_database
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    index = build_index(
+        export_edges(get_database()),
+        top_k=args.top_k,
+        score=args.score,
+        min_count=args.min_count,
+        chunk_size=args.chunk_size,
+    )
+    index.save(args.out)
+    print(
+        f"co-occurrence index: {len(index)} songs, {len(index.neighbors)} neighbours "
+        f"from {index.meta['edges']} edges in {time.perf_counter() - start:.1f}s -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# src/jobs/embeddings.py - Song.embedding을 float32 행렬로 export하고 IVF 색인 생성/증분 갱신
+# 실행: python -m src.jobs.embeddings --out data/vectors --nlist 1024 --dtype float16
+#       python -m src.jobs.embeddings --incremental   # 색인에 없는 새 곡만 추가
+from typing import List, Tuple
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+
+from src.core.config import settings
+from src.utils.vector_index import DTYPES, VectorIndex, train_centroids
+
+logger = logging.getLogger(__name__)
+
+COUNT_QUERY = "MATCH (s:Song) WHERE s.embedding IS NOT NULL RETURN count(s) AS count"
+EXPORT_QUERY = "MATCH (s:Song) WHERE s.embedding IS NOT NULL RETURN s.song_id AS song_id, s.embedding AS embedding"
+IDS_QUERY = "MATCH (s:Song) WHERE s.embedding IS NOT NULL RETURN s.song_id AS song_id"
+EMBEDDINGS_BY_IDS_QUERY = """
+UNWIND $song_ids AS song_id
+MATCH (s:Song {song_id: song_id})
+RETURN s.song_id AS song_id, s.embedding AS embedding
+"""
+
+
+def export_embeddings(db, path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """임베딩을 디스크의 float32 memmap으로 흘려 담는다. 전체 행렬을 메모리에 올리지 않는다."""
+    count = db.graph.query(COUNT_QUERY)[0]["count"]
+    song_ids: List[str] = []
+    matrix = None
+    for row in db.stream(EXPORT_QUERY):
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(count, len(row["embedding"])))
+        if len(song_ids) == count:
+            break  # export 도중 추가된 곡은 다음 증분 갱신에서 반영한다
+        matrix[len(song_ids)] = row["embedding"]
+        song_ids.append(str(row["song_id"]))
+    if matrix is None:
+        raise ValueError("No Song.embedding found in the graph")
+    return np.array(song_ids, dtype=str), matrix[:len(song_ids)]
+
+
+def fetch_new_embeddings(db, known: np.ndarray, batch_size: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    known_ids = set(known.tolist())
+    missing = [str(row["song_id"]) for row in db.stream(IDS_QUERY) if str(row["song_id"]) not in known_ids]
+    song_ids: List[str] = []
+    vectors: List[List[float]] = []
+    for start in range(0, len(missing), batch_size):
+        for row in db.graph.query(EMBEDDINGS_BY_IDS_QUERY, params={"song_ids": missing[start:start + batch_size]}):
+            song_ids.append(str(row["song_id"]))
+            vectors.append(row["embedding"])
+    return np.array(song_ids, dtype=str), np.array(vectors, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=settings.vector_index_path)
+    parser.add_argument("--nlist", type=int, default=settings.vector_nlist)
+    parser.add_argument("--dtype", choices=DTYPES, default=settings.vector_dtype)
+    parser.add_argument("--incremental", action="store_true", help="기존 centroid를 유지한 채 새 곡만 추가")
+    args = parser.parse_args()
+
+    from src.core.database import get_database
+
+    logging.basicConfig(level=logging.INFO)
+    db = get_database()
+    start = time.perf_counter()
+    if args.incremental:
+        index = VectorIndex.load(args.out)
+        song_ids, vectors = fetch_new_embeddings(db, index.song_ids)
+        if not len(song_ids):
+            print(f"vector index up to date: {len(index)} songs")
+            return
+        index = index.extend(song_ids, vectors)
+        print(f"added {len(song_ids)} songs")
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        export_path = os.path.join(args.out, "export.f32.npy")
+        song_ids, vectors = export_embeddings(db, export_path)
+        centroids = train_centroids(vectors, args.nlist)
+        index = VectorIndex.build(song_ids, vectors, centroids, args.dtype)
+        del vectors
+        os.remove(export_path)
+    index.save(args.out)
+    print(
+        f"vector index: {len(index)} songs x {index.dim} ({index.meta['dtype']}, nlist={index.meta['nlist']}) "
+        f"in {time.perf_counter() - start:.1f}s -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# src/jobs/genre_pools.py - 장르별 추천 후보 풀 생성 (플레이리스트 인기도 가중치 선택)
+# 실행: python -m src.jobs.genre_pools --out data/genre_pools --weighting popularity
+import argparse
+import logging
+import time
+
+from src.core.config import settings
+from src.utils.genre_pool import GenrePools
+
+logger = logging.getLogger(__name__)
+
+GENRE_SONGS_QUERY = """
+MATCH (s:Song)-[:HAS_GENRE]-(g:Genre)
+RETURN g.genre_id AS genre_id, s.song_id AS song_id, COUNT { (s)-[:INCLUDES]-(:Playlist) } AS popularity
+"""
+
+
+def export_rows(db):
+    for row in db.stream(GENRE_SONGS_QUERY):
+        yield row["genre_id"], row["song_id"], row["popularity"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=settings.genre_pool_path)
+    parser.add_argument("--weighting", choices=("popularity", "uniform"), default="popularity")
+    args = parser.parse_args()
+
+    from src.core.database import get_database
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    pools = GenrePools.build(export_rows(get_database()), weighting=args.weighting)
+    pools.save(args.out)
+    print(
+        f"genre pools: {pools.meta['genres']} genres, {pools.meta['pairs']} song-genre pairs "
+        f"({args.weighting}) in {time.perf_counter() - start:.1f}s -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
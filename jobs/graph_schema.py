@@ -0,0 +1,30 @@
+# src/jobs/graph_schema.py - Cypher 체인 프롬프트용 그래프 스키마를 다시 훑어 저장
+# 실행: python -m src.jobs.graph_schema --out data/graph_schema
+# 워커는 저장된 스키마를 읽기만 하므로, 라벨/관계/속성이 바뀌는 적재 뒤에 한 번 돌린다.
+import argparse
+import logging
+
+from src.core.config import settings
+from src.core.database import refresh_schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=settings.graph_schema_path)
+    args = parser.parse_args()
+
+    from langchain_neo4j import Neo4jGraph
+
+    logging.basicConfig(level=logging.INFO)
+    graph = Neo4jGraph(
+        url=settings.neo4j_uri,
+        username=settings.neo4j_username,
+        password=settings.neo4j_password,
+        refresh_schema=False,
+    )
+    refresh_schema(graph, args.out)
+    print(f"graph schema: {len(graph.structured_schema.get('node_props', {}))} labels -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# src/jobs/ingest.py - Melon 데이터셋 파일(genre_gn_all.json, song_meta.json, train.json)을 Neo4j에 스트리밍 적재
+# 실행: python -m src.jobs.ingest --data-dir data/melon                                         # 전체 적재
+#       python -m src.jobs.ingest --stages playlists --playlists data/melon/new_playlists.json  # 새 플레이리스트 증분 적재
+#       python -m src.jobs.ingest --data-dir data/melon --rebuild cooccurrence genre_pools snapshot
+# 모든 쓰기는 MERGE라서 같은 파일을 다시 넣어도 그래프가 같다. 끝나면 인기도/스키마를 갱신하고
+# 그래프 버전을 올려 API 워커가 그래프에서 만든 캐시와 색인을 버리고 다시 만들게 한다.
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import os
+import time
+import zlib
+
+from src.core.config import settings
+from src.jobs.popularity import POPULARITY_INDEX_QUERY, refresh_popularity
+from src.utils.graph_version import bump_graph_version
+from src.utils.json_stream import iter_array
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("genres", "songs", "playlists")
+REBUILDS = ("cooccurrence", "genre_pools", "snapshot")
+
+CONSTRAINTS = [
+    "CREATE CONSTRAINT song_id IF NOT EXISTS FOR (s:Song) REQUIRE s.song_id IS UNIQUE",
+    "CREATE CONSTRAINT artist_id IF NOT EXISTS FOR (a:Artist) REQUIRE a.artist_id IS UNIQUE",
+    "CREATE CONSTRAINT album_id IF NOT EXISTS FOR (al:Album) REQUIRE al.album_id IS UNIQUE",
+    "CREATE CONSTRAINT genre_id IF NOT EXISTS FOR (g:Genre) REQUIRE g.genre_id IS UNIQUE",
+    "CREATE CONSTRAINT subgenre_id IF NOT EXISTS FOR (sg:SubGenre) REQUIRE sg.subgenre_id IS UNIQUE",
+    "CREATE CONSTRAINT playlist_id IF NOT EXISTS FOR (p:Playlist) REQUIRE p.playlist_id IS UNIQUE",
+]
+
+INDEXES = [
+    "CREATE INDEX song_issue_date IF NOT EXISTS FOR (s:Song) ON (s.issue_date)",
+    POPULARITY_INDEX_QUERY,
+]
+
+# 행 끝의 선택 컬럼(앨범 발매일, 플레이리스트 좋아요 수/갱신일)이 없으면 null이라 그 속성은 쓰지 않는다.
+NODE_LOADS = {
+    "song": "UNWIND $rows AS row MERGE (s:Song {song_id: row[0]}) SET s.title = row[1], s.issue_date = row[2]",
+    "artist": "UNWIND $rows AS row MERGE (a:Artist {artist_id: row[0]}) SET a.name = row[1]",
+    "album": "UNWIND $rows AS row MERGE (al:Album {album_id: row[0]}) SET al.title = row[1], al.issue_date = row[2]",
+    "genre": "UNWIND $rows AS row MERGE (g:Genre {genre_id: row[0]}) SET g.name = row[1]",
+    "subgenre": "UNWIND $rows AS row MERGE (sg:SubGenre {subgenre_id: row[0]}) SET sg.name = row[1]",
+    "playlist": "UNWIND $rows AS row MERGE (p:Playlist {playlist_id: row[0]}) "
+                "SET p.title = row[1], p.like_cnt = row[2], p.updt_date = row[3]",
+}
+
+EDGE_LOADS = {
+    "song_artist": """
+UNWIND $rows AS row
+MATCH (s:Song {song_id: row[0]}), (a:Artist {artist_id: row[1]})
+MERGE (s)-[:PERFORMED_BY]->(a)
+""",
+    "song_album": """
+UNWIND $rows AS row
+MATCH (s:Song {song_id: row[0]}), (al:Album {album_id: row[1]})
+MERGE (s)-[:IN_ALBUM]->(al)
+""",
+    "song_genre": """
+UNWIND $rows AS row
+MATCH (s:Song {song_id: row[0]}), (g:Genre {genre_id: row[1]})
+MERGE (s)-[:HAS_GENRE]->(g)
+""",
+    "song_subgenre": """
+UNWIND $rows AS row
+MATCH (s:Song {song_id: row[0]}), (sg:SubGenre {subgenre_id: row[1]})
+MERGE (s)-[:HAS_GENRE]->(sg)
+""",
+    "genre_subgenre": """
+UNWIND $rows AS row
+MATCH (g:Genre {genre_id: row[0]}), (sg:SubGenre {subgenre_id: row[1]})
+MERGE (g)-[:CONTAINS]->(sg)
+""",
+    "playlist_song": """
+UNWIND $rows AS row
+MATCH (p:Playlist {playlist_id: row[0]}), (s:Song {song_id: row[1]})
+MERGE (p)-[:INCLUDES]->(s)
+""",
+}
+
+EXISTING_PLAYLISTS_QUERY = "UNWIND $ids AS id MATCH (p:Playlist {playlist_id: id}) RETURN id"
+
+Rows = List[Tuple[Any, ...]]
+
+
+def _bucket(key: str, n: int) -> int:
+    # 프로세스마다 달라지는 hash() 대신 crc32로 나눠 같은 키가 항상 같은 버킷에 간다.
+    return zlib.crc32(str(key).encode()) % n
+
+
+class StageStats:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds) if self.seconds else 0,
+        }
+
+
+class GraphWriter:
+    """라벨/관계별 행을 UNWIND 배치로 나눠 여러 스레드가 동시에 쓴다.
+
+    동시에 도는 트랜잭션이 같은 노드를 잠그면 교착과 재시도로 오히려 느려지므로, 노드는 키의
+    버킷으로, 관계는 (시작 노드 버킷, 끝 노드 버킷) 격자로 나눈다. 관계는 라운드마다 격자의
+    대각선 한 줄(i, i + shift)만 함께 돌리므로 같은 라운드의 배치끼리는 양 끝 노드가 겹치지 않는다.
+    """
+
+    def __init__(self, db, batch_size: int, workers: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self.stats: Dict[str, StageStats] = {}
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ingest")
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def _write(self, query: str, rows: List[list]) -> int:
+        created = 0
+        for start in range(0, len(rows), self.batch_size):
+            counters = self.db.write(query, {"rows": rows[start:start + self.batch_size]})
+            created += counters["nodes_created"] + counters["relationships_created"]
+        return created
+
+    def _record(self, name: str, rows: int, created: int, start: float) -> None:
+        stats = self.stats.setdefault(name, StageStats())
+        stats.rows += rows
+        stats.created += created
+        stats.seconds += time.perf_counter() - start
+
+    def nodes(self, label: str, rows: Rows) -> None:
+        if not rows:
+            return
+        start = time.perf_counter()
+        buckets: List[List[list]] = [[] for _ in range(self.workers)]
+        for row in rows:
+            buckets[_bucket(row[0], self.workers)].append(list(row))
+        query = NODE_LOADS[label]
+        created = sum(self._pool.map(lambda bucket: self._write(query, bucket), buckets))
+        self._record(label, len(rows), created, start)
+
+    def edges(self, name: str, rows: Rows) -> None:
+        if not rows:
+            return
+        start = time.perf_counter()
+        n = self.workers
+        grid: List[List[List[list]]] = [[[] for _ in range(n)] for _ in range(n)]
+        for src, dst in rows:
+            grid[_bucket(src, n)][_bucket(dst, n)].append([src, dst])
+        query = EDGE_LOADS[name]
+        created = 0
+        for shift in range(n):
+            created += sum(self._pool.map(lambda i: self._write(query, grid[i][(i + shift) % n]), range(n)))
+        self._record(name, len(rows), created, start)
+
+
+def genre_rows(path: str) -> Dict[str, Rows]:
+    """genre_gn_all.json(코드 → 이름). GNxx00은 대분류 장르, 나머지는 GNxx00에 속한 세부 장르다."""
+    with open(path, encoding="utf-8") as f:
+        codes = json.load(f)
+    rows: Dict[str, Rows] = {"genre": [], "subgenre": [], "genre_subgenre": []}
+    for code, name in sorted(codes.items()):
+        if code.endswith("00"):
+            rows["genre"].append((code, name))
+        else:
+            rows["subgenre"].append((code, name))
+            rows["genre_subgenre"].append((code[:4] + "00", code))
+    return rows
+
+
+def song_chunks(path: str, chunk_size: int) -> Iterator[Dict[str, Rows]]:
+    """song_meta.json을 chunk_size곡씩 노드/관계 행으로 바꿔 흘려보낸다.
+
+    아티스트/앨범은 여러 곡에 걸쳐 나오므로 처음 본 것만 노드 행으로 낸다. 기억하는 것은 id 집합뿐이라
+    메모리는 파일 크기가 아니라 아티스트/앨범 수에 비례한다.
+    """
+    seen_artists, seen_albums = set(), set()
+    chunk = _empty("song", "artist", "album", "song_artist", "song_album", "song_genre", "song_subgenre")
+    for item in iter_array(path):
+        song_id = str(item["id"])
+        issue_date = item.get("issue_date")
+        chunk["song"].append((song_id, item.get("song_name"), issue_date))
+        album_id = item.get("album_id")
+        if album_id is not None:
+            album_id = str(album_id)
+            chunk["song_album"].append((song_id, album_id))
+            if album_id not in seen_albums:
+                seen_albums.add(album_id)
+                chunk["album"].append((album_id, item.get("album_name"), issue_date))
+        for artist_id, name in zip(item.get("artist_id_basket") or [], item.get("artist_name_basket") or []):
+            artist_id = str(artist_id)
+            chunk["song_artist"].append((song_id, artist_id))
+            if artist_id not in seen_artists:
+                seen_artists.add(artist_id)
+                chunk["artist"].append((artist_id, name))
+        for genre_id in item.get("song_gn_gnr_basket") or []:
+            chunk["song_genre"].append((song_id, genre_id))
+        for subgenre_id in item.get("song_gn_dtl_gnr_basket") or []:
+            chunk["song_subgenre"].append((song_id, subgenre_id))
+        if len(chunk["song"]) >= chunk_size:
+            yield chunk
+            chunk = _empty(*chunk)
+    if chunk["song"]:
+        yield chunk
+
+
+def playlist_chunks(paths: Sequence[str], chunk_size: int) -> Iterator[Dict[str, Rows]]:
+    """train.json 형식(id, plylst_title, songs, like_cnt, updt_date) 파일들을 흘려보낸다.
+
+    플레이리스트마다 수록곡 수가 크게 다르므로 청크는 INCLUDES 행이 chunk_size개를 넘을 때 끊는다.
+    """
+    chunk = _empty("playlist", "playlist_song")
+    for path in paths:
+        for item in iter_array(path):
+            playlist_id = str(item["id"])
+            chunk["playlist"].append((playlist_id, item.get("plylst_title"), item.get("like_cnt"), item.get("updt_date")))
+            chunk["playlist_song"].extend((playlist_id, str(song_id)) for song_id in item.get("songs") or [])
+            if len(chunk["playlist_song"]) >= chunk_size:
+                yield chunk
+                chunk = _empty(*chunk)
+    if chunk["playlist"]:
+        yield chunk
+
+
+def _empty(*names: str) -> Dict[str, Rows]:
+    return {name: [] for name in names}
+
+
+def _new_playlists(db, chunk: Dict[str, Rows]) -> Dict[str, Rows]:
+    """이미 적재된 플레이리스트를 뺀다. 증분 적재에서 같은 파일을 다시 넣을 때 쓰기를 건너뛴다."""
+    ids = [row[0] for row in chunk["playlist"]]
+    existing = {row["id"] for row in db.graph.query(EXISTING_PLAYLISTS_QUERY, params={"ids": ids})}
+    if not existing:
+        return chunk
+    return {
+        "playlist": [row for row in chunk["playlist"] if row[0] not in existing],
+        "playlist_song": [row for row in chunk["playlist_song"] if row[0] not in existing],
+    }
+
+
+def _timed_chunks(chunks: Iterable[Dict[str, Rows]], stats: StageStats) -> Iterator[Dict[str, Rows]]:
+    """파일을 읽고 행으로 바꾸는 데 든 시간을 쓰기 시간과 따로 잰다."""
+    iterator = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(iterator, None)
+        stats.seconds += time.perf_counter() - start
+        if chunk is None:
+            return
+        stats.rows += sum(len(rows) for rows in chunk.values())
+        yield chunk
+
+
+def ingest_schema(db) -> None:
+    """적재 전에 키 제약 조건(MERGE/MATCH 조회 인덱스)과 정렬용 인덱스를 만든다."""
+    for statement in CONSTRAINTS + INDEXES:
+        db.graph.query(statement)
+
+
+def ingest(db, writer: GraphWriter, data_dir: str, stages: Sequence[str], playlist_files: Sequence[str],
+           chunk_size: int, skip_existing: bool = True) -> List[str]:
+    """제약 조건/인덱스를 만들고 단계별로 적재한다. 새로 적재한 playlist_id 목록을 반환한다."""
+    ingest_schema(db)
+    parse = writer.stats.setdefault("parse", StageStats())
+    if "genres" in stages:
+        rows = genre_rows(os.path.join(data_dir, "genre_gn_all.json"))
+        writer.nodes("genre", rows["genre"])
+        writer.nodes("subgenre", rows["subgenre"])
+        writer.edges("genre_subgenre", rows["genre_subgenre"])
+    if "songs" in stages:
+        for chunk in _timed_chunks(song_chunks(os.path.join(data_dir, "song_meta.json"), chunk_size), parse):
+            # 관계의 양 끝 노드가 먼저 있어야 MATCH가 찾는다.
+            for label in ("song", "artist", "album"):
+                writer.nodes(label, chunk[label])
+            for name in ("song_artist", "song_album", "song_genre", "song_subgenre"):
+                writer.edges(name, chunk[name])
+            logger.info(f"Songs loaded: {writer.stats['song'].rows}")
+    loaded: List[str] = []
+    if "playlists" in stages:
+        for chunk in _timed_chunks(playlist_chunks(playlist_files, chunk_size), parse):
+            if skip_existing:
+                chunk = _new_playlists(db, chunk)
+            writer.nodes("playlist", chunk["playlist"])
+            writer.edges("playlist_song", chunk["playlist_song"])
+            loaded.extend(row[0] for row in chunk["playlist"])
+            logger.info(f"Playlists loaded: {len(loaded)}")
+    return loaded
+
+
+def refresh_derived(db, stages: Sequence[str], playlist_ids: List[str], rebuild: Sequence[str]) -> Dict[str, float]:
+    """그래프에서 만든 것들을 갱신하고 그래프 버전을 올린다. 단계별 시간(초)을 반환한다.
+
+    인기도 테이블과 그래프 스키마는 워커가 파일을 다시 읽고, 나머지 사전 계산물은 rebuild에 든 것만
+    다시 만든다. 버전이 바뀌면 워커는 캐시를 비우고 색인/사전 계산물을 새로 연다.
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    if "songs" in stages:
+        refresh_popularity(db)
+    elif playlist_ids:
+        refresh_popularity(db, playlist_ids)
+    timings["popularity"] = time.perf_counter() - start
+    if "genres" in stages or "songs" in stages:
+        from src.core.database import refresh_schema
+
+        start = time.perf_counter()
+        refresh_schema(db.graph)
+        timings["graph_schema"] = time.perf_counter() - start
+    for name in rebuild:
+        start = time.perf_counter()
+        if name == "cooccurrence":
+            from src.jobs.cooccurrence import build_index, export_edges
+
+            build_index(export_edges(db), top_k=settings.cooccurrence_top_k).save(settings.cooccurrence_path)
+        elif name == "genre_pools":
+            from src.jobs.genre_pools import export_rows
+            from src.utils.genre_pool import GenrePools
+
+            GenrePools.build(export_rows(db)).save(settings.genre_pool_path)
+        elif name == "snapshot":
+            from src.jobs.snapshot import export_snapshot
+
+            export_snapshot(db, settings.snapshot_path)
+        timings[name] = time.perf_counter() - start
+    bump_graph_version(stages=list(stages), playlists=len(playlist_ids), rebuilt=list(rebuild))
+    return timings
+
+
+def report(writer: GraphWriter, elapsed: float) -> None:
+    parse = writer.stats.get("parse", StageStats())
+    written = sum(stats.rows for name, stats in writer.stats.items() if name != "parse")
+    for name, stats in writer.stats.items():
+        values = stats.as_dict()
+        print(f"{name:>15}: {values['rows']:>9} rows {values['created']:>9} created "
+              f"{values['seconds']:>8.1f}s {values['rows_per_second']:>8}/s")
+    print(f"total: {written} rows written in {elapsed:.1f}s ({written / max(elapsed, 1e-9):,.0f} rows/s, "
+          f"parse {parse.seconds:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--data-dir", default="data/melon")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--playlists", nargs="+", help="플레이리스트 파일 (기본: <data-dir>/train.json)")
+    parser.add_argument("--chunk-size", type=int, default=50_000,
+                        help="한 번에 읽어 쓰는 곡 수 / 플레이리스트 INCLUDES 행 수")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    parser.add_argument("--workers", type=int, default=settings.ingest_workers)
+    parser.add_argument("--skip-existing", action=argparse.BooleanOptionalAction, default=True,
+                        help="이미 있는 playlist_id는 건너뛴다 (--no-skip-existing이면 다시 MERGE)")
+    parser.add_argument("--rebuild", nargs="*", choices=REBUILDS, default=[],
+                        help="적재 후 다시 만들 사전 계산물")
+    args = parser.parse_args()
+
+    from src.core.database import get_database
+
+    logging.basicConfig(level=logging.INFO)
+    db = get_database()
+    writer = GraphWriter(db, args.batch_size, args.workers)
+    start = time.perf_counter()
+    try:
+        playlist_ids = ingest(db, writer, args.data_dir, args.stages,
+                              args.playlists or [os.path.join(args.data_dir, "train.json")],
+                              args.chunk_size, args.skip_existing)
+    finally:
+        writer.close()
+    report(writer, time.perf_counter() - start)
+    timings = refresh_derived(db, args.stages, playlist_ids, args.rebuild)
+    print("refreshed: " + " ".join(f"{name}={seconds:.1f}s" for name, seconds in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# src/jobs/popularity.py - 곡 인기도(플레이리스트 수록 수)를 Song.popularity와 순위 배열로 materialize
+# 실행: python -m src.jobs.popularity                          # 전체 재계산
+#       python -m src.jobs.popularity --playlists 123 456      # 변경된 플레이리스트의 곡만 갱신
+#       python -m src.jobs.popularity --every 21600            # 6시간마다 전체 재계산
+from typing import List, Optional
+import argparse
+import logging
+import time
+
+from src.core.config import settings
+from src.utils.popularity import PopularityTable
+
+logger = logging.getLogger(__name__)
+
+POPULARITY_INDEX_QUERY = "CREATE INDEX song_popularity IF NOT EXISTS FOR (s:Song) ON (s.popularity)"
+
+FULL_REFRESH_QUERY = """
+MATCH (s:Song)
+CALL {
+    WITH s
+    SET s.popularity = COUNT { (s)-[:INCLUDES]-(:Playlist) }
+} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+EXPORT_QUERY = "MATCH (s:Song) RETURN s.song_id AS song_id, coalesce(s.popularity, 0) AS popularity"
+
+PLAYLIST_REFRESH_QUERY = """
+UNWIND $playlist_ids AS playlist_id
+MATCH (:Playlist {playlist_id: playlist_id})-[:INCLUDES]-(s:Song)
+WITH DISTINCT s
+SET s.popularity = COUNT { (s)-[:INCLUDES]-(:Playlist) }
+RETURN s.song_id AS song_id, s.popularity AS popularity
+"""
+
+
+def refresh_popularity(db, playlist_ids: Optional[List[str]] = None, path: Optional[str] = None) -> PopularityTable:
+    """playlist_ids가 없으면 전체를, 있으면 그 플레이리스트에 담긴 곡만 다시 센다."""
+    path = path or settings.popularity_path
+    if playlist_ids:
+        rows = db.graph.query(PLAYLIST_REFRESH_QUERY, params={"playlist_ids": playlist_ids})
+        try:
+            table = PopularityTable.load(path).update((row["song_id"], row["popularity"]) for row in rows)
+        except OSError:
+            logger.warning(f"No popularity table at {path}, running a full refresh")
+            return refresh_popularity(db, path=path)
+        logger.info(f"Popularity updated for {len(rows)} songs from {len(playlist_ids)} playlists")
+    else:
+        db.graph.query(POPULARITY_INDEX_QUERY)
+        db.graph.query(FULL_REFRESH_QUERY)
+        table = PopularityTable.build((row["song_id"], row["popularity"]) for row in db.stream(EXPORT_QUERY))
+        logger.info(f"Popularity rebuilt for {len(table)} songs")
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default=settings.popularity_path)
+    parser.add_argument("--playlists", nargs="+", help="변경된 playlist_id 목록 (증분 갱신)")
+    parser.add_argument("--every", type=float, help="이 간격(초)마다 전체 재계산을 반복")
+    args = parser.parse_args()
+
+    from src.core.database import get_database
+
+    logging.basicConfig(level=logging.INFO)
+    db = get_database()
+    while True:
+        start = time.perf_counter()
+        table = refresh_popularity(db, args.playlists, args.out)
+        print(f"popularity: {len(table)} songs in {time.perf_counter() - start:.1f}s -> {args.out}")
+        if not args.every or args.playlists:
+            break
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
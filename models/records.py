@@ -0,0 +1,133 @@
+# src/models/records.py - 결과 곡을 담는 slotted 경량 레코드와 JSON 바이트 직렬화
+# 서비스는 드라이버/스냅샷 행을 Pydantic 검증 없이 이 레코드로 옮기고, API는 레코드를 그대로
+# 바이트로 쓴다. 필드 이름/순서/기본값은 SongInfo/ScoredSong에서 가져오므로 공개 응답 스키마가 같다.
+from dataclasses import field, make_dataclass
+from operator import attrgetter
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Union, get_args, get_origin
+import json
+import logging
+
+from pydantic import BaseModel
+
+from src.models.schemas import ScoredSong, SongInfo
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 같은 바이트를 만든다 (더 느리다)
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _record_base(model: type) -> type:
+    """Pydantic 모델과 같은 필드를 가진 slots dataclass. _json은 인코딩한 바이트를 담아 둔다."""
+    fields: List[Tuple[str, Any, Any]] = [
+        (name, info.annotation, field(default=info.default)) if not info.is_required() else (name, info.annotation)
+        for name, info in model.model_fields.items()
+    ]
+    fields.append(("_json", Optional[bytes], field(default=None, repr=False, compare=False)))
+    base = make_dataclass(f"_{model.__name__}Fields", fields, slots=True)
+    base._fields = tuple(model.model_fields)
+    base._getter = attrgetter(*base._fields)
+    base._checks = tuple(_check(name, info) for name, info in model.model_fields.items())
+    return base
+
+
+def _check(name: str, info) -> Tuple[str, type, bool, Any]:
+    """(이름, 값 타입, None 허용, None일 때 쓸 기본값). 필드 타입은 str, float와 그 Optional만 쓴다."""
+    kind, nullable = info.annotation, False
+    if get_origin(kind) is Union:
+        args = get_args(kind)
+        nullable = type(None) in args
+        kind = next(arg for arg in args if arg is not type(None))
+    default = None if info.is_required() else info.default
+    return name, kind, nullable, default
+
+
+class _Record:
+    __slots__ = ()
+    _fields: Tuple[str, ...]  # _record_base가 채운다
+    _getter: attrgetter
+    _checks: Tuple[Tuple[str, type, bool, Any], ...]
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]):
+        """드라이버/스냅샷 행을 레코드로 옮긴다. 응답 모델이 거절할 행이면 경고를 남기고 None.
+
+        응답은 Pydantic을 거치지 않으므로 여기서 같은 규칙을 확인한다. 필수 값이 비었거나(title 없는 곡 등)
+        타입이 다른 값은 거절하고, 기본값이 있는 필드의 None은 기본값으로, float 필드의 정수는 float로 바꾼다.
+        song_card 쿼리가 함께 돌려주는 정렬용 컬럼(rank 등)은 버린다.
+        """
+        values = []
+        for name, kind, nullable, default in cls._checks:
+            value = row.get(name)
+            if value is None:
+                if not nullable:
+                    if default is None:
+                        logger.warning(f"Dropping {cls.__name__} row without {name}: {dict(row)}")
+                        return None
+                    value = default
+            elif not isinstance(value, kind):
+                if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                    value = float(value)
+                else:
+                    logger.warning(f"Dropping {cls.__name__} row with {type(value).__name__} {name}: {dict(row)}")
+                    return None
+            values.append(value)
+        return cls(*values)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> list:
+        """from_row가 거절한 행은 빼고 순서대로."""
+        return [record for record in map(cls.from_row, rows) if record is not None]
+
+    def values(self) -> Tuple[Any, ...]:
+        return type(self)._getter(self)
+
+    def json(self) -> bytes:
+        """이 곡의 JSON 바이트. 레코드는 곡 캐시에서 여러 응답이 공유하므로 한 번만 인코딩한다.
+
+        그래서 레코드는 만든 뒤 바꾸지 않는다.
+        """
+        encoded = self._json
+        if encoded is None:
+            encoded = self._json = _dumps(dict(zip(self._fields, self.values())))
+        return encoded
+
+
+class SongRecord(_Record, _record_base(SongInfo)):
+    __slots__ = ()
+
+
+class ScoredSongRecord(_Record, _record_base(ScoredSong)):
+    __slots__ = ()
+
+    @classmethod
+    def scored(cls, song: SongRecord, score: float) -> "ScoredSongRecord":
+        return cls(*song.values(), score)
+
+
+def _array(records: Iterable[_Record]) -> bytes:
+    return b"[" + b",".join([record.json() for record in records]) + b"]"
+
+
+def dumps(value: Any) -> bytes:
+    """응답 값을 UTF-8 JSON 바이트로 만든다. 곡 레코드는 캐시해 둔 바이트를 이어 붙인다.
+
+    dict는 키별로, 레코드 리스트는 레코드별로 나눠 쓰고 나머지 값은 한 번에 인코딩한다.
+    """
+    if isinstance(value, _Record):
+        return value.json()
+    if isinstance(value, list) and value and isinstance(value[0], _Record):
+        return _array(value)
+    if isinstance(value, dict):
+        return b"{" + b",".join([_dumps(str(key)) + b":" + dumps(item) for key, item in value.items()]) + b"}"
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode()
+    return _dumps(value)
@@ -15,11 +15,21 @@ class SongInfo(BaseModel):
     album_id: Optional[str] = None
     subgenre_name: Optional[str] = None
 
+class ScoredSong(SongInfo):
+    score: float = 0.0
+
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=500)
-    search_type: str = Field(..., pattern="^(title|artist|rag|recommendation)$")
+    search_type: str = Field(..., pattern="^(title|artist|embedding|hybrid|rag|recommendation)$")
     limit: int = Field(default=10, ge=1, le=50)
     user_id: Optional[str] = None
+    # paginate이면 관련도 대신 (title, song_id) 순으로 읽고, 응답의 next_cursor로 다음 페이지를 요청한다.
+    paginate: bool = False
+    cursor: Optional[str] = None
+
+    @property
+    def paged(self) -> bool:
+        return self.paginate or self.cursor is not None
 
 class SearchResponse(BaseModel):
     songs: List[SongInfo]
@@ -28,12 +38,37 @@ class SearchResponse(BaseModel):
     search_type: str
     query: str
     execution_time: float
+    next_cursor: Optional[str] = None
+
+class ExportRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=500)
+    search_type: str = Field(..., pattern="^(title|artist)$")
+
+class BatchRecommendationRequest(BaseModel):
+    song_ids: List[str] = Field(..., min_length=1, max_length=100)
+    rec_type: str = Field(default="artist", pattern="^(genre|artist|cooccurrence|embedding)$")
+    limit: int = Field(default=20, ge=1, le=100)
+
+class BatchRecommendationResponse(BaseModel):
+    songs: List[ScoredSong]
+    total_count: int
+    rec_type: str
+    seed_count: int
+    execution_time: float
 
 class ChatMessage(BaseModel):
     role: str = Field(..., pattern="^(user|assistant)$") 
     content: str
     timestamp: datetime = Field(default_factory=datetime.now)
 
+class EventRequest(BaseModel):
+    user_id: str = Field(..., min_length=1, max_length=200)
+    song_ids: List[str] = Field(..., min_length=1, max_length=100)
+    kind: str = Field(default="click", pattern="^(view|click)$")
+
+class EventResponse(BaseModel):
+    accepted: int
+
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=1000)
     user_id: str
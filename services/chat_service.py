@@ -0,0 +1,51 @@
+# src/services/chat_service.py - 세션을 이어 가는 대화형 검색. 답은 RAGService가 만든다
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from src.models.records import SongRecord
+from src.models.schemas import ChatRequest
+from src.services.rag_service import RAGService, get_rag_service
+from src.utils.metrics import timed
+from src.utils.session_store import Session, get_session_store
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class ChatService:
+    def __init__(self, rag: Optional[RAGService] = None, store=None):
+        self.rag = rag or get_rag_service()
+        self.store = store or get_session_store()
+
+    def session(self, request: ChatRequest) -> Session:
+        """요청의 세션을 찾는다. 없거나 만료됐으면 새로 만들고, 다른 사용자의 세션이면 새 id를 준다."""
+        with timed("session_lookup"):
+            session = self.store.get(request.session_id) if request.session_id else None
+        if session is not None and session.user_id == request.user_id:
+            return session
+        if session is None and request.session_id:
+            return Session(request.session_id, request.user_id)
+        return Session(uuid.uuid4().hex, request.user_id)
+
+    def _record(self, session: Session, message: str, answer: str) -> None:
+        session.append("user", message)
+        session.append("assistant", answer)
+        with timed("session_save"):
+            self.store.save(session)
+
+    def chat(self, request: ChatRequest) -> Tuple[Session, str, List[SongRecord]]:
+        session = self.session(request)
+        answer, songs = self.rag.query(request.message, session.history())
+        self._record(session, request.message, answer)
+        return session, answer, songs
+
+    async def achat(self, request: ChatRequest) -> Tuple[Session, str, List[SongRecord]]:
+        session = self.session(request)
+        answer, songs, _ = await self.rag.aquery_admitted(request.message, session.history())
+        self._record(session, request.message, answer)
+        return session, answer, songs
+
+
+@lru_cache()
+def get_chat_service() -> ChatService:
+    return ChatService()
@@ -1,60 +1,525 @@
 # src/services/rag_service.py - 검증된 search_service 활용
-from langchain_neo4j.chains.graph_qa.cypher import GraphCypherQAChain
-from langchain_openai import ChatOpenAI
-from src.core.database import get_database
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_neo4j.chains.graph_qa.cypher import extract_cypher
+from src.core.database import get_database, get_async_database
 from src.core.config import settings
-from src.services.search_service import search_service
-from src.models.schemas import SongInfo
-from typing import List, Tuple
+from src.services.search_service import SearchService, get_search_service
+from src.models.records import SongRecord
+from src.utils.admission import Overloaded, get_gate
+from src.utils.cache import get_cache, register_cache
+from src.utils.metrics import LLM_TOKENS, observe_stage, register_collector
+from src.utils.ngram_index import normalize
+from src.utils.singleflight import get_flight
+from src.utils.query_understanding import Intent, IntentMatcher, from_plan, question_shape, to_plan
+from src.utils.semantic_cache import CachedAnswer, SemanticCache
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import logging
 import re
+import threading
+import time
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-class RAGService:
+GENRE_NAMES_QUERY = "MATCH (g:Genre) RETURN g.name AS name"
+
+STAGES = ("understand", "answer_cache", "plan_cache", "cypher_generation", "graph", "answer_generation", "hydrate",
+          "fallback_search")
+
+
+def degradable(exc: Overloaded) -> bool:
+    """게이트가 거절한 rag 요청을 adegraded로 대신할지. 마감(deadline)을 넘긴 요청은 이미 시간을 다 썼으므로
+    더 일하지 않고 거절한다. /api/chat과 /api/search(/stream)가 같은 규칙을 쓴다."""
+    return settings.rag_degrade and exc.reason != "deadline"
+
+
+class RAGStats:
+    """경로별 요청 수와 단계별 누적 시간. 피한 LLM 호출 수를 함께 센다."""
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {"fast_path": 0, "answer_cache": 0, "plan_cache": 0, "llm": 0, "degraded": 0}
+        self.llm_calls = 0
+        self.llm_calls_avoided = 0
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+
+    def record(self, path: str, timings: Dict[str, float], llm_calls: int) -> None:
+        with self._lock:
+            self.requests[path] += 1
+            self.llm_calls += llm_calls
+            self.llm_calls_avoided += 2 - llm_calls
+            for stage, seconds in timings.items():
+                self.stage_seconds[stage] += seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "llm_calls": self.llm_calls,
+                "llm_calls_avoided": self.llm_calls_avoided,
+                "stage_seconds": {k: round(v, 4) for k, v in self.stage_seconds.items()},
+            }
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[name] = timings.get(name, 0.0) + elapsed
+        observe_stage(f"rag_{name}", elapsed)
+
+
+class _TokenUsage(BaseCallbackHandler):
+    """LLM 호출이 끝날 때 응답의 usage_metadata를 stage별 토큰 카운터에 더한다."""
+
+    run_inline = True
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def on_llm_end(self, response, **kwargs) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    LLM_TOKENS.inc(usage.get("input_tokens", 0), stage=self.stage, kind="input")
+                    LLM_TOKENS.inc(usage.get("output_tokens", 0), stage=self.stage, kind="output")
+
+
+def _text(result: Any) -> str:
+    if isinstance(result, str):
+        return result
+    return getattr(result, "content", None) or str(result)
+
+
+class RAGService:
+    def __init__(self, llm=None, graph=None, adb=None, search: Optional[SearchService] = None):
+        """llm/graph/adb/search를 넘기면 그것을 쓴다. 테스트에서는 stub LLM과 가짜 그래프를 주입한다.
+
+        LLM, Cypher 체인과 Neo4j 연결은 처음 쓸 때 만든다. 생성자는 네트워크에 닿지 않는다.
+        """
         self.db = get_database()
-        self.llm = ChatOpenAI(
-            temperature=0, 
-            model="gpt-4o",
-            openai_api_key=settings.openai_api_key
-        )
-        
-        self.cypher_chain = GraphCypherQAChain.from_llm(
-            llm=self.llm,
-            graph=self.db.graph,
-            verbose=True,
-            return_direct=False,
-            return_intermediate_steps=True, 
-            allow_dangerous_requests=True,
-            top_k=settings.rag_top_k
-        )
+        self.adb = adb or get_async_database()
+        self.search = search or get_search_service()
+        self.llm = llm
+        self._graph = graph
+        self._cypher_chain = None
+        self._chain_lock = threading.Lock()
+        self.stats = RAGStats()
+        self.plans = get_cache("rag_cypher_plan", ttl=settings.rag_plan_ttl)
+        self.flights = get_flight("rag_query")
+        self.answers = None
+        if settings.rag_answer_cache:
+            self.answers = SemanticCache(
+                settings.rag_answer_maxsize, settings.rag_answer_ttl, settings.rag_answer_threshold
+            )
+            register_cache("rag_answer", self.answers)
+        self._matcher = None
+        self._matcher_lock = threading.Lock()
+        self._callbacks = {
+            "cypher_generation": {"callbacks": [_TokenUsage("cypher_generation")]},
+            "answer_generation": {"callbacks": [_TokenUsage("answer_generation")]},
+        }
+
+    @property
+    def graph(self):
+        return self._graph if self._graph is not None else self.db.graph
+
+    @property
+    def cypher_chain(self):
+        """GraphCypherQAChain. 프롬프트 스키마는 DatabaseManager가 저장해 둔 스키마를 쓴다."""
+        if self._cypher_chain is None:
+            with self._chain_lock:
+                if self._cypher_chain is None:
+                    from langchain_neo4j.chains.graph_qa.cypher import GraphCypherQAChain
+
+                    if self.llm is None:
+                        from langchain_openai import ChatOpenAI
+
+                        self.llm = ChatOpenAI(
+                            temperature=0,
+                            model="gpt-4o",
+                            openai_api_key=settings.openai_api_key,
+                            stream_usage=True
+                        )
+                    self._cypher_chain = GraphCypherQAChain.from_llm(
+                        llm=self.llm,
+                        graph=self.graph,
+                        verbose=True,
+                        return_direct=False,
+                        return_intermediate_steps=True,
+                        allow_dangerous_requests=True,
+                        top_k=settings.rag_top_k
+                    )
+        return self._cypher_chain
+
+    async def _achain(self):
+        # 첫 생성은 Neo4j 연결을 포함할 수 있으므로 이벤트 루프 밖에서 한다.
+        return self._cypher_chain or await asyncio.to_thread(lambda: self.cypher_chain)
+
+    def reset(self) -> None:
+        """그래프가 다시 적재된 뒤 장르 목록과 스키마가 들어간 체인을 버린다. 캐시는 invalidate_all이 비운다."""
+        self.db.reload_schema()
+        with self._chain_lock:
+            self._cypher_chain = None
+        with self._matcher_lock:
+            self._matcher = None
+
+    @property
+    def matcher(self) -> IntentMatcher:
+        if self._matcher is None:
+            with self._matcher_lock:
+                if self._matcher is None:
+                    genres = [row["name"] for row in self.graph.query(GENRE_NAMES_QUERY)]
+                    self._matcher = IntentMatcher(genres, self._artist_ids, limit=settings.rag_top_k)
+        return self._matcher
+
+    def _artist_ids(self, name: str) -> List[str]:
+        """이름이 정확히 같은 아티스트만 돌려준다. 동명이인은 모두 포함."""
+        return self.search.artist_index.exact(name, 5)
+
     def extract_title(self, results: str) -> List[str]:
         pattern = r"'([^']*)'"
         song_titles = re.findall(pattern, results)
         return song_titles
 
-    def search_details(self, song_ids: List[str]) -> List[SongInfo]:
-        songs=[]
-        for id in song_ids:
-            song_details = search_service.search_by_song_id(id)
-            songs.extend(song_details)
-        return songs
-    
-    def query(self, question: str) -> Tuple[str, List[SongInfo]]:
-        final_question=f"{question}. 반드시 song_id를 함께 반환해주세요."
+    def search_details(self, song_ids: List[str]) -> List[SongRecord]:
+        return self.search.search_by_song_ids([id for id in song_ids if id])
+
+    async def asearch_details(self, song_ids: List[str]) -> List[SongRecord]:
+        return await self.search.asearch_by_song_ids([id for id in song_ids if id])
+
+    @staticmethod
+    def _song_ids(context: List[Dict[str, Any]]) -> List[str]:
+        return [row.get("s.song_id") or row.get("song_id") for row in context]
+
+    @staticmethod
+    def _fast_answer(intent: Intent, songs: List[SongRecord]) -> str:
+        listed = ", ".join(f"'{song.title}' - {song.artist_name or '알 수 없음'}" for song in songs[:10])
+        return f"'{intent.label}' 조건에 맞는 곡 {len(songs)}개를 찾았습니다: {listed}"
+
+    def _plan_keys(self, question: str) -> Tuple[str, str, List[str]]:
+        shape, values = question_shape(question)
+        return f"shape:{shape}", f"exact:{normalize(question)}", values
+
+    def _cached_cypher(self, question: str) -> Optional[str]:
+        shape_key, exact_key, values = self._plan_keys(question)
+        plan = self.plans.get(shape_key, None)
+        if plan is not None:
+            return from_plan(plan, values)
+        return self.plans.get(exact_key, None)
+
+    def _store_cypher(self, question: str, cypher: str) -> None:
+        shape_key, exact_key, values = self._plan_keys(question)
+        plan = to_plan(cypher, values)
+        if plan is not None:
+            self.plans.set(shape_key, plan)
+        else:
+            self.plans.set(exact_key, cypher)
+
+    def _forget_cypher(self, question: str) -> None:
+        shape_key, exact_key, _ = self._plan_keys(question)
+        self.plans.delete(shape_key)
+        self.plans.delete(exact_key)
+
+    @staticmethod
+    def _answer_guard(question: str) -> str:
+        # 숫자(연도 등)가 다르면 임베딩이 가까워도 다른 질문으로 본다.
+        return ",".join(question_shape(question)[1])
+
+    def _lookup_answer(self, question: str, history: str = "") -> Tuple[Optional[np.ndarray], Optional[CachedAnswer]]:
+        # 대화 맥락에 기대는 질문("더 보여줘")의 답은 다른 대화에서 재사용할 수 없다.
+        if self.answers is None or history:
+            return None, None
         try:
-            rag_results=self.cypher_chain.invoke(
-                {"query": final_question},
-            )
-            song_ids=[song.get("s.song_id") for song in rag_results["intermediate_steps"][1]["context"]]
+            vector = np.asarray(self.search.embeddings.embed_query(question), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Question embedding failed, skipping answer cache: {e}")
+            return None, None
+        return vector, self.answers.lookup(vector, self._answer_guard(question))
+
+    async def _alookup_answer(self, question: str,
+                              history: str = "") -> Tuple[Optional[np.ndarray], Optional[CachedAnswer]]:
+        if self.answers is None or history:
+            return None, None
+        try:
+            vector = np.asarray(await self.search.embeddings.aembed_query(question), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Question embedding failed, skipping answer cache: {e}")
+            return None, None
+        return vector, self.answers.lookup(vector, self._answer_guard(question))
+
+    def _store_answer(self, vector: Optional[np.ndarray], question: str, answer: str, song_ids: List[str]) -> None:
+        # 곡을 못 찾은 답("찾지 못했습니다")은 재사용할 가치가 없으므로 담지 않는다.
+        song_ids = [song_id for song_id in song_ids if song_id]
+        if vector is not None and song_ids:
+            self.answers.store(vector, question, answer, song_ids, self._answer_guard(question))
+
+    @staticmethod
+    def _final_question(question: str, history: str) -> str:
+        final_question = f"{question}. 반드시 song_id를 함께 반환해주세요."
+        return f"{history}\n현재 질문: {final_question}" if history else final_question
+
+    def _generate_cypher(self, final_question: str) -> str:
+        # 체인의 _call과 같은 입력. 최신 langchain-neo4j 프롬프트는 examples 변수를 요구한다.
+        generated = self.cypher_chain.cypher_generation_chain.invoke(
+            {"question": final_question, "examples": None, "schema": self.cypher_chain.graph_schema},
+            config=self._callbacks["cypher_generation"],
+        )
+        return extract_cypher(_text(generated))
+
+    async def _agenerate_cypher(self, final_question: str) -> str:
+        chain = await self._achain()
+        generated = await chain.cypher_generation_chain.ainvoke(
+            {"question": final_question, "examples": None, "schema": chain.graph_schema},
+            config=self._callbacks["cypher_generation"],
+        )
+        return extract_cypher(_text(generated))
+
+    def _log(self, question: str, path: str, timings: Dict[str, float], llm_calls: int) -> None:
+        self.stats.record(path, timings, llm_calls)
+        stages = " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items())
+        logger.info(f"RAG '{question}' path={path} llm_calls={llm_calls} {stages}")
+
+    def query(self, question: str, history: str = "") -> Tuple[str, List[SongRecord]]:
+        """정규화한 질문이 같은 동시 요청은 체인을 한 번만 돌리고 답을 나눠 받는다.
+
+        history는 이전 대화를 줄인 텍스트다. 있으면 LLM 단계 프롬프트에 붙이고,
+        질문만으로 만든 plan/답변 캐시는 쓰지 않는다.
+        """
+        return self.flights.do(normalize(f"{history}\n{question}"), lambda: self._query(question, history))
+
+    def _query(self, question: str, history: str = "") -> Tuple[str, List[SongRecord]]:
+        timings: Dict[str, float] = {}
+        try:
+            with _stage(timings, "understand"):
+                intent = self.matcher.match(question)
+            if intent is not None:
+                with _stage(timings, "graph"):
+                    rows = self.graph.query(intent.cypher, params=intent.params)
+                with _stage(timings, "hydrate"):
+                    songs = self.search_details(self._song_ids(rows))
+                if songs:
+                    self._log(question, "fast_path", timings, 0)
+                    return self._fast_answer(intent, songs), songs
 
-            # song_titles = self.extract_title(rag_results["result"])
-            songs = self.search_details(song_ids)
-            return rag_results["result"], songs
+            with _stage(timings, "answer_cache"):
+                vector, hit = self._lookup_answer(question, history)
+            if hit is not None:
+                with _stage(timings, "hydrate"):
+                    songs = self.search_details(hit.song_ids)
+                self._log(question, "answer_cache", timings, 0)
+                return hit.answer, songs
+
+            final_question = self._final_question(question, history)
+            llm_calls = 0
+            with _stage(timings, "plan_cache"):
+                cypher = self._cached_cypher(question) if not history else None
+            context = None
+            if cypher is not None:
+                try:
+                    with _stage(timings, "graph"):
+                        context = self.graph.query(cypher)[: settings.rag_top_k]
+                except Exception as e:
+                    logger.warning(f"Cached Cypher plan failed, regenerating: {e}")
+                    self._forget_cypher(question)
+            if context is None:
+                with _stage(timings, "cypher_generation"):
+                    cypher = self._generate_cypher(final_question)
+                llm_calls += 1
+                with _stage(timings, "graph"):
+                    context = self.graph.query(cypher)[: settings.rag_top_k] if cypher else []
+                if cypher and not history:
+                    self._store_cypher(question, cypher)
+
+            with _stage(timings, "answer_generation"):
+                answer = _text(self.cypher_chain.qa_chain.invoke(
+                    {"question": final_question, "context": context}, config=self._callbacks["answer_generation"]
+                ))
+            llm_calls += 1
+
+            # song_titles = self.extract_title(answer)
+            song_ids = self._song_ids(context)
+            with _stage(timings, "hydrate"):
+                songs = self.search_details(song_ids)
+            self._store_answer(vector, question, answer, song_ids)
+            self._log(question, "plan_cache" if llm_calls == 1 else "llm", timings, llm_calls)
+            return answer, songs
 
         except Exception as e:
             logger.error(f"❌ Error in RAG query: {e}")
             return f"죄송합니다. 오류가 발생했습니다: {str(e)}", []
 
-rag_service = RAGService()
\ No newline at end of file
+    async def astream(self, question: str, history: str = "") -> AsyncIterator[Tuple[str, Any]]:
+        """RAG 결과를 준비되는 대로 (event, data)로 흘려보낸다.
+
+        Cypher 결과를 hydrate하자마자 ("songs", List[SongRecord])를 먼저 내보내고,
+        이어서 답변을 ("token", str) 조각으로, 마지막에 ("done", 단계별 시간)을 보낸다.
+        오류가 나면 ("error", 메시지)를 보내고 끝낸다.
+        """
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        try:
+            with _stage(timings, "understand"):
+                matcher = self._matcher or await asyncio.to_thread(lambda: self.matcher)
+                intent = matcher.match(question)
+            if intent is not None:
+                with _stage(timings, "graph"):
+                    rows = await self.adb.query(intent.cypher, params=intent.params)
+                with _stage(timings, "hydrate"):
+                    songs = await self.asearch_details(self._song_ids(rows))
+                if songs:
+                    yield "songs", songs
+                    time_to_songs = time.perf_counter() - start
+                    yield "token", self._fast_answer(intent, songs)
+                    self._log(question, "fast_path", timings, 0)
+                    yield "done", {"path": "fast_path", "time_to_songs": time_to_songs, "timings": timings}
+                    return
+
+            with _stage(timings, "answer_cache"):
+                vector, hit = await self._alookup_answer(question, history)
+            if hit is not None:
+                with _stage(timings, "hydrate"):
+                    songs = await self.asearch_details(hit.song_ids)
+                yield "songs", songs
+                time_to_songs = time.perf_counter() - start
+                yield "token", hit.answer
+                self._log(question, "answer_cache", timings, 0)
+                yield "done", {"path": "answer_cache", "time_to_songs": time_to_songs, "timings": timings,
+                               "similar_question": hit.question, "similarity": hit.similarity}
+                return
+
+            final_question = self._final_question(question, history)
+            llm_calls = 0
+            with _stage(timings, "plan_cache"):
+                cypher = self._cached_cypher(question) if not history else None
+            context = None
+            if cypher is not None:
+                try:
+                    with _stage(timings, "graph"):
+                        context = (await self.adb.query(cypher))[: settings.rag_top_k]
+                except Exception as e:
+                    logger.warning(f"Cached Cypher plan failed, regenerating: {e}")
+                    self._forget_cypher(question)
+            if context is None:
+                with _stage(timings, "cypher_generation"):
+                    cypher = await self._agenerate_cypher(final_question)
+                llm_calls += 1
+                with _stage(timings, "graph"):
+                    context = (await self.adb.query(cypher))[: settings.rag_top_k] if cypher else []
+                if cypher and not history:
+                    self._store_cypher(question, cypher)
+
+            song_ids = self._song_ids(context)
+            with _stage(timings, "hydrate"):
+                songs = await self.asearch_details(song_ids)
+            yield "songs", songs
+            time_to_songs = time.perf_counter() - start
+
+            tokens: List[str] = []
+            with _stage(timings, "answer_generation"):
+                chain = await self._achain()
+                async for chunk in chain.qa_chain.astream(
+                    {"question": final_question, "context": context}, config=self._callbacks["answer_generation"]
+                ):
+                    tokens.append(_text(chunk))
+                    yield "token", tokens[-1]
+            llm_calls += 1
+            self._store_answer(vector, question, "".join(tokens), song_ids)
+
+            path = "plan_cache" if llm_calls == 1 else "llm"
+            self._log(question, path, timings, llm_calls)
+            yield "done", {"path": path, "time_to_songs": time_to_songs, "timings": timings}
+
+        except Exception as e:
+            logger.error(f"❌ Error in RAG query: {e}")
+            yield "error", f"죄송합니다. 오류가 발생했습니다: {str(e)}"
+
+    async def aquery(self, question: str, history: str = "") -> Tuple[str, List[SongRecord]]:
+        """query의 async 버전. astream의 결과를 모아 한 번에 반환하며, 같은 질문의 동시 요청은 합친다."""
+        return await self.flights.ado(normalize(f"{history}\n{question}"), lambda: self._aquery(question, history))
+
+    async def _aquery(self, question: str, history: str = "") -> Tuple[str, List[SongRecord]]:
+        tokens: List[str] = []
+        songs: List[SongRecord] = []
+        async for event, data in self.astream(question, history):
+            if event == "songs":
+                songs = data
+            elif event == "token":
+                tokens.append(data)
+            elif event == "error":
+                return data, []
+        return "".join(tokens), songs
+
+    async def adegraded(self, question: str) -> Tuple[str, List[SongRecord]]:
+        """과부하일 때의 답. LLM/임베딩을 부르지 않고 템플릿 질문 → 캐시된 Cypher 계획 → 제목/아티스트 검색 순으로 찾는다.
+
+        질문 이해 색인이 아직 없으면 만들지 않고 건너뛴다. 답변 문장 대신 찾은 곡 목록을 돌려준다.
+        """
+        timings: Dict[str, float] = {}
+        songs: List[SongRecord] = []
+        try:
+            intent = self._matcher.match(question) if self._matcher is not None else None
+            if intent is not None:
+                with _stage(timings, "graph"):
+                    rows = await self.adb.query(intent.cypher, params=intent.params)
+                with _stage(timings, "hydrate"):
+                    songs = await self.asearch_details(self._song_ids(rows))
+                if songs:
+                    self._log(question, "degraded", timings, 0)
+                    return self._fast_answer(intent, songs), songs
+            with _stage(timings, "plan_cache"):
+                cypher = self._cached_cypher(question)
+            if cypher is not None:
+                with _stage(timings, "graph"):
+                    context = (await self.adb.query(cypher))[: settings.rag_top_k]
+                with _stage(timings, "hydrate"):
+                    songs = await self.asearch_details(self._song_ids(context))
+            if not songs:
+                with _stage(timings, "fallback_search"):
+                    songs = (await self.search.asearch_by_title(question, settings.rag_top_k)
+                             or await self.search.asearch_by_artist(question, settings.rag_top_k))
+        except Exception as e:
+            logger.warning(f"Degraded RAG answer failed: {e}")
+        self._log(question, "degraded", timings, 0)
+        if not songs:
+            return "지금은 요청이 많아 답변을 만들 수 없습니다. 잠시 후 다시 시도해 주세요.", []
+        listed = ", ".join(f"'{song.title}' - {song.artist_name or '알 수 없음'}" for song in songs[:10])
+        return f"지금은 요청이 많아 간단한 검색 결과를 먼저 보여드립니다: {listed}", songs
+
+    async def aquery_admitted(self, question: str, history: str = "") -> Tuple[str, List[SongRecord], bool]:
+        """aquery를 rag 게이트 안에서 실행한다. 게이트가 거절하면 degradable()일 때 adegraded의 답을,
+        아니면 Overloaded를 그대로 올린다. 세 번째 값은 축소된 답인지 여부."""
+        gate = get_gate("rag")
+        try:
+            answer, songs = await gate.run(lambda: self.aquery(question, history))
+            return answer, songs, False
+        except Overloaded as e:
+            if not degradable(e):
+                raise
+            gate.counts["degraded"] += 1
+            answer, songs = await self.adegraded(question)
+            return answer, songs, True
+
+
+def _rag_samples(service: RAGService):
+    stats = service.stats.as_dict()
+    for path, count in stats["requests"].items():
+        yield "stunes_rag_requests_total", "counter", "RAG requests by path", {"path": path}, count
+    yield "stunes_rag_llm_calls_total", "counter", "LLM calls made by RAG", {}, stats["llm_calls"]
+    yield "stunes_rag_llm_calls_avoided_total", "counter", "LLM calls skipped by fast path/plan cache", {}, stats["llm_calls_avoided"]
+
+
+
+@lru_cache()
+def get_rag_service() -> RAGService:
+    service = RAGService()
+    register_collector(lambda: _rag_samples(service))
+    return service
@@ -1,99 +1,452 @@
-from functools import cache, lru_cache
-from typing import List, Dict, Any
-from src.core.database import get_database
-from src.models.schemas import SongInfo
-# from src.utils.cache import cached
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from src.core.config import settings
+from src.core.database import get_database, get_async_database
+from src.utils.arrays import meta_stamp
+from src.models.records import ScoredSongRecord, SongRecord
+from src.services.search_service import SearchService, get_search_service
+from src.services.song_card import song_card_query
+from src.utils.cache import cached
+from src.utils.event_log import get_event_log
+from src.utils.popularity import get_popularity_table
+from src.utils.metrics import timed
+from src.utils.snapshot import SnapshotBackend, get_snapshot
+import asyncio
 import logging
+import threading
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 장르 후보 풀(jobs/genre_pools.py)이 없을 때만 쓰는 전체 정렬 쿼리
+GENRE_RECOMMENDATION_QUERY = song_card_query(
+    """
+    MATCH (seed:Song {song_id: $song_id})-[:HAS_GENRE]-(:Genre)-[:HAS_GENRE]-(s:Song)
+    WHERE seed.song_id <> s.song_id
+    WITH DISTINCT s
+    ORDER BY RAND()
+    LIMIT $limit
+    """
+)
+
+ARTIST_RECOMMENDATION_QUERY = song_card_query(
+    """
+    MATCH (seed:Song {song_id: $song_id})-[:PERFORMED_BY]-(a:Artist)-[:PERFORMED_BY]-(s:Song)
+    WHERE seed.song_id <> s.song_id
+    WITH DISTINCT s, a
+    ORDER BY s.issue_date DESC
+    LIMIT $limit
+    """,
+    artist="a",
+    order_by="s.issue_date DESC",
+)
+
+# 여러 seed 곡을 한 번에 처리하는 배치 쿼리. 점수는 후보와 아티스트/장르를 공유하는 seed 수다.
+BATCH_ARTIST_RECOMMENDATION_QUERY = song_card_query(
+    """
+    UNWIND $song_ids AS seed_id
+    MATCH (:Song {song_id: seed_id})-[:PERFORMED_BY]-(a:Artist)
+    WITH a, count(*) AS weight
+    MATCH (a)-[:PERFORMED_BY]-(s:Song)
+    WHERE NOT s.song_id IN $song_ids
+    WITH s, sum(weight) AS score, head(collect(a)) AS a
+    ORDER BY score DESC, s.issue_date DESC
+    LIMIT $limit
+    """,
+    carry=["score"],
+    artist="a",
+    order_by="score DESC, s.issue_date DESC",
+    returns=["score"],
+)
+
+# 장르 후보 풀이 없을 때만 쓰는 배치 장르 쿼리
+BATCH_GENRE_RECOMMENDATION_QUERY = song_card_query(
+    """
+    UNWIND $song_ids AS seed_id
+    MATCH (:Song {song_id: seed_id})-[:HAS_GENRE]-(g:Genre)
+    WITH g, count(*) AS weight
+    MATCH (g)-[:HAS_GENRE]-(s:Song)
+    WHERE NOT s.song_id IN $song_ids
+    WITH s, sum(weight) AS score
+    ORDER BY score DESC, RAND()
+    LIMIT $limit
+    """,
+    carry=["score"],
+    order_by="score DESC",
+    returns=["score"],
+)
+
+# 순위 배열(jobs/popularity.py)이 없을 때 Song.popularity 인덱스로 읽는 쿼리
+POPULAR_SONGS_QUERY = song_card_query(
+    """
+    MATCH (s:Song)
+    WHERE s.popularity IS NOT NULL
+    WITH s
+    ORDER BY s.popularity DESC
+    LIMIT $limit
+    """,
+    order_by="s.popularity DESC",
+)
+
+SNAPSHOT_HANDLERS = {
+    GENRE_RECOMMENDATION_QUERY: lambda snapshot, p: snapshot.genre_recommendations([p["song_id"]], p["limit"]),
+    ARTIST_RECOMMENDATION_QUERY: lambda snapshot, p: snapshot.artist_recommendations([p["song_id"]], p["limit"]),
+    BATCH_ARTIST_RECOMMENDATION_QUERY: lambda snapshot, p: snapshot.artist_recommendations(
+        p["song_ids"], p["limit"], scored=True),
+    BATCH_GENRE_RECOMMENDATION_QUERY: lambda snapshot, p: snapshot.genre_recommendations(
+        p["song_ids"], p["limit"], scored=True),
+    POPULAR_SONGS_QUERY: lambda snapshot, p: snapshot.popular_songs(p["limit"]),
+}
+
+
 class RecommendationService:
-    def __init__(self):
+    def __init__(self, search: Optional[SearchService] = None):
         self.db = get_database()
-    
-    @cache 
-    def recommend_by_genre(self, song_id: str, limit: int = 5) -> List[SongInfo]:
-        query = """
-        MATCH (s:Song {song_id: $song_id})-[:HAS_GENRE]-(g:Genre)-[:HAS_GENRE]-(rec:Song)
-        WHERE s.song_id <> rec.song_id
-        WITH DISTINCT rec
-        OPTIONAL MATCH (rec)-[:PERFORMED_BY]-(a:Artist)
-        OPTIONAL MATCH (rec)-[:HAS_GENRE]-(rg:Genre)
-        OPTIONAL MATCH (rec)-[:IN_ALBUM]-(al:Album)
-        RETURN rec.song_id AS song_id,
-               rec.title AS title,
-               rec.issue_date AS issue_date,
-               a.name AS artist_name,
-               a.artist_id AS artist_id,
-               rg.name AS genre_name,
-               rg.genre_id AS genre_id,
-               al.title AS album_title,
-               al.album_id AS album_id
-        ORDER BY RAND()
-        LIMIT $limit
-        """
-        
+        self.adb = get_async_database()
+        self._cooccurrence = None
+        self._genre_pools = None
+        self._backend = None
+        self._profiles = None
+        self._failed: Dict[str, Optional[float]] = {}
+        self._index_lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+        self.search = search or get_search_service()
+        self.events = get_event_log()
+
+    def _load_failed(self, name: str, stamp: Optional[float]) -> bool:
+        """같은 meta mtime에서 이미 로드에 실패한 사전 계산물이면 True. 파일이 새로 쓰이거나 reset()되면 다시 연다."""
+        return name in self._failed and self._failed[name] == stamp
+
+    @property
+    def cooccurrence(self):
+        """jobs/cooccurrence.py가 만든 이웃 테이블. 파일이 없으면 None."""
+        if self._cooccurrence is None:
+            from src.utils.cooccurrence import META, CooccurrenceIndex
+
+            stamp = meta_stamp(settings.cooccurrence_path, META)
+            if self._load_failed("cooccurrence", stamp):
+                return None
+            with self._index_lock:
+                if self._cooccurrence is None:
+                    if self._load_failed("cooccurrence", stamp):
+                        return None
+                    try:
+                        self._cooccurrence = CooccurrenceIndex.load(settings.cooccurrence_path)
+                        logger.info(f"Co-occurrence index loaded over {len(self._cooccurrence)} songs")
+                    except (OSError, ValueError) as e:
+                        self._failed["cooccurrence"] = stamp
+                        logger.warning(f"Co-occurrence index unavailable at {settings.cooccurrence_path}: {e}")
+                        return None
+        return self._cooccurrence
+
+    @property
+    def genre_pools(self):
+        """jobs/genre_pools.py가 만든 장르별 후보 풀. 파일이 없으면 None."""
+        if self._genre_pools is None:
+            from src.utils.genre_pool import META, GenrePools
+
+            stamp = meta_stamp(settings.genre_pool_path, META)
+            if self._load_failed("genre_pools", stamp):
+                return None
+            with self._index_lock:
+                if self._genre_pools is None:
+                    if self._load_failed("genre_pools", stamp):
+                        return None
+                    try:
+                        self._genre_pools = GenrePools.load(settings.genre_pool_path)
+                        logger.info(f"Genre pools loaded over {len(self._genre_pools)} genres")
+                    except (OSError, ValueError) as e:
+                        self._failed["genre_pools"] = stamp
+                        logger.warning(f"Genre pools unavailable at {settings.genre_pool_path}: {e}")
+                        return None
+        return self._genre_pools
+
+    @property
+    def profiles(self):
+        """사용자 취향 프로필. 처음 쓸 때 보존 기간의 이벤트 로그를 다시 읽어 만든다. 이웃 테이블이 없으면 None."""
+        if self._profiles is None:
+            index = self.cooccurrence
+            if index is None:
+                return None
+            with self._profile_lock:
+                if self._profiles is None:
+                    from src.utils.user_profiles import UserProfiles, song_genres
+
+                    pools = self.genre_pools
+                    profiles = UserProfiles(index.song_ids, song_genres(index.song_ids, pools),
+                                            len(pools) if pools is not None else 0, settings.user_profile_songs)
+                    self.events.flush()
+                    profiles.apply(self.events.read_new())
+                    logger.info(f"User profiles replayed: {len(profiles)} users, {profiles.events} events")
+                    self._profiles = profiles
+        return self._profiles
+
+    @property
+    def backend(self) -> Optional[SnapshotBackend]:
+        """serving_backend=snapshot이면 Neo4j 대신 읽는 그래프 스냅샷. 아니거나 파일이 없으면 None."""
+        if self._backend is None:
+            snapshot = get_snapshot()
+            if snapshot is not None:
+                self._backend = SnapshotBackend(snapshot, SNAPSHOT_HANDLERS)
+        return self._backend
+
+    def reset(self) -> None:
+        """그래프가 다시 적재된 뒤 사전 계산물을 버린다. 프로필은 곡 행 번호가 바뀌므로 이벤트 로그에서 다시 만든다."""
+        with self._index_lock, self._profile_lock:
+            self._cooccurrence = self._genre_pools = self._profiles = None
+            self._failed.clear()
+            self._backend = None
+
+    def _rows(self, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        backend = self.backend
+        if backend is not None and backend.supports(query):
+            return backend.query(query, params)
+        with timed("neo4j_query"):
+            return self.db.graph.query(query, params=params)
+
+    async def _arows(self, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        backend = self.backend
+        if backend is not None and backend.supports(query):
+            return backend.query(query, params)
+        return await self.adb.query(query, params=params)
+
+    def _query(self, query: str, params: Dict[str, Any]) -> List[SongRecord]:
+        return SongRecord.from_rows(self._rows(query, params))
+
+    async def _aquery(self, query: str, params: Dict[str, Any]) -> List[SongRecord]:
+        return SongRecord.from_rows(await self._arows(query, params))
+
+    def recommend_by_genre(self, song_id: str, limit: int = 5, seed: Optional[int] = None) -> List[SongRecord]:
+        """같은 장르 곡을 매 요청 새로 샘플링한다. seed를 주면 같은 결과를 재현한다."""
         try:
-            results = self.db.graph.query(query, params={"song_id": song_id, "limit": limit})
-            return [SongInfo(**result) for result in results]
+            pools = self.genre_pools
+            if pools is None:
+                return self._query(GENRE_RECOMMENDATION_QUERY, {"song_id": song_id, "limit": limit})
+            return self.search.search_by_song_ids(pools.sample(song_id, limit, seed))
         except Exception as e:
             logger.error(f"Error in genre-based recommendation: {e}")
             return []
-    
-    @cache
-    def recommend_by_artist(self, song_id: str, limit: int = 5) -> List[SongInfo]:
-        query = """
-        MATCH (s:Song {song_id: $song_id})-[:PERFORMED_BY]-(a:Artist)-[:PERFORMED_BY]-(rec:Song)
-        WHERE s.song_id <> rec.song_id
-        WITH DISTINCT rec, a
-        OPTIONAL MATCH (rec)-[:HAS_GENRE]-(g:Genre)
-        OPTIONAL MATCH (rec)-[:IN_ALBUM]-(al:Album)
-        RETURN rec.song_id AS song_id,
-               rec.title AS title,
-               rec.issue_date AS issue_date,
-               a.name AS artist_name,
-               a.artist_id AS artist_id,
-               g.name AS genre_name,
-               g.genre_id AS genre_id,
-               al.title AS album_title,
-               al.album_id AS album_id
-        ORDER BY rec.issue_date DESC
-        LIMIT $limit
-        """
-        
+
+    async def arecommend_by_genre(self, song_id: str, limit: int = 5, seed: Optional[int] = None) -> List[SongRecord]:
+        try:
+            pools = self.genre_pools
+            if pools is None:
+                return await self._aquery(GENRE_RECOMMENDATION_QUERY, {"song_id": song_id, "limit": limit})
+            return await self.search.asearch_by_song_ids(pools.sample(song_id, limit, seed))
+        except Exception as e:
+            logger.error(f"Error in genre-based recommendation: {e}")
+            return []
+
+    @cached("recommend_by_artist")
+    def recommend_by_artist(self, song_id: str, limit: int = 5) -> List[SongRecord]:
         try:
-            results = self.db.graph.query(query, params={"song_id": song_id, "limit": limit})
-            return [SongInfo(**result) for result in results]
+            return self._query(ARTIST_RECOMMENDATION_QUERY, {"song_id": song_id, "limit": limit})
         except Exception as e:
             logger.error(f"Error in artist-based recommendation: {e}")
             return []
-    
-    def get_popular_songs(self, limit: int = 10) -> List[SongInfo]:
-        query = """
-        MATCH (s:Song)-[:INCLUDES]-(p:Playlist)
-        WITH s, count(p) as playlist_count
-        ORDER BY playlist_count DESC
-        LIMIT $limit
-        WITH DISTINCT s
-        OPTIONAL MATCH (s)-[:PERFORMED_BY]-(a:Artist)
-        OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
-        OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
-        RETURN s.song_id AS song_id,
-               s.title AS title,
-               s.issue_date AS issue_date,
-               a.name AS artist_name,
-               a.artist_id AS artist_id,
-               g.name AS genre_name,
-               g.genre_id AS genre_id,
-               al.title AS album_title,
-               al.album_id AS album_id
-        """
-        
+
+    @cached("recommend_by_artist")
+    async def arecommend_by_artist(self, song_id: str, limit: int = 5) -> List[SongRecord]:
         try:
-            results = self.db.graph.query(query, params={"limit": limit})
-            return [SongInfo(**result) for result in results]
+            return await self._aquery(ARTIST_RECOMMENDATION_QUERY, {"song_id": song_id, "limit": limit})
+        except Exception as e:
+            logger.error(f"Error in artist-based recommendation: {e}")
+            return []
+
+    def get_popular_songs(self, limit: int = 10) -> List[SongRecord]:
+        """미리 계산된 인기도 순위의 상위 limit개. 갱신 잡이 돌면 다음 reload 주기부터 반영된다."""
+        try:
+            table = get_popularity_table()
+            if table is None:
+                return self._query(POPULAR_SONGS_QUERY, {"limit": limit})
+            return self.search.search_by_song_ids([song_id for song_id, _ in table.top(limit)])
         except Exception as e:
             logger.error(f"Error getting popular songs: {e}")
             return []
 
-recommendation_service = RecommendationService()
+    async def aget_popular_songs(self, limit: int = 10) -> List[SongRecord]:
+        try:
+            table = get_popularity_table()
+            if table is None:
+                return await self._aquery(POPULAR_SONGS_QUERY, {"limit": limit})
+            return await self.search.asearch_by_song_ids([song_id for song_id, _ in table.top(limit)])
+        except Exception as e:
+            logger.error(f"Error getting popular songs: {e}")
+            return []
+
+    def _cooccurrence_neighbors(self, song_id: str, limit: int) -> List[Tuple[str, float]]:
+        index = self.cooccurrence
+        return index.neighbors_of(song_id, limit) if index is not None else []
+
+    def _cooccurring_ids(self, song_id: str, limit: int) -> List[str]:
+        return [neighbor for neighbor, _ in self._cooccurrence_neighbors(song_id, limit)]
+
+    def recommend_by_playlist_cooccurrence(self, song_id: str, limit: int = 5) -> List[SongRecord]:
+        """같은 플레이리스트에 자주 함께 담긴 곡. 이웃은 미리 계산된 테이블에서 읽고 상세만 조회한다."""
+        try:
+            return self.search.search_by_song_ids(self._cooccurring_ids(song_id, limit))
+        except Exception as e:
+            logger.error(f"Error in co-occurrence recommendation: {e}")
+            return []
+
+    async def arecommend_by_playlist_cooccurrence(self, song_id: str, limit: int = 5) -> List[SongRecord]:
+        try:
+            return await self.search.asearch_by_song_ids(self._cooccurring_ids(song_id, limit))
+        except Exception as e:
+            logger.error(f"Error in co-occurrence recommendation: {e}")
+            return []
+
+    def _embedding_neighbors(self, song_id: str, limit: int) -> List[Tuple[str, float]]:
+        index = self.search.vector_index
+        return index.similar_to(song_id, limit, settings.vector_nprobe) if index is not None else []
+
+    def _similar_ids(self, song_id: str, limit: int) -> List[str]:
+        return [neighbor for neighbor, _ in self._embedding_neighbors(song_id, limit)]
+
+    def recommend_by_embedding(self, song_id: str, limit: int = 5) -> List[SongRecord]:
+        """임베딩이 가까운 곡. 저장된 Song.embedding 색인에서 k-NN으로 찾는다."""
+        try:
+            return self.search.search_by_song_ids(self._similar_ids(song_id, limit))
+        except Exception as e:
+            logger.error(f"Error in embedding-based recommendation: {e}")
+            return []
+
+    async def arecommend_by_embedding(self, song_id: str, limit: int = 5) -> List[SongRecord]:
+        try:
+            return await self.search.asearch_by_song_ids(self._similar_ids(song_id, limit))
+        except Exception as e:
+            logger.error(f"Error in embedding-based recommendation: {e}")
+            return []
+
+    def _neighbor_scores(self, song_ids: List[str], rec_type: str, limit: int) -> List[Tuple[str, float]]:
+        """seed마다 미리 계산된 이웃을 읽어 점수를 더한다. seed 자신은 후보에서 뺀다."""
+        neighbors = self._cooccurrence_neighbors if rec_type == "cooccurrence" else self._embedding_neighbors
+        seeds = set(song_ids)
+        scores: Dict[str, float] = {}
+        for song_id in dict.fromkeys(song_ids):
+            for neighbor, score in neighbors(song_id, limit):
+                if neighbor not in seeds:
+                    scores[neighbor] = scores.get(neighbor, 0.0) + score
+        return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+
+    def _batch_plan(self, song_ids: List[str], rec_type: str, limit: int,
+                    seed: Optional[int]) -> Tuple[Optional[str], Dict[str, Any], List[Tuple[str, float]]]:
+        """(Cypher, 파라미터, 미리 점수 매긴 후보) 중 하나를 고른다. Cypher가 None이면 후보를 hydrate한다."""
+        if rec_type == "artist":
+            return BATCH_ARTIST_RECOMMENDATION_QUERY, {"song_ids": song_ids, "limit": limit}, []
+        if rec_type == "genre":
+            pools = self.genre_pools
+            if pools is None:
+                return BATCH_GENRE_RECOMMENDATION_QUERY, {"song_ids": song_ids, "limit": limit}, []
+            return None, {}, sorted(pools.sample_many(song_ids, limit, seed), key=lambda item: -item[1])
+        if rec_type in ("cooccurrence", "embedding"):
+            return None, {}, self._neighbor_scores(song_ids, rec_type, limit)
+        raise ValueError(f"Unknown rec_type: {rec_type}")
+
+    @staticmethod
+    def _scored(songs: List[SongRecord], scored: List[Tuple[str, float]]) -> List[ScoredSongRecord]:
+        score_of = dict(scored)
+        return [ScoredSongRecord.scored(song, score_of.get(song.song_id, 0.0)) for song in songs]
+
+    def recommend_for_songs(self, song_ids: List[str], rec_type: str = "artist", limit: int = 20,
+                            seed: Optional[int] = None) -> List[ScoredSongRecord]:
+        """여러 seed 곡(결과 페이지, 플레이리스트)에 대한 추천을 합쳐 점수순으로 반환한다.
+
+        seed 수와 무관하게 그래프 왕복은 한 번이다. 여러 seed와 겹치는 후보일수록 점수가 높다.
+        """
+        try:
+            query, params, scored = self._batch_plan(song_ids, rec_type, limit, seed)
+            if query is not None:
+                return ScoredSongRecord.from_rows(self._rows(query, params))
+            return self._scored(self.search.search_by_song_ids([song_id for song_id, _ in scored]), scored)
+        except Exception as e:
+            logger.error(f"Error in batch {rec_type} recommendation: {e}")
+            return []
+
+    async def arecommend_for_songs(self, song_ids: List[str], rec_type: str = "artist", limit: int = 20,
+                                   seed: Optional[int] = None) -> List[ScoredSongRecord]:
+        try:
+            query, params, scored = self._batch_plan(song_ids, rec_type, limit, seed)
+            if query is not None:
+                return ScoredSongRecord.from_rows(await self._arows(query, params))
+            return self._scored(await self.search.asearch_by_song_ids([song_id for song_id, _ in scored]), scored)
+        except Exception as e:
+            logger.error(f"Error in batch {rec_type} recommendation: {e}")
+            return []
+
+    def record_events(self, user_id: str, song_ids: List[str], kind: str) -> int:
+        """사용자가 본/고른 곡을 이벤트 로그에 넣는다. 프로필에는 다음 sync_profiles()에서 반영된다."""
+        return self.events.append(user_id, song_ids, kind)
+
+    def sync_profiles(self) -> int:
+        """버퍼를 세그먼트에 쓰고, 모든 워커의 세그먼트에서 새로 쌓인 이벤트를 프로필에 더한다."""
+        flushed = self.events.flush()
+        if self._profiles is None:
+            return flushed
+        return self._profiles.apply(self.events.read_new())
+
+    def _user_scores(self, user_id: str, limit: int) -> List[Tuple[str, float]]:
+        """사용자 곡 가중치 × 각 곡의 공동 등장 이웃 점수를 후보별로 합하고 장르 선호로 가중한다.
+
+        프로필 곡들의 CSR 구간을 한 번에 모아 numpy로 집계하므로 파이썬 루프가 없다.
+        이미 들은 곡은 후보에서 뺀다.
+        """
+        index, profiles = self.cooccurrence, self.profiles
+        profile = profiles.get(user_id) if profiles is not None else None
+        if profile is None:
+            return []
+        rows, weights, genre_weights = profile
+        starts = index.indptr[rows]
+        lengths = index.indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return []
+        # 각 구간의 시작 위치를 구간 길이만큼 펼쳐 0..len-1을 더하면 모든 이웃의 위치가 된다.
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+        candidates, inverse = np.unique(index.neighbors[offsets], return_inverse=True)
+        scores = np.bincount(inverse, weights=index.scores[offsets] * np.repeat(weights, lengths))
+        unseen = ~np.isin(candidates, rows)
+        candidates, scores = candidates[unseen], scores[unseen]
+        if not len(candidates):
+            return []
+        if genre_weights.max() > 0:
+            affinity = genre_weights / genre_weights.max()
+            genres = profiles.genres[candidates]
+            scores = scores * (1.0 + settings.user_genre_boost * np.where(genres >= 0, affinity[genres], 0.0))
+        if len(candidates) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return [(str(index.song_ids[row]), float(score)) for row, score in zip(candidates[order], scores[order])]
+
+    def recommend_for_user(self, user_id: str, limit: int = 20) -> List[ScoredSongRecord]:
+        """사용자가 보고 고른 곡들로 만든 개인화 추천. 기록이 없거나 이웃 테이블이 없으면 인기곡을 준다."""
+        try:
+            with timed("user_scoring"):
+                scored = self._user_scores(user_id, limit)
+            if not scored:
+                return self._scored(self.get_popular_songs(limit), [])
+            return self._scored(self.search.search_by_song_ids([song_id for song_id, _ in scored]), scored)
+        except Exception as e:
+            logger.error(f"Error in user recommendation: {e}")
+            return []
+
+    async def arecommend_for_user(self, user_id: str, limit: int = 20) -> List[ScoredSongRecord]:
+        try:
+            # 최초 프로필은 이벤트 로그 전체를 재생하므로 이벤트 루프 밖에서 만든다.
+            if self._profiles is None:
+                await asyncio.to_thread(getattr, self, "profiles")
+            with timed("user_scoring"):
+                scored = self._user_scores(user_id, limit)
+            if not scored:
+                return self._scored(await self.aget_popular_songs(limit), [])
+            return self._scored(await self.search.asearch_by_song_ids([song_id for song_id, _ in scored]), scored)
+        except Exception as e:
+            logger.error(f"Error in user recommendation: {e}")
+            return []
+
+
+@lru_cache()
+def get_recommendation_service() -> RecommendationService:
+    return RecommendationService()
@@ -1,139 +1,757 @@
-from functools import cache, lru_cache
-from typing import List, Dict, Any
-from src.core.database import get_database
-from src.models.schemas import SongInfo, SearchRequest
-# from src.utils.cache import cached
+from functools import lru_cache
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Set, Tuple
+from src.core.config import settings
+from src.core.database import get_database, get_async_database
+from src.models.records import SongRecord
+from src.models.schemas import SearchRequest
+from src.services.song_card import song_card_query
+from src.utils.ngram_index import NgramIndex
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.admission import remaining
+from src.utils.arrays import meta_stamp
+from src.utils.cache import cached
+from src.utils.fusion import reciprocal_rank_fusion, rerank
+from src.utils.popularity import get_popularity_table
+from src.utils.metrics import timed
+from src.utils.snapshot import SnapshotBackend, get_snapshot
+import asyncio
 import logging
+import numpy as np
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# hybrid 검색의 어휘 후보: (가중치, 순위 목록)들, 아티스트별 관련도, 단어별 (곡, 아티스트) 집합
+Lexical = Tuple[List[Tuple[float, List[str]]], Dict[str, float], List[Tuple[Set[str], Set[str]]]]
+
+TITLE_INDEX_SOURCE = "MATCH (s:Song) RETURN s.song_id AS key, s.title AS text"
+ARTIST_INDEX_SOURCE = "MATCH (a:Artist) RETURN a.artist_id AS key, a.name AS text"
+
+SONGS_BY_IDS_QUERY = song_card_query(
+    """
+    UNWIND range(0, size($song_ids) - 1) AS idx
+    MATCH (s:Song {song_id: $song_ids[idx]})
+    """,
+    carry=["idx"],
+    order_by="idx",
+)
+
+SONG_BY_ID_QUERY = song_card_query("MATCH (s:Song {song_id: $song_id})")
+
+SONGS_BY_ARTIST_IDS_QUERY = song_card_query(
+    """
+    UNWIND range(0, size($artist_ids) - 1) AS rank
+    MATCH (a:Artist {artist_id: $artist_ids[rank]})-[:PERFORMED_BY]-(s:Song)
+    WITH s, rank, a
+    ORDER BY rank
+    WITH s, head(collect(rank)) AS rank, head(collect(a)) AS a
+    ORDER BY rank, coalesce(s.popularity, 0) DESC, s.title
+    LIMIT $limit
+    """,
+    carry=["rank"],
+    artist="a",
+    order_by="rank, coalesce(s.popularity, 0) DESC, s.title",
+)
+
+# hybrid 검색의 아티스트 후보. SONGS_BY_ARTIST_IDS_QUERY와 같은 순서로 song_id만 읽는다.
+SONG_IDS_BY_ARTIST_IDS_QUERY = """
+UNWIND range(0, size($artist_ids) - 1) AS rank
+MATCH (a:Artist {artist_id: $artist_ids[rank]})-[:PERFORMED_BY]-(s:Song)
+WITH s, min(rank) AS rank
+RETURN s.song_id AS song_id
+ORDER BY rank, coalesce(s.popularity, 0) DESC, s.title
+LIMIT $limit
+"""
+
+# hybrid 재순위에 쓰는 후보 곡의 특징. 곡 카드보다 가볍다 (앨범/장르를 읽지 않는다).
+SONG_FEATURES_QUERY = """
+UNWIND $song_ids AS song_id
+MATCH (s:Song {song_id: song_id})
+OPTIONAL MATCH (s)-[:PERFORMED_BY]-(a:Artist)
+RETURN s.song_id AS song_id, s.issue_date AS issue_date, coalesce(s.popularity, 0) AS popularity,
+       collect(a.artist_id) AS artist_ids
+"""
+
+# 아티스트 카탈로그를 (title, song_id) 순으로 읽는다. after_title이 있으면 그 뒤부터 이어간다.
+_ARTIST_CATALOG = """
+UNWIND $artist_ids AS artist_id
+MATCH (a:Artist {artist_id: artist_id})-[:PERFORMED_BY]-(s:Song)
+WITH s, head(collect(a)) AS a
+WHERE $after_title IS NULL OR s.title > $after_title OR (s.title = $after_title AND s.song_id > $after_id)
+WITH s, a
+ORDER BY s.title, s.song_id
+"""
+
+ARTIST_PAGE_QUERY = song_card_query(_ARTIST_CATALOG + "LIMIT $limit", artist="a", order_by="s.title, s.song_id")
+
+ARTIST_EXPORT_QUERY = song_card_query(_ARTIST_CATALOG, artist="a", order_by="s.title, s.song_id")
+
+# 인덱스를 만들 수 없을 때 사용하는 기존 CONTAINS 스캔 쿼리
+TITLE_SCAN_QUERY = song_card_query(
+    """
+    MATCH (s:Song)
+    WHERE toLower(s.title) CONTAINS toLower($query)
+    WITH DISTINCT s
+    ORDER BY s.title
+    LIMIT $limit
+    """,
+    order_by="s.title",
+)
+
+ARTIST_SCAN_QUERY = song_card_query(
+    """
+    MATCH (a:Artist)
+    WHERE toLower(a.name) CONTAINS toLower($query)
+    MATCH (a)-[:PERFORMED_BY]-(s:Song)
+    WITH DISTINCT s, a
+    ORDER BY s.title
+    LIMIT $limit
+    """,
+    artist="a",
+    order_by="s.title",
+)
+
+# serving_backend=snapshot일 때 Neo4j 대신 스냅샷으로 답하는 쿼리. 스캔 폴백은 Neo4j로 간다.
+SNAPSHOT_HANDLERS = {
+    TITLE_INDEX_SOURCE: lambda snapshot, p: snapshot.index_source("song", "title"),
+    ARTIST_INDEX_SOURCE: lambda snapshot, p: snapshot.index_source("artist", "name"),
+    SONGS_BY_IDS_QUERY: lambda snapshot, p: snapshot.songs_by_ids(p["song_ids"]),
+    SONG_BY_ID_QUERY: lambda snapshot, p: snapshot.songs_by_ids([p["song_id"]]),
+    SONGS_BY_ARTIST_IDS_QUERY: lambda snapshot, p: snapshot.songs_by_artist_ids(p["artist_ids"], p["limit"]),
+    SONG_IDS_BY_ARTIST_IDS_QUERY: lambda snapshot, p: snapshot.song_ids_by_artist_ids(p["artist_ids"], p["limit"]),
+    SONG_FEATURES_QUERY: lambda snapshot, p: snapshot.song_features(p["song_ids"]),
+    ARTIST_PAGE_QUERY: lambda snapshot, p: snapshot.artist_catalog(
+        p["artist_ids"], p["after_title"], p["after_id"], p["limit"]),
+    ARTIST_EXPORT_QUERY: lambda snapshot, p: snapshot.artist_catalog(p["artist_ids"], p["after_title"], p["after_id"]),
+}
+
+
 class SearchService:
     def __init__(self):
         self.db = get_database()
-    @cache 
-    def search_by_title(self, query: str, limit: int = 10) -> List[SongInfo]:
-        search_query = """
-        MATCH (s:Song)
-        WHERE toLower(s.title) CONTAINS toLower($query)
-        WITH DISTINCT s
-        OPTIONAL MATCH (s)-[:PERFORMED_BY]-(a:Artist)
-        OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
-        OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
-        OPTIONAL MATCH (g)-[:CONTAINS]-(sg:SubGenre)
-        WITH s, 
-             head(collect(DISTINCT a)) as artist,
-             head(collect(DISTINCT g)) as genre,
-             head(collect(DISTINCT al)) as album,
-             head(collect(DISTINCT sg)) as subgenre
-        RETURN s.song_id AS song_id,
-               s.title AS title,
-               s.issue_date AS issue_date,
-               artist.name AS artist_name,
-               artist.artist_id AS artist_id,
-               genre.name AS genre_name,
-               genre.genre_id AS genre_id,
-               album.title AS album_title,
-               album.album_id AS album_id,
-               subgenre.name AS subgenre_name
-        ORDER BY s.title
-        LIMIT $limit
-        """
+        self.adb = get_async_database()
+        self._title_index = None
+        self._artist_index = None
+        self._vector_index = None
+        self._failed: Dict[str, Optional[float]] = {}
+        self._embeddings = None
+        self._backend = None
+        self._index_lock = threading.Lock()
+
+    def _build_index(self, query: str) -> NgramIndex:
+        start_time = time.time()
+        rows = self._rows(query)
+        index = NgramIndex.build((row["key"], row["text"]) for row in rows)
+        logger.info(f"N-gram index built over {len(index)} entries in {time.time() - start_time:.2f}s")
+        return index
+
+    @property
+    def title_index(self) -> NgramIndex:
+        if self._title_index is None:
+            with self._index_lock:
+                if self._title_index is None:
+                    self._title_index = self._build_index(TITLE_INDEX_SOURCE)
+        return self._title_index
+
+    @property
+    def artist_index(self) -> NgramIndex:
+        if self._artist_index is None:
+            with self._index_lock:
+                if self._artist_index is None:
+                    self._artist_index = self._build_index(ARTIST_INDEX_SOURCE)
+        return self._artist_index
+
+    def _load_failed(self, name: str, stamp: Optional[float]) -> bool:
+        """같은 meta mtime에서 이미 로드에 실패한 사전 계산물이면 True. 파일이 새로 쓰이거나 reset()되면 다시 연다."""
+        return name in self._failed and self._failed[name] == stamp
+
+    @property
+    def vector_index(self):
+        """jobs/embeddings.py가 만든 곡 임베딩 IVF 색인. 파일이 없으면 None."""
+        if self._vector_index is None:
+            from src.utils.vector_index import META, VectorIndex
+
+            stamp = meta_stamp(settings.vector_index_path, META)
+            if self._load_failed("vector_index", stamp):
+                return None
+            with self._index_lock:
+                if self._vector_index is None:
+                    if self._load_failed("vector_index", stamp):
+                        return None
+                    try:
+                        self._vector_index = VectorIndex.load(settings.vector_index_path)
+                        logger.info(f"Vector index loaded over {len(self._vector_index)} songs")
+                    except (OSError, ValueError) as e:
+                        self._failed["vector_index"] = stamp
+                        logger.warning(f"Vector index unavailable at {settings.vector_index_path}: {e}")
+                        return None
+        return self._vector_index
+
+    @property
+    def embeddings(self):
+        """질의 임베딩 모델. 테스트에서는 embed_query/aembed_query를 가진 객체로 바꿔 끼운다."""
+        if self._embeddings is None:
+            from langchain_openai import OpenAIEmbeddings
+
+            self._embeddings = OpenAIEmbeddings(
+                model=settings.embedding_model,
+                openai_api_key=settings.openai_api_key,
+            )
+        return self._embeddings
+
+    def _ranked(self, index: NgramIndex) -> NgramIndex:
+        """인기도 테이블이 바뀌었으면 제목 색인의 동점 처리 가중치를 다시 건다."""
+        table = get_popularity_table()
+        if table is not None and index.priors_version != table.version:
+            index.set_priors(table.scores_for(index.keys).tolist(), table.version)
+        return index
+
+    def reset(self) -> None:
+        """그래프가 다시 적재된 뒤 그래프/파일에서 만든 색인을 버린다. 다음 접근에서 새로 만든다."""
+        with self._index_lock:
+            self._title_index = self._artist_index = self._vector_index = None
+            self._failed.clear()
+            self._backend = None
+
+    def build_indexes(self) -> None:
+        self.title_index
+        self.artist_index
+
+    async def _aindex(self, name: str) -> NgramIndex:
+        # 최초 인덱스 빌드는 수 초가 걸리므로 이벤트 루프 밖에서 수행한다.
+        if getattr(self, f"_{name}") is None:
+            return await asyncio.to_thread(getattr, self, name)
+        return getattr(self, name)
+
+    @property
+    def backend(self) -> Optional[SnapshotBackend]:
+        """serving_backend=snapshot이면 Neo4j 대신 읽는 그래프 스냅샷. 아니거나 파일이 없으면 None."""
+        if self._backend is None:
+            snapshot = get_snapshot()
+            if snapshot is not None:
+                self._backend = SnapshotBackend(snapshot, SNAPSHOT_HANDLERS)
+        return self._backend
+
+    def _rows(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterable[Dict[str, Any]]:
+        backend = self.backend
+        if backend is not None and backend.supports(query):
+            return backend.stream(query, params)
+        with timed("neo4j_query"):
+            return self.db.graph.query(query, params=params or {})
+
+    async def _arows(self, query: str, params: Optional[Dict[str, Any]] = None,
+                     timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        # 스냅샷 조회는 프로세스 안의 배열 읽기라서 이벤트 루프에서 바로 처리한다.
+        backend = self.backend
+        if backend is not None and backend.supports(query):
+            return backend.query(query, params)
+        return await self.adb.query(query, params=params, timeout=timeout)
+
+    def _query(self, query: str, params: Dict[str, Any]) -> List[SongRecord]:
+        return SongRecord.from_rows(self._rows(query, params))
+
+    async def _aquery(self, query: str, params: Dict[str, Any], timeout: Optional[float] = None) -> List[SongRecord]:
+        return SongRecord.from_rows(await self._arows(query, params, timeout))
+
+    @cached("search_by_title")
+    def search_by_title(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            song_ids = [key for key, _ in self._ranked(self.title_index).search(query, limit)]
+            songs = self.search_by_song_ids(song_ids)
+            execution_time = time.time() - start_time
+
+            logger.info(f"Title search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Title index search failed, falling back to scan: {e}")
+            return self._scan_by_title(query, limit)
+
+    @cached("search_by_title")
+    async def asearch_by_title(self, query: str, limit: int = 10) -> List[SongRecord]:
         try:
             start_time = time.time()
-            results = self.db.graph.query(search_query, params={"query": query, "limit": limit})
+            index = self._ranked(await self._aindex("title_index"))
+            song_ids = [key for key, _ in index.search(query, limit)]
+            songs = await self.asearch_by_song_ids(song_ids)
             execution_time = time.time() - start_time
-            
-            logger.info(f"Title search for '{query}' returned {len(results)} results in {execution_time:.2f}s")
-            
-            return [SongInfo(**result) for result in results]
+
+            logger.info(f"Title search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Title index search failed, falling back to scan: {e}")
+            try:
+                # 전체 Song 스캔이므로 짧은 트랜잭션 timeout으로 묶는다.
+                return await self._aquery(TITLE_SCAN_QUERY, {"query": query, "limit": limit},
+                                          remaining(settings.neo4j_scan_timeout))
+            except Exception as e:
+                logger.error(f"Error in title search: {e}")
+                return []
+
+    def _scan_by_title(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            songs = self._query(TITLE_SCAN_QUERY, {"query": query, "limit": limit})
+            execution_time = time.time() - start_time
+
+            logger.info(f"Title search for '{query}' returned {len(songs)} results in {execution_time:.2f}s")
+
+            return songs
         except Exception as e:
             logger.error(f"Error in title search: {e}")
             return []
-        
-    @cache
-    def search_by_song_id(self, song_id: str) -> List[SongInfo]:
-        search_query = """
-        MATCH (s:Song {song_id: $song_id})
-        OPTIONAL MATCH (s)-[:PERFORMED_BY]-(a:Artist)
-        OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
-        OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
-        OPTIONAL MATCH (g)-[:CONTAINS]-(sg:SubGenre)
-        WITH s, 
-             head(collect(DISTINCT a)) as artist,
-             head(collect(DISTINCT g)) as genre,
-             head(collect(DISTINCT al)) as album,
-             head(collect(DISTINCT sg)) as subgenre
-        RETURN s.song_id AS song_id,
-               s.title AS title,
-               s.issue_date AS issue_date,
-               artist.name AS artist_name,
-               artist.artist_id AS artist_id,
-               genre.name AS genre_name,
-               genre.genre_id AS genre_id,
-               album.title AS album_title,
-               album.album_id AS album_id,
-               subgenre.name AS subgenre_name
-        """
+
+    @cached("search_by_song_id")
+    def search_by_song_id(self, song_id: str) -> List[SongRecord]:
         try:
             start_time = time.time()
-            results = self.db.graph.query(search_query, params={"song_id": song_id})
+            songs = self._query(SONG_BY_ID_QUERY, {"song_id": song_id})
             execution_time = time.time() - start_time
-            
-            logger.info(f"ID search for '{song_id}' returned {len(results)} results in {execution_time:.4f}s")
-            
-            return [SongInfo(**result) for result in results]
+
+            logger.info(f"ID search for '{song_id}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
         except Exception as e:
             logger.error(f"Error in ID search: {e}")
             return []
-    
-    @cache
-    def search_by_artist(self, query: str, limit: int = 10) -> List[SongInfo]:
+
+    def _split_cached(self, song_ids: List[str]) -> Tuple[Dict[str, List[SongRecord]], List[str]]:
+        cache = self.search_by_song_id.cache()
+        key_for = self.search_by_song_id.key_for
+        found: Dict[str, List[SongRecord]] = {}
+        missing = []
+        with timed("cache_lookup"):
+            for song_id in dict.fromkeys(song_ids):
+                hit = cache.get(key_for(song_id), None)
+                if hit is None:
+                    missing.append(song_id)
+                else:
+                    found[song_id] = hit
+        return found, missing
+
+    def _merge_fetched(self, found: Dict[str, List[SongRecord]], missing: List[str], fetched: List[SongRecord]) -> None:
+        cache = self.search_by_song_id.cache()
+        key_for = self.search_by_song_id.key_for
+        for song_id in missing:
+            found[song_id] = []
+        for song in fetched:
+            found[song.song_id].append(song)
+        for song_id in missing:
+            cache.set(key_for(song_id), found[song_id])
+
+    @staticmethod
+    def _in_input_order(song_ids: List[str], found: Dict[str, List[SongRecord]]) -> List[SongRecord]:
+        songs = []
+        for song_id in song_ids:
+            songs.extend(found.get(song_id, []))
+        return songs
+
+    def search_by_song_ids(self, song_ids: List[str]) -> List[SongRecord]:
+        """여러 song_id를 한 번에 조회한다. 입력 순서를 유지하고 search_by_song_id 캐시를 공유한다."""
+        found, missing = self._split_cached(song_ids)
+        if missing:
+            try:
+                start_time = time.time()
+                fetched = self._query(SONGS_BY_IDS_QUERY, {"song_ids": missing})
+                execution_time = time.time() - start_time
+
+                logger.info(f"Bulk ID search for {len(missing)} ids returned {len(fetched)} results in {execution_time:.4f}s")
+            except Exception as e:
+                logger.error(f"Error in bulk ID search: {e}")
+            else:
+                self._merge_fetched(found, missing, fetched)
+        return self._in_input_order(song_ids, found)
+
+    async def asearch_by_song_ids(self, song_ids: List[str]) -> List[SongRecord]:
+        found, missing = self._split_cached(song_ids)
+        if missing:
+            try:
+                start_time = time.time()
+                fetched = await self._aquery(SONGS_BY_IDS_QUERY, {"song_ids": missing})
+                execution_time = time.time() - start_time
+
+                logger.info(f"Bulk ID search for {len(missing)} ids returned {len(fetched)} results in {execution_time:.4f}s")
+            except Exception as e:
+                logger.error(f"Error in bulk ID search: {e}")
+            else:
+                self._merge_fetched(found, missing, fetched)
+        return self._in_input_order(song_ids, found)
+
+    @cached("search_by_artist")
+    def search_by_artist(self, query: str, limit: int = 10) -> List[SongRecord]:
         """아티스트명으로 검색"""
-        search_query = """
-        MATCH (a:Artist)
-        WHERE toLower(a.name) CONTAINS toLower($query)
-        WITH DISTINCT a
-        OPTIONAL MATCH (a)-[:PERFORMED_BY]-(s:Song)
-        OPTIONAL MATCH (s)-[:HAS_GENRE]-(g:Genre)
-        OPTIONAL MATCH (s)-[:IN_ALBUM]-(al:Album)
-        OPTIONAL MATCH (g)-[:CONTAINS]-(sg:SubGenre)
-        WITH s, a,
-             head(collect(DISTINCT g)) as genre,
-             head(collect(DISTINCT al)) as album,
-             head(collect(DISTINCT sg)) as subgenre
-        WHERE s IS NOT NULL
-        RETURN s.song_id AS song_id,
-               s.title AS title,
-               s.issue_date AS issue_date,
-               a.name AS artist_name,
-               a.artist_id AS artist_id,
-               genre.name AS genre_name,
-               genre.genre_id AS genre_id,
-               album.title AS album_title,
-               album.album_id AS album_id,
-               subgenre.name AS subgenre_name
-        ORDER BY s.title
-        LIMIT $limit
-        """
         try:
             start_time = time.time()
-            results = self.db.graph.query(search_query, params={"query": query, "limit": limit})
+            # 관련도 상위 아티스트부터 곡을 채운다. 아티스트당 곡이 없을 수도 있어 여유분을 둔다.
+            artist_ids = [key for key, _ in self.artist_index.search(query, limit * 2)]
+            if not artist_ids:
+                return []
+            songs = self._query(SONGS_BY_ARTIST_IDS_QUERY, {"artist_ids": artist_ids, "limit": limit})
+            execution_time = time.time() - start_time
+
+            logger.info(f"Artist search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Artist index search failed, falling back to scan: {e}")
+            return self._scan_by_artist(query, limit)
+
+    @cached("search_by_artist")
+    async def asearch_by_artist(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            index = await self._aindex("artist_index")
+            artist_ids = [key for key, _ in index.search(query, limit * 2)]
+            if not artist_ids:
+                return []
+            songs = await self._aquery(SONGS_BY_ARTIST_IDS_QUERY, {"artist_ids": artist_ids, "limit": limit})
+            execution_time = time.time() - start_time
+
+            logger.info(f"Artist search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Artist index search failed, falling back to scan: {e}")
+            try:
+                return await self._aquery(ARTIST_SCAN_QUERY, {"query": query, "limit": limit},
+                                          remaining(settings.neo4j_scan_timeout))
+            except Exception as e:
+                logger.error(f"Error in artist search: {e}")
+                return []
+
+    def _scan_by_artist(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            songs = self._query(ARTIST_SCAN_QUERY, {"query": query, "limit": limit})
             execution_time = time.time() - start_time
-            
-            logger.info(f"Artist search for '{query}' returned {len(results)} results in {execution_time:.2f}s")
-            
-            return [SongInfo(**result) for result in results]
+
+            logger.info(f"Artist search for '{query}' returned {len(songs)} results in {execution_time:.2f}s")
+
+            return songs
         except Exception as e:
             logger.error(f"Error in artist search: {e}")
             return []
 
-    def search(self, request: SearchRequest) -> List[SongInfo]:
+    @cached("search_by_embedding")
+    def search_by_embedding(self, query: str, limit: int = 10) -> List[SongRecord]:
+        """질의 문장을 임베딩해 의미가 가까운 곡을 찾는다."""
+        try:
+            start_time = time.time()
+            index = self.vector_index
+            if index is None:
+                return []
+            vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            song_ids = [key for key, _ in index.search(vector, limit, settings.vector_nprobe)]
+            songs = self.search_by_song_ids(song_ids)
+            execution_time = time.time() - start_time
+
+            logger.info(f"Embedding search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Error in embedding search: {e}")
+            return []
+
+    @cached("search_by_embedding")
+    async def asearch_by_embedding(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            index = await self._aindex("vector_index")
+            if index is None:
+                return []
+            vector = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+            song_ids = [key for key, _ in index.search(vector, limit, settings.vector_nprobe)]
+            songs = await self.asearch_by_song_ids(song_ids)
+            execution_time = time.time() - start_time
+
+            logger.info(f"Embedding search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Error in embedding search: {e}")
+            return []
+
+    @staticmethod
+    def _terms(query: str) -> List[Tuple[str, float]]:
+        """(검색어, 가중치). 질의 전체에 더해, 단어가 여럿이면 2글자 이상인 단어 4개까지를 낮은 가중치로 쓴다.
+
+        n-gram 색인은 질의 전체가 들어 있는 문서만 찾으므로 "아이유 좋은날"처럼 아티스트와 제목을 섞은
+        질의는 단어로 나눠야 양쪽 색인에 걸린다.
+        """
+        words = [word for word in dict.fromkeys(query.split()) if len(word) >= 2][:4]
+        terms = [(query, 1.0)]
+        if len(words) > 1:
+            terms += [(word, settings.hybrid_term_weight) for word in words]
+        return terms
+
+    def _lexical(self, title_index: NgramIndex, artist_index: NgramIndex, query: str, candidates: int) -> Lexical:
+        """제목 색인의 (가중치, song_id 순위) 목록들, 질의에 맞은 아티스트별 관련도(최고 대비 0~1),
+        단어별 (제목이 맞은 곡, 이름이 맞은 아티스트) 집합.
+
+        색인 조회는 메모리 안에서 끝나므로 단어별 집합은 후보 수보다 넓게(hybrid_match_depth) 잡는다.
+        """
+        weight = settings.hybrid_weights.get("title", 1.0)
+        depth = max(candidates, settings.hybrid_match_depth)
+        terms = self._terms(query)
+        rankings = []
+        artists: Dict[str, float] = {}
+        matches = []
+        for term, term_weight in terms:
+            titles = [key for key, _ in title_index.search(term, depth)]
+            rankings.append((weight * term_weight, titles[:candidates]))
+            artist_hits = artist_index.search(term, depth)
+            for key, score in artist_hits:
+                artists[key] = max(artists.get(key, 0.0), term_weight * score)
+            # 단어가 여럿이면 질의 전체 대신 단어별로 맞춘 비율을 본다.
+            if len(terms) == 1 or term_weight < 1.0:
+                matches.append((set(titles), {key for key, _ in artist_hits}))
+        if artists:
+            best = max(artists.values())
+            artists = {key: score / best for key, score in artists.items()}
+        return rankings, artists, matches
+
+    @staticmethod
+    def _artist_params(artists: Dict[str, float], candidates: int) -> Dict[str, Any]:
+        ranked = sorted(artists, key=lambda key: (-artists[key], key))[:candidates]
+        return {"artist_ids": ranked, "limit": candidates}
+
+    @staticmethod
+    def _fuse(fused: Dict[str, float], artists: Dict[str, float], matches: List[Tuple[Set[str], Set[str]]],
+              feature_rows: Iterable[Dict[str, Any]], limit: int) -> List[str]:
+        with timed("hybrid_rerank"):
+            features = {row["song_id"]: row for row in feature_rows}
+            scored = rerank(fused, features, artists, matches, settings.hybrid_features,
+                            settings.hybrid_recency_half_life)
+        return [song_id for song_id, _ in scored[:limit]]
+
+    def _semantic(self, query: str, candidates: int) -> List[str]:
+        # 임베딩 API/색인이 없거나 실패해도 제목/아티스트 후보만으로 답한다.
+        try:
+            index = self.vector_index
+            if index is None:
+                return []
+            vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            return [key for key, _ in index.search(vector, candidates, settings.vector_nprobe)]
+        except Exception as e:
+            logger.warning(f"Embedding candidates unavailable for hybrid search: {e}")
+            return []
+
+    @cached("search_by_hybrid")
+    def search_by_hybrid(self, query: str, limit: int = 10) -> List[SongRecord]:
+        """제목/아티스트/임베딩 후보를 reciprocal-rank fusion으로 합치고 그래프 특징(아티스트 일치, 인기도,
+        발매일)으로 재순위한 뒤 상위 limit개만 상세를 읽는다. async 버전은 세 방식을 동시에 조회한다."""
+        try:
+            start_time = time.time()
+            candidates = max(limit, settings.hybrid_candidates)
+            rankings, artists, matches = self._lexical(self._ranked(self.title_index), self.artist_index, query,
+                                                       candidates)
+            if artists:
+                rows = self._rows(SONG_IDS_BY_ARTIST_IDS_QUERY, self._artist_params(artists, candidates))
+                rankings.append((settings.hybrid_weights.get("artist", 1.0), [row["song_id"] for row in rows]))
+            rankings.append((settings.hybrid_weights.get("embedding", 1.0), self._semantic(query, candidates)))
+            fused = reciprocal_rank_fusion(rankings, settings.hybrid_rrf_k)
+            song_ids = list(fused)
+            feature_rows = self._rows(SONG_FEATURES_QUERY, {"song_ids": song_ids}) if song_ids else []
+            songs = self.search_by_song_ids(self._fuse(fused, artists, matches, feature_rows, limit))
+            execution_time = time.time() - start_time
+
+            logger.info(f"Hybrid search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Error in hybrid search: {e}")
+            return []
+
+    async def _asemantic(self, query: str, candidates: int) -> List[str]:
+        try:
+            index = await self._aindex("vector_index")
+            if index is None:
+                return []
+            vector = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+            return [key for key, _ in index.search(vector, candidates, settings.vector_nprobe)]
+        except Exception as e:
+            logger.warning(f"Embedding candidates unavailable for hybrid search: {e}")
+            return []
+
+    async def _alexical(self, query: str, candidates: int) -> Lexical:
+        title_index = self._ranked(await self._aindex("title_index"))
+        artist_index = await self._aindex("artist_index")
+        rankings, artists, matches = self._lexical(title_index, artist_index, query, candidates)
+        if artists:
+            rows = await self._arows(SONG_IDS_BY_ARTIST_IDS_QUERY, self._artist_params(artists, candidates))
+            rankings.append((settings.hybrid_weights.get("artist", 1.0), [row["song_id"] for row in rows]))
+        return rankings, artists, matches
+
+    @cached("search_by_hybrid")
+    async def asearch_by_hybrid(self, query: str, limit: int = 10) -> List[SongRecord]:
+        try:
+            start_time = time.time()
+            candidates = max(limit, settings.hybrid_candidates)
+            # 질의 임베딩(네트워크)을 기다리는 동안 제목/아티스트 후보를 만든다.
+            (rankings, artists, matches), semantic = await asyncio.gather(
+                self._alexical(query, candidates), self._asemantic(query, candidates)
+            )
+            rankings.append((settings.hybrid_weights.get("embedding", 1.0), semantic))
+            fused = reciprocal_rank_fusion(rankings, settings.hybrid_rrf_k)
+            song_ids = list(fused)
+            feature_rows = await self._arows(SONG_FEATURES_QUERY, {"song_ids": song_ids}) if song_ids else []
+            songs = await self.asearch_by_song_ids(self._fuse(fused, artists, matches, feature_rows, limit))
+            execution_time = time.time() - start_time
+
+            logger.info(f"Hybrid search for '{query}' returned {len(songs)} results in {execution_time:.4f}s")
+
+            return songs
+        except Exception as e:
+            logger.error(f"Error in hybrid search: {e}")
+            return []
+
+    def _page_artist_ids(self, index: NgramIndex, query: str) -> List[str]:
+        # 페이지마다 같은 아티스트 집합을 써야 하므로 limit과 무관한 고정 개수를 쓴다.
+        return [key for key, _ in index.search(query, settings.search_page_artists)]
+
+    @staticmethod
+    def _artist_catalog_params(artist_ids: List[str], after: Optional[Tuple[str, str]]) -> Dict[str, Any]:
+        after_title, after_id = after or (None, None)
+        return {"artist_ids": artist_ids, "after_title": after_title, "after_id": after_id}
+
+    @staticmethod
+    def _next_cursor(last: Optional[Tuple[str, str]], count: int, limit: int) -> Optional[str]:
+        return encode_cursor(*last) if last is not None and count == limit else None
+
+    @cached("search_title_page", exact=("cursor",))
+    def search_title_page(self, query: str, limit: int = 10,
+                          cursor: Optional[str] = None) -> Tuple[List[SongRecord], Optional[str]]:
+        """제목 검색 결과를 (정규화된 제목, song_id) 순으로 한 페이지씩 읽는다. (곡 목록, 다음 커서)를 반환한다."""
+        after = decode_cursor(cursor)
+        try:
+            pairs = self.title_index.ordered(query, after, limit)
+            songs = self.search_by_song_ids([key for _, key in pairs])
+            return songs, self._next_cursor(pairs[-1] if pairs else None, len(pairs), limit)
+        except Exception as e:
+            logger.error(f"Error in paged title search: {e}")
+            return [], None
+
+    @cached("search_title_page", exact=("cursor",))
+    async def asearch_title_page(self, query: str, limit: int = 10,
+                                 cursor: Optional[str] = None) -> Tuple[List[SongRecord], Optional[str]]:
+        after = decode_cursor(cursor)
+        try:
+            index = await self._aindex("title_index")
+            pairs = index.ordered(query, after, limit)
+            songs = await self.asearch_by_song_ids([key for _, key in pairs])
+            return songs, self._next_cursor(pairs[-1] if pairs else None, len(pairs), limit)
+        except Exception as e:
+            logger.error(f"Error in paged title search: {e}")
+            return [], None
+
+    @cached("search_artist_page", exact=("cursor",))
+    def search_artist_page(self, query: str, limit: int = 10,
+                           cursor: Optional[str] = None) -> Tuple[List[SongRecord], Optional[str]]:
+        """매칭된 아티스트들의 곡을 (title, song_id) 순으로 한 페이지씩 읽는다."""
+        after = decode_cursor(cursor)
+        try:
+            artist_ids = self._page_artist_ids(self.artist_index, query)
+            if not artist_ids:
+                return [], None
+            songs = self._query(ARTIST_PAGE_QUERY, {**self._artist_catalog_params(artist_ids, after), "limit": limit})
+            last = (songs[-1].title, songs[-1].song_id) if songs else None
+            return songs, self._next_cursor(last, len(songs), limit)
+        except Exception as e:
+            logger.error(f"Error in paged artist search: {e}")
+            return [], None
+
+    @cached("search_artist_page", exact=("cursor",))
+    async def asearch_artist_page(self, query: str, limit: int = 10,
+                                  cursor: Optional[str] = None) -> Tuple[List[SongRecord], Optional[str]]:
+        after = decode_cursor(cursor)
+        try:
+            artist_ids = self._page_artist_ids(await self._aindex("artist_index"), query)
+            if not artist_ids:
+                return [], None
+            songs = await self._aquery(ARTIST_PAGE_QUERY, {**self._artist_catalog_params(artist_ids, after), "limit": limit})
+            last = (songs[-1].title, songs[-1].song_id) if songs else None
+            return songs, self._next_cursor(last, len(songs), limit)
+        except Exception as e:
+            logger.error(f"Error in paged artist search: {e}")
+            return [], None
+
+    async def aexport(self, search_type: str, query: str) -> AsyncIterator[SongRecord]:
+        """검색 결과 전체를 (title, song_id) 순으로 흘려보낸다. 캐시를 거치지 않고 목록을 모으지 않는다.
+
+        제목은 색인에서 정렬한 id를 export_batch_size개씩 hydrate하고, 아티스트는 Neo4j 결과를
+        레코드 단위로 그대로 넘긴다.
+        """
+        if search_type == "title":
+            index = await self._aindex("title_index")
+            song_ids = [key for _, key in index.ordered(query)]
+            for start in range(0, len(song_ids), settings.export_batch_size):
+                batch = song_ids[start:start + settings.export_batch_size]
+                for song in await self._aquery(SONGS_BY_IDS_QUERY, {"song_ids": batch}):
+                    yield song
+        elif search_type == "artist":
+            artist_ids = self._page_artist_ids(await self._aindex("artist_index"), query)
+            if not artist_ids:
+                return
+            params = self._artist_catalog_params(artist_ids, None)
+            backend = self.backend
+            if backend is not None:
+                for row in backend.stream(ARTIST_EXPORT_QUERY, params):
+                    song = SongRecord.from_row(row)
+                    if song is not None:
+                        yield song
+                return
+            async for row in self.adb.stream(ARTIST_EXPORT_QUERY, params, timeout=settings.export_query_timeout):
+                song = SongRecord.from_row(row)
+                if song is not None:
+                    yield song
+        else:
+            raise ValueError(f"Export is not supported for search type: {search_type}")
+
+    def search_page(self, request: SearchRequest) -> Tuple[List[SongRecord], Optional[str]]:
+        if request.search_type == "title":
+            return self.search_title_page(request.query, request.limit, request.cursor)
+        elif request.search_type == "artist":
+            return self.search_artist_page(request.query, request.limit, request.cursor)
+        else:
+            raise ValueError(f"Pagination is not supported for search type: {request.search_type}")
+
+    async def asearch_page(self, request: SearchRequest) -> Tuple[List[SongRecord], Optional[str]]:
+        if request.search_type == "title":
+            return await self.asearch_title_page(request.query, request.limit, request.cursor)
+        elif request.search_type == "artist":
+            return await self.asearch_artist_page(request.query, request.limit, request.cursor)
+        else:
+            raise ValueError(f"Pagination is not supported for search type: {request.search_type}")
+
+    def search(self, request: SearchRequest) -> List[SongRecord]:
         if request.search_type == "title":
             return self.search_by_title(request.query, request.limit)
         elif request.search_type == "artist":
             return self.search_by_artist(request.query, request.limit)
+        elif request.search_type == "embedding":
+            return self.search_by_embedding(request.query, request.limit)
+        elif request.search_type == "hybrid":
+            return self.search_by_hybrid(request.query, request.limit)
+        else:
+            raise ValueError(f"Unsupported search type: {request.search_type}")
+
+    async def asearch(self, request: SearchRequest) -> List[SongRecord]:
+        if request.search_type == "title":
+            return await self.asearch_by_title(request.query, request.limit)
+        elif request.search_type == "artist":
+            return await self.asearch_by_artist(request.query, request.limit)
+        elif request.search_type == "embedding":
+            return await self.asearch_by_embedding(request.query, request.limit)
+        elif request.search_type == "hybrid":
+            return await self.asearch_by_hybrid(request.query, request.limit)
         else:
             raise ValueError(f"Unsupported search type: {request.search_type}")
 
-search_service = SearchService()
\ No newline at end of file
+
+@lru_cache()
+def get_search_service() -> SearchService:
+    """워커당 하나. 생성자는 가볍고 색인/연결은 처음 쓸 때 만든다."""
+    return SearchService()
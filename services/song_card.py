@@ -0,0 +1,46 @@
+# src/services/song_card.py - 모든 서비스가 공유하는 곡 상세(SongInfo) hydration 단계
+from typing import Optional, Sequence
+import textwrap
+
+# 패턴 컴프리헨션은 곡마다 관계를 따로 펼치므로, OPTIONAL MATCH 네 번을 잇달아
+# 쓸 때처럼 아티스트×장르×앨범×서브장르 카티션 곱을 만든 뒤 버리지 않는다.
+# SubGenre는 곡에 직접 연결된 경우만 쓴다. Genre를 거쳐 CONTAINS로 가면 그 장르의
+# 서브장르 중 아무거나 잡히기 때문이다.
+_CARD = """
+WITH {carry}s,
+     {artist} AS artist,
+     head([(s)-[:HAS_GENRE]-(card_g:Genre) | card_g]) AS genre,
+     head([(s)-[:IN_ALBUM]-(card_al:Album) | card_al]) AS album,
+     head([(s)-[:HAS_GENRE]-(card_sg:SubGenre) | card_sg.name]) AS subgenre_name
+RETURN s.song_id AS song_id,
+       s.title AS title,
+       s.issue_date AS issue_date,
+       artist.name AS artist_name,
+       artist.artist_id AS artist_id,
+       genre.name AS genre_name,
+       genre.genre_id AS genre_id,
+       album.title AS album_title,
+       album.album_id AS album_id,
+       subgenre_name{returns}
+"""
+
+_FIRST_ARTIST = "head([(s)-[:PERFORMED_BY]-(card_a:Artist) | card_a])"
+
+
+def song_card_query(match: str, carry: Sequence[str] = (), artist: Optional[str] = None,
+                    order_by: Optional[str] = None, returns: Sequence[str] = ()) -> str:
+    """곡을 `s`로 찾는 match 절 뒤에 공통 hydration을 붙인다.
+
+    carry는 정렬에 쓸 변수(idx, rank 등), artist는 match에서 이미 찾은 아티스트
+    변수명이다. 없으면 곡의 첫 아티스트를 쓴다. LIMIT은 match 쪽에 두어야
+    잘라낸 곡만 hydrate한다. returns에 준 carry 변수는 같은 이름의 컬럼으로 함께 반환한다.
+    """
+    card = _CARD.format(
+        carry="".join(f"{name}, " for name in carry),
+        artist=artist or _FIRST_ARTIST,
+        returns="".join(f",\n       {name}" for name in returns),
+    )
+    query = textwrap.dedent(match).strip() + "\n" + card.strip()
+    if order_by:
+        query += f"\nORDER BY {order_by}"
+    return query + "\n"
@@ -0,0 +1,66 @@
+# src/services/warmup.py - 워커가 요청을 받기 시작한 뒤 백그라운드에서 색인/사전 계산물/캐시를 미리 올린다
+from typing import Any, Callable, Dict, List, Tuple
+import asyncio
+import logging
+import time
+
+from src.core.config import settings
+from src.services.rag_service import RAGService
+from src.services.recommendation_service import RecommendationService
+from src.services.search_service import SearchService
+from src.utils.cache import invalidate_all
+from src.utils.metrics import WARMUP_SECONDS
+from src.utils.snapshot import get_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _steps(search: SearchService, recommendation: RecommendationService,
+           rag: RAGService) -> List[Tuple[str, Callable[[], Any]]]:
+    return [
+        ("snapshot", lambda: search.backend),
+        ("title_index", lambda: search.title_index),
+        ("artist_index", lambda: search.artist_index),
+        ("vector_index", lambda: search.vector_index),
+        ("cooccurrence", lambda: recommendation.cooccurrence),
+        ("genre_pools", lambda: recommendation.genre_pools),
+        # 보존 기간의 이벤트 로그를 다시 읽어 사용자 프로필을 만든다.
+        ("user_profiles", lambda: recommendation.profiles),
+        ("rag_matcher", lambda: rag.matcher),
+        ("rag_chain", lambda: rag.cypher_chain),
+        # 인기곡 상세를 곡 캐시에 올려 둔다. 첫 화면과 추천 hydrate가 가장 자주 읽는 곡들이다.
+        ("popular_songs", lambda: recommendation.get_popular_songs(settings.warm_up_popular)),
+    ]
+
+
+def reset_graph_state(search: SearchService, recommendation: RecommendationService, rag: RAGService) -> None:
+    """적재 잡이 그래프 버전을 올린 뒤 부른다. 그래프에서 만든 캐시/색인/사전 계산물을 모두 버리므로
+    다음 접근이나 이어서 도는 warm_up()이 새 그래프와 새 파일로 다시 만든다.
+    """
+    invalidate_all()
+    get_snapshot.cache_clear()
+    search.reset()
+    recommendation.reset()
+    rag.reset()
+
+
+async def warm_up(search: SearchService, recommendation: RecommendationService,
+                  rag: RAGService) -> Dict[str, float]:
+    """단계를 순서대로 스레드에서 실행하고 단계별 시간(초)을 반환한다.
+
+    실패한 단계는 경고만 남기고 건너뛴다. 그 자원은 첫 요청에서 평소처럼 지연 생성된다.
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    for name, step in _steps(search, recommendation, rag):
+        step_start = time.perf_counter()
+        try:
+            await asyncio.to_thread(step)
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - step_start
+        WARMUP_SECONDS.set(timings[name], step=name)
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.1f}s: "
+                + " ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items()))
+    return timings
@@ -0,0 +1,15 @@
+# src/tests/conftest.py - 저장소를 src 패키지로 불러온다
+# 실행: python -m pytest -q tests
+# 코드는 src.*로 서로를 import하므로, 체크아웃 디렉터리 이름과 무관하게 이 저장소를 src로 등록한다.
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "src" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("src", os.path.join(ROOT, "__init__.py"),
+                                                  submodule_search_locations=[ROOT])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["src"] = module
+    spec.loader.exec_module(module)
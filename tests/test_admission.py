@@ -0,0 +1,120 @@
+# src/tests/test_admission.py - 처리 용량의 몇 배가 몰려도 들어간 요청의 지연은 묶이고 나머지는 빨리 거절되는지
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.api.main import app
+from src.bench.admission import SlowBackend, run
+from src.bench.cooccurrence import _percentile
+from src.bench.suite import MemoryAsyncDatabase, StubChatModel, setup_services
+from src.bench.synthetic import synthetic_graph
+from src.core.config import settings
+from src.services.rag_service import RAGService
+from src.services.search_service import get_search_service
+from src.utils import admission
+from src.utils.admission import AdmissionGate, Overloaded
+
+CAPACITY = 4
+SERVICE = 0.02
+WAIT = 0.2
+DEADLINE = 0.3
+SLACK = 0.1  # 이벤트 루프 스케줄링 여유
+
+
+@pytest.mark.parametrize("load", [2.0, 4.0])
+def test_admitted_latency_is_bounded_under_overload(load):
+    backend = SlowBackend(CAPACITY, SERVICE, 0.3, seed=1)
+    gate = AdmissionGate("load", CAPACITY, CAPACITY * 4, WAIT, DEADLINE)
+    result = asyncio.run(run(backend, gate, CAPACITY / SERVICE * load, 1.0, 0.0, 30.0, seed=1))
+    outcomes = result["outcomes"]
+    assert outcomes["ok"] > 0
+    assert outcomes["queue_full"] + outcomes["queue_timeout"] > 0
+    assert _percentile(result["latencies"], 0.99) <= WAIT + DEADLINE + SLACK
+    # 거절도 빨라야 한다. 줄에서 WAIT 넘게 붙잡히는 요청은 없다.
+    assert max(result["every"]) <= WAIT + DEADLINE + SLACK
+
+
+class SlowSearch:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    async def asearch(self, request):
+        await asyncio.sleep(self.seconds)
+        return []
+
+
+@pytest.fixture
+def title_gate(monkeypatch):
+    gate = AdmissionGate("title", 2, 4, WAIT, DEADLINE)
+    monkeypatch.setitem(admission._gates, "title", gate)
+    yield gate
+    app.dependency_overrides.clear()
+
+
+async def burst(requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def one():
+            start = time.perf_counter()
+            response = await client.post("/api/search", json={"query": "a", "search_type": "title"})
+            return response, time.perf_counter() - start
+
+        return await asyncio.gather(*[one() for _ in range(requests)])
+
+
+def test_excess_requests_get_429_or_503_with_retry_after(title_gate):
+    app.dependency_overrides[get_search_service] = lambda: SlowSearch(0.1)
+    results = asyncio.run(burst(40))
+    statuses = [response.status_code for response, _ in results]
+    assert set(statuses) <= {200, 429, 503}
+    assert statuses.count(200) >= 2
+    assert statuses.count(429) >= 40 - 2 - 4
+    for response, _ in results:
+        if response.status_code != 200:
+            assert int(response.headers["Retry-After"]) >= 1
+            assert response.json()["reason"] in ("queue_full", "queue_timeout")
+    admitted = [elapsed for response, elapsed in results if response.status_code == 200]
+    assert _percentile(admitted, 0.99) <= WAIT + DEADLINE + SLACK
+
+
+def test_requests_past_the_deadline_get_503(title_gate):
+    app.dependency_overrides[get_search_service] = lambda: SlowSearch(5.0)
+    start = time.perf_counter()
+    (response, _), = asyncio.run(burst(1))
+    assert time.perf_counter() - start <= DEADLINE + SLACK
+    assert response.status_code == 503
+    assert response.json()["reason"] == "deadline"
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.fixture(scope="module")
+def rag():
+    search, _, _, memory = setup_services(synthetic_graph(0.002, 3), "memory", False, 16, 0.0, {})
+    return RAGService(llm=StubChatModel(), graph=memory, adb=MemoryAsyncDatabase(memory), search=search)
+
+
+@pytest.mark.parametrize("reason, degraded", [("queue_full", True), ("queue_timeout", True), ("deadline", False)])
+def test_chat_and_stream_share_the_degrade_policy(rag, monkeypatch, reason, degraded):
+    gate = AdmissionGate("rag", 1, 1, WAIT, DEADLINE)
+    monkeypatch.setitem(admission._gates, "rag", gate)
+
+    async def rejected(factory):
+        raise gate.reject(reason)
+
+    monkeypatch.setattr(gate, "run", rejected)
+    monkeypatch.setattr(settings, "rag_degrade", True)
+    if degraded:
+        _, _, was_degraded = asyncio.run(rag.aquery_admitted("신나는 노래"))
+        assert was_degraded
+    else:
+        with pytest.raises(Overloaded):
+            asyncio.run(rag.aquery_admitted("신나는 노래"))
+
+
+def test_degraded_fallback_search_has_its_own_stage(rag):
+    before = dict(rag.stats.stage_seconds)
+    asyncio.run(rag.adegraded("전혀 없는 제목 zzqx"))
+    assert rag.stats.stage_seconds["fallback_search"] > before["fallback_search"]
+    assert rag.stats.stage_seconds["graph"] == before["graph"]
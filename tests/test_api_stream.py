@@ -0,0 +1,104 @@
+# src/tests/test_api_stream.py - /api/search/stream의 SSE 이벤트 순서와 곡 목록이 답변보다 먼저 나가는지
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.api.main as main
+from src.api.main import app
+from src.bench.suite import MemoryAsyncDatabase, StubChatModel, setup_services
+from src.bench.synthetic import synthetic_graph
+from src.services.rag_service import RAGService
+from src.services.search_service import get_search_service
+from src.utils.cache import invalidate_all
+
+TOKEN_DELAY = 0.02
+
+
+class TimedChatModel(StubChatModel):
+    """답변 토큰을 낼 때마다 시각을 적는 스트리밍 stub LLM."""
+
+    token_times: list = []
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            self.token_times.append(time.perf_counter())
+            yield chunk
+
+
+class Stamped:
+    """앱이 응답 본문 조각을 내보낸 시각을 적는 ASGI 래퍼. TestClient는 본문을 모아서 돌려주기 때문이다."""
+
+    def __init__(self, app):
+        self.app = app
+        self.chunks = []
+
+    async def __call__(self, scope, receive, send):
+        async def stamped(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                self.chunks.append((time.perf_counter(), message["body"]))
+            await send(message)
+
+        await self.app(scope, receive, stamped)
+
+
+def parse_events(chunks):
+    events = []
+    for at, body in chunks:
+        for block in body.decode().split("\n\n"):
+            if block.strip():
+                lines = dict(line.split(": ", 1) for line in block.splitlines())
+                events.append((at, lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture(scope="module")
+def services():
+    search, _, _, memory = setup_services(synthetic_graph(0.002, 11), "memory", False, 16, 0.0, {})
+    rag = RAGService(llm=TimedChatModel(token_delay=TOKEN_DELAY), graph=memory, adb=MemoryAsyncDatabase(memory),
+                     search=search)
+    return search, rag
+
+
+@pytest.fixture
+def client(services, monkeypatch):
+    search, rag = services
+    invalidate_all()
+    rag.llm.token_times.clear()
+    app.dependency_overrides[get_search_service] = lambda: search
+    # RAG 서비스는 rag 검색일 때만 핸들러 안에서 만들어지므로 의존성 대신 팩토리를 바꾼다.
+    monkeypatch.setattr(main, "get_rag_service", lambda: rag)
+    stamped = Stamped(app)
+    # with 블록 없이 쓰므로 startup(예열, 백그라운드 작업)은 돌지 않는다.
+    yield TestClient(stamped), stamped
+    app.dependency_overrides.clear()
+
+
+def test_rag_stream_sends_songs_before_the_answer_finishes(client, services):
+    http, stamped = client
+    _, rag = services
+    response = http.post("/api/search/stream", json={"query": "신나는 노래 10곡", "search_type": "rag"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(stamped.chunks)
+    names = [name for _, name, _ in events]
+    assert names[0] == "songs"
+    assert names[-1] == "done"
+    assert set(names[1:-1]) == {"token"} and len(names) > 3
+    assert events[0][2], "songs event should carry the hydrated songs"
+    assert events[-1][2]["path"] == "llm"
+
+    tokens = rag.llm.token_times
+    assert tokens
+    # 곡 목록은 답변의 첫 토큰이 나오기도 전에 이미 클라이언트 쪽으로 나갔다.
+    assert events[0][0] < tokens[0] < tokens[-1]
+    assert tokens[-1] - events[0][0] >= TOKEN_DELAY * (len(tokens) - 1)
+
+
+def test_search_stream_sends_songs_then_done(client):
+    http, stamped = client
+    response = http.post("/api/search/stream", json={"query": "a", "search_type": "title"})
+    assert response.status_code == 200
+    assert [name for _, name, _ in parse_events(stamped.chunks)] == ["songs", "done"]
@@ -0,0 +1,87 @@
+# src/tests/test_artifacts.py - 사전 계산물 로드 실패를 기억하고 파일이 새로 쓰이면 다시 여는지
+import logging
+import os
+
+import pytest
+
+from src.core.config import settings
+from src.jobs.cooccurrence import build_index
+from src.services.recommendation_service import RecommendationService
+from src.services.search_service import SearchService
+from src.utils.cooccurrence import CooccurrenceIndex
+
+PLAYLISTS = [("p1", "s1"), ("p1", "s2"), ("p2", "s1"), ("p2", "s2"), ("p2", "s3")]
+
+
+@pytest.fixture
+def recommendation(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "event_log_path", str(tmp_path / "events"))
+    return RecommendationService(search=SearchService())
+
+
+def count_loads(monkeypatch, cls):
+    calls = []
+    load = cls.load.__func__
+
+    def counting(klass, path):
+        calls.append(path)
+        return load(klass, path)
+
+    monkeypatch.setattr(cls, "load", classmethod(counting))
+    return calls
+
+
+def test_missing_cooccurrence_is_remembered_until_the_file_appears(recommendation, tmp_path, monkeypatch, caplog):
+    path = str(tmp_path / "cooccurrence")
+    monkeypatch.setattr(settings, "cooccurrence_path", path)
+    calls = count_loads(monkeypatch, CooccurrenceIndex)
+
+    with caplog.at_level(logging.WARNING):
+        assert recommendation.cooccurrence is None
+        assert recommendation.cooccurrence is None
+    assert len(calls) == 1
+    assert sum("Co-occurrence index unavailable" in record.message for record in caplog.records) == 1
+
+    build_index(PLAYLISTS).save(path)
+    assert recommendation.cooccurrence is not None
+    assert len(calls) == 2
+
+    recommendation.reset()
+    os.remove(os.path.join(path, "meta.json"))
+    assert recommendation.cooccurrence is None
+    assert len(calls) == 3
+
+
+def test_missing_vector_index_is_remembered_until_the_file_appears(tmp_path, monkeypatch):
+    from src.bench.suite import _vector_index
+    from src.bench.synthetic import synthetic_graph
+    from src.utils.vector_index import VectorIndex
+
+    path = str(tmp_path / "vectors")
+    monkeypatch.setattr(settings, "vector_index_path", path)
+    calls = count_loads(monkeypatch, VectorIndex)
+    search = SearchService()
+
+    assert search.vector_index is None
+    assert search.vector_index is None
+    assert len(calls) == 1
+
+    _vector_index(synthetic_graph(0.001, 1), 8).save(path)
+    assert search.vector_index is not None
+    assert len(calls) == 2
+
+
+def test_missing_genre_pools_are_remembered_until_the_file_appears(recommendation, tmp_path, monkeypatch):
+    from src.utils.genre_pool import GenrePools
+
+    path = str(tmp_path / "genre_pools")
+    monkeypatch.setattr(settings, "genre_pool_path", path)
+    calls = count_loads(monkeypatch, GenrePools)
+
+    assert recommendation.genre_pools is None
+    assert recommendation.genre_pools is None
+    assert len(calls) == 1
+
+    GenrePools.build([("g1", "s1", 3), ("g1", "s2", 1), ("g2", "s3", 2)]).save(path)
+    assert recommendation.genre_pools is not None
+    assert len(calls) == 2
@@ -0,0 +1,90 @@
+# src/tests/test_cache.py - RedisCache의 JSON 직렬화와 Redis 장애 시 동작
+import pickle
+
+import pytest
+
+from src.models.records import ScoredSongRecord, SongRecord
+from src.utils.cache import MemoryCache, RedisCache, _caches, invalidate_all
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.data) if key.startswith(prefix)]
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis is down")
+        return fail
+
+
+def song(song_id, title="t"):
+    return SongRecord(song_id=song_id, title=title, artist_name="a")
+
+
+def test_redis_values_round_trip_as_json():
+    client = DictRedis()
+    cache = RedisCache("ns", client, ttl=60)
+    songs = [song("1"), song("2", "두 번째")]
+    page = (songs, "cursor")
+    cache.set("ns:songs", songs)
+    cache.set("ns:page", page)
+    cache.set("ns:scored", [ScoredSongRecord.scored(songs[0], 0.5)])
+    cache.set("ns:plan", "MATCH (s) RETURN s")
+
+    assert cache.get("ns:songs") == songs
+    assert cache.get("ns:page") == page
+    assert cache.get("ns:scored")[0].score == 0.5
+    assert cache.get("ns:plan") == "MATCH (s) RETURN s"
+    assert all(not payload.startswith(b"\x80") for payload in client.data.values())
+
+
+def test_redis_ignores_pickle_payloads():
+    client = DictRedis()
+    cache = RedisCache("ns", client, ttl=60)
+    client.data["stunes:cache:ns:k"] = pickle.dumps(["x"])
+    assert cache.get("ns:k", None) is None
+    assert cache.stats.misses == 1
+
+
+def test_redis_outage_degrades_and_invalidate_all_clears_memory_tiers():
+    down = RedisCache("down", DownRedis(), ttl=60)
+    memory = MemoryCache("memory", 10, None)
+    memory.set("memory:k", 1)
+    assert down.get("down:k", None) is None
+    down.set("down:k", 1)
+    down.delete("down:k")
+    down.clear()
+    assert len(down) == 0
+
+    saved = dict(_caches)
+    _caches.clear()
+    _caches.update({"down": down, "memory": memory})
+    try:
+        invalidate_all()
+    finally:
+        _caches.clear()
+        _caches.update(saved)
+    assert len(memory) == 0
+
+
+@pytest.mark.parametrize("value", [[], (None, None), {"a": [1, 2]}])
+def test_plain_values_round_trip(value):
+    cache = RedisCache("ns", DictRedis(), ttl=None)
+    cache.set("ns:v", value)
+    assert cache.get("ns:v") == value
@@ -0,0 +1,56 @@
+# src/tests/test_database.py - 잡과 함께 쓰는 동기 그래프 연결에는 요청 마감이 걸리지 않는지
+import asyncio
+
+import src.core.database as database
+from src.core.config import settings
+from src.utils.admission import AdmissionGate
+
+
+class RecordingGraph:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_sync_graph_has_no_transaction_timeout(monkeypatch):
+    monkeypatch.setattr(database, "Neo4jGraph", RecordingGraph)
+    monkeypatch.setattr(database.DatabaseManager, "_load_schema", staticmethod(lambda graph: None))
+    graph = database.DatabaseManager().graph
+    assert "timeout" not in graph.kwargs
+
+
+def test_async_queries_take_the_request_deadline(monkeypatch):
+    timeouts = []
+
+    class Result:
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            raise StopAsyncIteration
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def run(self, query, params):
+            timeouts.append(query.timeout)
+            return Result()
+
+    class Driver:
+        def session(self):
+            return Session()
+
+    db = database.AsyncDatabaseManager()
+    db._driver = Driver()
+
+    async def scenario():
+        await db.query("RETURN 1")
+        async with AdmissionGate("test", 1, 1, 1.0, 0.5).admit():
+            await db.query("RETURN 1")
+
+    asyncio.run(scenario())
+    assert timeouts[0] == settings.neo4j_query_timeout
+    assert 0 < timeouts[1] <= 0.5
@@ -0,0 +1,97 @@
+# src/tests/test_fusion.py - RRF 가중치/동점, 특징 재순위, 질의 단어 coverage, 발매일 감쇠
+from datetime import date
+
+import pytest
+
+from src.utils.fusion import reciprocal_rank_fusion, recency, rerank
+
+TODAY = date(2024, 1, 1)
+WEIGHTS = {"coverage": 0.5, "artist": 0.3, "popularity": 0.2, "recency": 0.1}
+
+
+def feature(issue_date="20240101", popularity=0, artist_ids=()):
+    return {"issue_date": issue_date, "popularity": popularity, "artist_ids": list(artist_ids)}
+
+
+def test_rrf_sums_weight_over_k_plus_rank():
+    scores = reciprocal_rank_fusion([(1.0, ["a", "b"]), (2.0, ["b", "c"])], k=60)
+    assert scores["a"] == pytest.approx(1 / 61)
+    assert scores["b"] == pytest.approx(1 / 62 + 2 / 61)
+    assert scores["c"] == pytest.approx(2 / 62)
+    assert max(scores, key=scores.get) == "b"
+
+
+def test_rrf_weight_decides_between_lists():
+    lexical, semantic = ["x", "y"], ["y", "x"]
+    scores = reciprocal_rank_fusion([(1.0, lexical), (0.5, semantic)])
+    assert scores["x"] > scores["y"]
+    scores = reciprocal_rank_fusion([(0.5, lexical), (1.0, semantic)])
+    assert scores["y"] > scores["x"]
+    assert reciprocal_rank_fusion([(0.0, lexical)]) == {"x": 0.0, "y": 0.0}
+
+
+def test_rrf_mirrored_lists_tie():
+    scores = reciprocal_rank_fusion([(1.0, ["a", "b"]), (1.0, ["b", "a"])])
+    assert scores["a"] == pytest.approx(scores["b"])
+    assert reciprocal_rank_fusion([]) == {}
+
+
+def test_rerank_without_features_keeps_fused_order_and_breaks_ties_by_id():
+    fused = {"b": 0.02, "c": 0.01, "a": 0.02}
+    ranked = rerank(fused, {}, {}, [], WEIGHTS, 10, TODAY)
+    assert ranked == [("a", 1.0), ("b", 1.0), ("c", 0.5)]
+    assert rerank({}, {}, {}, [], WEIGHTS, 10, TODAY) == []
+
+
+def test_rerank_features_lift_popular_recent_matched_artist_songs():
+    fused = {"old": 0.020, "new": 0.019}
+    features = {
+        "old": feature("19900101", popularity=1, artist_ids=["a1"]),
+        "new": feature("20231201", popularity=100, artist_ids=["a2"]),
+    }
+    ranked = rerank(fused, features, {"a2": 1.0}, [], WEIGHTS, 10, TODAY)
+    assert [song_id for song_id, _ in ranked] == ["new", "old"]
+    # 가중치가 0이면 특징은 점수에 영향을 주지 않는다.
+    flat = rerank(fused, features, {"a2": 1.0}, [], {}, 10, TODAY)
+    assert [song_id for song_id, _ in flat] == ["old", "new"]
+    assert flat[0][1] == 1.0
+
+
+def test_rerank_artist_uses_the_best_matching_artist():
+    features = {"s": feature(artist_ids=["a1", "a2", "a3"])}
+    (_, score), = rerank({"s": 1.0}, features, {"a1": 0.2, "a3": 0.9}, [], {"artist": 1.0}, 10, TODAY)
+    assert score == pytest.approx(1.0 + 0.9)
+
+
+def test_coverage_counts_query_terms_matched_by_title_or_artist():
+    # "아이유 밤편지": 첫 단어는 아티스트 이름, 둘째 단어는 제목에 맞는다.
+    term_matches = [(set(), {"iu"}), ({"s1", "s3"}, set())]
+    features = {
+        "s1": feature(artist_ids=["iu"]),     # 두 단어 모두
+        "s2": feature(artist_ids=["iu"]),     # 아티스트만
+        "s3": feature(artist_ids=["other"]),  # 제목만
+        "s4": feature(artist_ids=["other"]),  # 둘 다 아님
+    }
+    fused = {song_id: 1.0 for song_id in features}
+    ranked = dict(rerank(fused, features, {}, term_matches, {"coverage": 1.0}, 10, TODAY))
+    assert ranked == {"s1": 2.0, "s2": 1.5, "s3": 1.5, "s4": 1.0}
+    # 한쪽 목록에서만 높았던 곡보다 두 단어를 모두 맞춘 곡이 앞선다.
+    lopsided = rerank({"s1": 0.6, "s2": 1.0}, features, {}, term_matches, {"coverage": 1.0}, 10, TODAY)
+    assert lopsided[0][0] == "s1"
+
+
+def test_recency_halves_every_half_life():
+    assert recency("20240101", 2, TODAY) == 1.0
+    assert recency("20220101", 2, TODAY) == pytest.approx(0.5, abs=1e-3)
+    assert recency("20200101", 2, TODAY) == pytest.approx(0.25, abs=1e-3)
+    assert recency("20250101", 2, TODAY) == 1.0  # 미래 발매일은 감쇠하지 않는다
+
+
+@pytest.mark.parametrize("issue_date", ["00000000", None, "", "2017", "201703", "abcdefgh", "20171340", "20170230"])
+def test_unknown_or_invalid_dates_score_zero(issue_date):
+    assert recency(issue_date, 2, TODAY) == 0.0
+
+
+def test_missing_month_or_day_falls_back_to_the_first():
+    assert recency("20230000", 2, TODAY) == recency("20230101", 2, TODAY)
+    assert recency("20230500", 2, TODAY) == recency("20230501", 2, TODAY)
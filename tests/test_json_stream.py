@@ -0,0 +1,44 @@
+# src/tests/test_json_stream.py - 청크 경계가 어디에 걸려도 원소를 json.loads와 똑같이 읽는지
+import json
+
+import pytest
+
+from src.utils.json_stream import iter_array
+
+ARRAYS = [
+    [],
+    [1.5, 22, {"a": 1}],
+    [-0.25, 1e-07, 12345678901234567890, 3.0e+10, -7, 0],
+    [True, False, None, "true", ""],
+    [{"song_id": "1", "song_name": "밤편지", "artist_name_basket": ["아이유"], "issue_date": "20170324"},
+     {"id": 2, "songs": [1, 22, 333], "tags": ["비 오는 날", "\"따옴표\""], "like_cnt": 71.25}],
+    [[[]], [{}], "]", ",", "[1,,2]"],
+]
+
+
+def write(tmp_path, text: str) -> str:
+    path = tmp_path / "array.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("array", ARRAYS)
+def test_every_chunk_size_reads_the_same_elements(tmp_path, array, indent):
+    path = write(tmp_path, json.dumps(array, ensure_ascii=False, indent=indent))
+    for chunk_size in range(1, 17):
+        assert list(iter_array(path, chunk_size)) == array, f"chunk_size={chunk_size}"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_number_split_at_a_chunk_boundary(tmp_path, chunk_size):
+    path = write(tmp_path, '[1.5, 22, {"a": 1}]')
+    assert list(iter_array(path, chunk_size)) == [1.5, 22, {"a": 1}]
+
+
+@pytest.mark.parametrize("text", ["[1,,2]", "[,1]", "[1,]", "[1 2]", "[1;2]", "[1.5.2]", "[1, 2", "{}", ""])
+def test_malformed_arrays_are_rejected(tmp_path, text):
+    path = write(tmp_path, text)
+    for chunk_size in range(1, 17):
+        with pytest.raises(ValueError):
+            list(iter_array(path, chunk_size))
@@ -0,0 +1,87 @@
+# src/tests/test_ngram_index.py - 한글/라틴 부분 문자열 검색, 정규화, 짧은 질의, 관련도 순서
+import pytest
+
+from src.utils.ngram_index import NgramIndex, normalize
+
+TITLES = [
+    ("1", "밤편지"), ("2", "좋은 날"), ("3", "Love Poem"), ("4", "LOVE wins all"),
+    ("5", "사랑을 했다"), ("6", "Blueming"), ("7", "밤"), ("8", "Glove (feat. 밤편지)"),
+    ("9", "ＬＯＶＥ"), ("10", "  좋은   날  "),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NgramIndex.build(TITLES)
+
+
+def keys(hits):
+    return [key for key, _ in hits]
+
+
+def brute_force(query):
+    query = normalize(query)
+    return {key for key, text in TITLES if query in normalize(text)}
+
+
+@pytest.mark.parametrize("query", ["밤", "편지", "밤편지", "좋은 날", "사랑", "love", "ove", "Bloom", "e", "o", "(", "zz", "없는곡"])
+def test_search_finds_exactly_the_substring_matches(index, query):
+    assert set(keys(index.search(query, 100))) == brute_force(query)
+
+
+@pytest.mark.parametrize("query", ["LOVE", "love", " Love ", "ｌｏｖｅ", "LoVe"])
+def test_case_width_and_whitespace_are_folded(index, query):
+    assert set(keys(index.search(query, 100))) == {"3", "4", "8", "9"}
+
+
+def test_whitespace_inside_text_is_collapsed(index):
+    assert set(index.exact("좋은 날")) == {"2", "10"}
+    assert set(index.exact(" 좋은    날")) == {"2", "10"}
+
+
+@pytest.mark.parametrize("query", ["밤", "e", "L"])
+def test_single_character_queries_use_unigrams(index, query):
+    assert set(keys(index.search(query, 100))) == brute_force(query)
+
+
+def test_relevance_orders_exact_prefix_word_start_then_substring(index):
+    # "밤" 정확 일치 > "밤편지" 접두 > "(feat. 밤편지)" 단어 시작
+    assert keys(index.search("밤", 10)) == ["7", "1", "8"]
+    # love: 정확 일치(9) > 접두(짧은 3, 긴 4) > 부분 문자열(8)
+    assert keys(index.search("love", 10)) == ["9", "3", "4", "8"]
+    scores = [score for _, score in index.search("love", 10)]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_priors_reorder_within_a_match_kind():
+    boosted = NgramIndex.build(TITLES)
+    popularity = [0.0] * len(TITLES)
+    popularity[3] = 1000.0  # "LOVE wins all"
+    boosted.set_priors(popularity, version=1.0)
+    assert keys(boosted.search("love", 10)) == ["9", "4", "3", "8"]
+    assert boosted.priors_version == 1.0
+
+
+def test_limit_keeps_the_most_relevant(index):
+    assert keys(index.search("love", 2)) == ["9", "3"]
+
+
+@pytest.mark.parametrize("query", ["", "   ", None])
+def test_blank_queries_match_nothing(index, query):
+    assert index.search(query) == []
+    assert index.exact(query) == []
+    assert index.ordered(query) == []
+
+
+def test_empty_index():
+    empty = NgramIndex.build([])
+    assert len(empty) == 0
+    assert empty.search("밤") == []
+    assert empty.exact("밤") == []
+    assert empty.ordered("밤") == []
+
+
+def test_items_without_a_key_are_skipped():
+    built = NgramIndex.build([(None, "밤"), ("1", None), ("2", "밤")])
+    assert built.keys == ["1", "2"]
+    assert keys(built.search("밤")) == ["2"]
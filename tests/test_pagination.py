@@ -0,0 +1,130 @@
+# src/tests/test_pagination.py - 커서 왕복, 잘못된 커서 거절, 페이지를 이어 읽어도 빠지거나 겹치는 곡이 없는지
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.bench.suite import setup_services
+from src.bench.synthetic import synthetic_graph
+from src.models.schemas import SearchRequest
+from src.services.recommendation_service import get_recommendation_service
+from src.services.search_service import SearchService, get_search_service
+from src.utils.cache import cached, invalidate_all
+from src.utils.ngram_index import NgramIndex
+from src.utils.pagination import decode_cursor, encode_cursor
+
+# 같은 제목이 여러 곡에 걸쳐 있어 song_id가 순서를 정해야 한다.
+SONGS = [
+    ("s05", "Love"), ("s01", "love"), ("s03", "LOVE "), ("s02", "Love Song"),
+    ("s04", "사랑 love"), ("s06", "사랑"), ("s07", "Lovely"), ("s08", "glove"),
+]
+
+
+@pytest.mark.parametrize("title, song_id", [
+    ("밤편지", "1"), ("", ""), ("\"따옴표\" & , ] [", "song-42"), ("a" * 300, "9" * 20),
+])
+def test_cursor_round_trips(title, song_id):
+    cursor = encode_cursor(title, song_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (title, song_id)
+
+
+def test_missing_cursor_means_first_page():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm90IGpzb24", encode_cursor("t", "1")[:-3], "WzEsIDJd", "WyJ0Il0"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def read_all(index: NgramIndex, query: str, limit: int):
+    pages, after = [], None
+    while True:
+        page = index.ordered(query, after, limit)
+        pages.append(page)
+        if len(page) < limit:
+            return pages
+        after = page[-1]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_pages_resume_strictly_after_the_cursor(limit):
+    index = NgramIndex.build(SONGS)
+    pages = read_all(index, "love", limit)
+    rows = [row for page in pages for row in page]
+    assert rows == index.ordered("love")
+    assert len(set(rows)) == len(rows) == 7
+    assert all(len(page) <= limit for page in pages)
+    # 같은 제목 "love" 세 곡은 song_id 순으로 이어진다.
+    assert [key for _, key in rows] == ["s08", "s01", "s03", "s05", "s02", "s07", "s04"]
+    for page, next_page in zip(pages, pages[1:]):
+        assert all(row > page[-1] for row in next_page)
+
+
+def test_after_the_last_row_is_empty():
+    index = NgramIndex.build(SONGS)
+    last = index.ordered("love")[-1]
+    assert index.ordered("love", last, 10) == []
+
+
+@pytest.fixture(scope="module")
+def search():
+    invalidate_all()
+    service, _, _, _ = setup_services(synthetic_graph(0.002, 5), "memory", False, 16, 0.0, {})
+    yield service
+    invalidate_all()
+
+
+def test_service_pages_end_with_no_cursor(search):
+    query = search.title_index.texts[0][:1]
+    total = len(search.title_index.ordered(query))
+    assert total > 3
+
+    async def read():
+        seen, cursor = [], None
+        while True:
+            request = SearchRequest(query=query, search_type="title", limit=3, cursor=cursor, paginate=True)
+            songs, cursor = await search.asearch_page(request)
+            seen += [song.song_id for song in songs]
+            if cursor is None:
+                return seen
+
+    seen = asyncio.run(read())
+    assert len(seen) == len(set(seen)) == total
+
+
+def test_invalid_cursor_is_a_400(search):
+    app.dependency_overrides[get_search_service] = lambda: search
+    app.dependency_overrides[get_recommendation_service] = lambda: None
+    try:
+        response = TestClient(app).post("/api/search", json={"query": "a", "search_type": "title", "cursor": "!!!"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
+
+
+def test_cursors_differing_only_in_case_have_their_own_cache_entries():
+    # base64 자리 하나의 대소문자만 다른 두 커서: ("aa", "1")과 ("Ga", "1")
+    lower, upper = encode_cursor("aa", "1"), encode_cursor("Ga", "1")
+    assert lower.casefold() == upper.casefold() and lower != upper
+    key_for = SearchService.search_title_page.key_for
+    assert key_for("Love", 10, lower) != key_for("Love", 10, upper)
+    # 커서가 아닌 질의 문자열은 여전히 접힌다.
+    assert key_for("Love", 10, lower) == key_for(" love ", 10, lower)
+
+    class Pages:
+        calls = 0
+
+        @cached("test_case_cursor", exact=("cursor",))
+        def page(self, query, cursor=None):
+            Pages.calls += 1
+            return decode_cursor(cursor)
+
+    pages = Pages()
+    assert pages.page("q", lower) == ("aa", "1")
+    assert pages.page("q", upper) == ("Ga", "1")
+    assert Pages.calls == 2
@@ -0,0 +1,74 @@
+# src/tests/test_query_understanding.py - 규칙 기반 질문 이해와 Cypher 계획 자리표시자
+import pytest
+
+from src.utils.query_understanding import (
+    ARTIST_SONGS_QUERY, GENRE_YEAR_SONGS_QUERY, IntentMatcher, from_plan, question_shape, to_plan,
+)
+
+ARTISTS = {"아이유": ["a1"], "bts": ["a2", "a3"]}
+
+
+@pytest.fixture
+def matcher():
+    return IntentMatcher(["발라드", "랩/힙합", "R&B/Soul"], lambda name: ARTISTS.get(name, []), limit=20)
+
+
+@pytest.mark.parametrize("question, artist_ids", [
+    ("아이유 노래 알려줘", ["a1"]),
+    ("아이유의 곡들 추천해줘", ["a1"]),
+    ("Songs by BTS?", ["a2", "a3"]),
+])
+def test_artist_questions(matcher, question, artist_ids):
+    intent = matcher.match(question)
+    assert intent.name == "artist_songs"
+    assert intent.cypher == ARTIST_SONGS_QUERY
+    assert intent.params == {"artist_ids": artist_ids, "limit": 20}
+
+
+@pytest.mark.parametrize("question, genre, year", [
+    ("2010년대 발라드 추천해줘", "발라드", "201"),
+    ("2010s ballads", "발라드", "201"),
+    ("2015년 발라드", "발라드", "2015"),
+    ("r&b songs from 2019", "R&B/Soul", "2019"),
+    ("발라드 노래", "발라드", ""),
+])
+def test_genre_year_questions(matcher, question, genre, year):
+    intent = matcher.match(question)
+    assert intent.name == "genre_year_songs"
+    assert intent.cypher == GENRE_YEAR_SONGS_QUERY
+    assert intent.params == {"genre": genre, "year": year, "limit": 20}
+
+
+@pytest.mark.parametrize("question", [
+    "신나는 여름 발라드",  # 장르 밖의 말이 남으면 해석이 필요하다
+    "아이유 신나는 노래",
+    "김철수 노래",  # 없는 아티스트
+    "2010년 발라드 10곡",
+    "",
+])
+def test_questions_that_need_the_llm(matcher, question):
+    assert matcher.match(question) is None
+
+
+def test_shape_replaces_numbers_with_slots():
+    assert question_shape("2010년  발라드 10곡") == ("<n0>년 발라드 <n1>곡", ["2010", "10"])
+    assert question_shape("2012년 발라드 5곡")[0] == question_shape("2010년 발라드 10곡")[0]
+
+
+def test_plan_round_trip():
+    cypher = "MATCH (s:Song) WHERE s.issue_date STARTS WITH '2010' RETURN s.song_id LIMIT 10"
+    shape, values = question_shape("2010년 발라드 10곡")
+    plan = to_plan(cypher, values)
+    assert plan == "MATCH (s:Song) WHERE s.issue_date STARTS WITH '<n0>' RETURN s.song_id LIMIT <n1>"
+    assert from_plan(plan, values) == cypher
+    assert from_plan(plan, question_shape("2012년 발라드 5곡")[1]) == (
+        "MATCH (s:Song) WHERE s.issue_date STARTS WITH '2012' RETURN s.song_id LIMIT 5")
+
+
+@pytest.mark.parametrize("cypher, values", [
+    ("MATCH (s) RETURN s LIMIT 10", ["10", "10"]),  # 같은 값이 질문에 두 번
+    ("MATCH (s) WHERE s.rank = 10 RETURN s LIMIT 10", ["10"]),  # 같은 리터럴이 Cypher에 두 번
+    ("MATCH (s) RETURN s LIMIT 50", ["10"]),  # 질문의 값을 쓰지 않았다
+])
+def test_ambiguous_literals_are_not_planned(cypher, values):
+    assert to_plan(cypher, values) is None
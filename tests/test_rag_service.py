@@ -0,0 +1,68 @@
+# src/tests/test_rag_service.py - LLM 호출을 피하는 RAG 경로 (빠른 경로, Cypher 계획 캐시)
+from typing import List
+import asyncio
+
+import pytest
+
+from src.bench.suite import STUB_CYPHER, MemoryAsyncDatabase, StubChatModel, setup_services
+from src.bench.synthetic import synthetic_graph
+from src.services.rag_service import RAGService
+from src.utils.cache import invalidate_all
+
+
+class CountingChatModel(StubChatModel):
+    """프롬프트 종류별로 호출을 적는 stub LLM."""
+
+    calls: List[str] = []
+
+    def _reply(self, messages) -> str:
+        reply = StubChatModel._reply(messages)
+        self.calls.append("cypher_generation" if reply == STUB_CYPHER else "answer_generation")
+        return reply
+
+
+@pytest.fixture(scope="module")
+def services():
+    graph = synthetic_graph(0.002, 7)
+    search, _, _, memory = setup_services(graph, "memory", False, 16, 0.0, {})
+    return graph, search, memory
+
+
+@pytest.fixture
+def rag(services):
+    _, search, memory = services
+    invalidate_all()
+    return RAGService(llm=CountingChatModel(), graph=memory, adb=MemoryAsyncDatabase(memory), search=search)
+
+
+def test_fast_path_makes_no_llm_call(services, rag):
+    graph, _, _ = services
+    artist_name = graph[0]["artist"][0][1]
+    answer, songs = rag.query(f"{artist_name} 노래 알려줘")
+    assert songs
+    assert artist_name in answer
+    assert rag.llm.calls == []
+    assert rag.stats.requests["fast_path"] == 1
+    assert rag.stats.llm_calls == 0
+
+
+def test_plan_cache_reuses_cypher_for_questions_of_the_same_shape(rag):
+    rag.query("신나는 노래 10곡")
+    assert rag.llm.calls == ["cypher_generation", "answer_generation"]
+
+    rag.llm.calls.clear()
+    rag.query("신나는 노래 20곡")
+    assert rag.llm.calls == ["answer_generation"]
+    assert rag.stats.requests == {"fast_path": 0, "answer_cache": 0, "plan_cache": 1, "llm": 1, "degraded": 0}
+    assert rag.plans.get("shape:신나는 노래 <n0>곡") == STUB_CYPHER.replace("10", "<n0>")
+
+
+async def _stream(rag, question):
+    return [event async for event, _ in rag.astream(question)]
+
+
+def test_streamed_fast_path_makes_no_llm_call(services, rag):
+    graph, _, _ = services
+    events = asyncio.run(_stream(rag, f"{graph[0]['artist'][0][1]} 노래 알려줘"))
+    assert events == ["songs", "token", "done"]
+    assert rag.llm.calls == []
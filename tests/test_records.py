@@ -0,0 +1,56 @@
+# src/tests/test_records.py - 레코드 직렬화가 응답 모델(SongInfo/ScoredSong)의 JSON과 같은지
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.records import ScoredSongRecord, SongRecord, dumps
+from src.models.schemas import ScoredSong, SongInfo
+
+ROWS = [
+    {"song_id": "1", "title": "밤편지", "artist_name": "아이유", "issue_date": "20170324", "rank": 3},
+    {"song_id": "2", "title": "Dynamite", "genre_name": None, "album_title": "BE"},
+    {"song_id": "3", "title": None, "artist_name": "제목 없음"},
+    {"song_id": None, "title": "id 없음"},
+    {"title": "song_id 열이 없음"},
+    {"song_id": 4, "title": "숫자 id"},
+    {"song_id": "5", "title": "숫자 날짜", "issue_date": 20200101},
+    {"song_id": "6", "title": "", "subgenre_name": "\"따옴표\" \\ 역슬래시"},
+]
+
+
+def accepted(model, rows):
+    models = []
+    for row in rows:
+        try:
+            models.append(model(**row))
+        except ValidationError:
+            pass
+    return models
+
+
+def test_records_serialize_like_song_info():
+    records = SongRecord.from_rows(ROWS)
+    models = accepted(SongInfo, ROWS)
+    assert [record.song_id for record in records] == [model.song_id for model in models] == ["1", "2", "6"]
+    for record, model in zip(records, models):
+        assert dumps(record) == model.model_dump_json().encode()
+    assert json.loads(dumps(records)) == [model.model_dump() for model in models]
+
+
+def test_null_title_is_never_serialized():
+    assert SongRecord.from_row({"song_id": "3", "title": None}) is None
+    assert b'"title":null' not in dumps(SongRecord.from_rows(ROWS))
+
+
+@pytest.mark.parametrize("score, expected", [(0.25, 0.25), (2, 2.0), (None, 0.0)])
+def test_scored_records_serialize_like_scored_song(score, expected):
+    row = {"song_id": "1", "title": "밤편지", "score": score}
+    record = ScoredSongRecord.from_row(row)
+    model = ScoredSong(**{**row, "score": expected})
+    assert record.score == expected
+    assert dumps(record) == model.model_dump_json().encode()
+
+
+def test_scored_record_rejects_non_numeric_score():
+    assert ScoredSongRecord.from_row({"song_id": "1", "title": "t", "score": "high"}) is None
@@ -0,0 +1,127 @@
+# src/tests/test_semantic_cache.py - 유사도 임계값, guard, TTL, LRU 축출과 슬롯 재사용, 적중률
+import types
+
+import numpy as np
+import pytest
+
+from src.utils import semantic_cache
+from src.utils.semantic_cache import SemanticCache
+
+THRESHOLD = 0.9
+
+
+def unit(*components) -> np.ndarray:
+    """앞쪽 성분만 채운 8차원 stub 임베딩. 정규화는 캐시가 한다."""
+    vector = np.zeros(8, dtype=np.float32)
+    vector[:len(components)] = components
+    return vector
+
+
+def angled(cos: float) -> np.ndarray:
+    """unit(1)과 코사인 유사도가 cos인 벡터."""
+    return unit(cos, float(np.sqrt(1 - cos * cos)))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_lookup_hits_above_the_threshold_and_misses_below():
+    cache = SemanticCache(4, None, THRESHOLD)
+    cache.store(unit(1), "신나는 노래", "답", ["s1", "s2"])
+
+    hit = cache.lookup(angled(0.95))
+    assert hit is not None
+    assert (hit.question, hit.answer, hit.song_ids) == ("신나는 노래", "답", ["s1", "s2"])
+    assert hit.similarity == pytest.approx(0.95, abs=1e-5)
+    assert cache.lookup(unit(3)).similarity == pytest.approx(1.0)  # 크기는 무관하다
+    assert cache.lookup(angled(0.85)) is None
+    assert cache.lookup(unit(0, 1)) is None
+
+
+def test_empty_cache_misses():
+    cache = SemanticCache(4, None, THRESHOLD)
+    assert cache.lookup(unit(1)) is None
+    assert cache.stats.misses == 1
+
+
+def test_guard_must_match_even_for_identical_questions():
+    cache = SemanticCache(4, None, THRESHOLD)
+    cache.store(unit(1), "2010년 발라드", "2010", ["a"], guard="2010")
+    cache.store(unit(1), "2012년 발라드", "2012", ["b"], guard="2012")
+    assert cache.lookup(unit(1), guard="2012").answer == "2012"
+    assert cache.lookup(unit(1), guard="2010").answer == "2010"
+    assert cache.lookup(unit(1), guard="1999") is None
+    assert cache.lookup(unit(1)) is None
+
+
+def test_guarded_match_is_found_behind_a_closer_mismatch():
+    cache = SemanticCache(4, None, THRESHOLD)
+    cache.store(unit(1), "가까운 질문", "다른 guard", ["a"], guard="x")
+    cache.store(angled(0.95), "조금 먼 질문", "맞는 guard", ["b"], guard="y")
+    assert cache.lookup(unit(1), guard="y").answer == "맞는 guard"
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = SemanticCache(4, 60, THRESHOLD)
+    cache.store(unit(1), "q", "a", [])
+    clock[0] += 59
+    assert cache.lookup(unit(1)) is not None
+    clock[0] += 1
+    assert cache.lookup(unit(1)) is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_maxsize_evicts_the_least_recently_used_and_reuses_its_slot():
+    cache = SemanticCache(3, None, THRESHOLD)
+    for axis in range(3):
+        cache.store(unit(*([0] * axis + [1])), f"q{axis}", f"a{axis}", [])
+    slots = dict(cache._entries)
+    assert cache.lookup(unit(1)).answer == "a0"  # q0을 최근 사용으로 올린다
+
+    cache.store(unit(0, 0, 0, 1), "q3", "a3", [])
+    assert len(cache) == 3
+    assert cache.stats.evictions == 1
+    assert cache.lookup(unit(0, 1)) is None  # 가장 오래 안 쓴 q1이 나갔다
+    assert cache.lookup(unit(1)).answer == "a0"
+    assert cache.lookup(unit(0, 0, 0, 1)).answer == "a3"
+    # 새 엔트리는 q1이 쓰던 행을 그대로 쓴다. 행렬은 커지지 않는다.
+    assert [slot for slot, entry in cache._entries.items() if entry["question"] == "q3"] == [
+        slot for slot, entry in slots.items() if entry["question"] == "q1"
+    ]
+    assert cache._vectors.shape == (3, 8)
+    assert int(cache._live.sum()) == 3
+
+
+def test_expired_slot_is_reused_before_evicting(clock):
+    cache = SemanticCache(2, 10, THRESHOLD)
+    cache.store(unit(1), "old", "a", [])
+    cache.store(unit(0, 1), "kept", "b", [])
+    clock[0] += 5
+    cache.lookup(unit(0, 1))
+    clock[0] += 6
+    assert cache.lookup(unit(1)) is None  # 만료되며 슬롯이 비었다
+    cache.store(unit(0, 0, 1), "new", "c", [])
+    assert cache.stats.evictions == 0
+    assert {entry["question"] for entry in cache._entries.values()} == {"kept", "new"}
+
+
+def test_clear_and_hit_rate():
+    cache = SemanticCache(4, None, THRESHOLD)
+    assert cache.as_dict()["hit_rate"] == 0.0
+    cache.store(unit(1), "q", "a", [])
+    cache.lookup(unit(1))
+    cache.lookup(unit(1))
+    cache.lookup(unit(0, 1))
+    stats = cache.as_dict()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.lookup(unit(1)) is None
+    assert cache.as_dict()["hit_rate"] == 0.5
@@ -0,0 +1,91 @@
+# src/tests/test_session_store.py - 세션 저장소의 메모리 상한, 만료/축출, 대화가 길어져도 일정한 프롬프트 길이
+import gc
+import time
+import tracemalloc
+
+from src.core.config import settings
+from src.utils.session_store import MemorySessionStore, RedisSessionStore, Session
+
+SESSIONS = 100_000
+BYTES_PER_IDLE_SESSION = 512  # 세션 객체 + id 문자열 + LRU 항목. 10만 세션이 50MB를 넘지 않는다
+
+
+def fill(store: MemorySessionStore, count: int, updated_at: float = None) -> None:
+    for i in range(count):
+        session = Session(f"session-{i:08d}", f"user-{i % 5000}")
+        if updated_at is not None:
+            session.updated_at = updated_at
+        store.save(session)
+
+
+def test_idle_sessions_stay_within_the_memory_budget():
+    store = MemorySessionStore(SESSIONS, 3600)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        fill(store, SESSIONS)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(store) == SESSIONS
+    assert used / SESSIONS < BYTES_PER_IDLE_SESSION, f"{used / SESSIONS:.0f} bytes/session"
+
+
+def test_maxsize_evicts_least_recently_used():
+    store = MemorySessionStore(1000, None)
+    fill(store, SESSIONS)
+    assert len(store) == 1000
+    assert store.stats.evictions == SESSIONS - 1000
+    assert store.get(f"session-{SESSIONS - 1:08d}") is not None
+    assert store.get("session-00000000") is None
+
+
+def test_ttl_sweep_drops_expired_sessions_on_save():
+    store = MemorySessionStore(SESSIONS, 60)
+    fill(store, SESSIONS, updated_at=time.time() - 120)
+    # 모두 만료된 채로 들어왔으므로 저장할 때마다 앞쪽의 만료 세션이 걷힌다.
+    assert len(store) <= 1
+    store.save(Session("fresh", "u"))
+    assert len(store) == 1
+    assert store.stats.expirations == SESSIONS
+    assert store.get("fresh") is not None
+
+
+def test_history_length_is_flat_as_the_conversation_grows():
+    session = Session("s", "u")
+    lengths = []
+    for turn in range(200):
+        session.append("user", f"질문 {turn:04d} " + "가" * 1000)
+        session.append("assistant", f"답변 {turn:04d} " + "나" * 1000)
+        lengths.append(len(session.history()))
+    bound = settings.chat_summary_chars + settings.chat_window * (settings.chat_message_chars + 16) + 32
+    assert max(lengths) <= bound
+    assert len(set(lengths[-150:])) == 1
+    assert len(session.messages) == settings.chat_window
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def test_redis_sessions_round_trip_as_json():
+    client = DictRedis()
+    store = RedisSessionStore(client, 60)
+    session = Session("s", "u")
+    session.append("user", "아이유 노래")
+    session.append("assistant", "밤편지")
+    store.save(session)
+    assert client.data["stunes:session:s"].startswith(b"{")
+
+    loaded = store.get("s")
+    assert (loaded.session_id, loaded.user_id, loaded.summary) == ("s", "u", "")
+    assert loaded.messages == session.messages
+    assert loaded.history() == session.history()
@@ -0,0 +1,114 @@
+# src/tests/test_singleflight.py - 동시 호출이 백엔드를 한 번만 부르고 결과/예외를 나눠 받는지
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.singleflight import SingleFlight, flight_stats, get_flight
+
+N = 16
+
+
+class SlowBackend:
+    """release가 열릴 때까지 붙잡혀 있는 백엔드. 호출 수를 센다."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+    async def acall(self):
+        self.calls += 1
+        while not self.release.is_set():
+            await asyncio.sleep(0.001)
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+
+def wait_for_followers(flight: SingleFlight, followers: int) -> None:
+    deadline = time.monotonic() + 5
+    while flight.stats.followers < followers:
+        assert time.monotonic() < deadline, "callers never joined the in-flight call"
+        time.sleep(0.001)
+
+
+def run_threads(flight: SingleFlight, backend: SlowBackend):
+    def call():
+        try:
+            return flight.do("key", backend)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(N) as pool:
+        futures = [pool.submit(call) for _ in range(N)]
+        wait_for_followers(flight, N - 1)
+        backend.release.set()
+        return [future.result() for future in futures]
+
+
+async def run_tasks(flight: SingleFlight, backend: SlowBackend):
+    tasks = [asyncio.ensure_future(flight.ado("key", backend.acall)) for _ in range(N)]
+    await asyncio.sleep(0)
+    assert flight.stats.followers == N - 1
+    backend.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_threads_share_one_execution():
+    flight = get_flight("test_threads")
+    backend = SlowBackend()
+    results = run_threads(flight, backend)
+    assert backend.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight_stats()["test_threads"] == {"executions": 1, "coalesced": N - 1, "ratio": round((N - 1) / N, 4)}
+
+
+def test_tasks_share_one_execution():
+    flight = get_flight("test_tasks")
+    backend = SlowBackend()
+    results = asyncio.run(run_tasks(flight, backend))
+    assert backend.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight_stats()["test_tasks"]["executions"] == 1
+    assert flight_stats()["test_tasks"]["coalesced"] == N - 1
+
+
+def test_thread_error_reaches_every_caller_and_is_not_remembered():
+    flight = SingleFlight("errors")
+    backend = SlowBackend(error=ValueError("neo4j down"))
+    results = run_threads(flight, backend)
+    assert backend.calls == 1
+    assert all(isinstance(result, ValueError) and result is results[0] for result in results)
+
+    backend.error = None
+    assert flight.do("key", backend) == {"calls": 2}
+    assert flight.stats.leaders == 2
+
+
+def test_task_error_reaches_every_caller_and_is_not_remembered():
+    flight = SingleFlight("aerrors")
+    backend = SlowBackend(error=ValueError("neo4j down"))
+
+    async def scenario():
+        results = await run_tasks(flight, backend)
+        assert all(isinstance(result, ValueError) for result in results)
+        backend.error = None
+        return await flight.ado("key", backend.acall)
+
+    assert asyncio.run(scenario()) == {"calls": 2}
+    assert backend.calls == 2
+    assert flight.stats.as_dict() == {"executions": 2, "coalesced": N - 1, "ratio": round((N - 1) / (N + 1), 4)}
+
+
+def test_sequential_calls_run_again():
+    flight = SingleFlight("sequential")
+    assert [flight.do("key", lambda i=i: i) for i in range(3)] == [0, 1, 2]
+    assert flight.stats.as_dict()["coalesced"] == 0
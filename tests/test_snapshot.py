@@ -0,0 +1,103 @@
+# src/tests/test_snapshot.py - 작은 그래프를 내보내고 다시 열어도 id/제목/아티스트 조회가 같은지
+import pytest
+
+from src.core.config import settings
+from src.jobs.snapshot import EDGE_QUERIES, NODE_QUERIES, export_snapshot
+from src.services import search_service
+from src.utils.snapshot import GraphSnapshot, SnapshotBackend, get_snapshot
+
+NODES = {
+    "song": [
+        {"id": "s1", "title": "밤편지", "issue_date": "20170324"},
+        {"id": "s2", "title": "좋은 날", "issue_date": "20101209"},
+        {"id": "s3", "title": "Love Poem", "issue_date": None},
+        {"id": "s4", "title": "Dynamite", "issue_date": "20200821"},
+    ],
+    "artist": [{"id": "a1", "name": "아이유"}, {"id": "a2", "name": "방탄소년단"}],
+    "album": [{"id": "al1", "title": "팔레트"}],
+    "genre": [{"id": "g1", "name": "발라드"}, {"id": "g2", "name": "댄스"}],
+    "subgenre": [],
+    "playlist": [{"id": "p1", "title": "출근길"}, {"id": "p2", "title": "퇴근길"}],
+}
+EDGES = {
+    "song_artist": [("s1", "a1"), ("s2", "a1"), ("s3", "a1"), ("s4", "a2"), ("s1", "a1")],
+    "song_album": [("s1", "al1")],
+    "song_genre": [("s1", "g1"), ("s2", "g1"), ("s4", "g2")],
+    "song_subgenre": [],
+    "playlist_song": [("p1", "s1"), ("p1", "s4"), ("p2", "s1"), ("p2", "missing")],
+}
+
+
+class FakeDatabase:
+    """export_snapshot이 부르는 stream만 흉내 낸다. 쿼리 문자열로 라벨/관계를 찾는다."""
+
+    def __init__(self):
+        self.rows = {query: NODES[label] for label, query in NODE_QUERIES.items()}
+        self.rows.update({
+            query: [{"src": src, "dst": dst} for src, dst in EDGES[name]]
+            for name, query in EDGE_QUERIES.items()
+        })
+
+    def stream(self, query, params=None):
+        return iter(self.rows[query])
+
+
+@pytest.fixture
+def exported(tmp_path):
+    path = str(tmp_path / "snapshot")
+    built = export_snapshot(FakeDatabase(), path)
+    return built, GraphSnapshot.load(path), path
+
+
+def test_export_then_load_keeps_nodes_edges_and_popularity(exported):
+    built, loaded, _ = exported
+    assert len(loaded) == 4
+    assert loaded.meta["nodes"] == built.meta["nodes"]
+    assert loaded.meta["edges"] == built.meta["edges"]
+    assert loaded.meta["edges"]["song_artist"] == 4  # 중복 간선은 하나로
+    assert loaded.meta["edges"]["playlist_song"] == 3  # 없는 곡으로 가는 간선은 버린다
+    assert loaded.song_popularity.tolist() == built.song_popularity.tolist() == [2, 0, 0, 1]
+    assert [str(loaded.ids["song"][row]) for row in loaded.song_popular_rank[:2]] == ["s1", "s4"]
+
+
+def test_backend_answers_id_title_and_artist_lookups(exported):
+    _, loaded, _ = exported
+    backend = SnapshotBackend(loaded, search_service.SNAPSHOT_HANDLERS)
+
+    (card,) = backend.query(search_service.SONG_BY_ID_QUERY, {"song_id": "s1"})
+    assert card == {
+        "song_id": "s1", "title": "밤편지", "issue_date": "20170324", "artist_name": "아이유", "artist_id": "a1",
+        "genre_name": "발라드", "genre_id": "g1", "album_title": "팔레트", "album_id": "al1", "subgenre_name": None,
+    }
+    rows = backend.query(search_service.SONGS_BY_IDS_QUERY, {"song_ids": ["s3", "nope", "s4"]})
+    assert [(row["song_id"], row["title"], row["issue_date"], row["artist_name"]) for row in rows] == [
+        ("s3", "Love Poem", None, "아이유"), ("s4", "Dynamite", "20200821", "방탄소년단"),
+    ]
+
+    titles = {row["key"]: row["text"] for row in backend.query(search_service.TITLE_INDEX_SOURCE)}
+    assert titles == {"s1": "밤편지", "s2": "좋은 날", "s3": "Love Poem", "s4": "Dynamite"}
+    artists = {row["key"]: row["text"] for row in backend.query(search_service.ARTIST_INDEX_SOURCE)}
+    assert artists == {"a1": "아이유", "a2": "방탄소년단"}
+
+    # 아티스트 순위 → 인기도 내림차순 → 제목 순
+    by_artist = backend.query(search_service.SONGS_BY_ARTIST_IDS_QUERY, {"artist_ids": ["a1", "a2"], "limit": 10})
+    assert [row["song_id"] for row in by_artist] == ["s1", "s3", "s2", "s4"]
+    page = backend.query(search_service.ARTIST_PAGE_QUERY,
+                         {"artist_ids": ["a1"], "after_title": "Love Poem", "after_id": "s3", "limit": 10})
+    assert [row["title"] for row in page] == ["밤편지", "좋은 날"]
+
+    assert not backend.supports("MATCH (s:Song) WHERE s.title CONTAINS $q RETURN s")
+
+
+def test_search_service_reads_titles_from_the_snapshot(exported, monkeypatch):
+    _, _, path = exported
+    monkeypatch.setattr(settings, "serving_backend", "snapshot")
+    monkeypatch.setattr(settings, "snapshot_path", path)
+    get_snapshot.cache_clear()
+    try:
+        service = search_service.SearchService()
+        service.db = None  # Neo4j로 새면 AttributeError
+        assert [song.title for song in service.search_by_song_ids(["s2", "s1"])] == ["좋은 날", "밤편지"]
+        assert service.title_index.exact("love poem") == ["s3"]
+    finally:
+        get_snapshot.cache_clear()
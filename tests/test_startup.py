@@ -0,0 +1,102 @@
+# src/tests/test_startup.py - 워커 부팅이 서비스/Neo4j에 닿지 않고 예열을 기다리지 않는지
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+
+from fastapi.testclient import TestClient
+
+import src.api.main as main
+from src.services.rag_service import get_rag_service
+
+CONFTEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conftest.py")
+
+
+def test_import_constructs_no_service_and_never_contacts_neo4j():
+    # 다른 테스트가 이미 import했으므로 새 인터프리터에서 확인한다.
+    script = textwrap.dedent(f"""
+        import runpy
+        runpy.run_path({CONFTEST!r})
+
+        import neo4j
+
+        def refuse(*args, **kwargs):
+            raise AssertionError("Neo4j driver created during import")
+
+        neo4j.GraphDatabase.driver = neo4j.AsyncGraphDatabase.driver = refuse
+
+        import src.api.main
+        from src.services.chat_service import get_chat_service
+        from src.services.rag_service import get_rag_service
+        from src.services.recommendation_service import get_recommendation_service
+        from src.services.search_service import get_search_service
+
+        for factory in (get_search_service, get_recommendation_service, get_rag_service, get_chat_service):
+            assert factory.cache_info().currsize == 0, factory.__name__
+        print("ok")
+    """)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("ok")
+
+
+def test_startup_returns_before_warm_up_finishes(monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_warm_up(search, recommendation, rag):
+        await release.wait()
+        return {"total": 1.0}
+
+    async def idle():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main.settings, "warm_up", True)
+    monkeypatch.setattr(main, "warm_up", slow_warm_up)
+    for name in ("get_search_service", "get_recommendation_service", "get_rag_service"):
+        monkeypatch.setattr(main, name, lambda: object())
+    monkeypatch.setattr(main, "_sync_profiles", idle)
+    monkeypatch.setattr(main, "_watch_graph_version", idle)
+
+    async def boot():
+        await asyncio.wait_for(main.start_warm_up(), timeout=1.0)
+        assert main._warm_up_status() == "running"
+        release.set()
+        await main.app.state.warm_up_task
+        assert main._warm_up_status() == {"total": 1.0}
+        for task in (main.app.state.profile_sync_task, main.app.state.graph_watch_task):
+            task.cancel()
+
+    asyncio.run(boot())
+
+
+def test_health_does_not_construct_the_rag_service(monkeypatch):
+    class Down:
+        async def health_check(self):
+            return False
+
+    monkeypatch.setattr(main, "get_async_database", lambda: Down())
+    get_rag_service.cache_clear()
+    main.app.state.warm_up_task = None
+    body = TestClient(main.app).get("/health").json()
+    assert body["rag"] is None
+    assert body["status"] == "unhealthy"
+    assert get_rag_service.cache_info().currsize == 0
+
+
+def test_title_search_does_not_construct_the_rag_service(monkeypatch):
+    class Search:
+        async def asearch(self, request):
+            return []
+
+    get_rag_service.cache_clear()
+    main.app.dependency_overrides[main.get_search_service] = lambda: Search()
+    main.app.dependency_overrides[main.get_recommendation_service] = lambda: None
+    try:
+        client = TestClient(main.app)
+        for path in ("/api/search", "/api/search/stream"):
+            response = client.post(path, json={"query": "밤편지", "search_type": "title"})
+            assert response.status_code == 200
+    finally:
+        main.app.dependency_overrides.clear()
+    assert get_rag_service.cache_info().currsize == 0
@@ -0,0 +1,35 @@
+# src/tests/test_user_recommendation.py - 첫 개인화 추천 요청이 프로필 재생을 이벤트 루프 밖에서 하는지
+import asyncio
+import threading
+
+from src.bench.suite import setup_services
+from src.bench.synthetic import synthetic_graph
+from src.utils.event_log import EventLog
+from src.utils.user_profiles import UserProfiles
+
+
+def test_first_profile_replay_runs_off_the_event_loop(tmp_path, monkeypatch):
+    _, recommendation, _, _ = setup_services(synthetic_graph(0.002, 7), "memory", False, 16, 0.0, {})
+    recommendation.events = EventLog(str(tmp_path), 1000, 30)
+    song_ids = [str(song_id) for song_id in recommendation.cooccurrence.song_ids[:5]]
+    recommendation.record_events("u1", song_ids, "click")
+
+    replayed_on = []
+    apply = UserProfiles.apply
+
+    def recording(self, events):
+        replayed_on.append(threading.current_thread())
+        return apply(self, events)
+
+    monkeypatch.setattr(UserProfiles, "apply", recording)
+
+    async def recommend():
+        loop_thread = threading.current_thread()
+        songs = await recommendation.arecommend_for_user("u1", 5)
+        return loop_thread, songs
+
+    loop_thread, songs = asyncio.run(recommend())
+    assert len(replayed_on) == 1
+    assert replayed_on[0] is not loop_thread
+    assert songs and not {song.song_id for song in songs} & set(song_ids)
+    assert all(song.score > 0 for song in songs)  # 인기곡 대체가 아니라 프로필로 점수를 매겼다
@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import json
 import uuid
 
 st.set_page_config(
@@ -35,6 +36,32 @@ def search_songs(query: str, search_type: str, limit: int = 10):
         st.error(f"API 연결 오류: {e}")
         return None
 
+def stream_search(query: str, search_type: str, limit: int = 10):
+    """/search/stream의 SSE를 (event, data)로 읽는다."""
+    try:
+        with requests.post(
+            f"{API_BASE_URL}/search/stream",
+            json={
+                "query": query,
+                "search_type": search_type,
+                "limit": limit,
+                "user_id": st.session_state.user_id
+            },
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                st.error(f"검색 오류: {response.status_code}")
+                return
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event:
+                    yield event, json.loads(line[len("data: "):])
+                    event = None
+    except Exception as e:
+        st.error(f"API 연결 오류: {e}")
+
 def get_recommendations(song_id: str, rec_type: str = "genre", limit: int = 5):
     try:
         response = requests.get(
@@ -49,6 +76,31 @@ def get_recommendations(song_id: str, rec_type: str = "genre", limit: int = 5):
         st.error(f"추천 API 오류: {e}")
         return []
 
+def record_click(song_id: str):
+    """추천 버튼을 누른 곡을 클릭 이벤트로 남긴다. 실패해도 화면은 그대로 둔다."""
+    try:
+        requests.post(
+            f"{API_BASE_URL}/events",
+            json={"user_id": st.session_state.user_id, "song_ids": [song_id], "kind": "click"},
+            timeout=2,
+        )
+    except Exception:
+        pass
+
+def get_user_recommendations(limit: int = 10):
+    try:
+        response = requests.get(
+            f"{API_BASE_URL}/recommendations/user/{st.session_state.user_id}",
+            params={"limit": limit}
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return []
+    except Exception as e:
+        st.error(f"추천 API 오류: {e}")
+        return []
+
 def display_song_card(song, show_recommendations=True):
     with st.expander(f"🎵 {song['title']} - {song.get('artist_name', '알 수 없음')}"):
         col1, col2, col3 = st.columns(3)
@@ -75,6 +127,7 @@ def display_song_card(song, show_recommendations=True):
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"🎭 같은 장르 추천", key=f"genre_{song['song_id']}"):
+                    record_click(song['song_id'])
                     recommendations = get_recommendations(song['song_id'], "genre")
                     if recommendations:
                         st.write("**같은 장르의 다른 노래:**")
@@ -82,6 +135,7 @@ def display_song_card(song, show_recommendations=True):
                             display_song_card(rec, show_recommendations=False)
             with col2:
                 if st.button(f"👨‍🎤 같은 아티스트", key=f"artist_{song['song_id']}"):
+                    record_click(song['song_id'])
                     recommendations = get_recommendations(song['song_id'], "artist")
                     if recommendations:
                         st.write("**같은 아티스트의 다른 노래:**")
@@ -111,12 +165,19 @@ with st.sidebar:
 
     st.markdown("---")
     st.write(f"**사용자 ID:** `{st.session_state.user_id[:8]}...`")
+    show_for_you = st.button("💝 나를 위한 추천")
+
+# 개인화 추천: 지금까지 본/고른 곡으로 만든다. 기록이 없으면 인기곡이 나온다.
+if show_for_you:
+    st.header("💝 나를 위한 추천")
+    for song in get_user_recommendations():
+        display_song_card(song, show_recommendations=False)
 
 # 검색 UI
 st.header("🔍 음악 검색")
 search_method = st.radio(
     "검색 방법 선택",
-    ["🎵 곡 제목 검색", "👨‍🎤 아티스트 검색", "🤖 자연어 RAG 검색"],
+    ["🎵 곡 제목 검색", "👨‍🎤 아티스트 검색", "🧭 의미 유사 검색", "🔀 통합 검색", "🤖 자연어 RAG 검색"],
     horizontal=True
 )
 query = st.text_input("검색어를 입력하세요:")
@@ -128,17 +189,40 @@ if st.button("🔍 검색 실행", type="primary"):
             search_type = "title"
         elif "아티스트" in search_method:
             search_type = "artist"
+        elif "의미 유사" in search_method:
+            search_type = "embedding"
+        elif "통합" in search_method:
+            search_type = "hybrid"
         else:
             search_type = "rag"
 
-        with st.spinner("검색 중..."):
-            results = search_songs(query, search_type, limit)
-            if results and results.get('songs'):
-                st.success(f"🎉 {results['total_count']}개의 결과를 찾았습니다! (실행시간: {results['execution_time']:.2f}초)")
-                for song in results['songs']:
-                    display_song_card(song)
-            else:
-                st.warning("검색 결과가 없습니다.")
+        if search_type == "rag":
+            # 곡 목록은 Cypher 결과가 나오는 즉시, 답변은 생성되는 대로 그린다.
+            answer_box = st.empty()
+            answer = ""
+            with st.spinner("검색 중..."):
+                for event, data in stream_search(query, search_type, limit):
+                    if event == "songs":
+                        if data:
+                            st.success(f"🎉 {len(data)}개의 결과를 찾았습니다!")
+                        for song in data:
+                            display_song_card(song)
+                    elif event == "token":
+                        answer += data
+                        answer_box.info(f"🤖 {answer}")
+                    elif event == "done":
+                        st.caption(f"첫 결과까지 {data.get('time_to_songs', 0):.2f}초 / 전체 {data['execution_time']:.2f}초")
+                    elif event == "error":
+                        answer_box.error(data)
+        else:
+            with st.spinner("검색 중..."):
+                results = search_songs(query, search_type, limit)
+                if results and results.get('songs'):
+                    st.success(f"🎉 {results['total_count']}개의 결과를 찾았습니다! (실행시간: {results['execution_time']:.2f}초)")
+                    for song in results['songs']:
+                        display_song_card(song)
+                else:
+                    st.warning("검색 결과가 없습니다.")
 
 st.markdown("---")
 st.markdown(
@@ -0,0 +1,159 @@
+# src/utils/admission.py - 검색 유형별 동시 실행 한도, 대기열 길이/대기 시간, 실행 마감 (admission control)
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import math
+import threading
+import time
+
+from src.core.config import settings
+from src.utils.metrics import register_collector
+
+T = TypeVar("T")
+
+# 지금 요청의 마감 시각(time.monotonic). AsyncDatabaseManager가 Neo4j 트랜잭션 timeout으로 쓴다.
+_deadline: ContextVar[Optional[float]] = ContextVar("stunes_deadline", default=None)
+
+
+def remaining(default: float) -> float:
+    """마감까지 남은 시간(초). 마감이 없으면 default, 있으면 default와 남은 시간 중 작은 값."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return max(0.01, min(default, deadline - time.monotonic()))
+
+
+def expired() -> bool:
+    """지금 요청의 마감이 지났는지. 스트리밍 응답처럼 wait_for로 감쌀 수 없는 곳에서 이벤트 사이마다 본다."""
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+class Overloaded(Exception):
+    """게이트가 요청을 받지 않았다. reason은 queue_full(429) | queue_timeout | deadline(503)."""
+
+    def __init__(self, gate: str, reason: str, retry_after: int):
+        super().__init__(f"{gate} is overloaded ({reason}), retry after {retry_after}s")
+        self.gate = gate
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def status_code(self) -> int:
+        return 429 if self.reason == "queue_full" else 503
+
+
+class AdmissionGate:
+    """동시에 limit개까지 실행하고 queue개까지 줄 세운다. 줄이 차면 바로, wait초를 기다려도 자리가 안 나면
+    그때 거절한다. 들어간 요청에는 deadline초 마감을 건다.
+
+    한도를 넘는 요청을 백엔드(Neo4j, OpenAI)에 그대로 밀어 넣으면 모든 요청이 함께 느려지므로,
+    한도 밖의 요청은 빨리 거절하고 Retry-After로 다시 올 시점을 알려 준다.
+    """
+
+    def __init__(self, name: str, limit: int, queue: int, wait: float, deadline: float):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.wait = wait
+        self.deadline = deadline
+        self.inflight = 0
+        self.waiting = 0
+        self.counts = {"admitted": 0, "queue_full": 0, "queue_timeout": 0, "deadline": 0, "degraded": 0}
+        self._latency = deadline / 4  # 처리 시간 EWMA. Retry-After 추정에 쓴다
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def retry_after(self) -> int:
+        """줄 선 요청이 모두 빠지는 데 걸릴 시간의 추정치(초). 1~30초로 자른다."""
+        seconds = self._latency * (self.waiting + self.inflight + 1) / max(1, self.limit)
+        return int(min(30, max(1, math.ceil(seconds))))
+
+    def reject(self, reason: str) -> Overloaded:
+        """거절 사유를 세고 올릴 예외를 만든다."""
+        self.counts[reason] += 1
+        return Overloaded(self.name, reason, self.retry_after())
+
+    def check(self) -> None:
+        """줄까지 가득 찼으면 바로 Overloaded(queue_full). 스트리밍 응답의 헤더를 보내기 전에 거절할 때 쓴다.
+
+        inflight는 자리를 얻은 뒤에야 오르므로, 한꺼번에 몰린 요청은 아직 기다리는 중(waiting)이다.
+        그래서 둘을 합쳐 한도 + 줄 길이와 비교한다.
+        """
+        if self.inflight + self.waiting >= self.limit + self.queue:
+            raise self.reject("queue_full")
+
+    @asynccontextmanager
+    async def admit(self):
+        """자리를 얻을 때까지 기다렸다가 마감을 건 채로 본문을 실행한다. 못 얻으면 Overloaded."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        self.check()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.wait)
+        except asyncio.TimeoutError:
+            raise self.reject("queue_timeout") from None
+        finally:
+            self.waiting -= 1
+        self.inflight += 1
+        self.counts["admitted"] += 1
+        start = time.monotonic()
+        token = _deadline.set(start + self.deadline)
+        try:
+            yield self
+        finally:
+            _deadline.reset(token)
+            self.inflight -= 1
+            self._semaphore.release()
+            self._latency = 0.8 * self._latency + 0.2 * (time.monotonic() - start)
+
+    async def run(self, factory: Callable[[], Awaitable[T]]) -> T:
+        """factory()를 게이트 안에서 마감까지만 기다린다. 넘기면 취소하고 Overloaded(deadline)."""
+        async with self.admit():
+            try:
+                return await asyncio.wait_for(factory(), self.deadline)
+            except asyncio.TimeoutError:
+                raise self.reject("deadline") from None
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"limit": self.limit, "inflight": self.inflight, "waiting": self.waiting, **self.counts}
+
+
+_gates: Dict[str, AdmissionGate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_gate(name: str) -> AdmissionGate:
+    """이름별 게이트. 한도/마감은 settings.admission_limits/admission_deadlines에서, 없으면 default 항목에서 읽는다."""
+    gate = _gates.get(name)
+    if gate is None:
+        with _gates_lock:
+            gate = _gates.get(name)
+            if gate is None:
+                limit = settings.admission_limits.get(name, settings.admission_limits["default"])
+                gate = _gates[name] = AdmissionGate(
+                    name,
+                    limit,
+                    limit * settings.admission_queue_factor,
+                    settings.admission_wait,
+                    settings.admission_deadlines.get(name, settings.admission_deadlines["default"]),
+                )
+    return gate
+
+
+def admission_stats() -> Dict[str, Dict[str, float]]:
+    return {name: gate.as_dict() for name, gate in list(_gates.items())}
+
+
+def _admission_samples():
+    for name, gate in list(_gates.items()):
+        labels = {"gate": name}
+        yield "stunes_admission_inflight", "gauge", "Requests running inside the gate", labels, gate.inflight
+        yield "stunes_admission_waiting", "gauge", "Requests queued for a slot", labels, gate.waiting
+        for outcome, count in gate.counts.items():
+            yield ("stunes_admission_requests_total", "counter",
+                   "Gate decisions (admitted, rejected by reason, served degraded)", {**labels, "outcome": outcome}, count)
+
+
+register_collector(_admission_samples)
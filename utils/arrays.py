@@ -0,0 +1,38 @@
+# src/utils/arrays.py - memory-mapped 배열 파일 저장/로드 공통 함수
+from typing import Any, Optional
+import json
+import os
+
+import numpy as np
+
+
+def save_array(path: str, name: str, array: np.ndarray) -> None:
+    """임시 파일에 쓴 뒤 교체한다. 기존 파일을 mmap 중인 워커는 이전 inode를 계속 읽는다."""
+    target = os.path.join(path, name)
+    with open(target + ".tmp", "wb") as f:
+        np.save(f, array)
+    os.replace(target + ".tmp", target)
+
+
+def load_array(path: str, name: str, mmap: bool = True) -> np.ndarray:
+    return np.load(os.path.join(path, name), mmap_mode="r" if mmap else None)
+
+
+def save_meta(path: str, name: str, meta: Any) -> None:
+    target = os.path.join(path, name)
+    with open(target + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(target + ".tmp", target)
+
+
+def load_meta(path: str, name: str) -> Any:
+    with open(os.path.join(path, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def meta_stamp(path: str, name: str) -> Optional[float]:
+    """meta 파일의 mtime. 저장 잡은 meta를 마지막에 교체하므로 이 값이 바뀌면 사전 계산물이 새로 쓰인 것이다. 없으면 None."""
+    try:
+        return os.path.getmtime(os.path.join(path, name))
+    except OSError:
+        return None
@@ -0,0 +1,333 @@
+# src/utils/cache.py - 크기 제한 + TTL 결과 캐시 (in-process LRU / 선택적 Redis 공유 백엔드)
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.core.config import settings
+from src.models.records import ScoredSongRecord, SongRecord
+from src.utils.metrics import register_collector, timed
+from src.utils.singleflight import get_flight
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_MISSING = object()
+
+
+def normalize_key_part(value: Any) -> str:
+    """대소문자/공백만 다른 질의가 같은 엔트리를 쓰도록 문자열 인자를 접는다."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip().casefold()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(normalize_key_part(v) for v in value) + "]"
+    return repr(value)
+
+
+def make_key(namespace: str, *args, **kwargs) -> str:
+    parts = [normalize_key_part(arg) for arg in args]
+    parts += [f"{k}={normalize_key_part(v)}" for k, v in sorted(kwargs.items())]
+    return f"{namespace}:" + "|".join(parts)
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class MemoryCache:
+    """스레드 안전한 LRU + 엔트리별 TTL 캐시."""
+
+    def __init__(self, namespace: str, maxsize: int, ttl: Optional[float]):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._data[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Redis 값은 pickle 대신 JSON으로 쓴다. 공유 Redis에 쓸 수 있으면 누구나 pickle.loads로 코드를 실행시킬 수 있다.
+# 곡 레코드와 tuple(페이지 결과의 (곡 목록, 커서))은 표식을 단 객체로 바꿔 두었다가 읽을 때 되살린다.
+_RECORD_TAGS = {SongRecord: "song", ScoredSongRecord: "scored_song"}
+_RECORDS = {tag: cls for cls, tag in _RECORD_TAGS.items()}
+
+
+def _plain(value: Any) -> Any:
+    tag = _RECORD_TAGS.get(type(value))
+    if tag is not None:
+        return {"$record": tag, "values": list(value.values())}
+    if isinstance(value, tuple):
+        return {"$tuple": [_plain(item) for item in value]}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    return value
+
+
+def _restore(obj: Dict[str, Any]) -> Any:
+    if "$record" in obj:
+        return _RECORDS[obj["$record"]](*obj["values"])
+    if "$tuple" in obj:
+        return tuple(obj["$tuple"])
+    return obj
+
+
+def encode_value(value: Any) -> bytes:
+    return json.dumps(_plain(value), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def decode_value(payload: bytes) -> Any:
+    return json.loads(payload, object_hook=_restore)
+
+
+class RedisCache:
+    """여러 워커가 공유하는 Redis 백엔드. 크기 제한은 Redis maxmemory 정책을 따른다.
+
+    Redis 오류는 캐시 미스/쓰기 생략으로 넘긴다. 캐시가 죽어도 요청과 invalidate_all은 계속된다.
+    """
+
+    def __init__(self, namespace: str, client, ttl: Optional[float]):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._client = client
+        self._prefix = "stunes:cache:"
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self._client.scan_iter(match=f"{self._prefix}{self.namespace}:*"))
+        except Exception as e:
+            logger.warning(f"Redis cache scan failed: {e}")
+            return 0
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        try:
+            payload = self._client.get(self._prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            payload = None
+        if payload is not None:
+            try:
+                value = decode_value(payload)
+            except (ValueError, TypeError, KeyError) as e:
+                # 형식이 다른 값(이전 버전의 pickle 등)은 미스로 보고 다시 계산한다.
+                logger.warning(f"Redis cache value for {key} is unreadable: {e}")
+            else:
+                self.stats.hits += 1
+                return value
+        self.stats.misses += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self._client.set(self._prefix + key, encode_value(value), ex=int(ttl) if ttl else None)
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=f"{self._prefix}{self.namespace}:*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis cache clear failed: {e}")
+
+
+_caches: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+_redis_client = None
+
+
+def _get_redis_client():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(settings.redis_url)
+        _redis_client.ping()
+    return _redis_client
+
+
+def get_cache(namespace: str, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+    """namespace별 캐시 인스턴스를 반환한다. 처음 호출될 때 settings.cache_backend에 따라 생성."""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return cache
+    with _registry_lock:
+        if namespace in _caches:
+            return _caches[namespace]
+        maxsize = maxsize or settings.cache_maxsize
+        ttl = settings.cache_ttl if ttl is None else ttl
+        cache = None
+        if settings.cache_backend == "redis":
+            try:
+                cache = RedisCache(namespace, _get_redis_client(), ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable, using in-process cache: {e}")
+        if cache is None:
+            cache = MemoryCache(namespace, maxsize, ttl)
+        _caches[namespace] = cache
+        return cache
+
+
+def register_cache(namespace: str, cache) -> None:
+    """get_cache로 만들지 않은 캐시(SemanticCache 등)도 통계/지표/invalidate_all에 포함시킨다."""
+    with _registry_lock:
+        _caches[namespace] = cache
+
+
+def cached(namespace: Optional[str] = None, ttl: Optional[float] = None, maxsize: Optional[int] = None,
+           coalesce: bool = True, exact: Tuple[str, ...] = ()):
+    """메서드(동기/async) 결과를 캐시한다. self는 키에 포함하지 않으므로 인스턴스를 붙잡지 않는다.
+
+    coalesce면 같은 키의 캐시 미스가 동시에 여러 개 들어와도 한 번만 실행하고 결과를 나눠 준다.
+    exact에 적은 인자(페이지 커서 등)는 대소문자/공백을 접지 않고 repr 그대로 키에 넣는다.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        name = namespace or func.__qualname__
+        signature = inspect.signature(func)
+        is_method = next(iter(signature.parameters), None) == "self"
+
+        def key_for(*args, **kwargs) -> str:
+            """self를 뺀 인자로 키를 만든다. 기본값/키워드 인자 여부와 무관하게 같은 키가 된다."""
+            bound = signature.bind(*((None,) + args if is_method else args), **kwargs)
+            bound.apply_defaults()
+            items = list(bound.arguments.items())[1 if is_method else 0:]
+            return f"{name}:" + "|".join(
+                repr(value) if arg in exact else normalize_key_part(value) for arg, value in items
+            )
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache = get_cache(name, maxsize, ttl)
+                key = key_for(*(args[1:] if is_method else args), **kwargs)
+                with timed("cache_lookup"):
+                    value = cache.get(key)
+                if value is not _MISSING:
+                    return value
+
+                async def load():
+                    loaded = await func(*args, **kwargs)
+                    cache.set(key, loaded)
+                    return loaded
+
+                return await (get_flight(name).ado(key, load) if coalesce else load())
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cache = get_cache(name, maxsize, ttl)
+                key = key_for(*(args[1:] if is_method else args), **kwargs)
+                with timed("cache_lookup"):
+                    value = cache.get(key)
+                if value is not _MISSING:
+                    return value
+
+                def load():
+                    loaded = func(*args, **kwargs)
+                    cache.set(key, loaded)
+                    return loaded
+
+                return get_flight(name).do(key, load) if coalesce else load()
+
+        def invalidate(*args, **kwargs) -> None:
+            """인자를 주면 해당 엔트리만, 없으면 namespace 전체를 비운다."""
+            cache = get_cache(name, maxsize, ttl)
+            if args or kwargs:
+                cache.delete(key_for(*args, **kwargs))
+            else:
+                cache.clear()
+
+        wrapper.namespace = name
+        wrapper.key_for = key_for
+        wrapper.invalidate = invalidate
+        wrapper.cache = lambda: get_cache(name, maxsize, ttl)
+        return wrapper
+
+    return decorator
+
+
+def invalidate_all() -> None:
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        name: {**cache.stats.as_dict(), "size": len(cache)}
+        for name, cache in list(_caches.items())
+    }
+
+
+def _cache_samples():
+    for name, cache in list(_caches.items()):
+        labels = {"namespace": name}
+        yield "stunes_cache_hits_total", "counter", "Cache lookups that returned a value", labels, cache.stats.hits
+        yield "stunes_cache_misses_total", "counter", "Cache lookups that missed", labels, cache.stats.misses
+        yield "stunes_cache_evictions_total", "counter", "Entries evicted by the LRU size limit", labels, cache.stats.evictions
+        if isinstance(cache, MemoryCache):
+            # Redis의 len()은 SCAN이라 스크레이프마다 돌리지 않는다.
+            yield "stunes_cache_entries", "gauge", "Entries held by the in-process cache", labels, len(cache)
+
+
+register_collector(_cache_samples)
@@ -0,0 +1,70 @@
+# src/utils/cooccurrence.py - 플레이리스트 공동 등장(item-item) 이웃 테이블 (memory-mapped)
+from typing import List, Tuple
+import os
+
+import numpy as np
+
+from src.utils.arrays import load_array, load_meta, save_array, save_meta
+
+SONG_IDS = "song_ids.npy"
+INDPTR = "indptr.npy"
+NEIGHBORS = "neighbors.npy"
+SCORES = "scores.npy"
+META = "meta.json"
+
+
+class CooccurrenceIndex:
+    """곡별 상위 K개 이웃을 CSR 형태로 담은 읽기 전용 테이블.
+
+    song_ids는 정렬되어 있어 이진 탐색으로 행을 찾고, 이웃은 indptr 구간의
+    neighbors/scores 슬라이스로 바로 읽는다. 모든 배열은 mmap으로 열리므로
+    여러 워커 프로세스가 같은 페이지 캐시를 공유한다.
+    """
+
+    def __init__(self, song_ids: np.ndarray, indptr: np.ndarray, neighbors: np.ndarray,
+                 scores: np.ndarray, meta: dict):
+        self.song_ids = song_ids
+        self.indptr = indptr
+        self.neighbors = neighbors
+        self.scores = scores
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.song_ids)
+
+    @classmethod
+    def load(cls, path: str) -> "CooccurrenceIndex":
+        return cls(
+            load_array(path, SONG_IDS),
+            load_array(path, INDPTR),
+            load_array(path, NEIGHBORS),
+            load_array(path, SCORES),
+            load_meta(path, META),
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        save_array(path, SONG_IDS, self.song_ids)
+        save_array(path, INDPTR, self.indptr)
+        save_array(path, NEIGHBORS, self.neighbors)
+        save_array(path, SCORES, self.scores)
+        save_meta(path, META, self.meta)
+
+    def row(self, song_id: str) -> int:
+        """song_id의 행 번호. 없으면 -1."""
+        pos = int(np.searchsorted(self.song_ids, song_id))
+        if pos < len(self.song_ids) and self.song_ids[pos] == song_id:
+            return pos
+        return -1
+
+    def neighbors_of(self, song_id: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """(song_id, score) 목록을 점수 내림차순으로 반환한다."""
+        row = self.row(song_id)
+        if row < 0:
+            return []
+        start = int(self.indptr[row])
+        end = min(int(self.indptr[row + 1]), start + limit)
+        return [
+            (str(self.song_ids[n]), float(s))
+            for n, s in zip(self.neighbors[start:end], self.scores[start:end])
+        ]
@@ -0,0 +1,106 @@
+# src/utils/event_log.py - 사용자 곡 조회/클릭 이벤트의 append-only 버퍼 로그 (워커별 세그먼트 파일)
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from src.core.config import settings
+from src.utils.metrics import USER_EVENTS
+import datetime
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 종류별 프로필 가중치. 검색 결과에 보인 곡(view)보다 직접 고른 곡(click)이 취향을 더 잘 나타낸다.
+EVENT_WEIGHTS = {"view": 0.2, "click": 1.0}
+
+Event = Tuple[str, str, str]  # (user_id, song_id, kind)
+
+
+def _clean(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+class EventLog:
+    """이벤트를 메모리 버퍼에 모았다가 flush_size개가 차거나 flush()가 불릴 때 파일 끝에 한 번에 쓴다.
+
+    워커마다 자기 세그먼트(YYYYMMDD-pid.log)에만 쓰고, read_new()는 디렉터리의 모든 세그먼트를
+    파일별 오프셋부터 읽는다. 그래서 다른 워커가 받은 이벤트도 다음 동기화 때 들어오고,
+    재시작하면 보존 기간 안의 세그먼트를 처음부터 다시 읽어 프로필을 복원한다.
+    """
+
+    def __init__(self, path: str, flush_size: int, retention_days: int):
+        self.path = path
+        self.flush_size = flush_size
+        self.retention_days = retention_days
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._offsets: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def append(self, user_id: str, song_ids: Iterable[str], kind: str) -> int:
+        """이벤트를 버퍼에 넣고 넣은 수를 반환한다. 요청 경로에서는 버퍼가 찼을 때만 파일에 쓴다."""
+        ts = int(time.time())
+        user = _clean(user_id)
+        lines = [f"{ts}\t{user}\t{_clean(song_id)}\t{kind}\n" for song_id in song_ids if song_id]
+        with self._lock:
+            self._buffer.extend(lines)
+            due = len(self._buffer) >= self.flush_size
+        USER_EVENTS.inc(len(lines), kind=kind)
+        if due:
+            self.flush()
+        return len(lines)
+
+    def _segment(self) -> str:
+        return os.path.join(self.path, f"{time.strftime('%Y%m%d')}-{os.getpid()}.log")
+
+    def flush(self) -> int:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return 0
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._segment(), "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except OSError as e:
+            logger.warning(f"Event log flush failed, dropped {len(lines)} events: {e}")
+            USER_EVENTS.inc(len(lines), kind="dropped")
+            return 0
+        return len(lines)
+
+    def read_new(self) -> List[Event]:
+        """모든 세그먼트에서 지난번 이후 추가된 완결된 줄을 읽는다. 보존 기간이 지난 세그먼트는 건너뛴다."""
+        cutoff = (datetime.date.today() - datetime.timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        events: List[Event] = []
+        with self._read_lock:
+            try:
+                names = sorted(name for name in os.listdir(self.path) if name.endswith(".log") and name[:8] >= cutoff)
+            except FileNotFoundError:
+                return events
+            for name in names:
+                full = os.path.join(self.path, name)
+                offset = self._offsets.get(name, 0)
+                try:
+                    with open(full, "rb") as f:
+                        f.seek(offset)
+                        data = f.read()
+                except OSError as e:
+                    logger.warning(f"Event segment {name} unreadable: {e}")
+                    continue
+                # 다른 워커가 쓰는 중인 마지막 줄은 다음 동기화에서 읽는다.
+                end = data.rfind(b"\n") + 1
+                self._offsets[name] = offset + end
+                for line in data[:end].decode("utf-8", errors="replace").splitlines():
+                    parts = line.split("\t")
+                    if len(parts) == 4:
+                        events.append((parts[1], parts[2], parts[3]))
+        return events
+
+
+@lru_cache()
+def get_event_log() -> EventLog:
+    return EventLog(settings.event_log_path, settings.event_flush_size, settings.event_retention_days)
@@ -0,0 +1,63 @@
+# src/utils/fusion.py - 여러 검색 방식의 순위 목록을 합치는 reciprocal-rank fusion과 그래프 특징 재순위
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import math
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Tuple[float, Sequence[str]]], k: int = 60) -> Dict[str, float]:
+    """(가중치, 순위 목록)들을 key마다 sum(weight / (k + rank))로 합친다. rank는 1부터.
+
+    점수가 아니라 순위만 쓰므로 n-gram 점수와 코사인 유사도처럼 척도가 다른 목록도 그대로 합칠 수 있다.
+    """
+    scores: Dict[str, float] = {}
+    for weight, ranked in rankings:
+        for rank, key in enumerate(ranked, 1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return scores
+
+
+def recency(issue_date: Optional[str], half_life: float, today: date) -> float:
+    """발매일(YYYYMMDD)이 half_life년 지날 때마다 반으로 줄어드는 0~1 값. 날짜를 모르면(00000000 등) 0."""
+    try:
+        released = date(int(issue_date[:4]), int(issue_date[4:6]) or 1, int(issue_date[6:8]) or 1)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.5 ** (max(0, (today - released).days) / 365.25 / half_life)
+
+
+def rerank(fused: Dict[str, float], features: Dict[str, Dict[str, Any]], artist_scores: Dict[str, float],
+           term_matches: Sequence[Tuple[Set[str], Set[str]]], weights: Dict[str, float], half_life: float,
+           today: Optional[date] = None) -> List[Tuple[str, float]]:
+    """fused 점수(최댓값 대비 0~1)에 그래프 특징을 가중해 더하고 점수 내림차순으로 돌려준다.
+
+    features[song_id]는 issue_date, popularity, artist_ids. 특징이 없는 곡은 fused 점수만 쓴다.
+    term_matches는 질의 단어마다 (제목에 단어가 든 song_id 집합, 이름에 단어가 든 artist_id 집합).
+    - coverage: 제목이나 아티스트 이름으로 맞춘 질의 단어의 비율. "아티스트 + 제목" 질의에서
+      한쪽 목록에만 높게 오른 곡보다 두 단어를 모두 맞춘 곡을 올린다
+    - artist: 곡의 아티스트 중 질의에 맞은 아티스트의 관련도(artist_scores, 0~1)의 최댓값
+    - popularity: 후보 안에서 가장 인기 있는 곡 대비 log 스케일
+    - recency: 발매일 감쇠 (recency())
+    """
+    if not fused:
+        return []
+    today = today or date.today()
+    top = max(fused.values())
+    popular = max((math.log1p(feature["popularity"] or 0) for feature in features.values()), default=0.0) or 1.0
+    w_coverage, w_artist, w_popularity, w_recency = (
+        weights.get(name, 0.0) for name in ("coverage", "artist", "popularity", "recency"))
+    scored = []
+    for song_id, score in fused.items():
+        score /= top
+        feature = features.get(song_id)
+        if feature is not None:
+            artist_ids = feature["artist_ids"]
+            if term_matches:
+                matched = sum(song_id in titles or any(artist_id in artists for artist_id in artist_ids)
+                              for titles, artists in term_matches)
+                score += w_coverage * matched / len(term_matches)
+            score += w_artist * max((artist_scores.get(artist_id, 0.0) for artist_id in artist_ids), default=0.0)
+            score += w_popularity * math.log1p(feature["popularity"] or 0) / popular
+            score += w_recency * recency(feature["issue_date"], half_life, today)
+        scored.append((song_id, score))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored
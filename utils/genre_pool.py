@@ -0,0 +1,185 @@
+# src/utils/genre_pool.py - 장르별 추천 후보 풀 (memory-mapped, 인기도 가중 샘플링)
+from typing import Iterable, List, Optional, Tuple
+import os
+
+import numpy as np
+
+from src.utils.arrays import load_array, load_meta, save_array, save_meta
+
+SONG_IDS = "song_ids.npy"
+GENRE_IDS = "genre_ids.npy"
+SONG_GENRE_INDPTR = "song_genre_indptr.npy"
+SONG_GENRES = "song_genres.npy"
+POOL_INDPTR = "pool_indptr.npy"
+POOL_SONGS = "pool_songs.npy"
+POOL_CUMWEIGHTS = "pool_cumweights.npy"
+META = "meta.json"
+
+
+class GenrePools:
+    """장르별 곡 후보를 CSR로 담은 테이블.
+
+    pool_cumweights는 장르 구간마다 0부터 다시 누적한 가중치라서, 난수를
+    searchsorted 하는 것만으로 가중 샘플을 뽑는다. 요청당 비용은 풀 크기와
+    무관하게 O(limit · log n)이다.
+    """
+
+    def __init__(self, song_ids: np.ndarray, genre_ids: np.ndarray, song_genre_indptr: np.ndarray,
+                 song_genres: np.ndarray, pool_indptr: np.ndarray, pool_songs: np.ndarray,
+                 pool_cumweights: np.ndarray, meta: dict):
+        self.song_ids = song_ids
+        self.genre_ids = genre_ids
+        self.song_genre_indptr = song_genre_indptr
+        self.song_genres = song_genres
+        self.pool_indptr = pool_indptr
+        self.pool_songs = pool_songs
+        self.pool_cumweights = pool_cumweights
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.genre_ids)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, float]], weighting: str = "popularity") -> "GenrePools":
+        """(genre_id, song_id, popularity) 행으로 풀을 만든다. weighting="uniform"이면 가중치를 무시한다."""
+        genre_index: dict = {}
+        song_index: dict = {}
+        pairs = []
+        popularity = {}
+        for genre_id, song_id, pop in rows:
+            if genre_id is None or song_id is None:
+                continue
+            song_id = str(song_id)
+            pairs.append((genre_index.setdefault(str(genre_id), len(genre_index)),
+                          song_index.setdefault(song_id, len(song_index))))
+            popularity[song_index[song_id]] = float(pop or 0)
+
+        # 곡/장르 id를 정렬 순서로 다시 번호 매겨 이진 탐색할 수 있게 한다.
+        song_ids = np.array(list(song_index), dtype=str)
+        song_order = np.argsort(song_ids, kind="stable")
+        song_remap = np.empty_like(song_order)
+        song_remap[song_order] = np.arange(len(song_order))
+        genre_ids = np.array(list(genre_index), dtype=str)
+        genre_order = np.argsort(genre_ids, kind="stable")
+        genre_remap = np.empty_like(genre_order)
+        genre_remap[genre_order] = np.arange(len(genre_order))
+
+        pair_array = np.array(sorted(set(pairs)), dtype=np.int64).reshape(-1, 2)
+        genres = genre_remap[pair_array[:, 0]]
+        songs = song_remap[pair_array[:, 1]]
+        weights = np.ones(len(songs), dtype=np.float64)
+        if weighting == "popularity":
+            pop = np.zeros(len(song_ids), dtype=np.float64)
+            for song, value in popularity.items():
+                pop[song_remap[song]] = value
+            weights = 1.0 + pop[songs]
+
+        by_genre = np.lexsort((songs, genres))
+        pool_songs = songs[by_genre].astype(np.int32)
+        pool_genres = genres[by_genre]
+        pool_indptr = np.searchsorted(pool_genres, np.arange(len(genre_ids) + 1)).astype(np.int64)
+        pool_weights = weights[by_genre]
+        pool_cumweights = np.empty(len(pool_songs), dtype=np.float64)
+        for g in range(len(genre_ids)):
+            lo, hi = pool_indptr[g], pool_indptr[g + 1]
+            pool_cumweights[lo:hi] = np.cumsum(pool_weights[lo:hi])
+
+        by_song = np.lexsort((genres, songs))
+        song_genres = genres[by_song].astype(np.int16)
+        song_genre_indptr = np.searchsorted(songs[by_song], np.arange(len(song_ids) + 1)).astype(np.int64)
+
+        return cls(
+            song_ids[song_order],
+            genre_ids[genre_order],
+            song_genre_indptr,
+            song_genres,
+            pool_indptr,
+            pool_songs,
+            pool_cumweights,
+            {"songs": len(song_ids), "genres": len(genre_ids), "pairs": len(pool_songs), "weighting": weighting},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "GenrePools":
+        return cls(
+            load_array(path, SONG_IDS),
+            load_array(path, GENRE_IDS, mmap=False),
+            load_array(path, SONG_GENRE_INDPTR),
+            load_array(path, SONG_GENRES),
+            load_array(path, POOL_INDPTR, mmap=False),
+            load_array(path, POOL_SONGS),
+            load_array(path, POOL_CUMWEIGHTS),
+            load_meta(path, META),
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        save_array(path, SONG_IDS, self.song_ids)
+        save_array(path, GENRE_IDS, self.genre_ids)
+        save_array(path, SONG_GENRE_INDPTR, self.song_genre_indptr)
+        save_array(path, SONG_GENRES, self.song_genres)
+        save_array(path, POOL_INDPTR, self.pool_indptr)
+        save_array(path, POOL_SONGS, self.pool_songs)
+        save_array(path, POOL_CUMWEIGHTS, self.pool_cumweights)
+        save_meta(path, META, self.meta)
+
+    def row(self, song_id: str) -> int:
+        pos = int(np.searchsorted(self.song_ids, song_id))
+        if pos < len(self.song_ids) and self.song_ids[pos] == song_id:
+            return pos
+        return -1
+
+    def genres_of(self, song_id: str) -> List[int]:
+        row = self.row(song_id)
+        if row < 0:
+            return []
+        return [int(g) for g in self.song_genres[self.song_genre_indptr[row]:self.song_genre_indptr[row + 1]]]
+
+    def sample(self, song_id: str, limit: int = 5, seed: Optional[int] = None, max_rounds: int = 4) -> List[str]:
+        """seed 곡과 장르를 공유하는 곡을 중복 없이 limit개까지 뽑는다."""
+        return [song_id for song_id, _ in self.sample_many([song_id], limit, seed, max_rounds)]
+
+    def sample_many(self, song_ids: List[str], limit: int = 20, seed: Optional[int] = None,
+                    max_rounds: int = 4) -> List[Tuple[str, float]]:
+        """여러 seed 곡의 장르 풀에서 함께 뽑는다. 장르는 그 장르를 가진 seed 수만큼 더 자주 뽑힌다.
+
+        점수는 뽑힌 곡의 장르 중 seed들과 겹치는 장르의 seed 수 합이다. 뽑힌 순서대로 반환하며
+        seed 곡 자신은 제외한다.
+        """
+        weight_of: dict = {}
+        for song_id in song_ids:
+            for g in self.genres_of(song_id):
+                weight_of[g] = weight_of.get(g, 0) + 1
+        if not weight_of:
+            return []
+        genres = list(weight_of)
+        rng = np.random.default_rng(seed)
+        totals = np.array([
+            self.pool_cumweights[self.pool_indptr[g + 1] - 1] if self.pool_indptr[g + 1] > self.pool_indptr[g] else 0.0
+            for g in genres
+        ])
+        draw_weights = totals * np.array([weight_of[g] for g in genres])
+        if draw_weights.sum() <= 0:
+            return []
+        picked: List[int] = []
+        seen = {self.row(song_id) for song_id in song_ids}
+        for _ in range(max_rounds):
+            need = limit - len(picked)
+            if need <= 0:
+                break
+            draws = rng.choice(len(genres), size=need * 2, p=draw_weights / draw_weights.sum())
+            for genre in draws:
+                g = genres[genre]
+                lo, hi = self.pool_indptr[g], self.pool_indptr[g + 1]
+                pos = lo + int(np.searchsorted(self.pool_cumweights[lo:hi], rng.random() * totals[genre], side="right"))
+                song = int(self.pool_songs[min(pos, hi - 1)])
+                if song not in seen:
+                    seen.add(song)
+                    picked.append(song)
+                    if len(picked) == limit:
+                        break
+        scored = []
+        for song in picked:
+            own = self.song_genres[self.song_genre_indptr[song]:self.song_genre_indptr[song + 1]]
+            scored.append((str(self.song_ids[song]), float(sum(weight_of.get(int(g), 0) for g in own))))
+        return scored
@@ -0,0 +1,25 @@
+# src/utils/graph_version.py - 적재 잡이 그래프를 바꿨음을 API 워커에 알리는 버전 파일
+from typing import Any, Optional
+import os
+import time
+
+from src.core.config import settings
+from src.utils.arrays import load_meta, save_meta
+
+VERSION = "version.json"
+
+
+def bump_graph_version(**info: Any) -> int:
+    """새 버전을 기록하고 반환한다. info(적재 단계, 플레이리스트 수 등)는 로그용으로 함께 남긴다."""
+    version = time.time_ns()
+    os.makedirs(settings.graph_version_path, exist_ok=True)
+    save_meta(settings.graph_version_path, VERSION, {"version": version, "updated_at": time.time(), **info})
+    return version
+
+
+def read_graph_version() -> Optional[int]:
+    """현재 그래프 버전. 적재 잡이 한 번도 돌지 않았으면 None."""
+    try:
+        return int(load_meta(settings.graph_version_path, VERSION)["version"])
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,69 @@
+# src/utils/json_stream.py - 큰 JSON 배열 파일을 원소 단위로 읽는 스트리밍 파서
+from typing import Any, Iterator
+import json
+
+WHITESPACE = " \t\r\n"
+TAIL = WHITESPACE + "0123456789.eE+-"  # 원소 뒤에 올 수 있는 공백과, 잘린 숫자의 나머지
+
+
+def iter_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """최상위가 JSON 배열인 파일의 원소를 하나씩 돌려준다.
+
+    파일을 chunk_size 글자씩 읽어 raw_decode로 원소를 잘라 내므로, 메모리에는 읽기 버퍼와
+    원소 하나만 올라간다. song_meta.json(70만 곡)이나 train.json도 파일 크기와 무관하게 읽는다.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer, pos, eof = "", 0, False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            more = f.read(chunk_size)
+            if not more:
+                eof = True
+                return False
+            buffer, pos = buffer[pos:] + more, 0
+            return True
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip(WHITESPACE)
+        if buffer[pos:pos + 1] != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+        skip(WHITESPACE)
+        if buffer[pos:pos + 1] == "]":
+            return
+        while True:
+            skip(WHITESPACE)
+            if pos >= len(buffer):
+                raise ValueError(f"{path}: unterminated JSON array")
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # 원소 뒤의 구분자가 버퍼 안에 보일 때만 원소가 끝났다고 본다. 청크 경계에서 잘린 숫자는
+            # raw_decode가 앞부분만 읽으므로("1.5"가 "1."에서 잘리면 1) 이어지는 숫자 글자까지 건너뛰어 보고,
+            # 그것이 버퍼 끝에 닿으면 다음 청크를 붙여 다시 읽는다.
+            after = end
+            while after < len(buffer) and buffer[after] in TAIL:
+                after += 1
+            if after == len(buffer):
+                if fill():
+                    continue
+                raise ValueError(f"{path}: unterminated JSON array")
+            separator = buffer[after]
+            if separator not in ",]" or buffer[end:after].strip(WHITESPACE):
+                raise ValueError(f"{path}: expected ',' or ']' after an array element, got {buffer[end:after + 1]!r}")
+            pos = after + 1
+            yield item
+            if separator == "]":
+                return
@@ -0,0 +1,189 @@
+# src/utils/metrics.py - 단계별 지연 히스토그램/카운터, Prometheus 텍스트 출력, 요청 단위 trace
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import math
+import threading
+import time
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (이름, 종류, 설명, 레이블, 값). 스크레이프 시점에 기존 통계(CacheStats 등)를 읽어 내보낸다.
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[Sample]]] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", self.labelnames, key, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[bucket] += 1
+            self._sums[key] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        names = self.labelnames + ("le",)
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, key, total
+            yield "_count", self.labelnames, key, cumulative
+
+
+def register_collector(collect: Callable[[], Iterable[Sample]]) -> None:
+    _collectors.append(collect)
+
+
+def render() -> str:
+    """등록된 지표 전체를 Prometheus text exposition format(0.0.4)으로 만든다."""
+    lines: List[str] = []
+    for metric in list(_registry):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for suffix, names, values, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+    # 같은 이름의 샘플은 한 묶음으로 나와야 하므로 이름별로 모은 뒤 쓴다.
+    families: Dict[str, List[str]] = {}
+    for collect in list(_collectors):
+        for name, kind, help, labels, value in collect():
+            family = families.setdefault(name, [f"# HELP {name} {help}", f"# TYPE {name} {kind}"])
+            family.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    for family in families.values():
+        lines.extend(family)
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram(
+    "stunes_stage_seconds", "Latency of one pipeline stage (neo4j_query, cache_lookup, rag_*, serialization)", ("stage",)
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "stunes_http_request_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+NEO4J_INFLIGHT = Gauge("stunes_neo4j_inflight_queries", "Async Neo4j queries running or waiting for a pooled connection")
+NEO4J_POOL_SIZE = Gauge("stunes_neo4j_pool_size", "Configured async Neo4j connection pool size")
+NEO4J_ERRORS = Counter("stunes_neo4j_query_errors_total", "Async Neo4j queries that raised")
+LLM_TOKENS = Counter("stunes_llm_tokens_total", "LLM tokens reported by the provider", ("stage", "kind"))
+STARTUP_SECONDS = Gauge("stunes_startup_seconds", "Worker boot time from importing the API module to serving")
+WARMUP_SECONDS = Gauge("stunes_warmup_seconds", "Background warm-up time by step", ("step",))
+USER_EVENTS = Counter("stunes_user_events_total", "User song events accepted by kind (dropped = lost on flush)", ("kind",))
+
+_trace: ContextVar[Optional[Dict[str, float]]] = ContextVar("stunes_trace", default=None)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    trace = _trace.get()
+    if trace is not None:
+        trace[stage] = trace.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def tracing():
+    """이 블록(과 여기서 시작한 task/스레드)에서 기록된 단계 시간을 모은 dict를 준다."""
+    trace: Dict[str, float] = {}
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def server_timing(trace: Dict[str, float]) -> str:
+    """Server-Timing 헤더 값. 브라우저 개발자 도구와 curl -v에서 단계별 시간을 바로 볼 수 있다."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in trace.items())
@@ -0,0 +1,137 @@
+# src/utils/ngram_index.py - 곡 제목 / 아티스트명 부분 문자열 검색용 n-gram 역색인
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import heapq
+import math
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+
+# 매칭 종류별 기본 점수 (정확히 일치 > 접두 > 단어 시작 > 부분 문자열)
+EXACT, PREFIX, WORD_START, SUBSTRING = 0, 1, 2, 3
+_MATCH_WEIGHT = {EXACT: 4.0, PREFIX: 3.0, WORD_START: 2.0, SUBSTRING: 1.0}
+
+
+def normalize(text: Optional[str]) -> str:
+    """NFKC 정규화 + casefold + 공백 정리. 한글/라틴 모두 동일하게 처리한다."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _grams(text: str, n: int) -> Iterable[str]:
+    if len(text) < n:
+        return (text,) if text else ()
+    return (text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class NgramIndex:
+    """문자 단위 unigram + bigram 역색인.
+
+    질의의 n-gram 중 가장 희소한 posting list만 후보로 꺼낸 뒤 실제 부분 문자열
+    여부를 검증하므로, 전체 문서를 훑는 CONTAINS 스캔 대신 후보 수에 비례하는
+    비용으로 검색한다.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.texts: List[str] = []
+        self._postings: Dict[str, array] = {}
+        self._priors: Optional[List[int]] = None
+        self.priors_version: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, str]]) -> "NgramIndex":
+        index = cls()
+        postings: Dict[str, List[int]] = {}
+        for key, text in items:
+            if key is None:
+                continue
+            norm = normalize(text)
+            doc = len(index.keys)
+            index.keys.append(str(key))
+            index.texts.append(norm)
+            grams = set(_grams(norm, 1))
+            grams.update(_grams(norm, 2))
+            for gram in grams:
+                postings.setdefault(gram, []).append(doc)
+        index._postings = {gram: array("I", docs) for gram, docs in postings.items()}
+        return index
+
+    def set_priors(self, popularity: Sequence[float], version: Optional[float] = None) -> None:
+        """keys 순서의 인기도를 받아 같은 매칭 종류 안에서 순위를 올리는 데 쓴다.
+
+        log2 구간으로 묶어서, 인기도가 비슷한 문서끼리는 기존처럼 짧은 텍스트가 앞선다.
+        """
+        self._priors = [-int(math.log2(1 + max(float(p), 0.0))) for p in popularity]
+        self.priors_version = version
+
+    def _candidates(self, query: str) -> Iterable[int]:
+        n = 1 if len(query) == 1 else 2
+        best = None
+        for gram in set(_grams(query, n)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best or ()
+
+    def _match_kind(self, text: str, query: str) -> int:
+        if text == query:
+            return EXACT
+        if text.startswith(query):
+            return PREFIX
+        if f" {query}" in text or f"({query}" in text:
+            return WORD_START
+        return SUBSTRING
+
+    def exact(self, query: str, limit: int = 10) -> List[str]:
+        """정규화한 텍스트가 질의와 완전히 같은 문서의 key 목록."""
+        query = normalize(query)
+        if not query:
+            return []
+        texts = self.texts
+        return [self.keys[doc] for doc in self._candidates(query) if texts[doc] == query][:limit]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """(key, score) 목록을 관련도 순으로 반환한다."""
+        query = normalize(query)
+        if not query:
+            return []
+        texts = self.texts
+        priors = self._priors
+        hits = []
+        for doc in self._candidates(query):
+            text = texts[doc]
+            if query not in text:
+                continue
+            hits.append((self._match_kind(text, query), priors[doc] if priors else 0, len(text), text, doc))
+        top = heapq.nsmallest(limit, hits)
+        return [
+            (self.keys[doc], _MATCH_WEIGHT[kind] + len(query) / max(length, 1))
+            for kind, _, length, _, doc in top
+        ]
+
+    def ordered(self, query: str, after: Optional[Tuple[str, str]] = None,
+                limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """질의를 포함하는 문서를 (text, key) 순으로 반환한다. after보다 뒤의 것만 돌려준다.
+
+        keyset 페이지네이션용이라 관련도가 아니라 정규화된 텍스트와 key로 정렬한다.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        texts = self.texts
+        keys = self.keys
+        hits = []
+        for doc in self._candidates(query):
+            text = texts[doc]
+            if query in text and (after is None or (text, keys[doc]) > after):
+                hits.append((text, keys[doc]))
+        return heapq.nsmallest(limit, hits) if limit is not None else sorted(hits)
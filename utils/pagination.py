@@ -0,0 +1,23 @@
+# src/utils/pagination.py - keyset 페이지네이션 커서 인코딩 (마지막 (title, song_id))
+from typing import Optional, Tuple
+import base64
+import json
+
+
+def encode_cursor(title: str, song_id: str) -> str:
+    raw = json.dumps([title, song_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """커서가 없으면 None. 형식이 잘못되었으면 ValueError."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        title, song_id = json.loads(raw.decode("utf-8"))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(title, str) or not isinstance(song_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return title, song_id
@@ -0,0 +1,128 @@
+# src/utils/popularity.py - 곡 인기도(플레이리스트 수록 수) 순위 테이블 (memory-mapped)
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from src.core.config import settings
+from src.utils.arrays import load_array, load_meta, save_array, save_meta
+
+logger = logging.getLogger(__name__)
+
+RANKED_IDS = "ranked_ids.npy"
+RANKED_SCORES = "ranked_scores.npy"
+SORTED_IDS = "sorted_ids.npy"
+SORTED_SCORES = "sorted_scores.npy"
+META = "meta.json"
+
+
+class PopularityTable:
+    """인기도 내림차순 배열(top-N 조회용)과 id 정렬 배열(점수 조회용)을 함께 담는다."""
+
+    def __init__(self, ranked_ids: np.ndarray, ranked_scores: np.ndarray, sorted_ids: np.ndarray,
+                 sorted_scores: np.ndarray, meta: dict):
+        self.ranked_ids = ranked_ids
+        self.ranked_scores = ranked_scores
+        self.sorted_ids = sorted_ids
+        self.sorted_scores = sorted_scores
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.ranked_ids)
+
+    @property
+    def version(self) -> float:
+        return self.meta["built_at"]
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, int]]) -> "PopularityTable":
+        scores: Dict[str, int] = {}
+        for song_id, count in rows:
+            if song_id is not None:
+                scores[str(song_id)] = int(count or 0)
+        return cls._from_scores(scores)
+
+    @classmethod
+    def _from_scores(cls, scores: Dict[str, int]) -> "PopularityTable":
+        ids = np.array(list(scores), dtype=str)
+        values = np.array(list(scores.values()), dtype=np.int32)
+        by_id = np.argsort(ids, kind="stable")
+        # 인기도가 같으면 song_id 순으로 고정해 결과가 매번 같도록 한다.
+        by_rank = np.lexsort((ids, -values.astype(np.int64)))
+        return cls(
+            ids[by_rank], values[by_rank], ids[by_id], values[by_id],
+            {"songs": len(ids), "built_at": time.time()},
+        )
+
+    def update(self, rows: Iterable[Tuple[str, int]]) -> "PopularityTable":
+        """변경된 곡의 점수만 덮어쓴 새 테이블을 반환한다 (증분 갱신)."""
+        scores = dict(zip(self.sorted_ids.tolist(), self.sorted_scores.tolist()))
+        for song_id, count in rows:
+            if song_id is not None:
+                scores[str(song_id)] = int(count or 0)
+        return self._from_scores(scores)
+
+    @classmethod
+    def load(cls, path: str) -> "PopularityTable":
+        return cls(
+            load_array(path, RANKED_IDS),
+            load_array(path, RANKED_SCORES),
+            load_array(path, SORTED_IDS),
+            load_array(path, SORTED_SCORES),
+            load_meta(path, META),
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        save_array(path, RANKED_IDS, self.ranked_ids)
+        save_array(path, RANKED_SCORES, self.ranked_scores)
+        save_array(path, SORTED_IDS, self.sorted_ids)
+        save_array(path, SORTED_SCORES, self.sorted_scores)
+        # meta를 마지막에 교체하므로 워커는 meta의 mtime 변화로 새 테이블을 감지한다.
+        save_meta(path, META, self.meta)
+
+    def top(self, limit: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        end = offset + limit
+        return list(zip(self.ranked_ids[offset:end].tolist(), self.ranked_scores[offset:end].tolist()))
+
+    def scores_for(self, song_ids: Sequence[str]) -> np.ndarray:
+        """song_id 목록의 인기도를 한 번에 조회한다. 없는 곡은 0."""
+        ids = np.asarray(song_ids, dtype=str)
+        if not len(self.sorted_ids) or not len(ids):
+            return np.zeros(len(ids), dtype=np.int32)
+        pos = np.minimum(np.searchsorted(self.sorted_ids, ids), len(self.sorted_ids) - 1)
+        found = self.sorted_ids[pos] == ids
+        return np.where(found, self.sorted_scores[pos], 0).astype(np.int32)
+
+
+_table: Optional[PopularityTable] = None
+_table_mtime: Optional[float] = None
+_checked_at = float("-inf")
+_lock = threading.Lock()
+
+
+def get_popularity_table() -> Optional[PopularityTable]:
+    """공유 인기도 테이블. refresh 잡이 파일을 교체하면 popularity_reload_interval 안에 다시 연다."""
+    global _table, _table_mtime, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < settings.popularity_reload_interval:
+        return _table
+    with _lock:
+        if now - _checked_at < settings.popularity_reload_interval:
+            return _table
+        _checked_at = now
+        try:
+            mtime = os.path.getmtime(os.path.join(settings.popularity_path, META))
+        except OSError:
+            return _table
+        if mtime != _table_mtime:
+            try:
+                _table = PopularityTable.load(settings.popularity_path)
+                _table_mtime = mtime
+                logger.info(f"Popularity table loaded over {len(_table)} songs")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Popularity table unavailable at {settings.popularity_path}: {e}")
+        return _table
@@ -0,0 +1,158 @@
+# src/utils/query_understanding.py - 자주 오는 질문 유형을 LLM 없이 파라미터화된 Cypher로 바꾸는 규칙 기반 이해 단계
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import re
+
+from src.utils.ngram_index import normalize
+
+ARTIST_SONGS_QUERY = """
+UNWIND $artist_ids AS artist_id
+MATCH (a:Artist {artist_id: artist_id})-[:PERFORMED_BY]-(s:Song)
+RETURN DISTINCT s.song_id AS song_id
+ORDER BY coalesce(s.popularity, 0) DESC
+LIMIT $limit
+"""
+
+GENRE_YEAR_SONGS_QUERY = """
+MATCH (g:Genre {name: $genre})-[:HAS_GENRE]-(s:Song)
+WHERE s.issue_date STARTS WITH $year
+RETURN DISTINCT s.song_id AS song_id
+ORDER BY coalesce(s.popularity, 0) DESC
+LIMIT $limit
+"""
+
+# 영문 질문의 장르 표현 → Melon 장르명. 그래프에 없는 장르명은 무시된다.
+GENRE_ALIASES = {
+    "ballad": "발라드", "ballads": "발라드",
+    "dance": "댄스",
+    "hip hop": "랩/힙합", "hiphop": "랩/힙합", "rap": "랩/힙합",
+    "rock": "록/메탈", "metal": "록/메탈",
+    "indie": "인디음악",
+    "r&b": "R&B/Soul", "soul": "R&B/Soul",
+    "electronica": "일렉트로니카", "edm": "일렉트로니카",
+    "trot": "성인가요/트로트",
+    "jazz": "재즈",
+    "classical": "클래식",
+    "pop": "POP",
+    "ost": "OST",
+    "folk": "포크/블루스", "blues": "포크/블루스",
+}
+
+# 규칙에 쓰이지 않고 남은 단어가 이 목록뿐일 때만 빠른 경로로 보낸다.
+FILLER_WORDS = {
+    "노래", "곡", "곡들", "노래들", "음악", "추천", "추천해줘", "추천해", "알려줘", "알려", "보여줘", "찾아줘",
+    "줘", "좀", "해줘", "뭐", "있어", "나온", "발매된", "발표된", "년", "년도", "년대", "에", "의",
+    "songs", "song", "tracks", "music", "from", "in", "of", "the", "released", "recommend", "show",
+    "me", "list", "find", "some", "give", "by",
+}
+_PARTICLES = re.compile(r"(의|을|를|은|는|이|가|에서|에|로|으로|도)$")
+_PUNCT = re.compile(r"[\s.,?!~]+")
+_YEAR = re.compile(r"(?<!\d)((?:19|20)\d{2})\s*(년대|s\b|년)?", re.IGNORECASE)
+_NUMBER = re.compile(r"(?<![0-9A-Za-z_$])\d+(?![0-9A-Za-z_])")
+
+_ARTIST_PATTERNS = [
+    re.compile(
+        r"^(?:(?:list|show|recommend|find|give)\s+(?:me\s+)?)?(?:some\s+)?(?:the\s+)?"
+        r"(?:songs|tracks|music)\s+(?:by|from)\s+(?P<artist>.+?)[.?!\s]*$"
+    ),
+    re.compile(
+        r"^(?P<artist>.+?)(?:의)?\s*(?:노래|곡|음악)(?:들)?\s*(?:좀\s*)?"
+        r"(?:알려\s*줘|추천\s*해\s*줘|추천|보여\s*줘|찾아\s*줘|뭐\s*있어)?[.?!\s]*$"
+    ),
+]
+
+
+class Intent(NamedTuple):
+    name: str
+    cypher: str
+    params: Dict[str, object]
+    label: str
+
+
+def _is_filler(text: str) -> bool:
+    for token in _PUNCT.split(text):
+        if token and token not in FILLER_WORDS and _PARTICLES.sub("", token) not in FILLER_WORDS | {""}:
+            return False
+    return True
+
+
+class IntentMatcher:
+    """'X 노래', 'songs by X', '2010년 발라드' 같은 템플릿 질문을 알아본다.
+
+    질문에서 인식한 조각(아티스트/장르/연도)을 빼고 남은 말이 '노래 추천해줘'
+    같은 군더더기뿐일 때만 매칭하므로, '신나는 여름 노래'처럼 해석이 필요한
+    질문은 기존 LLM 경로로 넘어간다.
+    """
+
+    def __init__(self, genre_names: Iterable[str], artist_lookup: Callable[[str], List[str]], limit: int = 50):
+        self.genres = {normalize(name): name for name in genre_names if name}
+        for alias, name in GENRE_ALIASES.items():
+            if normalize(name) in self.genres:
+                self.genres.setdefault(alias, name)
+        # 긴 이름부터 확인해야 'r&b'가 'b'처럼 짧은 조각에 가려지지 않는다.
+        self._genre_keys = sorted(self.genres, key=len, reverse=True)
+        self.artist_lookup = artist_lookup
+        self.limit = limit
+
+    def match(self, question: str) -> Optional[Intent]:
+        text = normalize(question)
+        if not text:
+            return None
+        return self._genre_year(text) or self._artist(text)
+
+    def _artist(self, text: str) -> Optional[Intent]:
+        for pattern in _ARTIST_PATTERNS:
+            m = pattern.match(text)
+            if not m:
+                continue
+            artist = m.group("artist").strip()
+            artist_ids = self.artist_lookup(artist) if artist else []
+            if artist_ids:
+                return Intent("artist_songs", ARTIST_SONGS_QUERY, {"artist_ids": artist_ids, "limit": self.limit}, artist)
+        return None
+
+    def _genre_year(self, text: str) -> Optional[Intent]:
+        genre_key = next((key for key in self._genre_keys if re.search(rf"(?<!\w){re.escape(key)}", text)), None)
+        if genre_key is None:
+            return None
+        rest = re.sub(rf"(?<!\w){re.escape(genre_key)}", " ", text, count=1)
+        year = ""
+        m = _YEAR.search(rest)
+        if m:
+            year = m.group(1)[:3] if m.group(2) and m.group(2).lower() in ("년대", "s") else m.group(1)
+            rest = rest[:m.start()] + " " + rest[m.end():]
+        if not _is_filler(rest):
+            return None
+        genre = self.genres[genre_key]
+        label = f"{m.group(0).strip()} {genre}" if m else genre
+        return Intent("genre_year_songs", GENRE_YEAR_SONGS_QUERY, {"genre": genre, "year": year, "limit": self.limit}, label)
+
+
+def question_shape(question: str) -> Tuple[str, List[str]]:
+    """숫자 리터럴을 자리표시자로 바꾼 질문 형태와 뽑아낸 값을 반환한다.
+
+    '2010년 발라드'와 '2012년 발라드'는 같은 형태가 되어 한 번 생성한 Cypher를 함께 쓴다.
+    """
+    values: List[str] = []
+
+    def _slot(m: "re.Match") -> str:
+        values.append(m.group(0))
+        return f"<n{len(values) - 1}>"
+
+    return _NUMBER.sub(_slot, normalize(question)), values
+
+
+def to_plan(cypher: str, values: List[str]) -> Optional[str]:
+    """생성된 Cypher의 숫자 리터럴을 자리표시자로 바꾼다. 값이 모호하게 쓰였으면 None."""
+    plan = cypher
+    for i, value in enumerate(values):
+        literal = rf"(?<![0-9A-Za-z_$]){re.escape(value)}(?![0-9A-Za-z_])"
+        if len(re.findall(literal, plan)) != 1 or values.count(value) != 1:
+            return None
+        plan = re.sub(literal, f"<n{i}>", plan)
+    return plan
+
+
+def from_plan(plan: str, values: List[str]) -> str:
+    for i, value in enumerate(values):
+        plan = plan.replace(f"<n{i}>", value)
+    return plan
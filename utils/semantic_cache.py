@@ -0,0 +1,98 @@
+# src/utils/semantic_cache.py - 질문 임베딩 유사도로 찾는 RAG 답변 캐시 (in-process, 크기 제한 + TTL)
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+import threading
+import time
+
+import numpy as np
+
+from src.utils.cache import CacheStats
+from src.utils.vector_index import normalize_rows
+
+
+class CachedAnswer(NamedTuple):
+    question: str
+    answer: str
+    song_ids: List[str]
+    similarity: float
+
+
+class SemanticCache:
+    """정규화한 질문 임베딩을 고정 크기 행렬에 두고 내적으로 가장 가까운 답을 찾는다.
+
+    엔트리 수가 수천 개라 IVF 없이 전수 비교한다(2000 x 1536 float32 행렬곱 ≈ 1ms).
+    guard가 다른 엔트리는 유사도와 무관하게 맞지 않는다. '2010년 발라드'/'2012년 발라드'처럼
+    임베딩은 거의 같지만 답이 달라야 하는 질문을 숫자 값으로 구분하는 데 쓴다.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float], threshold: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.stats = CacheStats()
+        self._vectors: Optional[np.ndarray] = None
+        self._live = np.zeros(maxsize, dtype=bool)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, slot: int) -> None:
+        del self._entries[slot]
+        self._live[slot] = False
+
+    def lookup(self, vector: np.ndarray, guard: str = "") -> Optional[CachedAnswer]:
+        query = normalize_rows(vector)
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                self.stats.misses += 1
+                return None
+            scores = np.where(self._live, self._vectors @ query, -np.inf)
+            now = time.monotonic()
+            for slot in np.argsort(-scores):
+                slot = int(slot)
+                if scores[slot] < self.threshold:
+                    break
+                entry = self._entries[slot]
+                if entry["expires_at"] is not None and entry["expires_at"] <= now:
+                    self._drop(slot)
+                    self.stats.expirations += 1
+                    continue
+                if entry["guard"] != guard:
+                    continue
+                self._entries.move_to_end(slot)
+                self.stats.hits += 1
+                return CachedAnswer(entry["question"], entry["answer"], entry["song_ids"], float(scores[slot]))
+            self.stats.misses += 1
+            return None
+
+    def store(self, vector: np.ndarray, question: str, answer: str, song_ids: List[str], guard: str = "") -> None:
+        row = normalize_rows(vector)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, len(row)), dtype=np.float32)
+            if len(self._entries) >= self.maxsize:
+                slot, _ = self._entries.popitem(last=False)
+                self.stats.evictions += 1
+            else:
+                slot = int(np.argmin(self._live))
+            self._vectors[slot] = row
+            self._live[slot] = True
+            self._entries[slot] = {
+                "question": question,
+                "answer": answer,
+                "song_ids": list(song_ids),
+                "guard": guard,
+                "expires_at": time.monotonic() + self.ttl if self.ttl else None,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._live[:] = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = self.stats.as_dict()
+        lookups = stats["hits"] + stats["misses"]
+        return {**stats, "size": len(self), "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0}
@@ -0,0 +1,222 @@
+# src/utils/session_store.py - 대화 세션 저장소 (최근 메시지 창 + 이전 질문 요약 상한 + TTL, in-process LRU / 선택적 Redis 공유 백엔드)
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from src.core.config import settings
+from src.utils.cache import CacheStats, _get_redis_client
+from src.utils.metrics import register_collector
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ROLE_NAMES = {"user": "사용자", "assistant": "어시스턴트"}
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class Session:
+    """한 대화의 상태. 메시지는 (role, content, timestamp) 튜플로 들고, 창을 넘친 질문은 summary로 접는다.
+
+    대화가 길어져도 history()의 길이는 창 크기와 요약 상한으로 묶인다.
+    """
+
+    __slots__ = ("session_id", "user_id", "summary", "messages", "updated_at")
+
+    def __init__(self, session_id: str, user_id: str):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.summary = ""
+        self.messages: List[Tuple[str, str, float]] = []
+        self.updated_at = time.time()
+
+    def append(self, role: str, content: str) -> None:
+        self.messages.append((role, _clip(content, settings.chat_message_chars), time.time()))
+        while len(self.messages) > settings.chat_window:
+            old_role, old_content, _ = self.messages.pop(0)
+            # 창을 벗어난 답변은 버리고 질문만 남긴다. 최근 질문이 남도록 앞쪽을 자른다.
+            if old_role == "user":
+                summary = f"{self.summary} / {old_content}" if self.summary else old_content
+                self.summary = summary[-settings.chat_summary_chars:]
+        self.updated_at = time.time()
+
+    def history(self) -> str:
+        """RAG 프롬프트에 붙일 이전 대화 텍스트. 대화 전이면 빈 문자열."""
+        parts = []
+        if self.summary:
+            parts.append(f"앞서 물어본 것: {self.summary}")
+        if self.messages:
+            parts.append("최근 대화:\n" + "\n".join(
+                f"{ROLE_NAMES.get(role, role)}: {content}" for role, content, _ in self.messages
+            ))
+        return "\n".join(parts)
+
+
+class MemorySessionStore:
+    """스레드 안전한 LRU + 마지막 사용 시각 기준 TTL 세션 저장소.
+
+    마지막으로 쓴 순서대로 놓이므로 만료된 세션은 항상 앞쪽에 모인다. 저장할 때 앞에서부터
+    만료분을 걷어내므로 청소 비용은 만료된 세션 수에만 비례한다.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _expired(self, session: Session, now: float) -> bool:
+        return bool(self.ttl) and session.updated_at + self.ttl <= now
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._data.get(session_id)
+            if session is not None and self._expired(session, time.time()):
+                del self._data[session_id]
+                self.stats.expirations += 1
+                session = None
+            if session is None:
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(session_id)
+            self.stats.hits += 1
+            return session
+
+    def save(self, session: Session) -> None:
+        now = time.time()
+        with self._lock:
+            self._data[session.session_id] = session
+            self._data.move_to_end(session.session_id)
+            while self._data:
+                oldest = next(iter(self._data.values()))
+                if not self._expired(oldest, now):
+                    break
+                self._data.popitem(last=False)
+                self.stats.expirations += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._data.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def encode_session(session: Session) -> bytes:
+    return json.dumps({
+        "session_id": session.session_id,
+        "user_id": session.user_id,
+        "summary": session.summary,
+        "messages": session.messages,
+        "updated_at": session.updated_at,
+    }, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def decode_session(payload: bytes) -> Session:
+    data = json.loads(payload)
+    session = Session(data["session_id"], data["user_id"])
+    session.summary = data["summary"]
+    session.messages = [tuple(message) for message in data["messages"]]
+    session.updated_at = data["updated_at"]
+    return session
+
+
+class RedisSessionStore:
+    """여러 워커가 공유하는 Redis 백엔드. 만료는 키 TTL로, 크기 제한은 Redis maxmemory 정책을 따른다.
+
+    세션은 pickle 대신 JSON으로 쓴다 (utils/cache.py의 RedisCache와 같은 이유). Redis 오류는 세션 없음으로 넘긴다.
+    """
+
+    def __init__(self, client, ttl: Optional[float]):
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._client = client
+        self._prefix = "stunes:session:"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=f"{self._prefix}*"))
+
+    def get(self, session_id: str) -> Optional[Session]:
+        try:
+            payload = self._client.get(self._prefix + session_id)
+        except Exception as e:
+            logger.warning(f"Redis session get failed: {e}")
+            payload = None
+        if payload is not None:
+            try:
+                session = decode_session(payload)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Redis session {session_id} is unreadable: {e}")
+            else:
+                self.stats.hits += 1
+                return session
+        self.stats.misses += 1
+        return None
+
+    def save(self, session: Session) -> None:
+        try:
+            self._client.set(self._prefix + session.session_id, encode_session(session),
+                             ex=int(self.ttl) if self.ttl else None)
+        except Exception as e:
+            logger.warning(f"Redis session save failed: {e}")
+
+    def delete(self, session_id: str) -> None:
+        try:
+            self._client.delete(self._prefix + session_id)
+        except Exception as e:
+            logger.warning(f"Redis session delete failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=f"{self._prefix}*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis session clear failed: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """settings.session_backend에 따른 세션 저장소. Redis에 붙지 못하면 in-process로 대신한다."""
+    global _store
+    if _store is not None:
+        return _store
+    with _store_lock:
+        if _store is None:
+            store = None
+            if settings.session_backend == "redis":
+                try:
+                    store = RedisSessionStore(_get_redis_client(), settings.session_timeout)
+                except Exception as e:
+                    logger.warning(f"Redis session store unavailable, using in-process store: {e}")
+            _store = store or MemorySessionStore(settings.chat_max_sessions, settings.session_timeout)
+        return _store
+
+
+def _session_samples():
+    store = _store
+    if store is None:
+        return
+    yield "stunes_chat_session_lookups_total", "counter", "Chat session lookups", {"result": "hit"}, store.stats.hits
+    yield "stunes_chat_session_lookups_total", "counter", "Chat session lookups", {"result": "miss"}, store.stats.misses
+    yield "stunes_chat_session_expirations_total", "counter", "Sessions dropped after session_timeout", {}, store.stats.expirations
+    yield "stunes_chat_session_evictions_total", "counter", "Sessions evicted by chat_max_sessions", {}, store.stats.evictions
+    if isinstance(store, MemorySessionStore):
+        yield "stunes_chat_sessions", "gauge", "Sessions held by the in-process store", {}, len(store)
+
+
+register_collector(_session_samples)
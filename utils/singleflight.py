@@ -0,0 +1,110 @@
+# src/utils/singleflight.py - 같은 키로 동시에 들어온 호출을 한 번만 실행하고 결과를 나눠 준다 (single-flight)
+from typing import Any, Awaitable, Callable, Dict
+from src.utils.metrics import register_collector
+import asyncio
+import threading
+
+
+class FlightStats:
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.leaders + self.followers
+        return {
+            "executions": self.leaders,
+            "coalesced": self.followers,
+            "ratio": round(self.followers / total, 4) if total else 0.0,
+        }
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Any = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 실행을 하나만 둔다. 스레드(do)와 이벤트 루프(ado) 경로를 따로 관리한다.
+
+    결과는 캐시하지 않는다. 실행이 끝나면 키를 지우므로 그 뒤의 호출은 다시 실행된다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = FlightStats()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, "asyncio.Task"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.leaders += 1
+            else:
+                self.stats.followers += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None and task.get_loop() is loop:
+                self.stats.followers += 1
+            else:
+                task = self._tasks[key] = loop.create_task(factory())
+                task.add_done_callback(lambda done: self._forget(key, done))
+                self.stats.leaders += 1
+        # 먼저 온 요청이 끊겨도(클라이언트 종료 등) 기다리는 나머지 요청의 실행은 계속된다.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task") -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+
+_flights: Dict[str, SingleFlight] = {}
+_registry_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    flight = _flights.get(name)
+    if flight is not None:
+        return flight
+    with _registry_lock:
+        return _flights.setdefault(name, SingleFlight(name))
+
+
+def flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: flight.stats.as_dict() for name, flight in list(_flights.items())}
+
+
+def _flight_samples():
+    for name, flight in list(_flights.items()):
+        for role, count in (("leader", flight.stats.leaders), ("follower", flight.stats.followers)):
+            yield ("stunes_singleflight_calls_total", "counter",
+                   "Calls that executed (leader) or shared an in-flight execution (follower)",
+                   {"name": name, "role": role}, count)
+
+
+register_collector(_flight_samples)
@@ -0,0 +1,367 @@
+# src/utils/snapshot.py - Neo4j 없이 읽기 요청을 처리하는 그래프 스냅샷 (CSR 인접 배열 + 문자열 테이블, memory-mapped)
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import heapq
+import logging
+import os
+import time
+
+import numpy as np
+
+from src.core.config import settings
+from src.utils.arrays import load_array, load_meta, save_array, save_meta
+
+logger = logging.getLogger(__name__)
+
+# 라벨별로 id 다음에 오는 문자열 속성
+NODES = {
+    "song": ("title", "issue_date"),
+    "artist": ("name",),
+    "album": ("title",),
+    "genre": ("name",),
+    "subgenre": ("name",),
+    "playlist": ("title",),
+}
+# 관계 이름 → (출발 라벨, 도착 라벨)
+EDGES = {
+    "song_artist": ("song", "artist"),
+    "song_album": ("song", "album"),
+    "song_genre": ("song", "genre"),
+    "song_subgenre": ("song", "subgenre"),
+    "playlist_song": ("playlist", "song"),
+}
+# build에서 뒤집어 만드는 역방향 CSR
+REVERSED = {"artist_song": "song_artist", "genre_song": "song_genre"}
+SONG_POPULARITY = "song.popularity.npy"
+SONG_POPULAR_RANK = "song.popular_rank.npy"
+META = "meta.json"
+
+
+class StringTable:
+    """UTF-8 바이트를 이어 붙인 data와 경계 offsets. 고정 폭 유니코드 배열보다 훨씬 작다."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def build(cls, values: Iterable[Optional[str]]) -> "StringTable":
+        encoded = [(value or "").encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        """빈 문자열은 None으로 돌려준다 (속성이 없던 노드)."""
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self.data[start:end].tobytes().decode("utf-8") or None
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(src, dst) 간선을 src 기준 CSR로 만든다. 중복 간선은 하나로 합친다."""
+    order = np.lexsort((dst, src))
+    src, dst = src[order], dst[order]
+    if len(src):
+        keep = np.ones(len(src), dtype=bool)
+        keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst = src[keep], dst[keep]
+    indptr = np.searchsorted(src, np.arange(n + 1)).astype(np.int64)
+    return indptr, dst.astype(np.int32)
+
+
+class GraphSnapshot:
+    """Song/Artist/Album/Genre/SubGenre/Playlist 그래프의 읽기 전용 사본.
+
+    노드는 라벨마다 정렬한 id 배열의 행 번호로, 관계는 CSR(indptr, indices)로 담는다.
+    곡 한 건의 상세는 이진 탐색 한 번과 배열 인덱싱 몇 번이면 만들어지므로 Bolt 왕복이
+    없고, 파일은 mmap으로 열기 때문에 여러 워커 프로세스가 같은 페이지를 공유한다.
+    """
+
+    def __init__(self, ids: Dict[str, np.ndarray], strings: Dict[Tuple[str, str], StringTable],
+                 edges: Dict[str, Tuple[np.ndarray, np.ndarray]], song_popularity: np.ndarray,
+                 song_popular_rank: np.ndarray, meta: dict):
+        self.ids = ids
+        self.strings = strings
+        self.edges = edges
+        self.song_popularity = song_popularity
+        self.song_popular_rank = song_popular_rank
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.ids["song"])
+
+    @classmethod
+    def build(cls, nodes: Dict[str, Iterable[Sequence[Any]]],
+              edges: Dict[str, Iterable[Tuple[Any, Any]]]) -> "GraphSnapshot":
+        """nodes[label]은 (id, *NODES[label] 속성) 행, edges[name]은 (출발 id, 도착 id) 행."""
+        ids: Dict[str, np.ndarray] = {}
+        strings: Dict[Tuple[str, str], StringTable] = {}
+        rows: Dict[str, Dict[str, int]] = {}
+        for label, fields in NODES.items():
+            records = {str(record[0]): record[1:] for record in nodes.get(label, ()) if record[0] is not None}
+            keys = sorted(records)
+            ids[label] = np.array(keys, dtype=str)
+            rows[label] = {key: row for row, key in enumerate(keys)}
+            for i, field in enumerate(fields):
+                strings[(label, field)] = StringTable.build(
+                    records[key][i] if i < len(records[key]) else None for key in keys
+                )
+
+        csr: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for name, (src_label, dst_label) in EDGES.items():
+            src_rows, dst_rows = rows[src_label], rows[dst_label]
+            src, dst = array("i"), array("i")
+            for a, b in edges.get(name, ()):
+                s, d = src_rows.get(str(a)), dst_rows.get(str(b))
+                if s is not None and d is not None:
+                    src.append(s)
+                    dst.append(d)
+            csr[name] = _csr(np.array(src, dtype=np.int32), np.array(dst, dtype=np.int32), len(ids[src_label]))
+        for name, forward in REVERSED.items():
+            src_label, dst_label = EDGES[forward]
+            indptr, indices = csr[forward]
+            origin = np.repeat(np.arange(len(ids[src_label]), dtype=np.int32), np.diff(indptr))
+            csr[name] = _csr(indices, origin, len(ids[dst_label]))
+
+        songs = len(ids["song"])
+        popularity = np.bincount(csr["playlist_song"][1], minlength=songs).astype(np.int32)
+        # 인기도가 같으면 song_id 순으로 고정한다 (PopularityTable과 같은 순서).
+        popular_rank = np.lexsort((np.arange(songs), -popularity.astype(np.int64))).astype(np.int32)
+        meta = {
+            "nodes": {label: len(keys) for label, keys in ids.items()},
+            "edges": {name: len(indices) for name, (_, indices) in csr.items()},
+            "built_at": time.time(),
+        }
+        return cls(ids, strings, csr, popularity, popular_rank, meta)
+
+    @classmethod
+    def load(cls, path: str) -> "GraphSnapshot":
+        ids = {label: load_array(path, f"{label}.ids.npy") for label in NODES}
+        strings = {
+            (label, field): StringTable(
+                load_array(path, f"{label}.{field}.data.npy"),
+                load_array(path, f"{label}.{field}.offsets.npy"),
+            )
+            for label, fields in NODES.items() for field in fields
+        }
+        edges = {
+            name: (load_array(path, f"{name}.indptr.npy"), load_array(path, f"{name}.indices.npy"))
+            for name in list(EDGES) + list(REVERSED)
+        }
+        return cls(ids, strings, edges, load_array(path, SONG_POPULARITY), load_array(path, SONG_POPULAR_RANK),
+                   load_meta(path, META))
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        for label, keys in self.ids.items():
+            save_array(path, f"{label}.ids.npy", keys)
+        for (label, field), table in self.strings.items():
+            save_array(path, f"{label}.{field}.data.npy", table.data)
+            save_array(path, f"{label}.{field}.offsets.npy", table.offsets)
+        for name, (indptr, indices) in self.edges.items():
+            save_array(path, f"{name}.indptr.npy", indptr)
+            save_array(path, f"{name}.indices.npy", indices)
+        save_array(path, SONG_POPULARITY, self.song_popularity)
+        save_array(path, SONG_POPULAR_RANK, self.song_popular_rank)
+        save_meta(path, META, self.meta)
+
+    def row(self, label: str, key: str) -> int:
+        """key의 행 번호. 없으면 -1."""
+        keys = self.ids[label]
+        pos = int(np.searchsorted(keys, key))
+        if pos < len(keys) and keys[pos] == key:
+            return pos
+        return -1
+
+    def adjacent(self, edge: str, row: int) -> np.ndarray:
+        indptr, indices = self.edges[edge]
+        return indices[indptr[row]:indptr[row + 1]]
+
+    def _first(self, edge: str, row: int) -> int:
+        adjacent = self.adjacent(edge, row)
+        return int(adjacent[0]) if len(adjacent) else -1
+
+    def _key(self, label: str, row: int) -> Optional[str]:
+        return str(self.ids[label][row]) if row >= 0 else None
+
+    def _text(self, label: str, field: str, row: int) -> Optional[str]:
+        return self.strings[(label, field)][row] if row >= 0 else None
+
+    def card(self, song: int, artist: int = -1) -> Dict[str, Any]:
+        """song_card_query와 같은 컬럼의 행. artist를 주지 않으면 곡의 첫 아티스트를 쓴다."""
+        if artist < 0:
+            artist = self._first("song_artist", song)
+        genre = self._first("song_genre", song)
+        album = self._first("song_album", song)
+        subgenre = self._first("song_subgenre", song)
+        return {
+            "song_id": self._key("song", song),
+            "title": self._text("song", "title", song),
+            "issue_date": self._text("song", "issue_date", song),
+            "artist_name": self._text("artist", "name", artist),
+            "artist_id": self._key("artist", artist),
+            "genre_name": self._text("genre", "name", genre),
+            "genre_id": self._key("genre", genre),
+            "album_title": self._text("album", "title", album),
+            "album_id": self._key("album", album),
+            "subgenre_name": self._text("subgenre", "name", subgenre),
+        }
+
+    def _song_rows(self, song_ids: Iterable[str]) -> List[int]:
+        return [row for row in (self.row("song", song_id) for song_id in song_ids) if row >= 0]
+
+    def _songs_of_artists(self, artist_ids: Iterable[str]) -> Dict[int, Tuple[int, int]]:
+        """곡 → (처음 나온 아티스트의 순위, 그 아티스트 행)."""
+        found: Dict[int, Tuple[int, int]] = {}
+        for rank, artist_id in enumerate(artist_ids):
+            artist = self.row("artist", artist_id)
+            if artist < 0:
+                continue
+            for song in self.adjacent("artist_song", artist).tolist():
+                found.setdefault(song, (rank, artist))
+        return found
+
+    def index_source(self, label: str, field: str) -> Iterator[Dict[str, Any]]:
+        """NgramIndex.build에 넣을 {"key", "text"} 행. TITLE/ARTIST_INDEX_SOURCE와 같은 모양."""
+        table = self.strings[(label, field)]
+        for row, key in enumerate(self.ids[label].tolist()):
+            yield {"key": key, "text": table[row]}
+
+    def songs_by_ids(self, song_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        return [self.card(song) for song in self._song_rows(song_ids)]
+
+    def _artist_songs(self, artist_ids: Sequence[str], limit: int) -> List[Tuple[int, int]]:
+        """(곡 행, 아티스트 행)을 아티스트 순위 → 인기도 내림차순 → 제목 순으로 limit개."""
+        found = self._songs_of_artists(artist_ids)
+        titles = self.strings[("song", "title")]
+        popularity = self.song_popularity
+        top = heapq.nsmallest(limit, found, key=lambda song: (found[song][0], -int(popularity[song]), titles[song] or ""))
+        return [(song, found[song][1]) for song in top]
+
+    def songs_by_artist_ids(self, artist_ids: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        """SONGS_BY_ARTIST_IDS_QUERY와 같은 순서."""
+        return [self.card(song, artist) for song, artist in self._artist_songs(artist_ids, limit)]
+
+    def song_ids_by_artist_ids(self, artist_ids: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        """songs_by_artist_ids와 같은 순서의 song_id만. 상세는 만들지 않는다."""
+        return [{"song_id": self._key("song", song)} for song, _ in self._artist_songs(artist_ids, limit)]
+
+    def song_features(self, song_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """재순위에 쓰는 곡 특징: 발매일, 인기도(담긴 플레이리스트 수), 아티스트 id 목록."""
+        dates = self.strings[("song", "issue_date")]
+        return [{
+            "song_id": self._key("song", song),
+            "issue_date": dates[song],
+            "popularity": int(self.song_popularity[song]),
+            "artist_ids": [self._key("artist", artist) for artist in self.adjacent("song_artist", song).tolist()],
+        } for song in self._song_rows(song_ids)]
+
+    def artist_catalog(self, artist_ids: Sequence[str], after_title: Optional[str] = None,
+                       after_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """아티스트들의 곡을 (title, song_id) 순으로. after_title이 있으면 그 뒤부터."""
+        found = self._songs_of_artists(artist_ids)
+        titles = self.strings[("song", "title")]
+        keyed = []
+        for song, (_, artist) in found.items():
+            key = (titles[song] or "", str(self.ids["song"][song]))
+            if after_title is None or key > (after_title, after_id):
+                keyed.append((key, song, artist))
+        chosen = heapq.nsmallest(limit, keyed) if limit is not None else sorted(keyed)
+        return [self.card(song, artist) for _, song, artist in chosen]
+
+    def artist_recommendations(self, song_ids: Sequence[str], limit: int, scored: bool = False) -> List[Dict[str, Any]]:
+        """seed 곡과 아티스트를 공유하는 곡. scored면 겹치는 seed가 많은 곡부터, 그다음 발매일 최신 순."""
+        seeds = set(self._song_rows(song_ids))
+        weights: Dict[int, int] = {}
+        for seed in seeds:
+            for artist in self.adjacent("song_artist", seed).tolist():
+                weights[artist] = weights.get(artist, 0) + 1
+        scores: Dict[int, int] = {}
+        artist_of: Dict[int, int] = {}
+        for artist, weight in weights.items():
+            for song in self.adjacent("artist_song", artist).tolist():
+                if song not in seeds:
+                    scores[song] = scores.get(song, 0) + weight
+                    artist_of.setdefault(song, artist)
+        dates = self.strings[("song", "issue_date")]
+        top = heapq.nlargest(limit, scores, key=lambda song: (scores[song] if scored else 0, dates[song] or ""))
+        rows = []
+        for song in top:
+            row = self.card(song, artist_of[song])
+            if scored:
+                row["score"] = float(scores[song])
+            rows.append(row)
+        return rows
+
+    def genre_recommendations(self, song_ids: Sequence[str], limit: int, scored: bool = False,
+                              seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """seed 곡과 장르를 공유하는 곡을 무작위로 뽑는다. scored면 겹치는 seed가 많은 곡부터."""
+        seeds = self._song_rows(song_ids)
+        weights: Dict[int, int] = {}
+        for song in set(seeds):
+            for genre in self.adjacent("song_genre", song).tolist():
+                weights[genre] = weights.get(genre, 0) + 1
+        scores = np.zeros(len(self), dtype=np.float64)
+        for genre, weight in weights.items():
+            scores[self.adjacent("genre_song", genre)] += weight
+        scores[seeds] = 0
+        candidates = np.flatnonzero(scores)
+        if not len(candidates) or limit <= 0:
+            return []
+        # 점수는 정수라서 [0, 1) 난수를 더해도 점수 순서는 유지되고 동점끼리만 섞인다.
+        keys = (scores[candidates] if scored else 0) + np.random.default_rng(seed).random(len(candidates))
+        take = min(limit, len(candidates))
+        picked = np.argpartition(-keys, take - 1)[:take]
+        picked = picked[np.argsort(-keys[picked])]
+        rows = []
+        for song in candidates[picked].tolist():
+            row = self.card(song)
+            if scored:
+                row["score"] = float(scores[song])
+            rows.append(row)
+        return rows
+
+    def popular_songs(self, limit: int) -> List[Dict[str, Any]]:
+        return [self.card(song) for song in self.song_popular_rank[:limit].tolist()]
+
+
+Handler = Callable[[GraphSnapshot, Dict[str, Any]], Iterable[Dict[str, Any]]]
+
+
+class SnapshotBackend:
+    """DatabaseManager.graph.query 자리에서 스냅샷으로 답한다.
+
+    서비스가 등록한 Cypher 상수만 처리한다. 등록되지 않은 쿼리(CONTAINS 스캔 폴백,
+    RAG가 생성한 Cypher 등)는 supports()가 False이므로 서비스가 Neo4j로 보낸다.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot, handlers: Dict[str, Handler]):
+        self.snapshot = snapshot
+        self.handlers = handlers
+
+    def supports(self, query: str) -> bool:
+        return query in self.handlers
+
+    def stream(self, query: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        return iter(self.handlers[query](self.snapshot, params or {}))
+
+    def query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return list(self.stream(query, params))
+
+
+@lru_cache()
+def get_snapshot() -> Optional[GraphSnapshot]:
+    """serving_backend가 snapshot이면 snapshot_path의 스냅샷을 연다. 아니거나 파일이 없으면 None."""
+    if settings.serving_backend != "snapshot":
+        return None
+    try:
+        snapshot = GraphSnapshot.load(settings.snapshot_path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Graph snapshot unavailable at {settings.snapshot_path}, using Neo4j: {e}")
+        return None
+    logger.info(f"Graph snapshot loaded: {snapshot.meta['nodes']}")
+    return snapshot
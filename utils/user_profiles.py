@@ -0,0 +1,102 @@
+# src/utils/user_profiles.py - 사용자별 희소 취향 프로필 (최근 곡 가중치 + 장르 가중치)
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+from src.utils.event_log import EVENT_WEIGHTS, Event
+
+APPLY_CHUNK = 10000  # 한 번에 잠그고 반영하는 이벤트 수. 대량 재생 중에도 추천 요청이 오래 기다리지 않는다
+
+
+def song_genres(song_ids: np.ndarray, pools) -> np.ndarray:
+    """곡 어휘(정렬된 song_ids)의 대표 장르 번호. 장르 풀에 없는 곡은 -1."""
+    genres = np.full(len(song_ids), -1, dtype=np.int32)
+    if pools is None or not len(song_ids) or not len(pools.song_ids):
+        return genres
+    pos = np.minimum(np.searchsorted(pools.song_ids, song_ids), len(pools.song_ids) - 1)
+    starts = pools.song_genre_indptr[pos]
+    found = (pools.song_ids[pos] == song_ids) & (pools.song_genre_indptr[pos + 1] > starts)
+    genres[found] = pools.song_genres[starts[found]]
+    return genres
+
+
+class UserProfiles:
+    """사용자 id → (곡 행 번호, 가중치) 희소 벡터와 장르 가중치 행.
+
+    곡은 이웃 테이블(CooccurrenceIndex)의 행 번호라서 추천할 때 CSR 슬라이스를 바로 읽는다.
+    사용자마다 int32/float32 array 두 개만 들고 max_songs를 넘으면 오래된 곡부터 버리므로,
+    활동이 많은 사용자도 크기가 묶인다. 장르 가중치는 사용자 수 × 장르 수 float32 행렬에 모은다.
+    """
+
+    def __init__(self, song_ids: np.ndarray, genres: np.ndarray, n_genres: int, max_songs: int):
+        self.song_ids = song_ids
+        self.genres = genres
+        self.max_songs = max_songs
+        self.events = 0
+        self._uid: Dict[str, int] = {}
+        self._songs: List[array] = []
+        self._weights: List[array] = []
+        self._genre_weights = np.zeros((1024, max(n_genres, 1)), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._uid)
+
+    def _user(self, user_id: str) -> int:
+        uid = self._uid.get(user_id)
+        if uid is None:
+            uid = self._uid[user_id] = len(self._songs)
+            self._songs.append(array("i"))
+            self._weights.append(array("f"))
+            if uid >= len(self._genre_weights):
+                grown = np.zeros((len(self._genre_weights) * 2, self._genre_weights.shape[1]), dtype=np.float32)
+                grown[: len(self._genre_weights)] = self._genre_weights
+                self._genre_weights = grown
+        return uid
+
+    def _rows(self, song_ids: List[str]) -> np.ndarray:
+        if not len(self.song_ids):
+            return np.full(len(song_ids), -1, dtype=np.int64)
+        wanted = np.array(song_ids, dtype=str)
+        pos = np.minimum(np.searchsorted(self.song_ids, wanted), len(self.song_ids) - 1)
+        return np.where(self.song_ids[pos] == wanted, pos, -1)
+
+    def apply(self, events: Iterable[Event]) -> int:
+        """이벤트를 프로필에 더하고 반영한 수를 반환한다. 어휘에 없는 곡과 모르는 종류는 건너뛴다."""
+        events = [event for event in events if event[2] in EVENT_WEIGHTS]
+        applied = 0
+        for start in range(0, len(events), APPLY_CHUNK):
+            chunk = events[start:start + APPLY_CHUNK]
+            rows = self._rows([song_id for _, song_id, _ in chunk]).tolist()
+            genres = self.genres[rows].tolist() if len(self.genres) else [-1] * len(rows)
+            with self._lock:
+                for (user_id, _, kind), row, genre in zip(chunk, rows, genres):
+                    if row < 0:
+                        continue
+                    weight = EVENT_WEIGHTS[kind]
+                    uid = self._user(user_id)
+                    songs, weights = self._songs[uid], self._weights[uid]
+                    try:
+                        weights[songs.index(row)] += weight
+                    except ValueError:
+                        songs.append(row)
+                        weights.append(weight)
+                        if len(songs) > self.max_songs:
+                            del songs[0]
+                            del weights[0]
+                    if genre >= 0:
+                        self._genre_weights[uid, genre] += weight
+                    applied += 1
+        self.events += applied
+        return applied
+
+    def get(self, user_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(곡 행 번호, 가중치, 장르 가중치) 복사본. 이벤트가 없는 사용자는 None."""
+        with self._lock:
+            uid = self._uid.get(user_id)
+            if uid is None:
+                return None
+            return (np.array(self._songs[uid], dtype=np.int64), np.array(self._weights[uid], dtype=np.float32),
+                    self._genre_weights[uid].copy())
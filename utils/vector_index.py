@@ -0,0 +1,237 @@
+# src/utils/vector_index.py - 곡 임베딩 IVF 근사 최근접 이웃 색인 (memory-mapped, float16/int8 양자화)
+from typing import Iterable, List, Optional, Tuple
+import os
+
+import numpy as np
+
+from src.utils.arrays import load_array, load_meta, save_array, save_meta
+
+SONG_IDS = "song_ids.npy"
+ID_ORDER = "id_order.npy"
+VECTORS = "vectors.npy"
+SCALES = "scales.npy"
+CENTROIDS = "centroids.npy"
+ASSIGNMENTS = "assignments.npy"
+LIST_ROWS = "list_rows.npy"
+LIST_OFFSETS = "list_offsets.npy"
+META = "meta.json"
+
+DTYPES = ("float32", "float16", "int8")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """정규화된 float32 행을 저장용 dtype으로 바꾼다. int8은 행별 scale을 함께 반환한다."""
+    if dtype == "float32":
+        return vectors.astype(np.float32), None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.maximum(scales, 1e-12).astype(np.float32)
+    return np.round(vectors / scales[:, None]).astype(np.int8), scales
+
+
+def _chunks(n: int, size: int) -> Iterable[Tuple[int, int]]:
+    for start in range(0, n, size):
+        yield start, min(start + size, n)
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    """각 행을 내적이 가장 큰 centroid에 배정한다."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start, end in _chunks(len(vectors), chunk_size):
+        out[start:end] = np.argmax(normalize_rows(vectors[start:end]) @ centroids.T, axis=1)
+    return out
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = 10, sample_size: int = 100_000,
+                    seed: int = 0) -> np.ndarray:
+    """표본에 대해 spherical k-means를 돌려 IVF coarse quantizer를 학습한다."""
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False))
+    sample = normalize_rows(vectors[sample_rows])
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = counts == 0
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class VectorIndex:
+    """IVF 색인. 벡터는 코사인 유사도를 내적으로 계산하도록 정규화해 저장한다.
+
+    검색은 질의와 가까운 nprobe개 리스트의 행만 꺼내 점수를 매기므로, 전체
+    행렬과 내적하는 brute-force 대비 약 nprobe/nlist 만큼의 벡터만 읽는다.
+    """
+
+    def __init__(self, song_ids: np.ndarray, id_order: np.ndarray, vectors: np.ndarray,
+                 scales: Optional[np.ndarray], centroids: np.ndarray, assignments: np.ndarray,
+                 list_rows: np.ndarray, list_offsets: np.ndarray, meta: dict):
+        self.song_ids = song_ids
+        self.id_order = id_order
+        self.vectors = vectors
+        self.scales = scales
+        self.centroids = centroids
+        self.assignments = assignments
+        self.list_rows = list_rows
+        self.list_offsets = list_offsets
+        self.meta = meta
+
+    def __len__(self) -> int:
+        return len(self.song_ids)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    @classmethod
+    def build(cls, song_ids: np.ndarray, vectors: np.ndarray, centroids: np.ndarray,
+              dtype: str = "float16", assignments: Optional[np.ndarray] = None,
+              chunk_size: int = 65536) -> "VectorIndex":
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        stored = np.empty(vectors.shape, dtype=np.dtype(dtype))
+        scales = np.empty(len(vectors), dtype=np.float32) if dtype == "int8" else None
+        for start, end in _chunks(len(vectors), chunk_size):
+            stored[start:end], chunk_scales = quantize(normalize_rows(vectors[start:end]), dtype)
+            if scales is not None:
+                scales[start:end] = chunk_scales
+        if assignments is None:
+            assignments = assign(vectors, centroids, chunk_size)
+        return cls._assemble(np.asarray(song_ids, dtype=str), stored, scales, centroids, assignments, dtype)
+
+    @classmethod
+    def _assemble(cls, song_ids, stored, scales, centroids, assignments, dtype) -> "VectorIndex":
+        list_rows = np.argsort(assignments, kind="stable").astype(np.int32)
+        list_offsets = np.searchsorted(assignments[list_rows], np.arange(len(centroids) + 1)).astype(np.int64)
+        return cls(
+            song_ids,
+            np.argsort(song_ids, kind="stable").astype(np.int32),
+            stored,
+            scales,
+            centroids.astype(np.float32),
+            assignments.astype(np.int32),
+            list_rows,
+            list_offsets,
+            {"songs": len(song_ids), "dim": int(stored.shape[1]), "nlist": len(centroids), "dtype": dtype},
+        )
+
+    def extend(self, song_ids: np.ndarray, vectors: np.ndarray) -> "VectorIndex":
+        """새 곡을 기존 centroid에 배정해 덧붙인 색인을 반환한다. centroid는 다시 학습하지 않는다."""
+        dtype = self.meta["dtype"]
+        added = VectorIndex.build(song_ids, vectors, self.centroids, dtype)
+        scales = None
+        if dtype == "int8":
+            scales = np.concatenate([self.scales, added.scales])
+        return VectorIndex._assemble(
+            np.concatenate([self.song_ids, added.song_ids]),
+            np.concatenate([self.vectors, added.vectors]),
+            scales,
+            self.centroids,
+            np.concatenate([self.assignments, added.assignments]),
+            dtype,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        meta = load_meta(path, META)
+        return cls(
+            load_array(path, SONG_IDS),
+            load_array(path, ID_ORDER),
+            load_array(path, VECTORS),
+            load_array(path, SCALES) if meta["dtype"] == "int8" else None,
+            load_array(path, CENTROIDS, mmap=False),
+            load_array(path, ASSIGNMENTS),
+            load_array(path, LIST_ROWS),
+            load_array(path, LIST_OFFSETS),
+            meta,
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        save_array(path, SONG_IDS, self.song_ids)
+        save_array(path, ID_ORDER, self.id_order)
+        save_array(path, VECTORS, self.vectors)
+        if self.scales is not None:
+            save_array(path, SCALES, self.scales)
+        save_array(path, CENTROIDS, self.centroids)
+        save_array(path, ASSIGNMENTS, self.assignments)
+        save_array(path, LIST_ROWS, self.list_rows)
+        save_array(path, LIST_OFFSETS, self.list_offsets)
+        save_meta(path, META, self.meta)
+
+    def row(self, song_id: str) -> int:
+        """song_id의 행 번호. 없으면 -1."""
+        pos = self._bisect(song_id)
+        if pos < len(self.song_ids) and self.song_ids[self.id_order[pos]] == song_id:
+            return int(self.id_order[pos])
+        return -1
+
+    def _bisect(self, song_id: str) -> int:
+        # 정렬된 id 배열 전체를 만들지 않고 id_order를 따라 이진 탐색한다.
+        lo, hi = 0, len(self.id_order)
+        ids, order = self.song_ids, self.id_order
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ids[order[mid]] < song_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def vector(self, row: int) -> np.ndarray:
+        return self._decode(np.array([row]))[0]
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(self.vectors[rows], dtype=np.float32)
+        if self.scales is not None:
+            vectors *= np.asarray(self.scales[rows])[:, None]
+        return vectors
+
+    def _top(self, rows: np.ndarray, scores: np.ndarray, k: int, exclude: Optional[int]) -> List[Tuple[str, float]]:
+        if exclude is not None:
+            keep = rows != exclude
+            rows, scores = rows[keep], scores[keep]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+            rows, scores = rows[top], scores[top]
+        ranked = np.argsort(-scores, kind="stable")
+        return [(str(self.song_ids[r]), float(s)) for r, s in zip(rows[ranked], scores[ranked])]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = 16,
+               exclude: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(song_id, cosine) 목록을 유사도 내림차순으로 반환한다."""
+        query = normalize_rows(query)
+        lists = np.argsort(-(self.centroids @ query))[:nprobe]
+        rows = np.concatenate(
+            [self.list_rows[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists]
+        ).astype(np.int64)
+        if not len(rows):
+            return []
+        return self._top(rows, self._decode(rows) @ query, k, exclude)
+
+    def brute_force(self, query: np.ndarray, k: int = 10, exclude: Optional[int] = None,
+                    chunk_size: int = 65536) -> List[Tuple[str, float]]:
+        """전체 행렬과 내적하는 정확한 k-NN. 재현율 측정의 기준값."""
+        query = normalize_rows(query)
+        scores = np.empty(len(self), dtype=np.float32)
+        for start, end in _chunks(len(self), chunk_size):
+            scores[start:end] = self._decode(np.arange(start, end)) @ query
+        return self._top(np.arange(len(self)), scores, k, exclude)
+
+    def similar_to(self, song_id: str, k: int = 10, nprobe: int = 16) -> List[Tuple[str, float]]:
+        row = self.row(song_id)
+        if row < 0:
+            return []
+        return self.search(self.vector(row), k, nprobe, exclude=row)